@@ -0,0 +1,61 @@
+# coding: utf8
+
+import timeit
+from collections import Counter
+# noinspection PyPackageRequirements
+import numpy
+from pandas import DataFrame
+from dfqueue import assign_dataframe
+
+
+def rowwise_queue_items(dataframe: DataFrame, selected_columns: list) -> tuple:
+    """
+        Row-wise construction of the initial queue (dfqueue <= 1.0), kept as reference.
+    """
+
+    def get_values(local_row, local_columns, counter):
+        values = dict()
+        for local_column in local_columns:
+            values[local_column] = local_row[local_column]
+        if local_row.name not in counter:
+            counter[local_row.name] = Counter()
+        counter[local_row.name][frozenset(local_columns)] += 1
+        return values
+
+    reseted_counter = {}
+    reseted_queue = dataframe.apply(lambda row: (row.name,
+                                                 get_values(row, selected_columns,
+                                                            reseted_counter)),
+                                    axis=1,
+                                    result_type='reduce')
+    return reseted_queue, reseted_counter
+
+
+class AssignDataframe:
+    params = [10**4, 10**5, 10**6, 10**7]
+    param_names = ['rows_nb']
+    timeout = 3600
+
+    def setup(self, rows_nb):
+        self.selected_columns = ['A', 'C']
+        self.dataframe = DataFrame(numpy.random.rand(rows_nb, 4), columns=['A', 'B', 'C', 'D'])
+
+    def time_columnar(self, rows_nb):
+        assign_dataframe(self.dataframe, rows_nb, self.selected_columns,
+                         queue_name='BENCH_ASSIGN_DATAFRAME')
+
+    def time_rowwise(self, rows_nb):
+        rowwise_queue_items(self.dataframe, self.selected_columns)
+
+
+if __name__ == '__main__':
+    import sys
+
+    benchmark = AssignDataframe()
+    for selected_rows_nb in [int(arg) for arg in sys.argv[1:]] or AssignDataframe.params:
+        benchmark.setup(selected_rows_nb)
+        for method_name in ['time_columnar', 'time_rowwise']:
+            duration = timeit.timeit(lambda: getattr(benchmark, method_name)(selected_rows_nb),
+                                     number=1)
+            print("{:>10} rows - {:<14} : {:.3f} s".format(selected_rows_nb, method_name,
+                                                          duration))
@@ -0,0 +1,48 @@
+# coding: utf8
+
+import timeit
+from contextlib import contextmanager
+from pandas import DataFrame
+from dfqueue import adding, managing, assign_dataframe, batch
+
+
+QUEUE_NAME = 'BENCHMARK_BATCH'
+
+
+@contextmanager
+def no_batch(queue_name: str):
+    yield
+
+
+@managing(queue_name=QUEUE_NAME)
+@adding(queue_name=QUEUE_NAME)
+def ingest_row(label: int, value: float) -> list:
+    # The row is already in the dataframe: only the bookkeeping of dfqueue is measured
+    return [(label, {'A': value})]
+
+
+class BatchBenchmark:
+    params = ([10**5], ['per_call', 'batch'])
+    param_names = ['rows_nb', 'ingest_mode']
+    timeout = 3600
+
+    def setup(self, rows_nb, ingest_mode):
+        self.dataframe = DataFrame({'A': [0.0] * rows_nb, 'B': [0.0] * rows_nb})
+        assign_dataframe(self.dataframe, rows_nb, ['A'], QUEUE_NAME)
+        self.context = batch if ingest_mode == 'batch' else no_batch
+
+    def time_ingest(self, rows_nb, ingest_mode):
+        with self.context(QUEUE_NAME):
+            for label in range(rows_nb):
+                ingest_row(label, 0.0)
+
+
+if __name__ == '__main__':
+    benchmark = BatchBenchmark()
+    for selected_rows_nb in BatchBenchmark.params[0]:
+        for selected_ingest_mode in BatchBenchmark.params[1]:
+            arguments = (selected_rows_nb, selected_ingest_mode)
+            benchmark.setup(*arguments)
+            duration = timeit.timeit(lambda: benchmark.time_ingest(*arguments), number=1)
+            print("{:>8} rows - {:<8} : {:.3f} s ({:.0f} rows/s)".format(
+                selected_rows_nb, selected_ingest_mode, duration, selected_rows_nb / duration))
@@ -0,0 +1,66 @@
+# coding: utf8
+
+import gc
+import timeit
+import tracemalloc
+from collections import Counter
+from dfqueue.core.counters import InternedCounter
+
+
+def legacy_count(items: list) -> dict:
+    """
+        Counter of the queue's items used by dfqueue <= 1.0, kept as reference.
+    """
+
+    counter = dict()
+    for label, checking_values in items:
+        if label not in counter:
+            counter[label] = Counter()
+        counter[label][frozenset(checking_values.keys())] += 1
+    return counter
+
+
+def interned_count(items: list) -> InternedCounter:
+    counter = InternedCounter()
+    increment = counter.increment
+    for label, checking_values in items:
+        increment(label, checking_values)
+    return counter
+
+
+class CounterBenchmark:
+    params = ([10**5, 10**6], ['legacy', 'interned'])
+    param_names = ['rows_nb', 'counter_type']
+    timeout = 3600
+
+    def setup(self, rows_nb, counter_type):
+        # Two groups of checking columns
+        self.items = [(index, {'A': 0.0, 'B': 0.0} if index % 10 else {'A': 0.0})
+                      for index in range(rows_nb)]
+        self.count = legacy_count if counter_type == 'legacy' else interned_count
+
+    def track_bytes_per_row(self, rows_nb, counter_type):
+        gc.collect()
+        tracemalloc.start()
+        counter = self.count(self.items)
+        counter_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del counter
+        return counter_bytes / rows_nb
+
+    track_bytes_per_row.unit = 'bytes'
+
+    def time_count(self, rows_nb, counter_type):
+        self.count(self.items)
+
+
+if __name__ == '__main__':
+    benchmark = CounterBenchmark()
+    for selected_rows_nb in CounterBenchmark.params[0]:
+        for selected_counter_type in CounterBenchmark.params[1]:
+            arguments = (selected_rows_nb, selected_counter_type)
+            benchmark.setup(*arguments)
+            print("{:>8} rows - {:<8} : {:6.1f} bytes/row, counting {:.3f} s".format(
+                selected_rows_nb, selected_counter_type,
+                benchmark.track_bytes_per_row(*arguments),
+                timeit.timeit(lambda: benchmark.time_count(*arguments), number=1)))
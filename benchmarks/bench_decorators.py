@@ -0,0 +1,53 @@
+# coding: utf8
+
+import timeit
+from pandas import DataFrame
+from dfqueue import adding, managing, synchronized, assign_dataframe
+
+
+QUEUE_NAME = 'BENCHMARK_DECORATORS'
+CALLS_NB = 100000
+
+
+def create_function(decorators: str):
+    def ingest_row(label: int) -> list:
+        return [(label, {'A': 0.0})]
+
+    if 'adding' in decorators:
+        ingest_row = adding(queue_name=QUEUE_NAME)(ingest_row)
+    if 'managing' in decorators:
+        ingest_row = managing(queue_name=QUEUE_NAME)(ingest_row)
+    if 'synchronized' in decorators:
+        ingest_row = synchronized(queue_name=QUEUE_NAME)(ingest_row)
+    return ingest_row
+
+
+class DecoratorsBenchmark:
+    params = (['none', 'adding', 'managing', 'adding+managing', 'adding+managing+synchronized'],)
+    param_names = ['decorators']
+    timeout = 3600
+
+    def setup(self, decorators):
+        # The rows are already in the dataframe : the managing process doesn't remove rows
+        self.dataframe = DataFrame({'A': [0.0] * 100, 'B': [0.0] * 100})
+        assign_dataframe(self.dataframe, 100, ['A'], QUEUE_NAME)
+        self.ingest_row = create_function(decorators)
+
+    def time_calls(self, decorators):
+        ingest_row = self.ingest_row
+        for label in range(CALLS_NB):
+            ingest_row(label % 100)
+
+
+if __name__ == '__main__':
+    benchmark = DecoratorsBenchmark()
+    reference_duration = None
+    for selected_decorators in DecoratorsBenchmark.params[0]:
+        benchmark.setup(selected_decorators)
+        duration = min(timeit.repeat(lambda: benchmark.time_calls(selected_decorators),
+                                     number=1, repeat=5))
+        if reference_duration is None:
+            reference_duration = duration
+        print("{:<29} : {:6.0f} ns/call ({:6.0f} ns/call of overhead)".format(
+            selected_decorators, duration / CALLS_NB * 1e9,
+            (duration - reference_duration) / CALLS_NB * 1e9))
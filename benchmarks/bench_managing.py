@@ -0,0 +1,132 @@
+# coding: utf8
+
+import timeit
+# noinspection PyPackageRequirements
+import numpy
+from pandas import DataFrame, MultiIndex
+from dfqueue import adding, managing, assign_dataframe, QueueBehaviour
+
+
+QUEUE_NAME = 'BENCHMARK_MANAGING'
+CALLS_NB = 10000
+
+
+class EvictionBenchmark:
+    # Size of the dataframe, rows removed by one managing process and behaviour of the queue
+    params = ([10**4, 10**5, 10**6], [1, 100, 10000], ['LAST_ITEM', 'ALL_ITEMS'])
+    param_names = ['rows_nb', 'batch_size', 'queue_behaviour']
+    timeout = 3600
+
+    def setup(self, rows_nb, batch_size, queue_behaviour):
+        self.dataframe = DataFrame(numpy.random.rand(rows_nb + batch_size, 4),
+                                   columns=['A', 'B', 'C', 'D'])
+        # The first 'batch_size' rows are above the max size
+        assign_dataframe(self.dataframe, rows_nb, ['A', 'C'], QUEUE_NAME,
+                         queue_behaviour=QueueBehaviour[queue_behaviour])
+
+        @managing(queue_name=QUEUE_NAME)
+        def manage() -> None:
+            pass
+
+        self.manage = manage
+
+    def time_managing(self, rows_nb, batch_size, queue_behaviour):
+        self.manage()
+
+
+class EvictionIndexBenchmark:
+    # Size of the dataframe and type of its index : one managing process removes 10 rows (the
+    # first managing process builds the map of the label positions)
+    params = ([10**4, 10**5, 10**6], ['range', 'integer', 'string'])
+    param_names = ['rows_nb', 'index_type']
+    timeout = 3600
+
+    def setup(self, rows_nb, index_type):
+        index = None
+        if index_type == 'integer':
+            index = numpy.arange(0, 2 * (rows_nb + 10), 2)
+        elif index_type == 'string':
+            index = ['row_{}'.format(label) for label in range(rows_nb + 10)]
+        self.dataframe = DataFrame(numpy.random.rand(rows_nb + 10, 4),
+                                   columns=['A', 'B', 'C', 'D'], index=index)
+        assign_dataframe(self.dataframe, rows_nb, ['A'], QUEUE_NAME)
+
+        @managing(queue_name=QUEUE_NAME)
+        def manage() -> None:
+            pass
+
+        self.manage = manage
+
+    def time_managing(self, rows_nb, index_type):
+        self.manage()
+
+
+class CallsBenchmark:
+    # Each call adds a new row : the managing process removes one row for each call
+    params = (['LAST_ITEM', 'ALL_ITEMS'],)
+    param_names = ['queue_behaviour']
+    timeout = 3600
+
+    def setup(self, queue_behaviour):
+        self.dataframe = DataFrame({'A': numpy.arange(1000.0), 'B': numpy.arange(1000.0)})
+        assign_dataframe(self.dataframe, 1000, ['A'], QUEUE_NAME,
+                         queue_behaviour=QueueBehaviour[queue_behaviour])
+
+        @managing(queue_name=QUEUE_NAME)
+        @adding(queue_name=QUEUE_NAME)
+        def add_row(label: int) -> list:
+            self.dataframe.at[label, 'A'] = float(label)
+            return [(label, {'A': float(label)})]
+
+        self.add_row = add_row
+
+    def time_calls(self, queue_behaviour):
+        add_row = self.add_row
+        for label in range(1000, 1000 + CALLS_NB // 10):
+            add_row(label)
+
+
+class MultiIndexColumnsBenchmark:
+    params = ([10**4, 10**5],)
+    param_names = ['rows_nb']
+    timeout = 3600
+
+    def setup(self, rows_nb):
+        columns = MultiIndex.from_tuples([('A', '1'), ('A', '2'), ('B', '1'), ('B', '2')],
+                                         names=['first', 'second'])
+        self.selected_columns = [('A', '1'), ('B', '2')]
+        self.dataframe = DataFrame(numpy.random.rand(rows_nb, 4), columns=columns)
+        assign_dataframe(self.dataframe, rows_nb, self.selected_columns, QUEUE_NAME)
+
+        # The rows are already in the dataframe : the managing process checks the items
+        @managing(queue_name=QUEUE_NAME)
+        @adding(queue_name=QUEUE_NAME)
+        def update_row(label: int) -> list:
+            return [(label, {('A', '1'): self.dataframe.iat[label, 0],
+                             ('B', '2'): self.dataframe.iat[label, 3]})]
+
+        self.update_row = update_row
+
+    def time_assign_dataframe(self, rows_nb):
+        assign_dataframe(self.dataframe, rows_nb, self.selected_columns, QUEUE_NAME)
+
+    def time_calls(self, rows_nb):
+        update_row = self.update_row
+        for label in range(CALLS_NB):
+            update_row(label % rows_nb)
+
+
+if __name__ == '__main__':
+    import itertools
+
+    for benchmark_class in [EvictionBenchmark, EvictionIndexBenchmark, CallsBenchmark,
+                            MultiIndexColumnsBenchmark]:
+        benchmark = benchmark_class()
+        for arguments in itertools.product(*benchmark_class.params):
+            for method_name in [name for name in dir(benchmark_class)
+                                if name.startswith('time_')]:
+                benchmark.setup(*arguments)
+                duration = timeit.timeit(lambda: getattr(benchmark, method_name)(*arguments),
+                                         number=1)
+                print("{:<26} - {:<22} - {:<30} : {:.4f} s".format(
+                    benchmark_class.__name__, method_name, str(arguments), duration))
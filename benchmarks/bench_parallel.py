@@ -0,0 +1,87 @@
+# coding: utf8
+
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from random import randint
+from uuid import uuid4
+from pandas import DataFrame, Series
+from dfqueue import adding, managing, synchronized, assign_dataframe
+
+
+QUEUE_NAMES = ('BENCHMARK_PARALLEL_A', 'BENCHMARK_PARALLEL_B')
+SELECTED_COLUMNS = (['A', 'C'], ['B', 'D'])
+OPERATIONS_NB = 1000
+
+
+def create_functions(queue_name: str, selected_columns: list):
+    @synchronized(queue_name=queue_name)
+    @managing(queue_name=queue_name)
+    @adding(queue_name=queue_name)
+    def add_row(dataframe: DataFrame, label: str, columns_dict: dict) -> list:
+        dataframe.at[label] = Series(data=columns_dict)
+        return [(label, {column: columns_dict[column] for column in selected_columns})]
+
+    # The row is updated without the managing process
+    @synchronized(queue_name=queue_name)
+    @adding(queue_name=queue_name)
+    def change_row(dataframe: DataFrame, label: str, columns_dict: dict) -> list:
+        dataframe.at[label] = Series(data=columns_dict)
+        return [(label, {column: columns_dict[column] for column in selected_columns})]
+
+    return add_row, change_row
+
+
+def create_columns_dict() -> dict:
+    return {'A': str(uuid4()), 'B': str(uuid4()), 'C': str(uuid4()), 'D': str(uuid4())}
+
+
+class ParallelBenchmark:
+    """
+        Threaded scenarios of the 'test_parallel' tests: adding threads and updating threads of
+        one queue, or adding threads of two queues assigned to the same dataframe.
+    """
+
+    params = (['one_queue', 'two_queues'],)
+    param_names = ['scenario']
+    timeout = 3600
+
+    def setup(self, scenario):
+        self.dataframe = DataFrame(columns=['A', 'B', 'C', 'D'])
+        assign_dataframe(self.dataframe, 1000, SELECTED_COLUMNS[0], QUEUE_NAMES[0])
+        self.functions = [create_functions(QUEUE_NAMES[0], SELECTED_COLUMNS[0])]
+        if scenario == 'two_queues':
+            assign_dataframe(self.dataframe, 500, SELECTED_COLUMNS[1], QUEUE_NAMES[1])
+            self.functions.append(create_functions(QUEUE_NAMES[1], SELECTED_COLUMNS[1]))
+
+    def time_threads(self, scenario):
+        dataframe = self.dataframe
+
+        def thread_adding(add_row):
+            for _ in range(OPERATIONS_NB):
+                add_row(dataframe, str(uuid4()), create_columns_dict())
+
+        def thread_change(change_row):
+            for _ in range(OPERATIONS_NB // 4):
+                if len(dataframe) > 0:
+                    change_row(dataframe, dataframe.index.values[randint(0, len(dataframe) - 1)],
+                               create_columns_dict())
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            if scenario == 'one_queue':
+                add_row, change_row = self.functions[0]
+                futures = [executor.submit(thread_adding, add_row),
+                           executor.submit(thread_adding, add_row),
+                           executor.submit(thread_change, change_row)]
+            else:
+                futures = [executor.submit(thread_adding, functions[0])
+                           for functions in self.functions]
+            for future in futures:
+                future.result()
+
+
+if __name__ == '__main__':
+    benchmark = ParallelBenchmark()
+    for selected_scenario in ParallelBenchmark.params[0]:
+        benchmark.setup(selected_scenario)
+        duration = timeit.timeit(lambda: benchmark.time_threads(selected_scenario), number=1)
+        print("{:<10} : {:.3f} s".format(selected_scenario, duration))
@@ -0,0 +1,63 @@
+# coding: utf8
+
+import gc
+import timeit
+import tracemalloc
+from collections import deque
+# noinspection PyPackageRequirements
+import numpy
+from pandas import DataFrame
+from dfqueue import QueueStorage
+from dfqueue.core import dfqueue
+from dfqueue.core.storage import ColumnarQueue
+
+
+def create_queue(dataframe: DataFrame, selected_columns: list, queue_storage: QueueStorage):
+    if queue_storage == QueueStorage.COLUMNAR:
+        return ColumnarQueue.from_dataframe(dataframe, selected_columns)
+    return deque(getattr(dfqueue, '__create_queue_items')(dataframe, selected_columns))
+
+
+class QueueStorageBenchmark:
+    params = ([10**5, 10**6], [QueueStorage.DEQUE, QueueStorage.COLUMNAR])
+    param_names = ['rows_nb', 'queue_storage']
+    timeout = 3600
+
+    def setup(self, rows_nb, queue_storage):
+        self.selected_columns = ['A', 'C', 'E']
+        self.dataframe = DataFrame(numpy.random.rand(rows_nb, 4), columns=['A', 'B', 'C', 'D'])
+        self.dataframe['E'] = numpy.arange(rows_nb)
+
+    def track_bytes_per_item(self, rows_nb, queue_storage):
+        gc.collect()
+        tracemalloc.start()
+        queue = create_queue(self.dataframe, self.selected_columns, queue_storage)
+        queue_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del queue
+        return queue_bytes / rows_nb
+
+    track_bytes_per_item.unit = 'bytes'
+
+    def time_create(self, rows_nb, queue_storage):
+        create_queue(self.dataframe, self.selected_columns, queue_storage)
+
+    def time_popleft(self, rows_nb, queue_storage):
+        queue = create_queue(self.dataframe, self.selected_columns, queue_storage)
+        popleft_items = getattr(dfqueue, '__popleft_items')
+        for _ in range(100):
+            popleft_items(queue, rows_nb // 100)
+
+
+if __name__ == '__main__':
+    benchmark = QueueStorageBenchmark()
+    for selected_rows_nb in QueueStorageBenchmark.params[0]:
+        for selected_queue_storage in QueueStorageBenchmark.params[1]:
+            arguments = (selected_rows_nb, selected_queue_storage)
+            benchmark.setup(*arguments)
+            print("{:>8} rows - {:<22} : {:6.1f} bytes/item, creation {:.3f} s, "
+                  "popleft (100 batches) {:.3f} s".format(
+                      selected_rows_nb, str(selected_queue_storage),
+                      benchmark.track_bytes_per_item(*arguments),
+                      timeit.timeit(lambda: benchmark.time_create(*arguments), number=1),
+                      timeit.timeit(lambda: benchmark.time_popleft(*arguments), number=1)))
@@ -0,0 +1,55 @@
+# coding: utf8
+
+import timeit
+# noinspection PyPackageRequirements
+import numpy
+from pandas import DataFrame
+from dfqueue import adding, managing, assign_dataframe, RingFrame
+
+
+QUEUE_NAME = 'BENCHMARK_RING_FRAME'
+CALLS_NB = 100
+
+
+class RingFrameBenchmark:
+    # Full dataframe : each call adds a new row and the managing process removes the oldest row
+    params = ([10**3, 10**4, 10**5, 10**6], ['dataframe', 'ring_frame'])
+    param_names = ['rows_nb', 'frame_type']
+    timeout = 3600
+
+    def setup(self, rows_nb, frame_type):
+        dataframe = DataFrame(numpy.random.rand(rows_nb, 4), columns=['A', 'B', 'C', 'D'])
+        if frame_type == 'ring_frame':
+            frame = RingFrame.from_dataframe(dataframe, capacity=rows_nb + 1)
+        else:
+            frame = dataframe
+        assign_dataframe(frame, rows_nb, ['A'], QUEUE_NAME)
+
+        @managing(queue_name=QUEUE_NAME)
+        @adding(queue_name=QUEUE_NAME)
+        def add_row(label: int) -> list:
+            values = {'A': float(label), 'B': 0.0, 'C': 0.0, 'D': 0.0}
+            if frame_type == 'ring_frame':
+                frame.set_row(label, values)
+            else:
+                frame.loc[label] = [values['A'], values['B'], values['C'], values['D']]
+            return [(label, {'A': float(label)})]
+
+        self.rows_nb = rows_nb
+        self.add_row = add_row
+
+    def time_calls(self, rows_nb, frame_type):
+        add_row = self.add_row
+        for label in range(rows_nb, rows_nb + CALLS_NB):
+            add_row(label)
+
+
+if __name__ == '__main__':
+    benchmark = RingFrameBenchmark()
+    for selected_rows_nb in RingFrameBenchmark.params[0]:
+        for selected_frame_type in RingFrameBenchmark.params[1]:
+            arguments = (selected_rows_nb, selected_frame_type)
+            benchmark.setup(*arguments)
+            duration = timeit.timeit(lambda: benchmark.time_calls(*arguments), number=1)
+            print("{:>8} rows - {:<10} : {:.3f} s ({:.0f} calls/s)".format(
+                selected_rows_nb, selected_frame_type, duration, CALLS_NB / duration))
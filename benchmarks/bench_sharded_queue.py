@@ -0,0 +1,55 @@
+# coding: utf8
+
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from pandas import DataFrame
+from dfqueue import adding, managing, synchronized, assign_dataframe, QueueStorage
+
+
+QUEUE_NAME = 'BENCHMARK_SHARDED_QUEUE'
+ROWS_NB = 1000
+CALLS_NB = 20000
+# Items added by each call
+ITEMS_NB = 10
+
+
+def create_ingest_function(dataframe: DataFrame):
+    @synchronized(queue_name=QUEUE_NAME, shared=True)
+    @managing(queue_name=QUEUE_NAME)
+    @adding(queue_name=QUEUE_NAME)
+    def ingest_rows(label: int) -> list:
+        return [((label + index) % ROWS_NB, {'A': index}) for index in range(ITEMS_NB)]
+    return ingest_rows
+
+
+class ShardedQueueBenchmark:
+    params = ([1, 2, 4, 8, 16], ['DEQUE', 'SHARDED'])
+    param_names = ['threads_nb', 'queue_storage']
+    timeout = 3600
+
+    def setup(self, threads_nb, queue_storage):
+        self.dataframe = DataFrame({'A': [0.0] * ROWS_NB, 'B': [0.0] * ROWS_NB})
+        assign_dataframe(self.dataframe, ROWS_NB, ['A'], QUEUE_NAME,
+                         queue_storage=QueueStorage[queue_storage], shards_nb=16)
+        self.ingest_rows = create_ingest_function(self.dataframe)
+
+    def time_ingest(self, threads_nb, queue_storage):
+        def ingest(start_label: int):
+            for call_index in range(CALLS_NB // threads_nb):
+                self.ingest_rows(start_label + call_index)
+
+        with ThreadPoolExecutor(max_workers=threads_nb) as executor:
+            for future in [executor.submit(ingest, thread_index * 100)
+                           for thread_index in range(threads_nb)]:
+                future.result()
+
+
+if __name__ == '__main__':
+    benchmark = ShardedQueueBenchmark()
+    for selected_threads_nb in ShardedQueueBenchmark.params[0]:
+        for selected_queue_storage in ShardedQueueBenchmark.params[1]:
+            arguments = (selected_threads_nb, selected_queue_storage)
+            benchmark.setup(*arguments)
+            duration = timeit.timeit(lambda: benchmark.time_ingest(*arguments), number=1)
+            print("{:>3} threads - {:<7} : {:.3f} s ({:.0f} calls/s)".format(
+                selected_threads_nb, selected_queue_storage, duration, CALLS_NB / duration))
@@ -0,0 +1,91 @@
+# coding: utf8
+
+import timeit
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from pandas import DataFrame
+from dfqueue import adding, managing, synchronized, assign_dataframe, attach_dataframe, \
+    SharedFrame
+
+
+QUEUE_NAME = 'BENCHMARK_SHARED_FRAME'
+ROWS_NB = 1000
+CALLS_NB = 4000
+# Work of each call holding the GIL (parsing in Python, ...)
+WORK_SIZE = 2000
+
+
+def compute_value(label: int) -> float:
+    return float(sum((label + index) % 7 for index in range(WORK_SIZE)))
+
+
+@synchronized(queue_name=QUEUE_NAME)
+@managing(queue_name=QUEUE_NAME)
+@adding(queue_name=QUEUE_NAME)
+def ingest_row(dataframe: DataFrame, label: int, value: float) -> list:
+    dataframe.at[label, 'A'] = value
+    return [(label, {'A': value})]
+
+
+@synchronized(queue_name=QUEUE_NAME)
+@managing(queue_name=QUEUE_NAME)
+@adding(queue_name=QUEUE_NAME)
+def ingest_shared_row(frame: SharedFrame, label: int, value: float) -> list:
+    frame.set_row(label, {'A': value})
+    return [(label, {'A': value})]
+
+
+def ingest_rows(dataframe: DataFrame, start_label: int, calls_nb: int):
+    for label in range(start_label, start_label + calls_nb):
+        ingest_row(dataframe, label, compute_value(label))
+
+
+def ingest_shared_rows(frame: SharedFrame, start_label: int, calls_nb: int):
+    attach_dataframe(frame, QUEUE_NAME)
+    for label in range(start_label, start_label + calls_nb):
+        ingest_shared_row(frame, label, compute_value(label))
+
+
+class SharedFrameBenchmark:
+    params = ([1, 2, 4], ['threads', 'processes'])
+    param_names = ['workers_nb', 'backend']
+    timeout = 3600
+
+    def setup(self, workers_nb, backend):
+        if backend == 'threads':
+            self.dataframe = DataFrame({'A': [0.0] * ROWS_NB}, index=range(-ROWS_NB, 0))
+        else:
+            self.dataframe = SharedFrame(['A'], 2 * ROWS_NB, queue_capacity=4 * ROWS_NB)
+            for label in range(-ROWS_NB, 0):
+                self.dataframe.set_row(label, {'A': 0.0})
+        assign_dataframe(self.dataframe, ROWS_NB, ['A'], QUEUE_NAME)
+
+    def time_ingest(self, workers_nb, backend):
+        calls_nb = CALLS_NB // workers_nb
+        if backend == 'threads':
+            with ThreadPoolExecutor(max_workers=workers_nb) as executor:
+                for future in [executor.submit(ingest_rows, self.dataframe, index * calls_nb,
+                                               calls_nb)
+                               for index in range(workers_nb)]:
+                    future.result()
+            return
+
+        processes = [multiprocessing.Process(target=ingest_shared_rows,
+                                             args=(self.dataframe, index * calls_nb, calls_nb))
+                     for index in range(workers_nb)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+
+if __name__ == '__main__':
+    benchmark = SharedFrameBenchmark()
+    for selected_backend in SharedFrameBenchmark.params[1]:
+        for selected_workers_nb in SharedFrameBenchmark.params[0]:
+            arguments = (selected_workers_nb, selected_backend)
+            benchmark.setup(*arguments)
+            duration = timeit.timeit(lambda: benchmark.time_ingest(*arguments), number=1)
+            print("{:>2} {:<9} : {:.3f} s ({:.0f} calls/s, {} rows)".format(
+                selected_workers_nb, selected_backend, duration, CALLS_NB / duration,
+                len(benchmark.dataframe)))
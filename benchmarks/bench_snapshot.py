@@ -0,0 +1,59 @@
+# coding: utf8
+
+import shutil
+import tempfile
+import timeit
+# noinspection PyPackageRequirements
+import numpy
+from pandas import DataFrame
+from dfqueue import assign_dataframe, save_queue, load_queue, QueueStorage
+
+
+QUEUE_NAME = 'BENCH_SNAPSHOT'
+
+
+class Snapshot:
+    params = ([10**4, 10**5, 10**6], ['DEQUE', 'COLUMNAR'])
+    param_names = ['rows_nb', 'queue_storage']
+    timeout = 3600
+
+    def setup(self, rows_nb, queue_storage):
+        self.path = tempfile.mkdtemp()
+        self.dataframe = DataFrame(numpy.random.rand(rows_nb, 4), columns=['A', 'B', 'C', 'D'])
+        assign_dataframe(self.dataframe, rows_nb, ['A', 'C'], QUEUE_NAME,
+                         queue_storage=QueueStorage[queue_storage])
+        save_queue(QUEUE_NAME, self.path)
+
+    def teardown(self, rows_nb, queue_storage):
+        shutil.rmtree(self.path)
+
+    def time_assign_dataframe(self, rows_nb, queue_storage):
+        # Cold restart : the queue is rebuilt in the index's order
+        assign_dataframe(self.dataframe, rows_nb, ['A', 'C'], QUEUE_NAME,
+                         queue_storage=QueueStorage[queue_storage])
+
+    def time_save_queue(self, rows_nb, queue_storage):
+        save_queue(QUEUE_NAME, self.path)
+
+    def time_load_queue(self, rows_nb, queue_storage):
+        load_queue(self.path)
+
+    def time_load_queue_with_dataframe(self, rows_nb, queue_storage):
+        load_queue(self.path, dataframe=self.dataframe)
+
+
+if __name__ == '__main__':
+    import sys
+
+    benchmark = Snapshot()
+    for selected_rows_nb in [int(arg) for arg in sys.argv[1:]] or Snapshot.params[0]:
+        for selected_queue_storage in Snapshot.params[1]:
+            arguments = (selected_rows_nb, selected_queue_storage)
+            benchmark.setup(*arguments)
+            for method_name in ['time_assign_dataframe', 'time_save_queue', 'time_load_queue',
+                                'time_load_queue_with_dataframe']:
+                duration = timeit.timeit(lambda: getattr(benchmark, method_name)(*arguments),
+                                         number=1)
+                print("{:>10} rows - {:<8} - {:<30} : {:.3f} s".format(
+                    selected_rows_nb, selected_queue_storage, method_name, duration))
+            benchmark.teardown(*arguments)
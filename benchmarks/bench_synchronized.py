@@ -0,0 +1,138 @@
+# coding: utf8
+
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from pandas import DataFrame
+from dfqueue import adding, managing, synchronized, assign_dataframe, profile_lock
+
+
+QUEUE_NAME = 'BENCHMARK_SYNCHRONIZED'
+ROWS_NB = 1000
+CALLS_NB = 4000
+# Work of each call releasing the GIL (I/O, parsing in C, ...)
+IO_DURATION = 0.0002
+
+
+def create_ingest_function(shared: bool, dataframe: DataFrame):
+    @synchronized(queue_name=QUEUE_NAME, shared=shared)
+    @managing(queue_name=QUEUE_NAME)
+    @adding(queue_name=QUEUE_NAME)
+    def ingest_row(label: int) -> list:
+        time.sleep(IO_DURATION)
+        return [(label, {'A': dataframe.at[label, 'A']})]
+    return ingest_row
+
+
+def create_adding_function(workload: str, dataframe: DataFrame):
+    if workload == 'add_rows':
+        # New rows : exclusive calls
+        @synchronized(queue_name=QUEUE_NAME)
+        @managing(queue_name=QUEUE_NAME)
+        @adding(queue_name=QUEUE_NAME)
+        def add_row(label: int, value: float) -> list:
+            dataframe.at[label] = [value, value]
+            return [(label, {'A': value})]
+        return add_row
+
+    # Updates of existing rows with the dataframe's lock : shared calls
+    dataframe_lock = Lock()
+
+    @synchronized(queue_name=QUEUE_NAME, shared=True)
+    @managing(queue_name=QUEUE_NAME)
+    @adding(queue_name=QUEUE_NAME)
+    def update_row(label: int, value: float) -> list:
+        label %= ROWS_NB
+        with dataframe_lock:
+            dataframe.at[label, 'A'] = value
+        return [(label, {'A': value})]
+    return update_row
+
+
+class SynchronizedBenchmark:
+    """
+        Calls of a synchronized function reading an existing row, by several threads.
+
+        The scaling of the shared mode only comes from the work releasing the GIL of each call
+        (a sleep of IO_DURATION seconds) : the calls don't add rows and the cost of the pandas
+        operations doesn't scale with the threads. The functions adding rows (the calls of
+        test_parallel for example) can't use the shared mode and are serialized like the
+        exclusive calls (see AddingBenchmark).
+    """
+
+    params = ([1, 2, 4, 8, 16], ['exclusive', 'shared'], [False, True])
+    param_names = ['threads_nb', 'lock_mode', 'lock_profile']
+    timeout = 3600
+
+    def setup(self, threads_nb, lock_mode, lock_profile):
+        self.dataframe = DataFrame({'A': [0.0] * ROWS_NB, 'B': [0.0] * ROWS_NB})
+        assign_dataframe(self.dataframe, ROWS_NB, ['A'], QUEUE_NAME)
+        profile_lock(QUEUE_NAME, lock_profile)
+        self.ingest_row = create_ingest_function(lock_mode == 'shared', self.dataframe)
+
+    def time_ingest(self, threads_nb, lock_mode, lock_profile):
+        def ingest_rows(start_label: int):
+            for call_index in range(CALLS_NB // threads_nb):
+                self.ingest_row((start_label + call_index) % ROWS_NB)
+
+        with ThreadPoolExecutor(max_workers=threads_nb) as executor:
+            for future in [executor.submit(ingest_rows, thread_index * 100)
+                           for thread_index in range(threads_nb)]:
+                future.result()
+
+
+class AddingBenchmark:
+    """
+        Calls of a synchronized adding function by several threads, each call after the
+        reception of its record (a sleep of IO_DURATION seconds without the lock):
+        - add_rows : new rows (exclusive calls : the shared mode doesn't support the functions
+        adding rows), a managing process removing one row for each call
+        - update_rows : updates of existing rows with a lock of the dataframe (shared calls)
+
+        The work of the calls (pandas operations, queue's items) holds the GIL : only the
+        receptions of the records overlap.
+    """
+
+    params = ([1, 2, 4, 8, 16], ['add_rows', 'update_rows'])
+    param_names = ['threads_nb', 'workload']
+    timeout = 3600
+
+    def setup(self, threads_nb, workload):
+        self.dataframe = DataFrame({'A': [0.0] * ROWS_NB, 'B': [0.0] * ROWS_NB})
+        assign_dataframe(self.dataframe, ROWS_NB, ['A'], QUEUE_NAME)
+        self.add_row = create_adding_function(workload, self.dataframe)
+
+    def time_adding(self, threads_nb, workload):
+        def add_rows(thread_index: int):
+            start_label = ROWS_NB + thread_index * CALLS_NB
+            for call_index in range(CALLS_NB // threads_nb):
+                time.sleep(IO_DURATION)
+                self.add_row(start_label + call_index, float(call_index))
+
+        with ThreadPoolExecutor(max_workers=threads_nb) as executor:
+            for future in [executor.submit(add_rows, thread_index)
+                           for thread_index in range(threads_nb)]:
+                future.result()
+
+
+if __name__ == '__main__':
+    benchmark = SynchronizedBenchmark()
+    for selected_threads_nb in SynchronizedBenchmark.params[0]:
+        for selected_lock_mode in SynchronizedBenchmark.params[1]:
+            for selected_lock_profile in SynchronizedBenchmark.params[2]:
+                arguments = (selected_threads_nb, selected_lock_mode, selected_lock_profile)
+                benchmark.setup(*arguments)
+                duration = timeit.timeit(lambda: benchmark.time_ingest(*arguments), number=1)
+                print("{:>3} threads - {:<9} - profile {:<5} : {:.3f} s ({:.0f} calls/s)".format(
+                    selected_threads_nb, selected_lock_mode, str(selected_lock_profile), duration,
+                    CALLS_NB / duration))
+
+    benchmark = AddingBenchmark()
+    for selected_threads_nb in AddingBenchmark.params[0]:
+        for selected_workload in AddingBenchmark.params[1]:
+            arguments = (selected_threads_nb, selected_workload)
+            benchmark.setup(*arguments)
+            duration = timeit.timeit(lambda: benchmark.time_adding(*arguments), number=1)
+            print("{:>3} threads - {:<11} : {:.3f} s ({:.0f} calls/s)".format(
+                selected_threads_nb, selected_workload, duration, CALLS_NB / duration))
@@ -0,0 +1,68 @@
+# coding: utf8
+
+import os
+import shutil
+import tempfile
+import timeit
+from pandas import DataFrame
+from dfqueue import assign_dataframe, adding, managing, save_queue, replay, sync_wal
+from dfqueue.core.dfqueue import QueuesHandler
+
+
+QUEUE_NAME = 'BENCH_WAL'
+CALLS_NB = 10000
+
+
+@managing(queue_name=QUEUE_NAME)
+@adding(queue_name=QUEUE_NAME)
+def add_row(dataframe: DataFrame, label: int) -> list:
+    dataframe.at[label, 'A'] = label
+    return [(label, {'A': label})]
+
+
+class WriteAheadLog:
+    # No log, log synced for each call, group commits each 1 and 10 ms
+    params = (['NONE', '0', '1', '10'],)
+    param_names = ['sync_ms']
+    timeout = 600
+
+    def setup(self, sync_ms):
+        self.path = tempfile.mkdtemp()
+        self.dataframe = DataFrame({'A': range(100)})
+        assign_dataframe(self.dataframe, 100, ['A'], QUEUE_NAME,
+                         wal_path=None if sync_ms == 'NONE' else os.path.join(self.path, 'wal'),
+                         wal_sync_ms=0 if sync_ms == 'NONE' else float(sync_ms))
+        save_queue(QUEUE_NAME, os.path.join(self.path, 'snapshot'))
+
+    def teardown(self, sync_ms):
+        assign_dataframe(None, 1, [], QUEUE_NAME)
+        shutil.rmtree(self.path)
+
+    def time_adding(self, sync_ms):
+        # Each call logs one appended item and one evicted row
+        for label in range(100, 100 + CALLS_NB):
+            add_row(self.dataframe, label)
+
+    def time_replay(self, sync_ms):
+        if sync_ms != 'NONE':
+            replay(os.path.join(self.path, 'snapshot'), os.path.join(self.path, 'wal'))
+
+
+if __name__ == '__main__':
+    benchmark = WriteAheadLog()
+    for selected_sync_ms in WriteAheadLog.params[0]:
+        benchmark.setup(selected_sync_ms)
+        duration = timeit.timeit(lambda: benchmark.time_adding(selected_sync_ms), number=1)
+        wal = QueuesHandler().get_state(QUEUE_NAME).wal
+        if wal is None:
+            print("sync_ms={:<5} : {:>8.0f} calls/s".format(selected_sync_ms,
+                                                            CALLS_NB / duration))
+        else:
+            sync_wal(QUEUE_NAME)
+            replay_duration = timeit.timeit(lambda: benchmark.time_replay(selected_sync_ms),
+                                            number=1)
+            print("sync_ms={:<5} : {:>8.0f} calls/s - {:.0f} bytes/call - write amplification "
+                  "{:.1f} - {} syncs - replay {:.3f} s".format(
+                      selected_sync_ms, CALLS_NB / duration, wal.written_bytes / CALLS_NB,
+                      wal.synced_bytes / wal.written_bytes, wal.syncs_nb, replay_duration))
+        benchmark.teardown(selected_sync_ms)
@@ -0,0 +1,201 @@
+# coding: utf8
+
+"""
+    Run the benchmarks of this directory without asv and save the results as JSON.
+
+    The benchmarks are the asv-style classes of the 'bench_*' modules ('params', 'param_names',
+    'setup', 'teardown' and 'time_*' methods). Each 'time_*' method is timed once per repeat
+    after a call of 'setup'.
+
+    python -m benchmarks.run --output results.json [--filter Eviction] [--quick]
+    python -m benchmarks.run --output new.json --compare results.json
+"""
+
+import argparse
+import datetime
+import importlib
+import itertools
+import json
+import os
+import pkgutil
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import timeit
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+# Version of the format of the results
+RESULTS_VERSION = 1
+
+
+def get_parameters(benchmark_class: type) -> List[Tuple]:
+    """
+        :return: Combinations of the parameters of a benchmark (asv semantics: a list of values
+        is one parameter, a list of lists are several parameters)
+        :rtype: List[Tuple]
+    """
+
+    params = getattr(benchmark_class, 'params', [])
+    if not params:
+        return [tuple()]
+    if not all(isinstance(values, (list, tuple)) for values in params):
+        params = [params]
+    return list(itertools.product(*params))
+
+
+def get_benchmarks(name_filter: str) -> Iterator[Tuple[str, type, str]]:
+    """
+        :return: Name, class and method's name of the selected benchmarks
+        :rtype: Iterator[Tuple[str, type, str]]
+    """
+
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for module_info in sorted(pkgutil.iter_modules([directory]), key=lambda info: info.name):
+        if not module_info.name.startswith('bench_'):
+            continue
+        module = importlib.import_module('{}.{}'.format(__package__, module_info.name))
+        for class_name, benchmark_class in sorted(vars(module).items()):
+            if not isinstance(benchmark_class, type) or \
+                    benchmark_class.__module__ != module.__name__:
+                continue
+            for method_name in sorted(name for name in dir(benchmark_class)
+                                      if name.startswith('time_')):
+                name = '{}.{}.{}'.format(module_info.name, class_name, method_name)
+                if re.search(name_filter, name):
+                    yield name, benchmark_class, method_name
+
+
+def run_benchmark(benchmark_class: type, method_name: str, parameters: Tuple,
+                  repeat: int) -> List[float]:
+    """
+        :return: Durations in seconds of the method (one for each repeat)
+        :rtype: List[float]
+    """
+
+    durations = list()
+    for _ in range(repeat):
+        benchmark = benchmark_class()
+        if hasattr(benchmark, 'setup'):
+            benchmark.setup(*parameters)
+        try:
+            durations.append(timeit.timeit(lambda: getattr(benchmark, method_name)(*parameters),
+                                           number=1))
+        finally:
+            if hasattr(benchmark, 'teardown'):
+                benchmark.teardown(*parameters)
+    return durations
+
+
+def get_environment() -> Dict[str, Any]:
+    import numpy
+    import pandas
+    import dfqueue
+
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL,
+                                         cwd=os.path.dirname(os.path.abspath(__file__)))
+        commit = commit.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'commit': commit,
+            'machine': platform.node(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'python': platform.python_version(),
+            'packages': {'dfqueue': dfqueue.__version__, 'pandas': pandas.__version__,
+                         'numpy': numpy.__version__}}
+
+
+def run(name_filter: str = '', repeat: int = 3, quick: bool = False) -> Dict[str, Any]:
+    """
+        :param name_filter: Regular expression of the selected benchmarks's names
+        :type name_filter: str
+
+        :param repeat: Number of timings of each benchmark and parameters
+        :type repeat: int
+
+        :param quick: Only the first combination of parameters of each benchmark
+        :type quick: bool
+
+        :return: Results (see 'save')
+        :rtype: Dict[str, Any]
+    """
+
+    results = dict()
+    for name, benchmark_class, method_name in get_benchmarks(name_filter):
+        param_names = list(getattr(benchmark_class, 'param_names', []))
+        results[name] = list()
+        for parameters in get_parameters(benchmark_class)[:1 if quick else None]:
+            durations = run_benchmark(benchmark_class, method_name, parameters, repeat)
+            result = {'params': dict(zip(param_names, map(str, parameters))),
+                      'min': min(durations),
+                      'median': statistics.median(durations),
+                      'durations': durations}
+            results[name].append(result)
+            print("{:<70} {:<50} {:>10.4f} s".format(name, str(result['params']),
+                                                     result['min']), flush=True)
+    return {'version': RESULTS_VERSION, 'environment': get_environment(), 'results': results}
+
+
+def save(results: Dict[str, Any], path: str) -> None:
+    with open(path, 'w') as results_file:
+        json.dump(results, results_file, indent=2, sort_keys=True)
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> int:
+    """
+        Print the ratios of the min durations of two runs.
+
+        :param threshold: Min ratio of a regression
+        :type threshold: float
+
+        :return: Number of regressions
+        :rtype: int
+    """
+
+    assert baseline.get('version') == RESULTS_VERSION, \
+        "Results version {} not supported".format(baseline.get('version'))
+    regressions_nb = 0
+    for name, name_results in sorted(results['results'].items()):
+        baseline_results = {json.dumps(result['params'], sort_keys=True): result
+                            for result in baseline['results'].get(name, [])}
+        for result in name_results:
+            baseline_result = baseline_results.get(json.dumps(result['params'], sort_keys=True))
+            if baseline_result is None:
+                continue
+            ratio = result['min'] / baseline_result['min']
+            is_regression = ratio > threshold
+            regressions_nb += is_regression
+            print("{:<70} {:<50} {:>10.4f} s -> {:>10.4f} s : x{:.2f}{}".format(
+                name, str(result['params']), baseline_result['min'], result['min'], ratio,
+                ' REGRESSION' if is_regression else ''))
+    return regressions_nb
+
+
+def main(arguments: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Run the benchmarks of dfqueue.")
+    parser.add_argument('--output', help="JSON file of the results")
+    parser.add_argument('--filter', default='', help="Regular expression of the benchmarks")
+    parser.add_argument('--repeat', type=int, default=3, help="Timings of each benchmark")
+    parser.add_argument('--quick', action='store_true',
+                        help="First combination of parameters only")
+    parser.add_argument('--compare', help="JSON file of the baseline results")
+    parser.add_argument('--threshold', type=float, default=1.1,
+                        help="Min ratio of the regressions (with --compare)")
+    options = parser.parse_args(arguments)
+
+    results = run(options.filter, options.repeat, options.quick)
+    if options.output is not None:
+        save(results, options.output)
+    if options.compare is not None:
+        with open(options.compare) as baseline_file:
+            return 1 if compare(results, json.load(baseline_file), options.threshold) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -3,11 +3,38 @@
 from .core.dfqueue import adding
 from .core.dfqueue import managing
 from .core.dfqueue import synchronized
+from .core.dfqueue import batch
+from .core.dfqueue import touching
 
 from .core.dfqueue import assign_dataframe
 from .core.dfqueue import list_queue_names
 from .core.dfqueue import get_info_provider
+from .core.dfqueue import wait_for_eviction
+from .core.dfqueue import stop_eviction_worker
+from .core.dfqueue import expire_items
+from .core.dfqueue import touch
+from .core.dfqueue import attach_dataframe
+from .core.dfqueue import save_queue
+from .core.dfqueue import load_queue
+from .core.dfqueue import replay
+from .core.dfqueue import sync_wal
+from .core.dfqueue import export_stats
+from .core.dfqueue import serve_stats
+from .core.dfqueue import profile_lock
 
 from .core.dfqueue import QueueBehaviour
+from .core.dfqueue import QueueStorage
+from .core.dfqueue import QueueFullPolicy
+from .core.dfqueue import QueueFullError
+
+from .core.shared import SharedFrame
+from .core.backends import FrameBackend, DataFrameBackend
+from .core.ring import RingFrame
+
+from .core.hooks import QueueEvent
+from .core.hooks import register_hook
+from .core.hooks import unregister_hook
+from .core.hooks import register_logging_hooks
+from .core.hooks import unregister_logging_hooks
 
 from .__meta__ import __version__
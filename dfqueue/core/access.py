@@ -0,0 +1,296 @@
+# coding: utf8
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+
+__all__ = ['RecencyQueue', 'FrequencyQueue']
+
+
+class _AccessOrderedQueue(ABC):
+    """
+        Queue with one item for each label, ordered by the accesses of the labels.
+
+        A new item replaces the item of its label. The first item is the next evicted item. The
+        queue may be manipulated as a deque:
+        - append, extend and popleft methods (append and extend return the replaced items)
+        - brackets with int type
+        - len function
+        - iteration
+        - containing
+        - equality
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def append(self, item: Tuple[Any, Dict]) -> Union[Tuple[Any, Dict], None]:
+        pass
+
+    @abstractmethod
+    def popleft(self) -> Tuple[Any, Dict]:
+        pass
+
+    @abstractmethod
+    def touch(self, label: Any) -> bool:
+        """
+            Record an access (i.e a read) of a label.
+
+            :param label: Row's label
+            :type label: Any
+
+            :return: False if the label doesn't have an item
+            :rtype: bool
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[Tuple[Any, Dict]]:
+        pass
+
+    def extend(self, items: Iterable[Tuple[Any, Dict]]) -> List[Tuple[Any, Dict]]:
+        """
+            :return: Items replaced by the new items
+            :rtype: List[Tuple[Any, Dict]]
+        """
+
+        replaced_items = list()
+        for item in items:
+            replaced_item = self.append(item)
+            if replaced_item is not None:
+                replaced_items.append(replaced_item)
+        return replaced_items
+
+    def __getitem__(self, index: int) -> Tuple[Any, Dict]:
+        if not isinstance(index, int):
+            raise TypeError("Queue indices must be integers")
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("Queue index out of range")
+        return next(islice(self, index, None))
+
+    def __contains__(self, item: Any) -> bool:
+        return any(queue_item == item for queue_item in self)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, (_AccessOrderedQueue, Sequence)):
+            return NotImplemented
+        if len(self) != len(other):
+            return False
+        return all(item == other_item for item, other_item in zip(self, other))
+
+    def __ne__(self, other: Any) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __repr__(self) -> str:
+        return "{}({})".format(type(self).__name__, list(self))
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+
+class RecencyQueue(_AccessOrderedQueue):
+    """
+        Queue of the LRU behaviour: the items are ordered from the least recently used label to
+        the most recently used label (ordered hash map, O(1) for each access).
+
+        A new item and a touch of a label move the label at the end of the queue.
+    """
+
+    __slots__ = ('__items',)
+
+    def __init__(self, items: Iterable[Tuple[Any, Dict]] = ()):
+        # Label -> item (least recently used label first)
+        self.__items = OrderedDict()
+        self.extend(items)
+
+    def append(self, item: Tuple[Any, Dict]) -> Union[Tuple[Any, Dict], None]:
+        label = item[0]
+        items = self.__items
+        replaced_item = items.pop(label, None)
+        items[label] = item
+        return replaced_item
+
+    def popleft(self) -> Tuple[Any, Dict]:
+        if not self.__items:
+            raise IndexError("pop from an empty queue")
+        return self.__items.popitem(last=False)[1]
+
+    def touch(self, label: Any) -> bool:
+        try:
+            self.__items.move_to_end(label)
+        except KeyError:
+            return False
+        return True
+
+    def clear(self) -> None:
+        self.__items.clear()
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def __iter__(self) -> Iterator[Tuple[Any, Dict]]:
+        return iter(self.__items.values())
+
+
+class _FrequencyBucket:
+    """
+        Labels with the same number of accesses (node of a doubly linked list sorted by
+        frequency).
+    """
+
+    __slots__ = ('frequency', 'labels', 'previous', 'next')
+
+    def __init__(self, frequency: int, previous: Union['_FrequencyBucket', None],
+                 next_bucket: Union['_FrequencyBucket', None]):
+        self.frequency = frequency
+        # Label -> None (least recently used label first)
+        self.labels = OrderedDict()
+        self.previous = previous
+        self.next = next_bucket
+
+
+class FrequencyQueue(_AccessOrderedQueue):
+    """
+        Queue of the LFU behaviour: the items are ordered from the least frequently used label to
+        the most frequently used label, then from the least recently used label (frequency
+        buckets in a doubly linked list, O(1) for each access).
+
+        A new item of a label and a touch of a label increment the number of accesses of the
+        label. A new label has one access.
+    """
+
+    __slots__ = ('__items', '__head')
+
+    def __init__(self, items: Iterable[Tuple[Any, Dict]] = ()):
+        # Label -> [item, frequency bucket]
+        self.__items = dict()
+        # Bucket with the lowest frequency
+        self.__head = None
+        self.extend(items)
+
+    @classmethod
+    def from_frequencies(cls, items: Iterable[Tuple[Any, Dict]],
+                         frequencies: Iterable[int]) -> 'FrequencyQueue':
+        """
+            Create a queue from the items of another queue in its order (increasing frequency) and
+            their numbers of accesses, without replaying the accesses.
+
+            :param items: Items in the queue's order
+            :type items: Iterable[Tuple[Any, Dict]]
+
+            :param frequencies: Number of accesses of each item
+            :type frequencies: Iterable[int]
+
+            :return: Queue
+            :rtype: FrequencyQueue
+        """
+
+        queue = cls()
+        bucket = None
+        for item, frequency in zip(items, frequencies):
+            if bucket is None or bucket.frequency != frequency:
+                assert bucket is None or frequency > bucket.frequency, \
+                    "The items are not sorted by frequency"
+                new_bucket = _FrequencyBucket(frequency, bucket, None)
+                if bucket is None:
+                    queue.__head = new_bucket
+                else:
+                    bucket.next = new_bucket
+                bucket = new_bucket
+            bucket.labels[item[0]] = None
+            queue.__items[item[0]] = [item, bucket]
+        return queue
+
+    def __unlink(self, bucket: _FrequencyBucket) -> None:
+        if bucket.previous is None:
+            self.__head = bucket.next
+        else:
+            bucket.previous.next = bucket.next
+        if bucket.next is not None:
+            bucket.next.previous = bucket.previous
+
+    def __increment(self, label: Any, entry: List) -> None:
+        bucket = entry[1]
+        next_bucket = bucket.next
+        if next_bucket is None or next_bucket.frequency != bucket.frequency + 1:
+            next_bucket = _FrequencyBucket(bucket.frequency + 1, bucket, next_bucket)
+            if bucket.next is not None:
+                bucket.next.previous = next_bucket
+            bucket.next = next_bucket
+        del bucket.labels[label]
+        next_bucket.labels[label] = None
+        entry[1] = next_bucket
+        if not bucket.labels:
+            self.__unlink(bucket)
+
+    def append(self, item: Tuple[Any, Dict]) -> Union[Tuple[Any, Dict], None]:
+        label = item[0]
+        entry = self.__items.get(label)
+        if entry is not None:
+            replaced_item = entry[0]
+            entry[0] = item
+            self.__increment(label, entry)
+            return replaced_item
+
+        head = self.__head
+        if head is None or head.frequency != 1:
+            head = _FrequencyBucket(1, None, head)
+            if head.next is not None:
+                head.next.previous = head
+            self.__head = head
+        head.labels[label] = None
+        self.__items[label] = [item, head]
+        return None
+
+    def popleft(self) -> Tuple[Any, Dict]:
+        head = self.__head
+        if head is None:
+            raise IndexError("pop from an empty queue")
+        label, _ = head.labels.popitem(last=False)
+        if not head.labels:
+            self.__unlink(head)
+        return self.__items.pop(label)[0]
+
+    def touch(self, label: Any) -> bool:
+        entry = self.__items.get(label)
+        if entry is None:
+            return False
+        self.__increment(label, entry)
+        return True
+
+    def get_frequency(self, label: Any) -> int:
+        """
+            :return: Number of accesses of a label (0 without item)
+            :rtype: int
+        """
+
+        entry = self.__items.get(label)
+        return 0 if entry is None else entry[1].frequency
+
+    def clear(self) -> None:
+        self.__items.clear()
+        self.__head = None
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def __iter__(self) -> Iterator[Tuple[Any, Dict]]:
+        items = self.__items
+        bucket = self.__head
+        while bucket is not None:
+            for label in list(bucket.labels):
+                yield items[label][0]
+            bucket = bucket.next
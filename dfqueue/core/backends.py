@@ -0,0 +1,185 @@
+# coding: utf8
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, NoReturn, Union
+# noinspection PyPackageRequirements
+import numpy
+from pandas import DataFrame
+from .comparison import LabelPositions, get_frame_values, select_matching_rows
+
+
+__all__ = ['FrameBackend', 'DataFrameBackend', 'get_backend']
+
+
+class FrameBackend(ABC):
+    """
+        Store of the rows of an assigned dataframe (see 'assign_dataframe').
+
+        The queues only use this interface to manage the rows:
+        - len function : number of rows
+        - columns property : names of the columns (checking columns of the queue's items)
+        - get_positions : positions of the rows of labels in the store
+        - get_values : values of a column in the rows at some positions
+        - drop_labels : removal of rows
+        - to_dataframe : copy of the rows as a DataFrame object (initial queue's items and
+        snapshots)
+        - reserve : preallocation of rows (optional)
+
+        The DataFrame objects are managed by DataFrameBackend. RingFrame is a store of numpy
+        arrays implementing the interface without pandas operations. A backend without the
+        abstract methods can't be created.
+    """
+
+    __slots__ = ()
+
+    @property
+    @abstractmethod
+    def columns(self) -> Iterable[Any]:
+        pass
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def get_positions(self, labels: List[Any]) -> numpy.ndarray:
+        """
+            :param labels: Selected labels
+            :type labels: List[Any]
+
+            :return: Position of the row of each label (-1 if the label doesn't have a row)
+            :rtype: numpy.ndarray
+        """
+
+    @abstractmethod
+    def get_values(self, column: Any, positions: numpy.ndarray) -> numpy.ndarray:
+        """
+            :param column: Selected column
+            :type column: Any
+
+            :param positions: Positions of the selected rows
+            :type positions: numpy.ndarray
+
+            :return: Values of the column in the selected rows (datetimes and timedeltas as
+            objects, comparable with the values of the queue's items)
+            :rtype: numpy.ndarray
+        """
+
+    @abstractmethod
+    def drop_labels(self, labels: List[Any]) -> NoReturn:
+        """
+            Remove the rows of labels.
+
+            :param labels: Labels of existing rows
+            :type labels: List[Any]
+        """
+
+    @abstractmethod
+    def to_dataframe(self) -> DataFrame:
+        pass
+
+    def reserve(self, capacity: int) -> NoReturn:
+        """
+            Preallocate rows (no preallocation by default).
+
+            :param capacity: Expected max number of rows
+            :type capacity: int
+        """
+
+        pass
+
+    def select_labels(self, labels: List[Any]) -> List[Any]:
+        """
+            :param labels: Selected labels
+            :type labels: List[Any]
+
+            :return: Labels with a row (in the order of their positions by default)
+            :rtype: List[Any]
+        """
+
+        positions = self.get_positions(labels)
+        order = numpy.argsort(positions, kind='stable')
+        return [labels[index] for index in order[numpy.count_nonzero(positions < 0):]]
+
+    def select_matching_labels(self, queue_items: Dict[Any, Dict]) -> List[Any]:
+        """
+            Select the labels whose rows match the checking values of their queue's items (see
+            'select_matching_rows' of the comparison module).
+
+            :param queue_items: Checking values of each selected row's label (existing rows)
+            :type queue_items: Dict[Any, Dict]
+
+            :return: Labels of the matching rows
+            :rtype: List[Any]
+        """
+
+        return select_matching_rows(
+            queue_items, self.get_positions,
+            lambda columns, positions: [self.get_values(column, positions)
+                                        for column in columns])
+
+
+class DataFrameBackend(FrameBackend):
+    """
+        Rows of a DataFrame object. The positions of the labels are kept by a LabelPositions
+        object (shared by the backends of the same queue) and the rows are removed by their
+        positions: DataFrame.drop would hash the whole index at each removal.
+    """
+
+    __slots__ = ('dataframe', 'label_positions')
+
+    def __init__(self, dataframe: DataFrame, label_positions: Union[LabelPositions, None] = None):
+        self.dataframe = dataframe
+        self.label_positions = LabelPositions() if label_positions is None else label_positions
+
+    @property
+    def columns(self) -> Iterable[Any]:
+        return self.dataframe.columns
+
+    def __len__(self) -> int:
+        return len(self.dataframe.index)
+
+    def get_positions(self, labels: List[Any]) -> numpy.ndarray:
+        return self.label_positions.get_positions(self.dataframe.index, labels)
+
+    def get_values(self, column: Any, positions: numpy.ndarray) -> numpy.ndarray:
+        return get_frame_values(self.dataframe, self.dataframe.columns.get_loc(column), positions)
+
+    def drop_labels(self, labels: List[Any]) -> NoReturn:
+        dataframe = self.dataframe
+        index = dataframe.index
+        positions = self.get_positions(labels)
+        if (positions < 0).any():
+            raise KeyError("{} not found in the index".format(
+                [label for label, position in zip(labels, positions) if position < 0]))
+        kept_rows = numpy.ones(len(index), dtype=bool)
+        kept_rows[positions] = False
+        # In-place update of the dataframe (as DataFrame.drop with inplace=True)
+        # noinspection PyProtectedMember
+        dataframe._update_inplace(dataframe.iloc[kept_rows])
+        self.label_positions.remove(index, labels, dataframe.index)
+
+    def to_dataframe(self) -> DataFrame:
+        return self.dataframe
+
+
+def get_backend(dataframe: Union[DataFrame, FrameBackend],
+                label_positions: Union[LabelPositions, None] = None) -> FrameBackend:
+    """
+        :param dataframe: Assigned dataframe
+        :type dataframe: Union[DataFrame, FrameBackend]
+
+        :param label_positions: Positions of the labels of a DataFrame object, kept between the
+        calls (new positions by default)
+        :type label_positions: Union[LabelPositions, None]
+
+        :return: Backend managing the rows of the dataframe
+        :rtype: FrameBackend
+    """
+
+    return dataframe if isinstance(dataframe, FrameBackend) else \
+        DataFrameBackend(dataframe, label_positions)
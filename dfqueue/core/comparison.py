@@ -0,0 +1,374 @@
+# coding: utf8
+
+from bisect import bisect_left, insort
+from itertools import compress
+from typing import Any, Callable, Dict, Iterable, List, NoReturn, Tuple, Union
+# noinspection PyPackageRequirements
+import numpy
+from pandas import DataFrame, Index, RangeIndex, isna
+
+
+__all__ = ['select_matching_labels', 'select_matching_rows', 'get_label_positions',
+           'get_frame_values', 'LabelPositions']
+
+
+# The label positions are rebuilt when the removed slots exceed 1/REBUILD_DIVISOR of the rows
+REBUILD_DIVISOR = 8
+
+
+def get_label_positions(index: Index, labels: List[Any]) -> numpy.ndarray:
+    """
+        Find the positions of labels in an index:
+        - increasing integer index : binary searches (the order of each new index object is
+        checked by one pass over the index)
+        - RangeIndex : arithmetic
+        - other indexes (strings, unsorted integers, ...) : hash table of the index (see
+        Index.get_indexer), built for each new index object
+
+        The lookups of the managing processes keep the positions between the removals of rows
+        instead (see LabelPositions).
+
+        :param index: Index of the dataframe (unique labels)
+        :type index: Index
+
+        :param labels: Selected labels
+        :type labels: List[Any]
+
+        :return: Position of each label (-1 if the label isn't in the index)
+        :rtype: numpy.ndarray
+
+        :raise ValueError: The index isn't unique
+    """
+
+    if index.dtype.kind in 'iu' and not isinstance(index, RangeIndex) and \
+            index.is_monotonic_increasing:
+        label_array = numpy.asarray(labels)
+        if label_array.ndim == 1 and label_array.dtype.kind in 'iu':
+            index_values = index.values
+            positions = index_values.searchsorted(label_array)
+            is_found = positions < len(index_values)
+            is_found[is_found] = index_values[positions[is_found]] == label_array[is_found]
+            return numpy.where(is_found, positions, -1)
+    if not index.is_unique:
+        raise ValueError("The index of the dataframe isn't unique")
+    return index.get_indexer(labels)
+
+
+class LabelPositions:
+    """
+        Positions of the labels of a dataframe's index, kept between the managing processes of a
+        queue so the cost of a lookup depends on the number of labels, not on the index's size.
+
+        Each label has a slot: its position when the map was built, or the next slot when its
+        row was added at the end of the index. The position of a label is its slot minus the
+        number of removed slots before it (binary search in the sorted removed slots, the removed
+        slots before the first row are only counted), so a removal of rows doesn't move the other
+        labels.
+
+        The map assumes the rows are added at the end of the index (setting with enlargement,
+        append) and only removed by 'remove'. Each found position is checked in the index: the
+        map is rebuilt by a pass over the whole index when a check fails, when the index is
+        smaller than expected, when an unknown label is found by the index, when the removed
+        slots exceed 1/REBUILD_DIVISOR of the rows or when the removed labels exceed the rows. A
+        RangeIndex is searched by arithmetic until its first removal.
+
+        The index must be unique: a ValueError is raised at the build of the map otherwise.
+    """
+
+    __slots__ = ('__index', '__slots', '__slots_nb', '__first_slot', '__removed_slots',
+                 '__removed_labels')
+
+    def __init__(self):
+        # Index of the last lookup (None : map to rebuild)
+        self.__index = None
+        self.__slots = dict()
+        self.__slots_nb = 0
+        # Slots before the first slot are removed
+        self.__first_slot = 0
+        # Sorted removed slots after the first slot
+        self.__removed_slots = list()
+        # Labels removed since the build of the map (known missing labels)
+        self.__removed_labels = set()
+
+    def __len__(self) -> int:
+        return self.__slots_nb - self.__first_slot - len(self.__removed_slots)
+
+    def __rebuild(self, index: Index) -> NoReturn:
+        slots = dict(zip(index, range(len(index))))
+        if len(slots) != len(index):
+            raise ValueError("The index of the dataframe isn't unique")
+        self.__index = index
+        self.__slots = slots
+        self.__slots_nb = len(index)
+        self.__first_slot = 0
+        self.__removed_slots = list()
+        self.__removed_labels = set()
+
+    def __update(self, index: Index) -> bool:
+        """
+            Add the labels of the rows added at the end of the index since the last lookup.
+
+            :param index: Current index of the dataframe
+            :type index: Index
+
+            :return: True if the map was rebuilt
+            :rtype: bool
+        """
+
+        if index is self.__index:
+            return False
+        rows_nb = len(self)
+        if self.__index is None or len(index) < rows_nb:
+            self.__rebuild(index)
+            return True
+        slots = self.__slots
+        for label in index[rows_nb:]:
+            if label in slots:
+                # Duplicated label or index changed by other operations
+                self.__rebuild(index)
+                return True
+            slots[label] = self.__slots_nb
+            self.__slots_nb += 1
+            self.__removed_labels.discard(label)
+        self.__index = index
+        return False
+
+    def __find(self, index: Index, labels: List[Any],
+               is_checked: bool) -> Union[numpy.ndarray, None]:
+        """
+            :param index: Current index of the dataframe
+            :type index: Index
+
+            :param labels: Selected labels
+            :type labels: List[Any]
+
+            :param is_checked: Check the positions in the index (map not rebuilt for the lookup)
+            :type is_checked: bool
+
+            :return: Position of each label (-1 if the label isn't in the index) or None if the
+            map doesn't match the index
+            :rtype: Union[numpy.ndarray, None]
+        """
+
+        slots = self.__slots
+        first_slot = self.__first_slot
+        removed_slots = self.__removed_slots
+        rows_nb = len(index)
+        positions = numpy.full(len(labels), -1, dtype=numpy.intp)
+        unknown_labels = list()
+        for label_index, label in enumerate(labels):
+            slot = slots.get(label)
+            if slot is not None:
+                position = slot - first_slot - bisect_left(removed_slots, slot)
+                if is_checked and (position >= rows_nb or index[position] != label):
+                    return None
+                positions[label_index] = position
+            elif is_checked and label not in self.__removed_labels:
+                unknown_labels.append(label)
+        if unknown_labels and (index.get_indexer(unknown_labels) >= 0).any():
+            return None
+        return positions
+
+    def get_positions(self, index: Index, labels: List[Any]) -> numpy.ndarray:
+        """
+            :param index: Current index of the dataframe
+            :type index: Index
+
+            :param labels: Selected labels
+            :type labels: List[Any]
+
+            :return: Position of each label (-1 if the label isn't in the index)
+            :rtype: numpy.ndarray
+
+            :raise ValueError: The index isn't unique
+        """
+
+        if isinstance(index, RangeIndex) and self.__index is None:
+            return get_label_positions(index, labels)
+        is_rebuilt = self.__update(index)
+        positions = self.__find(index, labels, not is_rebuilt)
+        if positions is None:
+            self.__rebuild(index)
+            positions = self.__find(index, labels, False)
+        return positions
+
+    def remove(self, index: Index, labels: List[Any], new_index: Index) -> NoReturn:
+        """
+            Remove the labels of removed rows.
+
+            :param index: Index before the removal (index of the last lookup)
+            :type index: Index
+
+            :param labels: Labels of the removed rows
+            :type labels: List[Any]
+
+            :param new_index: Index after the removal
+            :type new_index: Index
+        """
+
+        if index is not self.__index:
+            self.__index = None
+            return
+        slots = self.__slots
+        removed_slots = self.__removed_slots
+        for label in labels:
+            insort(removed_slots, slots.pop(label))
+        self.__removed_labels.update(labels)
+        # Removed slots following the first slot
+        first_slot = self.__first_slot
+        removed_nb = 0
+        while removed_nb < len(removed_slots) and \
+                removed_slots[removed_nb] == first_slot + removed_nb:
+            removed_nb += 1
+        if removed_nb > 0:
+            del removed_slots[:removed_nb]
+            self.__first_slot = first_slot + removed_nb
+        rows_nb = len(self)
+        if rows_nb != len(new_index) or len(removed_slots) * REBUILD_DIVISOR > rows_nb or \
+                len(self.__removed_labels) > rows_nb:
+            self.__index = None
+        else:
+            self.__index = new_index
+
+
+def get_frame_values(dataframe: DataFrame, column_position: int,
+                     row_positions: numpy.ndarray) -> numpy.ndarray:
+    """
+        Extract the values of some rows in a dataframe's column.
+
+        Numeric and object columns are directly taken from their numpy array. Other columns
+        (datetimes, extension types, ...) are converted to objects so their values are comparable
+        with the values stored in the queue's items.
+
+        :param dataframe: Assigned dataframe
+        :type dataframe: DataFrame
+
+        :param column_position: Position of the selected column
+        :type column_position: int
+
+        :param row_positions: Positions of the selected rows
+        :type row_positions: numpy.ndarray
+
+        :return: Values of the selected rows
+        :rtype: numpy.ndarray
+    """
+
+    column = dataframe.iloc[:, column_position]
+    values = column.values
+    if isinstance(values, numpy.ndarray) and values.dtype.kind not in 'mM':
+        return values[row_positions]
+    return column.iloc[row_positions].astype(object).values
+
+
+def __get_equality_mask(frame_values: numpy.ndarray, expected_values: List[Any]) -> numpy.ndarray:
+    """
+        Compare element-wise the dataframe's values with the queue items's values.
+
+        Missing values (NaN, None, NaT) are equal to each other.
+
+        :param frame_values: Values in the dataframe
+        :type frame_values: numpy.ndarray
+
+        :param expected_values: Values in the queue's items
+        :type expected_values: List[Any]
+
+        :return: Equality mask
+        :rtype: numpy.ndarray
+    """
+
+    expected_array = None
+    if frame_values.dtype.kind in 'biufc':
+        candidate_array = numpy.asarray(expected_values)
+        if candidate_array.ndim == 1 and candidate_array.dtype.kind in 'biufc':
+            expected_array = candidate_array
+    if expected_array is None:
+        expected_array = numpy.empty(len(expected_values), dtype=object)
+        expected_array[:] = expected_values
+        frame_values = frame_values.astype(object, copy=False)
+
+    mask = numpy.asarray(frame_values == expected_array, dtype=bool)
+    if frame_values.dtype.kind in 'fcO':
+        mask |= isna(frame_values) & isna(expected_array)
+    return mask
+
+
+def __group_by_columns(queue_items: Dict[Any, Dict]) -> Dict[Tuple, Tuple[List, List]]:
+    """
+        Group queue items's labels and values by their checking columns.
+
+        :param queue_items: Checking values of each row's label
+        :type queue_items: Dict[Any, Dict]
+
+        :return: Labels and rows of values for each group of checking columns
+        :rtype: Dict[Tuple, Tuple[List, List]]
+    """
+
+    groups = dict()
+    for label, checking_values in queue_items.items():
+        columns = tuple(checking_values)
+        group = groups.get(columns)
+        if group is None:
+            group = groups[columns] = (list(), list())
+        group[0].append(label)
+        group[1].append(tuple(checking_values.values()))
+    return groups
+
+
+def select_matching_rows(queue_items: Dict[Any, Dict],
+                         get_row_positions: Callable[[List[Any]], numpy.ndarray],
+                         get_columns_values: Callable[[Tuple, numpy.ndarray],
+                                                      Iterable[numpy.ndarray]]) -> List[Any]:
+    """
+        Select the labels whose rows match the checking values of their queue's items in a store
+        of columns (see 'select_matching_labels').
+
+        :param queue_items: Checking values of each selected row's label
+        :type queue_items: Dict[Any, Dict]
+
+        :param get_row_positions: Function returning the positions of the rows of labels
+        :type get_row_positions: Callable[[List[Any]], numpy.ndarray]
+
+        :param get_columns_values: Function returning the values of columns in the rows at some
+        positions (one array for each column)
+        :type get_columns_values: Callable[[Tuple, numpy.ndarray], Iterable[numpy.ndarray]]
+
+        :return: Labels of the matching rows
+        :rtype: List[Any]
+    """
+
+    matching_labels = list()
+    for columns, (labels, rows_values) in __group_by_columns(queue_items).items():
+        row_positions = get_row_positions(labels)
+        matches = numpy.ones((len(labels), len(columns)), dtype=bool)
+        for index, (frame_values, expected_values) in enumerate(zip(
+                get_columns_values(columns, row_positions), zip(*rows_values))):
+            matches[:, index] = __get_equality_mask(frame_values, list(expected_values))
+        matching_labels.extend(compress(labels, matches.all(axis=1)))
+    return matching_labels
+
+
+def select_matching_labels(dataframe: DataFrame, queue_items: Dict[Any, Dict]) -> List[Any]:
+    """
+        Select the labels whose rows in the dataframe match the checking values of their queue's
+        items.
+
+        Items are compared by group of checking columns: the values of each column are compared
+        as numpy arrays and the result is reduced with a row-wise 'all'.
+
+        :param dataframe: Assigned dataframe (the selected labels must exist in its index)
+        :type dataframe: DataFrame
+
+        :param queue_items: Checking values of each selected row's label
+        :type queue_items: Dict[Any, Dict]
+
+        :return: Labels of the matching rows
+        :rtype: List[Any]
+    """
+
+    def get_columns_values(columns: Tuple, row_positions: numpy.ndarray) -> List[numpy.ndarray]:
+        return [get_frame_values(dataframe, column_position, row_positions)
+                for column_position in dataframe.columns.get_indexer(list(columns))]
+
+    return select_matching_rows(queue_items,
+                                lambda labels: get_label_positions(dataframe.index, labels),
+                                get_columns_values)
@@ -0,0 +1,246 @@
+# coding: utf8
+
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+
+__all__ = ['InternedCounter']
+
+
+class InternedCounter:
+    """
+        Number of queue's items for each row's label and group of checking columns.
+
+        Groups of checking columns (i.e schemas) are interned to small integer identifiers and the
+        counts are stored in one flat dictionary for each schema (label -> count). Labels without
+        items are removed.
+
+        It may be read as the dictionary of Counter objects used by the first versions
+        (label -> Counter(frozenset of checking columns -> count)):
+        - brackets with label
+        - len function
+        - iteration
+        - containing
+        - equality
+        - keys method
+        - values method
+        - items method
+    """
+
+    __slots__ = ('__schemas', '__schema_ids', '__counts')
+
+    def __init__(self, counter: Union[Dict[Any, Counter], None] = None):
+        # Schema identifier -> group of checking columns
+        self.__schemas = list()
+        # Group of checking columns (frozenset or tuple in the items's order) -> schema identifier
+        self.__schema_ids = dict()
+        # Schema identifier -> {label: count}
+        self.__counts = list()
+        if counter is not None:
+            for label, label_counter in counter.items():
+                for key, count in label_counter.items():
+                    if count > 0:
+                        self.__counts[self.__get_key_schema_id(key)][label] = count
+
+    @classmethod
+    def from_labels(cls, labels: Iterable[Any], columns: Iterable[Any]) -> 'InternedCounter':
+        """
+            Create a counter with one item for each label.
+
+            :param labels: Labels of the items
+            :type labels: Iterable[Any]
+
+            :param columns: Checking columns of the items
+            :type columns: Iterable[Any]
+
+            :return: Counter
+            :rtype: InternedCounter
+        """
+
+        counter = cls()
+        counts = counter.__counts[counter.__get_schema_id(tuple(columns))]
+        counts.update(Counter(labels))
+        return counter
+
+    @classmethod
+    def from_schema_counts(cls, schema_counts: Iterable[Tuple[Iterable[Any], Dict[Any, int]]]) \
+            -> 'InternedCounter':
+        """
+            Create a counter from the counts of another counter (see 'to_schema_counts').
+
+            :param schema_counts: Checking columns and counts (label -> count) of each schema
+            :type schema_counts: Iterable[Tuple[Iterable[Any], Dict[Any, int]]]
+
+            :return: Counter
+            :rtype: InternedCounter
+        """
+
+        counter = cls()
+        for columns, counts in schema_counts:
+            counter.__counts[counter.__get_key_schema_id(frozenset(columns))].update(counts)
+        return counter
+
+    def to_schema_counts(self) -> List[Tuple[Any, Dict[Any, int]]]:
+        """
+            :return: Checking columns and counts (label -> count) of each schema with items (the
+            dictionaries of the counter, not copies)
+            :rtype: List[Tuple[Any, Dict[Any, int]]]
+        """
+
+        return [(schema, counts) for schema, counts in zip(self.__schemas, self.__counts)
+                if counts]
+
+    def __get_key_schema_id(self, key: Any) -> int:
+        schema_id = self.__schema_ids.get(key)
+        if schema_id is None:
+            schema_id = len(self.__schemas)
+            self.__schemas.append(key)
+            self.__counts.append(dict())
+            self.__schema_ids[key] = schema_id
+        return schema_id
+
+    def __get_schema_id(self, columns: Tuple) -> int:
+        schema_id = self.__schema_ids.get(columns)
+        if schema_id is None:
+            schema_id = self.__get_key_schema_id(frozenset(columns))
+            self.__schema_ids[columns] = schema_id
+        return schema_id
+
+    def increment(self, label: Any, checking_values: Dict) -> int:
+        """
+            Count a new queue's item.
+
+            :param label: Row's label of the item
+            :type label: Any
+
+            :param checking_values: Checking values of the item
+            :type checking_values: Dict
+
+            :return: Number of items with the same label and checking columns (new item included)
+            :rtype: int
+        """
+
+        counts = self.__counts[self.__get_schema_id(tuple(checking_values))]
+        count = counts.get(label, 0) + 1
+        counts[label] = count
+        return count
+
+    def increment_many(self, items: Iterable[Tuple[Any, Dict]]) -> int:
+        """
+            Count new queue's items in one pass.
+
+            :param items: New queue's items (label, checking values)
+            :type items: Iterable[Tuple[Any, Dict]]
+
+            :return: Number of new items with a previous item of the same label and checking
+            columns (superseded items with the LAST_ITEM behaviour)
+            :rtype: int
+        """
+
+        schema_ids = self.__schema_ids
+        all_counts = self.__counts
+        superseded_nb = 0
+        for label, checking_values in items:
+            columns = tuple(checking_values)
+            schema_id = schema_ids.get(columns)
+            if schema_id is None:
+                schema_id = self.__get_schema_id(columns)
+            counts = all_counts[schema_id]
+            count = counts.get(label, 0)
+            if count:
+                superseded_nb += 1
+            counts[label] = count + 1
+        return superseded_nb
+
+    def decrement(self, label: Any, checking_values: Dict) -> int:
+        """
+            Uncount a removed queue's item.
+
+            :param label: Row's label of the item
+            :type label: Any
+
+            :param checking_values: Checking values of the item
+            :type checking_values: Dict
+
+            :return: Number of items with the same label and checking columns before the removal
+            :rtype: int
+        """
+
+        counts = self.__counts[self.__get_schema_id(tuple(checking_values))]
+        count = counts.get(label, 0)
+        if count > 1:
+            counts[label] = count - 1
+        elif count == 1:
+            del counts[label]
+        return count
+
+    def count(self, label: Any, checking_values: Dict) -> int:
+        """
+            :return: Number of items with the same label and checking columns
+            :rtype: int
+        """
+
+        return self.__counts[self.__get_schema_id(tuple(checking_values))].get(label, 0)
+
+    @property
+    def schemas_nb(self) -> int:
+        return len(self.__schemas)
+
+    def __labels(self) -> Iterable[Any]:
+        non_empty_counts = [counts for counts in self.__counts if counts]
+        if len(non_empty_counts) == 1:
+            return non_empty_counts[0].keys()
+        labels = dict()
+        for counts in non_empty_counts:
+            labels.update(dict.fromkeys(counts))
+        return labels.keys()
+
+    def __getitem__(self, label: Any) -> Counter:
+        label_counter = Counter({self.__schemas[schema_id]: counts[label]
+                                 for schema_id, counts in enumerate(self.__counts)
+                                 if label in counts})
+        if not label_counter:
+            raise KeyError(label)
+        return label_counter
+
+    def __len__(self) -> int:
+        return len(self.__labels())
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.__labels())
+
+    def __contains__(self, label: Any) -> bool:
+        return any(label in counts for counts in self.__counts)
+
+    def keys(self) -> Iterable[Any]:
+        return self.__labels()
+
+    def values(self) -> List[Counter]:
+        return [self[label] for label in self.__labels()]
+
+    def items(self) -> List[Tuple[Any, Counter]]:
+        return [(label, self[label]) for label in self.__labels()]
+
+    def to_dict(self) -> Dict[Any, Counter]:
+        return dict(self.items())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, InternedCounter):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            # Labels and checking columns without items are ignored
+            positive_counters = ((label, +Counter(label_counter))
+                                 for label, label_counter in other.items())
+            return self.to_dict() == {label: label_counter for label, label_counter
+                                      in positive_counters if label_counter}
+        return NotImplemented
+
+    def __ne__(self, other: Any) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __repr__(self) -> str:
+        return "{}({})".format(type(self).__name__, self.to_dict())
+
+    def __str__(self) -> str:
+        return self.__repr__()
@@ -1,19 +1,43 @@
 # coding: utf8
 
 import logging
+import asyncio
 
 from uuid import uuid4
 from collections import deque, Counter
-from itertools import islice, compress
+from itertools import islice, compress, repeat
 from enum import Enum
-from typing import Union, Callable, Tuple, Any, NoReturn, Dict, Iterable, List
+from typing import Union, Callable, Tuple, Any, NoReturn, Dict, Iterable, Iterator, List
 from functools import wraps
-from threading import Lock
+from contextlib import contextmanager
+from threading import Condition, Lock, local
+from concurrent.futures import Executor
+from http.server import HTTPServer
+from time import monotonic, perf_counter, time
 from pandas import DataFrame
+from .storage import QueueStorage, ColumnarQueue
+from .sharding import ShardedQueue, ShardedCounter
+from .counters import InternedCounter
+from .workers import EvictionWorker
+from .locks import SharedExclusiveLock, LockProfile
+from .memory import MemoryBudget
+from .expiry import QueueExpiry
+from .access import RecencyQueue, FrequencyQueue
+from .shared import SharedFrame, SharedQueueView, SharedCounterView
+from .backends import FrameBackend, get_backend
+from .comparison import LabelPositions
+from .snapshot import QueueSnapshot
+from .wal import WriteAheadLog, WalRecordType
+from .stats import QueueStats, format_prometheus, start_stats_server
+from .hooks import HOOKS, ITEM_ADDED, BATCH_EVICTED, ITEM_IGNORED, DATAFRAME_ASSIGNED, \
+    _create_logging_message
 
 
 __all__ = ['adding', 'managing', 'synchronized', 'assign_dataframe', 'list_queue_names',
-           'get_info_provider', 'QueueBehaviour']
+           'get_info_provider', 'QueueBehaviour', 'QueueStorage', 'batch', 'wait_for_eviction',
+           'stop_eviction_worker', 'QueueFullPolicy', 'QueueFullError', 'expire_items', 'touching',
+           'touch', 'attach_dataframe', 'save_queue', 'load_queue', 'replay', 'sync_wal',
+           'export_stats', 'serve_stats', 'profile_lock']
 
 
 class QueueHandlerItem(Enum):
@@ -22,9 +46,16 @@ class QueueHandlerItem(Enum):
 
         QUEUE : queue
         COUNTER : number of occurences of queue items with the same row label and selected columns
+        (InternedCounter)
         DATAFRAME : dataframe assigned to the queue
         MAX_SIZE : assigned dataframe's max size
         BEHAVIOUR : queue managing behaviour
+        EVICTION_POLICY : watermarks and frequency of the managing process (optional item)
+        EVICTION_WORKER : background thread of the managing process or None (optional item)
+        QUEUE_LIMIT : max length of the queue or None (optional item)
+        MEMORY_BUDGET : byte budget of the assigned dataframe or None (optional item)
+        EXPIRY : time-to-live of the queue's items or None (optional item)
+        WAL : write-ahead log of the queue's mutations or None (optional item)
     """
 
     QUEUE = 0
@@ -32,6 +63,12 @@ class QueueHandlerItem(Enum):
     DATAFRAME = 2
     MAX_SIZE = 3
     BEHAVIOUR = 4
+    EVICTION_POLICY = 5
+    EVICTION_WORKER = 6
+    QUEUE_LIMIT = 7
+    MEMORY_BUDGET = 8
+    EXPIRY = 9
+    WAL = 10
 
 
 class QueueBehaviour(Enum):
@@ -42,10 +79,231 @@ class QueueBehaviour(Enum):
         (same row label and same selected columns) is used during the managing process
         ALL_ITEMS : all items in the queue for each group of items
         (same row label and same selected columns) is used during the managing process
+        LRU : the queue keeps the last item of each row label and the least recently used row
+        (new item or read recorded by 'touching') is removed first
+        LFU : the queue keeps the last item of each row label and the least frequently used row
+        (new items and reads recorded by 'touching') is removed first
     """
 
     LAST_ITEM = 0
     ALL_ITEMS = 1
+    LRU = 2
+    LFU = 3
+
+
+# A full queue is only compacted if at least 1/N of its max length is superseded (see QueueLimit)
+MIN_COMPACTION_DIVISOR = 8
+
+# Queue of each behaviour ordered by the accesses of the rows
+ACCESS_QUEUES = {QueueBehaviour.LRU: RecencyQueue,
+                 QueueBehaviour.LFU: FrequencyQueue}
+
+# Types of the assigned dataframes (a SharedFrame object is shared by several processes, a
+# FrameBackend object stores the rows without DataFrame object, see RingFrame)
+FRAME_TYPES = (DataFrame, SharedFrame, FrameBackend)
+
+
+class QueueFullPolicy(Enum):
+    """
+        Behaviour of the adding functions when the new queue's items don't fit in a bounded queue
+        after its compaction. The policy is applied before the call of the decorated function, so
+        its rows are not written (the functions adding several items may only fail after their
+        call).
+
+        RAISE : a QueueFullError is raised
+        BLOCK : the adding function waits until the managing process removes enough items (a
+        QueueFullError is raised at the end of the timeout). The exclusive side of the queue's
+        Lock object is released while waiting (see 'synchronized')
+    """
+
+    RAISE = 0
+    BLOCK = 1
+
+
+class QueueFullError(Exception):
+    """
+        New queue's items don't fit in a bounded queue.
+    """
+
+
+class QueueLimit:
+    """
+        Max length of a queue.
+
+        When the max length is reached, the superseded items of the queue (LAST_ITEM behaviour
+        only) are removed if they are at least 1/8 of the max length (and enough for the new
+        items): a compaction of the whole queue for a few items would be repeated at each call.
+        Then the managing process is run if it is due and if the adding function holds the
+        queue's Lock object. Otherwise the queue full policy is applied.
+
+        The max length must be greater than the high watermark: the rows of the dataframe have
+        their items in the queue until the managing process removes them.
+    """
+
+    def __init__(self, max_length: int, policy: QueueFullPolicy = QueueFullPolicy.RAISE,
+                 timeout: Union[float, None] = None):
+        assert isinstance(max_length, int) and max_length > 0, \
+            "The max length of the queue is not a positive integer"
+        assert isinstance(policy, QueueFullPolicy), "Policy is not a QueueFullPolicy object"
+        assert timeout is None or timeout >= 0, "The timeout is negative"
+
+        self.__max_length = max_length
+        self.__policy = policy
+        self.__timeout = timeout
+
+    @property
+    def max_length(self) -> int:
+        return self.__max_length
+
+    @property
+    def policy(self) -> QueueFullPolicy:
+        return self.__policy
+
+    @property
+    def timeout(self) -> Union[float, None]:
+        return self.__timeout
+
+
+class EvictionPolicy:
+    """
+        Eviction policy of an assigned dataframe during the managing process.
+
+        Rows are removed when the dataframe's size is greater than the high watermark, until the
+        dataframe's size reaches the low watermark. The removal is done in one batch.
+
+        The managing process may be coalesced: it is only run every 'period_calls' calls of the
+        managing functions and/or every 'period_ms' milliseconds (the first reached). Without
+        period, it is run at each call.
+    """
+
+    def __init__(self, high_watermark: int, low_watermark: int,
+                 period_calls: Union[int, None] = None, period_ms: Union[float, None] = None):
+        assert isinstance(high_watermark, int) and isinstance(low_watermark, int), \
+            "Watermarks are not integers"
+        assert 0 <= low_watermark <= high_watermark, \
+            "The low watermark {} is not between 0 and the high watermark {}".format(
+                low_watermark, high_watermark)
+        assert period_calls is None or (isinstance(period_calls, int) and period_calls > 0), \
+            "The period in calls is not a positive integer"
+        assert period_ms is None or period_ms >= 0, "The period in milliseconds is negative"
+
+        self.__high_watermark = high_watermark
+        self.__low_watermark = low_watermark
+        self.__period_calls = period_calls
+        self.__period_s = None if period_ms is None else period_ms / 1000
+        self.__calls_nb = 0
+        self.__last_time = monotonic()
+
+    @property
+    def high_watermark(self) -> int:
+        return self.__high_watermark
+
+    @property
+    def low_watermark(self) -> int:
+        return self.__low_watermark
+
+    @property
+    def period_calls(self) -> Union[int, None]:
+        return self.__period_calls
+
+    @property
+    def period_ms(self) -> Union[float, None]:
+        return None if self.__period_s is None else self.__period_s * 1000
+
+    def is_due(self) -> bool:
+        """
+            Register a call of a managing function and check if the managing process has to be
+            run.
+
+            :return: True if the managing process has to be run
+            :rtype: bool
+        """
+
+        if self.__period_calls is None and self.__period_s is None:
+            return True
+
+        self.__calls_nb += 1
+        now = monotonic()
+        if (self.__period_calls is not None and self.__calls_nb >= self.__period_calls) or \
+                (self.__period_s is not None and now - self.__last_time >= self.__period_s):
+            self.__calls_nb = 0
+            self.__last_time = now
+            return True
+        return False
+
+
+class QueueState:
+    """
+        State of a queue in the QueuesHandler's instance.
+
+        A new state is created at each assignment of the queue: the decorated functions keep the
+        state of their queue while the generation of the QueuesHandler's instance is unchanged.
+    """
+
+    __slots__ = ('name', 'queue', 'counter', 'dataframe', 'max_size', 'behaviour',
+                 'eviction_policy', 'eviction_worker', 'queue_limit', 'memory_budget', 'expiry',
+                 'wal', 'lock', 'append_lock', 'space_available', 'stats', 'superseded_nb',
+                 'reserved_nb', 'label_positions')
+
+    def __init__(self, name: str, queue: Union[deque, ColumnarQueue, ShardedQueue],
+                 counter: Union[InternedCounter, ShardedCounter],
+                 dataframe: Union[DataFrame, None], max_size: int, behaviour: QueueBehaviour,
+                 eviction_policy: EvictionPolicy, eviction_worker: Union[EvictionWorker, None],
+                 queue_limit: Union[QueueLimit, None], memory_budget: Union[MemoryBudget, None],
+                 expiry: Union[QueueExpiry, None], wal: Union[WriteAheadLog, None],
+                 lock: SharedExclusiveLock):
+        self.name = name
+        self.queue = queue
+        self.counter = counter
+        self.dataframe = dataframe
+        self.max_size = max_size
+        self.behaviour = behaviour
+        self.eviction_policy = eviction_policy
+        self.eviction_worker = eviction_worker
+        self.queue_limit = queue_limit
+        self.memory_budget = memory_budget
+        self.expiry = expiry
+        self.wal = wal
+        # Lock object shared by the queues of the same dataframe
+        self.lock = lock
+        # Short lock of the queue's appends
+        self.append_lock = Lock()
+        # Notified when the managing process removes items of a bounded queue
+        self.space_available = Condition(self.append_lock)
+        # Items of a bounded queue reserved by the calls of the adding functions
+        self.reserved_nb = 0
+        # Runtime statistics (reset at each assignment of the queue)
+        self.stats = QueueStats()
+        if isinstance(queue, ShardedQueue):
+            # Items added before the assignment
+            queue.pop_added_nb()
+        # Positions of the labels of a DataFrame object (managing process)
+        self.label_positions = LabelPositions()
+        # Items followed by an item of the same label and checking columns (LAST_ITEM behaviour,
+        # only used by the compactions of the bounded or logged queues : not updated by the
+        # appends of the sharded queues without queue limit nor WAL)
+        self.superseded_nb = 0
+        if behaviour == QueueBehaviour.LAST_ITEM and \
+                isinstance(counter, (InternedCounter, ShardedCounter)):
+            self.superseded_nb = len(queue) - sum(len(counts) for _, counts
+                                                  in counter.to_schema_counts())
+
+    def get_stats(self) -> QueueStats:
+        """
+            :return: Runtime statistics of the queue, with the items added in the shards of a
+            sharded queue since the last call
+            :rtype: QueueStats
+        """
+
+        if isinstance(self.queue, ShardedQueue):
+            added_nb = self.queue.pop_added_nb()
+            # The other appends count their items with the lock of the appends held
+            with self.append_lock:
+                self.stats.items_added += added_nb
+        return self.stats
+
+    def __repr__(self) -> str:
+        return "{}({})".format(type(self).__name__, self.name)
 
 
 class QueuesHandler:
@@ -67,81 +325,204 @@ class QueuesHandler:
         def __init__(self):
             # Define the default queue's name
             self.__default_queue_name = str(uuid4())
+            # Incremented each time the state of a queue is replaced
+            self.generation = 0
             # Define the default queue
-            self.__queues = {self.__default_queue_name: deque()}
-            self.__counters = {self.__default_queue_name: dict()}
-            self.__assigned_dataframes = {self.__default_queue_name: None}
-            self.__assigned_dataframe_max_sizes = {self.__default_queue_name: 1000000}
-            self.__assigned_locks = {self.__default_queue_name: Lock()}
-            self.__queue_behaviour = {self.__default_queue_name: QueueBehaviour.LAST_ITEM}
+            self.__states = {self.__default_queue_name: QueueState(
+                self.__default_queue_name, deque(), InternedCounter(), None, 1000000,
+                QueueBehaviour.LAST_ITEM, EvictionPolicy(1000000, 1000000), None, None, None,
+                None, None, SharedExclusiveLock())}
+            # Lock object -> (event loop, asyncio Lock object)
+            self.__assigned_async_locks = dict()
 
         @property
         def default_queue_name(self) -> str:
             return self.__default_queue_name
 
-        def get_assigned_lock(self, queue_name: str) -> Lock:
-            assert queue_name in self.__assigned_locks, \
-                "The queue '{}' doesn't exist".format(queue_name)
-            return self.__assigned_locks[queue_name]
+        @property
+        def __queues(self) -> Dict[str, Union[deque, ColumnarQueue]]:
+            return {queue_name: state.queue for queue_name, state in self.__states.items()}
+
+        @property
+        def __counters(self) -> Dict[str, InternedCounter]:
+            return {queue_name: state.counter for queue_name, state in self.__states.items()}
+
+        def get_state(self, queue_name: Union[str, None]) -> QueueState:
+            """
+                :param queue_name: Name of the queue (None : default queue)
+                :type queue_name: Union[str, None]
+
+                :return: Current state of the queue
+                :rtype: QueueState
+            """
+
+            state = self.__states.get(self.__default_queue_name if queue_name is None
+                                      else queue_name)
+            assert state is not None, "The queue '{}' doesn't exist".format(queue_name)
+            return state
+
+        def get_assigned_lock(self, queue_name: Union[str, None]) -> SharedExclusiveLock:
+            return self.get_state(queue_name).lock
+
+        def get_assigned_async_lock(self, queue_name: Union[str, None]) -> asyncio.Lock:
+            """
+                asyncio Lock object of a queue for the current event loop. Queues sharing the same
+                Lock object share the same asyncio Lock object.
+            """
+
+            lock = self.get_assigned_lock(queue_name)
+            loop = asyncio.get_event_loop()
+            loop_and_async_lock = self.__assigned_async_locks.get(lock)
+            if loop_and_async_lock is None or loop_and_async_lock[0] is not loop:
+                assigned_locks = set(state.lock for state in self.__states.values())
+                for unused_lock in [selected_lock for selected_lock in self.__assigned_async_locks
+                                    if selected_lock not in assigned_locks]:
+                    del self.__assigned_async_locks[unused_lock]
+                loop_and_async_lock = (loop, asyncio.Lock())
+                self.__assigned_async_locks[lock] = loop_and_async_lock
+            return loop_and_async_lock[1]
 
         def list_queue_names(self) -> Tuple[str]:
-            return tuple(self.__queues.keys())
+            return tuple(self.__states.keys())
+
+        def __get_shared_lock(self, queue_name: str,
+                              assigned_dataframe: Union[DataFrame, None]) -> SharedExclusiveLock:
+            if isinstance(assigned_dataframe, SharedFrame):
+                # The processes share the Lock object of the SharedFrame object
+                return assigned_dataframe.lock
+            if assigned_dataframe is not None:
+                for selected_queue_name, state in self.__states.items():
+                    if selected_queue_name != queue_name and \
+                            state.dataframe is assigned_dataframe:
+                        return state.lock
+            return SharedExclusiveLock()
 
         def assign_lock(self, queue_name: str, assigned_dataframe: DataFrame) -> NoReturn:
-            queue_names = [selected_queue_name for (selected_queue_name, selected_dataframe) in
-                           self.__assigned_dataframes.items() if
-                           id(selected_dataframe) == id(assigned_dataframe)]
-            is_lock_found = False
-            if queue_names:
-                for selected_queue_name in self.__assigned_locks:
-                    if selected_queue_name in queue_names:
-                        self.__assigned_locks[queue_name] = \
-                            self.__assigned_locks[selected_queue_name]
-                        is_lock_found = True
-                        break
-                if is_lock_found is False:
-                    self.__assigned_locks[queue_name] = Lock()
-            else:
-                self.__assigned_locks[queue_name] = Lock()
+            self.get_state(queue_name).lock = self.__get_shared_lock(queue_name,
+                                                                     assigned_dataframe)
+
+        def pop_eviction_worker(self, queue_name: str) -> Union[EvictionWorker, None]:
+            """
+                Detach the eviction worker of a queue (the managing functions of the queue remove
+                the rows themselves).
+
+                :return: Detached eviction worker (None if the queue doesn't have eviction worker)
+                :rtype: Union[EvictionWorker, None]
+            """
+
+            state = self.__states.get(queue_name)
+            if state is None:
+                return None
+            worker = state.eviction_worker
+            state.eviction_worker = None
+            return worker
+
+        def pop_wal(self, queue_name: str) -> Union[WriteAheadLog, None]:
+            """
+                Detach the write-ahead log of a queue (the mutations of the queue are not logged).
+
+                :return: Detached write-ahead log (None if the queue doesn't have write-ahead log)
+                :rtype: Union[WriteAheadLog, None]
+            """
+
+            state = self.__states.get(queue_name)
+            if state is None:
+                return None
+            wal = state.wal
+            state.wal = None
+            return wal
 
         def __getitem__(self, queue_name: str) -> Dict[QueueHandlerItem, Any]:
-            assert queue_name in self.__queues, \
+            assert queue_name in self.__states, \
                 "The queue '{}' doesn't exist".format(queue_name)
-            assert queue_name in self.__counters, \
-                "The counter for the queue '{}' doesn't exist".format(queue_name)
-            assert queue_name in self.__assigned_dataframes, \
-                "The assigned dataframe for the queue '{}' doesn't exist".format(queue_name)
-            assert queue_name in self.__assigned_dataframe_max_sizes, \
-                "The assigned dataframe's max size for " \
-                "the queue '{}' doesn't exist".format(queue_name)
-            assert queue_name in self.__queue_behaviour,\
-                "The behaviour for the queue '{}' doesn't exist".format(queue_name)
-
-            return {QueueHandlerItem.QUEUE: self.__queues[queue_name],
-                    QueueHandlerItem.COUNTER: self.__counters[queue_name],
-                    QueueHandlerItem.DATAFRAME: self.__assigned_dataframes[queue_name],
-                    QueueHandlerItem.MAX_SIZE: self.__assigned_dataframe_max_sizes[queue_name],
-                    QueueHandlerItem.BEHAVIOUR: self.__queue_behaviour[queue_name]}
+            state = self.__states[queue_name]
+
+            return {QueueHandlerItem.QUEUE: state.queue,
+                    QueueHandlerItem.COUNTER: state.counter,
+                    QueueHandlerItem.DATAFRAME: state.dataframe,
+                    QueueHandlerItem.MAX_SIZE: state.max_size,
+                    QueueHandlerItem.BEHAVIOUR: state.behaviour,
+                    QueueHandlerItem.EVICTION_POLICY: state.eviction_policy,
+                    QueueHandlerItem.EVICTION_WORKER: state.eviction_worker,
+                    QueueHandlerItem.QUEUE_LIMIT: state.queue_limit,
+                    QueueHandlerItem.MEMORY_BUDGET: state.memory_budget,
+                    QueueHandlerItem.EXPIRY: state.expiry,
+                    QueueHandlerItem.WAL: state.wal}
 
         def __setitem__(self, queue_name: str, items: dict) -> NoReturn:
-            assert len(items) == len(QueueHandlerItem), \
+            assert all([item in items for item in QueueHandlerItem
+                        if item not in QueuesHandler.OPTIONAL_ITEMS]), \
                 "Queue handler item(s) is(are) missing in the dictionary"
-            assert all([item in items for item in QueueHandlerItem]), \
+            assert all([isinstance(item, QueueHandlerItem) for item in items]), \
                 "Items in the dictionary are not queue handler item"
-            self.__queues[queue_name] = deque(items[QueueHandlerItem.QUEUE])
-            assert isinstance(items[QueueHandlerItem.COUNTER],
-                              dict) and all([isinstance(counter, Counter) for counter
-                                             in items[QueueHandlerItem.COUNTER].values()])
-            self.__counters[queue_name] = items[QueueHandlerItem.COUNTER]
-            assert isinstance(items[QueueHandlerItem.DATAFRAME], DataFrame) or \
-                   items[QueueHandlerItem.DATAFRAME] is None, \
-                "Dataframe is not a Dataframe object or None"
-            self.__assigned_dataframes[queue_name] = items[QueueHandlerItem.DATAFRAME]
-            assert isinstance(items[QueueHandlerItem.MAX_SIZE], int), "Max size is not an integer"
-            self.__assigned_dataframe_max_sizes[queue_name] = items[QueueHandlerItem.MAX_SIZE]
-            assert isinstance(items[QueueHandlerItem.BEHAVIOUR], QueueBehaviour), \
+            behaviour = items[QueueHandlerItem.BEHAVIOUR]
+            assert isinstance(behaviour, QueueBehaviour), \
                 "Behaviour is not a QueueBehaviour object"
-            self.__queue_behaviour[queue_name] = items[QueueHandlerItem.BEHAVIOUR]
+            queue = items[QueueHandlerItem.QUEUE]
+            dataframe = items[QueueHandlerItem.DATAFRAME]
+            assert isinstance(dataframe, FRAME_TYPES) or dataframe is None, \
+                "Dataframe is not a Dataframe object, a SharedFrame object, a FrameBackend " \
+                "object or None"
+            if isinstance(dataframe, SharedFrame):
+                assert isinstance(queue, SharedQueueView), \
+                    "The queue of a SharedFrame object is not a SharedQueueView object"
+            elif behaviour in ACCESS_QUEUES:
+                queue_type = ACCESS_QUEUES[behaviour]
+                queue = queue if isinstance(queue, queue_type) else queue_type(queue)
+            else:
+                queue = queue if isinstance(queue, (ColumnarQueue, ShardedQueue)) else deque(queue)
+            counter = items[QueueHandlerItem.COUNTER]
+            if isinstance(queue, ShardedQueue):
+                assert counter is queue.counter, \
+                    "The counter of a ShardedQueue object is not its ShardedCounter object"
+            elif isinstance(dataframe, SharedFrame):
+                assert isinstance(counter, SharedCounterView), \
+                    "The counter of a SharedFrame object is not a SharedCounterView object"
+            elif not isinstance(counter, InternedCounter):
+                assert isinstance(counter, dict) and all([isinstance(label_counter, Counter)
+                                                          for label_counter in counter.values()]), \
+                    "Counter is not an InternedCounter object or a dictionary of Counter objects"
+                counter = InternedCounter(counter)
+            max_size = items[QueueHandlerItem.MAX_SIZE]
+            assert isinstance(max_size, int), "Max size is not an integer"
+            eviction_policy = items.get(QueueHandlerItem.EVICTION_POLICY)
+            if eviction_policy is None:
+                eviction_policy = EvictionPolicy(max_size, max_size)
+            assert isinstance(eviction_policy, EvictionPolicy), \
+                "Eviction policy is not an EvictionPolicy object"
+            eviction_worker = items.get(QueueHandlerItem.EVICTION_WORKER)
+            assert isinstance(eviction_worker, EvictionWorker) or eviction_worker is None, \
+                "Eviction worker is not an EvictionWorker object or None"
+            queue_limit = items.get(QueueHandlerItem.QUEUE_LIMIT)
+            assert isinstance(queue_limit, QueueLimit) or queue_limit is None, \
+                "Queue limit is not a QueueLimit object or None"
+            memory_budget = items.get(QueueHandlerItem.MEMORY_BUDGET)
+            assert isinstance(memory_budget, MemoryBudget) or memory_budget is None, \
+                "Memory budget is not a MemoryBudget object or None"
+            expiry = items.get(QueueHandlerItem.EXPIRY)
+            assert isinstance(expiry, QueueExpiry) or expiry is None, \
+                "Expiry is not a QueueExpiry object or None"
+            assert expiry is None or len(expiry) == len(queue), \
+                "The expiry doesn't have a timestamp for each item of the queue"
+            wal = items.get(QueueHandlerItem.WAL)
+            assert isinstance(wal, WriteAheadLog) or wal is None, \
+                "WAL is not a WriteAheadLog object or None"
+            assert wal is None or not isinstance(dataframe, SharedFrame), \
+                "The queue of a SharedFrame object doesn't support a write-ahead log"
+
+            self.__states[queue_name] = QueueState(
+                queue_name, queue, counter, dataframe, max_size, behaviour, eviction_policy,
+                eviction_worker, queue_limit, memory_budget, expiry, wal,
+                self.__get_shared_lock(queue_name, dataframe))
+            self.generation += 1
+
+    # Items which may be omitted when a queue is set (default values are used)
+    OPTIONAL_ITEMS = frozenset([QueueHandlerItem.EVICTION_POLICY,
+                                QueueHandlerItem.EVICTION_WORKER,
+                                QueueHandlerItem.QUEUE_LIMIT,
+                                QueueHandlerItem.MEMORY_BUDGET,
+                                QueueHandlerItem.EXPIRY,
+                                QueueHandlerItem.WAL])
 
     __instance = None
 
@@ -161,29 +542,518 @@ class QueuesHandler:
         self.__instance[queue_name] = items
 
 
-def __create_logging_message(message: str) -> str:
+def __popleft_items(queue: Union[deque, ColumnarQueue, ShardedQueue], items_nb: int) -> \
+        List[Tuple[Any, Dict]]:
     """
-        Generate a logging message with a predefined format.
+        Remove and return the first items of a queue.
 
-        :param message: raw logging message
-        :type message: str
+        :param queue: Selected queue
+        :type queue: Union[deque, ColumnarQueue, ShardedQueue]
 
-        :return: formatted message
-        :rtype: str
+        :param items_nb: Number of removed items
+        :type items_nb: int
+
+        :return: Removed items
+        :rtype: List[Tuple[Any, Dict]]
     """
 
-    line_decorator = '| '
-    lines = message.split('\n')
-    edge_length = max([len(line) for line in lines]) + len(line_decorator)
-    edge = ''.join(['-' for _ in range(edge_length)])
-    decorated_message = '\n' + edge + '\n'
+    if isinstance(queue, (ColumnarQueue, ShardedQueue)):
+        return queue.popleft_many(items_nb)
+    popleft = queue.popleft
+    return [popleft() for _ in range(items_nb)]
+
+
+def __check_queue_items(queue_items: Any, dataframe: DataFrame, result: Any) -> NoReturn:
+    """
+        Check the format of new queue's items.
+
+        :param queue_items: New queue's items
+        :type queue_items: Any
+
+        :param dataframe: Assigned dataframe
+        :type dataframe: DataFrame
+
+        :param result: Result of the decorated function
+        :type result: Any
+    """
+
+    assigned_dataframe_columns = dataframe.columns
+    assert isinstance(queue_items, (list, tuple)), \
+        "Queue's items must be contained in a list or a tuple object"
+    for index, item in enumerate(queue_items):
+        assert isinstance(item, (list, tuple)) and len(item) == 2, \
+            "Item {} : The new queue's item must be a list or a " \
+            "tuple with length of 2".format(index)
+        assert isinstance(item[1], dict), \
+            "Item {} : The second element of the new queue's " \
+            "item must be a dictionary".format(index)
+        for key in item[1]:
+            assert key in assigned_dataframe_columns, \
+                "Item {} : Column {} in the second element of the new queue's " \
+                "item is not in the assigned dataframe : " \
+                "{}".format(list(result[1].keys()), key, index)
+
+
+def __compact_queue(state: QueueState) -> int:
+    """
+        Remove the superseded items of a queue (LAST_ITEM behaviour only): these items are ignored
+        by the managing process because a later item has the same label and checking columns.
+
+        The append lock of the queue must be held.
+
+        :param state: State of the queue
+        :type state: QueueState
+
+        :return: Number of removed items
+        :rtype: int
+    """
+
+    queue = state.queue
+    counter = state.counter
+    if state.behaviour != QueueBehaviour.LAST_ITEM or state.superseded_nb == 0:
+        return 0
+
+    if state.wal is not None:
+        # The compaction is replayed from the logged items
+        state.wal.log_compaction()
+    items = __popleft_items(queue, len(queue))
+    # The last item of each group (same label and checking columns) decrements its count from 1
+    is_kept = [counter.decrement(item[0], item[1]) == 1 for item in items]
+    kept_items = list(compress(items, is_kept))
+    queue.extend(kept_items)
+    counter.increment_many(kept_items)
+    state.superseded_nb = 0
+    if state.expiry is not None:
+        state.expiry.filter(is_kept)
+    return len(items) - len(kept_items)
+
+
+def __is_queue_full(state: QueueState, items_nb: int) -> bool:
+    """
+        :param state: State of a bounded queue
+        :type state: QueueState
 
-    for line in lines:
-        decorated_line = line_decorator + line
-        decorated_message += \
-            decorated_line + ''.join([' ' for _ in range(edge_length - len(decorated_line))]) + '\n'
-    decorated_message += edge
-    return decorated_message
+        :param items_nb: Number of new items
+        :type items_nb: int
+
+        :return: True if the new items don't fit in the queue (with the reserved items)
+        :rtype: bool
+    """
+
+    return len(state.queue) + state.reserved_nb + items_nb > state.queue_limit.max_length
+
+
+def __reserve_space(state: QueueState, items_nb: int) -> NoReturn:
+    """
+        Reserve the room of new items in a bounded queue (see 'QueueLimit'). The reserved items
+        are released by '__append_items' or '__release_space'.
+
+        When the queue is full, its superseded items are removed if they are at least 1/8 of its
+        max length, then the rows of its first items are removed if the managing process is due
+        and the queue's Lock object is held by the current thread. Otherwise the queue full policy
+        is applied: the exclusive side of the queue's Lock object is released while waiting so
+        the managing processes of the other threads may remove rows.
+
+        The append lock of the queue must not be held.
+
+        :param state: State of the queue
+        :type state: QueueState
+
+        :param items_nb: Number of new items
+        :type items_nb: int
+    """
+
+    queue_limit = state.queue_limit
+    max_length = queue_limit.max_length
+    if items_nb > max_length:
+        raise QueueFullError("{} new items can't fit in the queue '{}' (max length : {})".format(
+            items_nb, state.name, max_length))
+
+    lock = state.lock
+    is_lock_owned = isinstance(lock, SharedExclusiveLock) and lock.is_owned()
+    deadline = None
+    # The whole queue is compacted for at least 1/8 of its max length
+    min_superseded_nb = max(items_nb, -(-max_length // MIN_COMPACTION_DIVISOR))
+    while True:
+        if is_lock_owned and __is_queue_full(state, items_nb) and __is_eviction_needed(state):
+            __remove_rows(state)
+        with state.append_lock:
+            if not __is_queue_full(state, items_nb) or \
+                    (state.superseded_nb >= min_superseded_nb and __compact_queue(state) > 0 and
+                     not __is_queue_full(state, items_nb)):
+                state.reserved_nb += items_nb
+                return
+            timeout = None
+            if queue_limit.policy == QueueFullPolicy.BLOCK and queue_limit.timeout is not None:
+                if deadline is None:
+                    deadline = monotonic() + queue_limit.timeout
+                timeout = deadline - monotonic()
+            if queue_limit.policy == QueueFullPolicy.RAISE or \
+                    (timeout is not None and timeout <= 0):
+                raise QueueFullError("The queue '{}' is full : {} items (max length : {})".format(
+                    state.name, len(state.queue), max_length))
+            if not is_lock_owned:
+                # The append lock is released while waiting
+                state.space_available.wait(timeout)
+                continue
+        # The managing processes of the other threads need the exclusive side of the Lock object
+        lock.release()
+        try:
+            with state.space_available:
+                state.space_available.wait_for(lambda: not __is_queue_full(state, items_nb),
+                                               timeout)
+        finally:
+            lock.acquire()
+
+
+def __release_space(state: QueueState, reserved_nb: int) -> NoReturn:
+    """
+        Release the room of reserved items which are not added (see '__reserve_space').
+
+        :param state: State of the queue
+        :type state: QueueState
+
+        :param reserved_nb: Number of released items
+        :type reserved_nb: int
+    """
+
+    if reserved_nb == 0:
+        return
+    with state.space_available:
+        state.reserved_nb -= reserved_nb
+        state.space_available.notify_all()
+
+
+def __append_items(state: QueueState, queue_items: List[Tuple[Any, Dict]],
+                   reserved_nb: int = 0) -> NoReturn:
+    """
+        Add new items at the end of a queue and count them.
+
+        :param state: State of the queue
+        :type state: QueueState
+
+        :param queue_items: New queue's items
+        :type queue_items: List[Tuple[Any, Dict]]
+
+        :param reserved_nb: Number of items reserved in the bounded queue before the call of the
+        adding function (see '__reserve_space')
+        :type reserved_nb: int
+    """
+
+    if isinstance(state.dataframe, SharedFrame):
+        # The SharedFrame object holds its own lock (the hooks are not called)
+        state.dataframe.append_items(queue_items)
+        state.stats.items_added += len(queue_items)
+        return
+
+    queue = state.queue
+    counter = state.counter
+    item_added_hooks = HOOKS[ITEM_ADDED]
+    if isinstance(queue, ShardedQueue) and not item_added_hooks and state.queue_limit is None \
+            and state.wal is None and state.memory_budget is None and state.expiry is None:
+        # Each shard holds its own lock : the shared calls only wait for the calls adding items
+        # in the same shards (the shards count the added items, see 'QueueState.get_stats')
+        queue.extend(queue_items, counted=True)
+        return
+
+    if state.queue_limit is not None and len(queue_items) > reserved_nb:
+        # The rows of the items are already in the dataframe : only the calls adding several items
+        # may fail here
+        try:
+            __reserve_space(state, len(queue_items) - reserved_nb)
+        except BaseException:
+            __release_space(state, reserved_nb)
+            raise
+        reserved_nb = len(queue_items)
+
+    # Items may be added by several shared calls at the same time (see 'synchronized')
+    with state.append_lock:
+        if state.queue_limit is not None:
+            state.reserved_nb -= reserved_nb
+            if reserved_nb > len(queue_items):
+                state.space_available.notify_all()
+        state.stats.items_added += len(queue_items)
+        if state.wal is not None:
+            state.wal.log_append(queue_items)
+        if state.memory_budget is not None:
+            state.memory_budget.update_rows(state.dataframe, [item[0] for item in queue_items])
+        if state.expiry is not None:
+            state.expiry.add(len(queue_items))
+        if not item_added_hooks:
+            # The queues of the LRU and LFU behaviours return the replaced items
+            replaced_items = queue.extend(queue_items)
+            state.superseded_nb += counter.increment_many(queue_items)
+            if replaced_items:
+                for item in replaced_items:
+                    counter.decrement(item[0], item[1])
+            return
+
+        for item in queue_items:
+            replaced_item = queue.append(item)
+            if counter.increment(item[0], item[1]) > 1:
+                state.superseded_nb += 1
+            if replaced_item is not None:
+                counter.decrement(replaced_item[0], replaced_item[1])
+            for hook in item_added_hooks:
+                hook(state.name, item, len(queue), len(state.dataframe), state.max_size)
+
+
+def __is_eviction_needed(state: QueueState) -> bool:
+    """
+        :param state: State of the queue
+        :type state: QueueState
+
+        :return: True if the dataframe's size is greater than the high watermark, if the estimated
+        memory of the dataframe is greater than the byte budget or if items have expired
+        :rtype: bool
+    """
+
+    if isinstance(state.dataframe, SharedFrame):
+        return state.dataframe.is_eviction_needed()
+    return len(state.dataframe) > state.eviction_policy.high_watermark or \
+        (state.memory_budget is not None and state.memory_budget.is_exceeded()) or \
+        (state.expiry is not None and state.expiry.get_expired_nb() > 0)
+
+
+def __remove_rows(state: QueueState) -> NoReturn:
+    """
+        Run the managing process of a queue: remove the rows of the first queue's items when the
+        dataframe's size is greater than the high watermark or when the estimated memory of the
+        dataframe is greater than the byte budget, and the rows of the expired items.
+
+        :param state: State of the queue
+        :type state: QueueState
+    """
+
+    if isinstance(state.dataframe, SharedFrame):
+        state.dataframe.manage()
+        return
+
+    queue = state.queue
+    counter = state.counter
+    dataframe = state.dataframe
+    # Rows of the dataframe (DataFrame object or store of columns)
+    backend = get_backend(dataframe, state.label_positions)
+    max_size = state.max_size
+    behaviour = state.behaviour
+    eviction_policy = state.eviction_policy
+    memory_budget = state.memory_budget
+    expiry = state.expiry
+
+    is_size_exceeded = len(dataframe) > eviction_policy.high_watermark
+    if not is_size_exceeded and \
+            (memory_budget is None or not memory_budget.is_exceeded()) and \
+            (expiry is None or expiry.get_expired_nb() == 0):
+        return
+    target_size = eviction_policy.low_watermark
+    stats = state.stats
+    stats.managing_runs += 1
+
+    def get_items_nb() -> int:
+        queue_size = len(queue)
+        diff = len(dataframe) - target_size if is_size_exceeded else 0
+        if memory_budget is not None:
+            excess_rows_nb = memory_budget.get_excess_rows_nb()
+            diff = excess_rows_nb if excess_rows_nb > diff else diff
+        if expiry is not None:
+            expired_nb = expiry.get_expired_nb()
+            diff = expired_nb if expired_nb > diff else diff
+        return queue_size if diff > queue_size else diff
+
+    item_ignored_hooks = HOOKS[ITEM_IGNORED]
+    batch_evicted_hooks = HOOKS[BATCH_EVICTED]
+
+    def pop_left_queue(pop_nb: int) -> Tuple[Dict, List[Tuple[Any, Dict]]]:
+        items = list()
+        superseded_items = list()
+        if expiry is not None:
+            expiry.pop(pop_nb)
+        for item in __popleft_items(queue, pop_nb):
+            # Number of items with the same label and checking columns (item included)
+            count = counter.decrement(item[0], item[1])
+            if behaviour == QueueBehaviour.LAST_ITEM:
+                if count == 1:
+                    items.append(item)
+                else:
+                    stats.items_superseded += 1
+                    state.superseded_nb -= 1
+                    if item_ignored_hooks:
+                        superseded_items.append(item)
+                    if __debug__ and count <= 0:
+                        logging.warning(
+                            _create_logging_message("'{}' is an item in the queue but "
+                                                    "the value of the related counter "
+                                                    "is {}").format(item, count))
+            elif behaviour == QueueBehaviour.ALL_ITEMS or behaviour in ACCESS_QUEUES:
+                items.append(item)
+            else:
+                raise ValueError("Behaviour '{}' not supported".format(behaviour))
+        return dict(items), superseded_items
+
+    items_nb = get_items_nb()
+    while items_nb > 0 and queue:
+        queue_items, ignored_items = pop_left_queue(items_nb)
+        # Labels of the removed items in the dataframe (in the dataframe's order)
+        selected_labels = backend.select_labels(list(queue_items.keys()))
+
+        new_selected_labels = backend.select_matching_labels(
+            {label: queue_items[label] for label in selected_labels})
+        backend.drop_labels(new_selected_labels)
+        stats.items_evicted += items_nb
+        stats.rows_evicted += len(new_selected_labels)
+        stats.items_stale += len(queue_items) - len(new_selected_labels)
+        if state.wal is not None:
+            state.wal.log_eviction(items_nb, new_selected_labels)
+        if memory_budget is not None:
+            # Rows removed by the managing process or missing in the dataframe
+            memory_budget.remove_rows(new_selected_labels)
+            memory_budget.remove_rows(set(queue_items.keys()).difference(selected_labels))
+
+        if item_ignored_hooks:
+            removed_labels = set(new_selected_labels)
+            ignored_items.extend(item for item in queue_items.items()
+                                 if item[0] not in removed_labels)
+            for item in ignored_items:
+                for hook in item_ignored_hooks:
+                    hook(state.name, item)
+        for hook in batch_evicted_hooks:
+            hook(state.name, queue_items, new_selected_labels, len(queue),
+                 len(dataframe), max_size)
+        items_nb = get_items_nb()
+
+    if state.queue_limit is not None:
+        # Adding functions may wait for the removed items (see 'QueueFullPolicy.BLOCK')
+        with state.space_available:
+            state.space_available.notify_all()
+
+
+def __manage(state: QueueState) -> NoReturn:
+    """
+        Run the managing process of a queue after a call of a managing function when the eviction
+        policy is due.
+
+        With an eviction worker, the worker is only notified unless the dataframe's size exceeds
+        the high watermark by more than the worker's max overflow.
+
+        :param state: State of the queue
+        :type state: QueueState
+    """
+
+    stats = state.stats
+    stats.managing_calls += 1
+    start = perf_counter()
+    try:
+        eviction_policy = state.eviction_policy
+        if not eviction_policy.is_due():
+            return
+        eviction_worker = state.eviction_worker
+        if eviction_worker is not None:
+            dataframe_size = len(state.dataframe)
+            if dataframe_size <= eviction_policy.high_watermark + eviction_worker.max_overflow:
+                if __is_eviction_needed(state):
+                    eviction_worker.notify()
+                return
+        __remove_rows(state)
+    finally:
+        stats.managing_latency.observe(perf_counter() - start)
+
+
+class __QueueBatch:
+    """
+        Queue's items buffered during a batch (see 'batch').
+    """
+
+    __slots__ = ('depth', 'dataframe', 'items', 'is_managing_deferred')
+
+    def __init__(self, dataframe: DataFrame):
+        self.depth = 0
+        self.dataframe = dataframe
+        self.items = list()
+        self.is_managing_deferred = False
+
+
+# Batches of each thread (queue's name -> __QueueBatch)
+__batches = local()
+
+
+def __get_batch(real_queue_name: str) -> Any:
+    """
+        :return: Current batch of the queue in the current thread (None without batch)
+        :rtype: Union[__QueueBatch, None]
+    """
+
+    queue_batches = getattr(__batches, 'queues', None)
+    return queue_batches.get(real_queue_name) if queue_batches else None
+
+
+def __bind_state(queue_name: Union[str, None]) -> Callable[[], QueueState]:
+    """
+        Create a function returning the current state of a queue. The state is only searched in
+        the QueuesHandler's instance when the generation of the instance changes.
+
+        :param queue_name: Name of the queue
+        :type queue_name: Union[str, None]
+
+        :return: Function returning the state of the queue
+        :rtype: Callable[[], QueueState]
+    """
+
+    QueuesHandler()
+    # noinspection PyProtectedMember
+    handler = QueuesHandler._QueuesHandler__instance
+    bound_state = (None, None)
+
+    def get_state() -> QueueState:
+        nonlocal bound_state
+        generation, state = bound_state
+        if generation != handler.generation:
+            # The generation is read first : a concurrent assignment triggers a new search
+            generation = handler.generation
+            state = handler.get_state(queue_name)
+            bound_state = (generation, state)
+        return state
+    return get_state
+
+
+def __get_managed_state(state: QueueState) -> Union[QueueState, None]:
+    """
+        Check the queue of a managing function's call.
+
+        :param state: State of the queue
+        :type state: QueueState
+
+        :return: State of the queue (None in a batch : the managing process is run at the end of
+        the batch)
+        :rtype: Union[QueueState, None]
+    """
+
+    queue_batch = __get_batch(state.name)
+    if queue_batch is not None:
+        queue_batch.is_managing_deferred = True
+        return None
+    assert isinstance(state.dataframe, FRAME_TYPES), \
+        "The dataframe of the queue '{}' is not assigned".format(state.name)
+    return state
+
+
+async def __acquire_lock(lock: Lock) -> NoReturn:
+    """
+        Acquire a Lock object without blocking the event loop.
+
+        :param lock: Selected Lock object
+        :type lock: Lock
+    """
+
+    # Positional argument : the Lock objects of the multiprocessing module have another keyword
+    if lock.acquire(False):
+        return
+    future = asyncio.get_event_loop().run_in_executor(None, lock.acquire)
+    try:
+        await asyncio.shield(future)
+    except asyncio.CancelledError:
+        # The Lock object is released as soon as the executor acquires it
+        future.add_done_callback(lambda _: lock.release())
+        raise
 
 
 def adding(queue_items_creation_function: Callable[..., List[Tuple[Any, Dict]]] = None,
@@ -216,15 +1086,10 @@ def adding(queue_items_creation_function: Callable[..., List[Tuple[Any, Dict]]]
         :rtype: Callable
     """
 
-    def decorator(decorated_function: Callable) -> Callable:
-        @wraps(decorated_function)
-        def wrapper(*args, **kwargs) -> Any:
-            handler = QueuesHandler()
-            real_queue_name = handler.default_queue_name if queue_name is None else queue_name
-            queue_data = handler[real_queue_name]
-            assert isinstance(queue_data[QueueHandlerItem.DATAFRAME], DataFrame), \
-                "The dataframe of the queue '{}' is not assigned".format(real_queue_name)
-            result = decorated_function(*args, **kwargs)
+    def add_items(state: QueueState, queue_batch: Union[__QueueBatch, None], dataframe: DataFrame,
+                  result: Any, reserved_nb: int) -> NoReturn:
+        start = perf_counter()
+        try:
             if queue_items_creation_function is None:
                 new_result = result
             elif other_args is None:
@@ -233,149 +1098,348 @@ def adding(queue_items_creation_function: Callable[..., List[Tuple[Any, Dict]]]
                 new_result = queue_items_creation_function(result, **other_args)
 
             if __debug__:
-                # Check result's format
-                assigned_dataframe_columns = list(queue_data[QueueHandlerItem.DATAFRAME])
-                assert isinstance(new_result, (list, tuple)), \
-                    "Queue's items must be contained in a list or a tuple object"
-                for index, item in enumerate(new_result):
-                    assert isinstance(item, (list, tuple)) and len(item) == 2, \
-                        "Item {} : The new queue's item must be a list or a " \
-                        "tuple with length of 2".format(index)
-                    assert isinstance(item[1], dict), \
-                        "Item {} : The second element of the new queue's " \
-                        "item must be a dictionary".format(index)
-                    for key in item[1]:
-                        assert key in assigned_dataframe_columns, \
-                            "Item {} : Column {} in the second element of the new queue's " \
-                            "item is not in the assigned dataframe : " \
-                            "{}".format(list(result[1].keys()), key, index)
-
-            for item in new_result:
-                queue_data[QueueHandlerItem.QUEUE].append(item)
-                counter = queue_data[QueueHandlerItem.COUNTER]
-                if item[0] not in counter:
-                    counter[item[0]] = Counter()
-                counter[item[0]][frozenset(item[1].keys())] += 1
-
-                if __debug__:
-                    logging.debug(
-                        __create_logging_message("New item added in the queue '{}' : {}\n"
-                                                 "Size of the queue : {}\n"
-                                                 "Size of the assigned dataframe : {}\n"
-                                                 "Max size of the assigned "
-                                                 "dataframe : {}".
-                                                 format(real_queue_name,
-                                                        item,
-                                                        len(queue_data[QueueHandlerItem.QUEUE]),
-                                                        len(queue_data[QueueHandlerItem.DATAFRAME]),
-                                                        queue_data[QueueHandlerItem.MAX_SIZE])))
+                __check_queue_items(new_result, dataframe, result)
+        except BaseException:
+            __release_space(state, reserved_nb)
+            raise
 
+        if queue_batch is None:
+            __append_items(state, new_result, reserved_nb)
+        else:
+            queue_batch.items.extend(new_result)
+        stats = state.stats
+        stats.adding_calls += 1
+        stats.adding_latency.observe(perf_counter() - start)
+
+    def get_adding_context(get_state: Callable[[], QueueState]) -> Tuple[QueueState, Any,
+                                                                         DataFrame]:
+        state = get_state()
+        queue_batch = __get_batch(state.name)
+        dataframe = state.dataframe if queue_batch is None else queue_batch.dataframe
+        assert isinstance(dataframe, FRAME_TYPES), \
+            "The dataframe of the queue '{}' is not assigned".format(state.name)
+        return state, queue_batch, dataframe
+
+    def reserve_space(state: QueueState, queue_batch: Union[__QueueBatch, None]) -> int:
+        # The queue full policy of a bounded queue is applied before the rows are written
+        if state.queue_limit is None or queue_batch is not None:
+            return 0
+        __reserve_space(state, 1)
+        return 1
+
+    def decorator(decorated_function: Callable) -> Callable:
+        get_state = __bind_state(queue_name)
+
+        if asyncio.iscoroutinefunction(decorated_function):
+            @wraps(decorated_function)
+            async def async_wrapper(*args, **kwargs) -> Any:
+                adding_context = get_adding_context(get_state)
+                reserved_nb = reserve_space(*adding_context[:2])
+                try:
+                    result = await decorated_function(*args, **kwargs)
+                except BaseException:
+                    __release_space(adding_context[0], reserved_nb)
+                    raise
+                add_items(*adding_context, result, reserved_nb)
+                return result
+            return async_wrapper
+
+        @wraps(decorated_function)
+        def wrapper(*args, **kwargs) -> Any:
+            adding_context = get_adding_context(get_state)
+            reserved_nb = reserve_space(*adding_context[:2])
+            try:
+                result = decorated_function(*args, **kwargs)
+            except BaseException:
+                __release_space(adding_context[0], reserved_nb)
+                raise
+            add_items(*adding_context, result, reserved_nb)
             return result
         return wrapper
     return decorator
 
 
-def managing(queue_name: Union[str, None] = None) -> Callable:
+def managing(queue_name: Union[str, None] = None, offload_eviction: bool = False,
+             executor: Union[Executor, None] = None) -> Callable:
     """
         Remove rows in the dataframe's queue when the dataframe's max size is reached.
 
         If a row's label is present in the queue but the column's values don't match, the queue's
         item will be ignored.
 
+        The max size is the default high and low watermarks of the queue's eviction policy (see
+        'assign_dataframe'): rows are removed when the dataframe's size is greater than the high
+        watermark until the low watermark is reached.
+
+        If the queue has an eviction worker, the rows are removed in the background (see
+        'assign_dataframe').
+
+        Coroutine functions may be decorated: their managing process may be run in an executor so
+        the event loop is not blocked while rows are removed (the decorated coroutine function
+        should be synchronized, see 'synchronized').
+
         :param queue_name: Name of the queue for the managing
         :type queue_name: Union[str, None]
 
+        :param offload_eviction: Run the removal of rows of coroutine functions in an executor
+        :type offload_eviction: bool
+
+        :param executor: Executor of the offloaded removals (default executor of the event loop
+        by default)
+        :type executor: Union[Executor, None]
+
         :return: Decorated function
         :rtype: Callable
     """
 
     def decorator(decorated_function: Callable) -> Callable:
+        get_state = __bind_state(queue_name)
+
+        if asyncio.iscoroutinefunction(decorated_function):
+            @wraps(decorated_function)
+            async def async_wrapper(*args, **kwargs) -> Any:
+                state = __get_managed_state(get_state())
+                result = await decorated_function(*args, **kwargs)
+                if state is not None:
+                    if offload_eviction and __is_eviction_needed(state):
+                        await asyncio.get_event_loop().run_in_executor(executor, __manage, state)
+                    else:
+                        __manage(state)
+                return result
+            return async_wrapper
+
         @wraps(decorated_function)
         def wrapper(*args, **kwargs) -> Any:
-            handler = QueuesHandler()
-            real_queue_name = handler.default_queue_name if queue_name is None else queue_name
-            queue_data = handler[real_queue_name]
-            assert isinstance(queue_data[QueueHandlerItem.DATAFRAME], DataFrame), \
-                "The dataframe of the queue '{}' is not assigned".format(real_queue_name)
+            state = __get_managed_state(get_state())
             result = decorated_function(*args, **kwargs)
-            queue = queue_data[QueueHandlerItem.QUEUE]
-            counter = queue_data[QueueHandlerItem.COUNTER]
-            dataframe = queue_data[QueueHandlerItem.DATAFRAME]
-            max_size = queue_data[QueueHandlerItem.MAX_SIZE]
-            behaviour = queue_data[QueueHandlerItem.BEHAVIOUR]
-
-            def get_items_nb() -> int:
-                queue_size = len(queue)
-                diff = dataframe.index.size - max_size
-                return queue_size if diff > queue_size else diff
-
-            def pop_left_queue(pop_nb: int) -> List[dict]:
-                items = list()
-                for _ in range(pop_nb):
-                    item = queue.popleft()
-                    key = frozenset(item[1].keys())
-                    if behaviour == QueueBehaviour.LAST_ITEM:
-                        if counter[item[0]][key] == 1:
-                            items.append(item)
-                        elif __debug__ and counter[item[0]][key] <= 0:
-                            logging.warning(
-                                __create_logging_message("'{}' is an item in the queue but the "
-                                                         "value of the related counter is "
-                                                         "{}").format(item, counter[item[0]][key]))
-                    elif behaviour == QueueBehaviour.ALL_ITEMS:
-                        items.append(item)
-                    else:
-                        raise ValueError("Behaviour '{}' not supported".format(behaviour))
-
-                    counter[item[0]][key] -= 1
-                return dict(items)
-
-            items_nb = get_items_nb()
-            while items_nb > 0 and queue:
-                queue_items = pop_left_queue(items_nb)
-                selected_labels = list(compress(dataframe.index,
-                                                dataframe.index.isin(queue_items.keys())))
-
-                selected_checking_values_list = list()
-                selected_columns = set()
-                for selected_label in selected_labels:
-                    selected_checking_values = queue_items[selected_label]
-                    selected_checking_values_list.append(selected_checking_values)
-                    selected_columns.update(selected_checking_values.keys())
-                selected_columns = list(selected_columns)
-
-                original_dataframe = dataframe.loc[selected_labels, selected_columns]
-                queue_items_dataframe = DataFrame(data=selected_checking_values_list,
-                                                  index=selected_labels)
-                comparison_result = original_dataframe == queue_items_dataframe.reindex(
-                    columns=original_dataframe.columns)
-                new_selected_labels = list(filter(None,
-                                                  comparison_result.apply(lambda row:
-                                                                          row.name if all(row)
-                                                                          else None, axis=1)))
-                dataframe.drop(new_selected_labels, inplace=True)
-                if __debug__:
-                    logging.debug(
-                        __create_logging_message("Item removed from the queue '{}' : {}\n"
-                                                 "Size of the queue : {}\n"
-                                                 "Size of the assigned dataframe : {}\n"
-                                                 "Max size of the assigned dataframe : {}".
-                                                 format(real_queue_name,
-                                                        "\n".join(
-                                                            [str((label, values))
-                                                             for label, values in
-                                                             queue_items.items()]),
-                                                        len(queue),
-                                                        len(dataframe),
-                                                        max_size)))
-                items_nb = get_items_nb()
+            if state is not None:
+                managed_queues = getattr(__shared_calls, 'managed_queues', None)
+                if managed_queues is None:
+                    __manage(state)
+                else:
+                    # The managing process is run after the shared call (exclusive lock)
+                    managed_queues[state.name] = state
+            return result
+        return wrapper
+    return decorator
+
+
+def __touch_labels(state: QueueState, labels: Iterable[Any]) -> NoReturn:
+    """
+        Record reads of rows in a queue with the LRU or LFU behaviour (ignored for the other
+        behaviours).
+
+        :param state: State of the queue
+        :type state: QueueState
+
+        :param labels: Labels of the read rows
+        :type labels: Iterable[Any]
+    """
+
+    if state.behaviour not in ACCESS_QUEUES:
+        return
+    touch_label = state.queue.touch
+    # Rows may be read by several shared calls at the same time (see 'synchronized')
+    with state.append_lock:
+        if state.wal is not None:
+            labels = list(labels)
+            state.wal.log_touch(labels)
+        for label in labels:
+            touch_label(label)
+
+
+def touching(labels_function: Callable[..., Iterable[Any]] = None,
+             queue_name: Union[str, None] = None,
+             other_args: Union[None, Dict[str, Any]] = None) -> Callable:
+    """
+        Record reads of rows in a queue with the LRU or LFU behaviour (see QueueBehaviour).
+
+        Read rows will be the labels in the result of the decorated function or in the result of
+        the labels function if it is not None. Reads of rows without queue's item and reads in the
+        queues of the other behaviours are ignored.
 
+        :param labels_function: labels function used with the result of the decorated function
+        :type labels_function: Callable[[Any], Iterable[Any]]
+
+        :param queue_name: name of the selected queue
+        :type queue_name: Union[str, None]
+
+        :param other_args: additional args for the labels function
+        :type other_args: Union[None, Dict[str, Any]]
+
+        :return: Decorated function
+        :rtype: Callable
+    """
+
+    def touch_labels(state: QueueState, result: Any) -> NoReturn:
+        if labels_function is None:
+            labels = result
+        elif other_args is None:
+            labels = labels_function(result)
+        else:
+            labels = labels_function(result, **other_args)
+        __touch_labels(state, labels)
+
+    def decorator(decorated_function: Callable) -> Callable:
+        get_state = __bind_state(queue_name)
+
+        if asyncio.iscoroutinefunction(decorated_function):
+            @wraps(decorated_function)
+            async def async_wrapper(*args, **kwargs) -> Any:
+                result = await decorated_function(*args, **kwargs)
+                touch_labels(get_state(), result)
+                return result
+            return async_wrapper
+
+        @wraps(decorated_function)
+        def wrapper(*args, **kwargs) -> Any:
+            result = decorated_function(*args, **kwargs)
+            touch_labels(get_state(), result)
             return result
         return wrapper
     return decorator
 
 
-def synchronized(queue_name: Union[str, None] = None) -> Callable:
+def touch(labels: Iterable[Any], queue_name: Union[str, None] = None) -> NoReturn:
+    """
+        Record reads of rows in a queue with the LRU or LFU behaviour (see 'touching').
+
+        :param labels: Labels of the read rows
+        :type labels: Iterable[Any]
+
+        :param queue_name: name of the selected queue
+        :type queue_name: Union[str, None]
+    """
+
+    __touch_labels(QueuesHandler().get_state(queue_name), labels)
+
+
+@contextmanager
+def batch(queue_name: Union[str, None] = None) -> Iterator[None]:
+    """
+        Defer the bookkeeping and the managing process of a queue to the end of the context.
+
+        In the context, the functions decorated by 'adding' for the queue only buffer their new
+        queue's items and the functions decorated by 'managing' don't remove rows. At the end of
+        the context, the buffered items are added in the queue in one pass and one managing process
+        is run if a managing function was called.
+
+        Batches are specific to the current thread and may be nested (the outermost batch adds the
+        items). With several threads, the whole context should hold the queue's lock. In an event
+        loop, all the coroutines of the thread are in the batch.
+
+        :param queue_name: Name of the selected queue
+        :type queue_name: Union[str, None]
+    """
+
+    handler = QueuesHandler()
+    state = handler.get_state(queue_name)
+    assert isinstance(state.dataframe, FRAME_TYPES), \
+        "The dataframe of the queue '{}' is not assigned".format(state.name)
+
+    queue_batches = getattr(__batches, 'queues', None)
+    if queue_batches is None:
+        queue_batches = __batches.queues = dict()
+    queue_batch = queue_batches.get(state.name)
+    if queue_batch is None:
+        queue_batch = queue_batches[state.name] = __QueueBatch(state.dataframe)
+    queue_batch.depth += 1
+    try:
+        yield
+    finally:
+        queue_batch.depth -= 1
+        if queue_batch.depth == 0:
+            # Items are added even after an exception : their rows may be in the dataframe
+            del queue_batches[state.name]
+            state = handler.get_state(state.name)
+            __append_items(state, queue_batch.items)
+            if queue_batch.is_managing_deferred:
+                __manage(state)
+
+
+# Shared calls of each thread (see 'synchronized') :
+# - locks : Lock objects held by the thread on their shared side
+# - managed_queues : managing processes run after the outermost shared call (queue's name ->
+# state of the queue)
+__shared_calls = local()
+
+
+def __call_shared(lock: SharedExclusiveLock, decorated_function: Callable, args: tuple,
+                  kwargs: dict, queue_name: str, holder: str) -> Any:
+    """
+        Call a function holding the shared side of a Lock object then run the deferred managing
+        processes holding its exclusive side.
+
+        The acquisitions are recorded in the profile of the Lock object if it is profiled (see
+        'profile_lock').
+
+        :param lock: Lock object of the queue
+        :type lock: SharedExclusiveLock
+
+        :param decorated_function: Called function
+        :type decorated_function: Callable
+
+        :param args: Positional arguments of the call
+        :type args: tuple
+
+        :param kwargs: Keyword arguments of the call
+        :type kwargs: dict
+
+        :param queue_name: Name of the queue
+        :type queue_name: str
+
+        :param holder: Name of the called function in the profile
+        :type holder: str
+
+        :return: Result of the call
+        :rtype: Any
+    """
+
+    held_locks = getattr(__shared_calls, 'locks', None)
+    if held_locks is None:
+        held_locks = __shared_calls.locks = list()
+    if lock in held_locks:
+        # The shared side isn't reentrant when an exclusive acquisition is waiting
+        return decorated_function(*args, **kwargs)
+
+    is_outermost_call = not held_locks
+    if is_outermost_call:
+        __shared_calls.managed_queues = dict()
+    profile = lock.profile
+    if profile is not None:
+        start = perf_counter()
+    lock.acquire_shared()
+    if profile is not None:
+        acquisition_time = perf_counter()
+    held_locks.append(lock)
+    try:
+        return decorated_function(*args, **kwargs)
+    finally:
+        held_locks.remove(lock)
+        if profile is not None:
+            release_time = perf_counter()
+        lock.release_shared()
+        if profile is not None:
+            profile.record(queue_name, holder, 'shared', acquisition_time - start,
+                           release_time - acquisition_time)
+        if is_outermost_call:
+            managed_queues = __shared_calls.managed_queues
+            __shared_calls.managed_queues = None
+            if managed_queues:
+                if profile is None:
+                    with lock:
+                        __manage_queues(managed_queues)
+                else:
+                    profile.call(lock, queue_name, '{} (managing)'.format(holder),
+                                 __manage_queues, (managed_queues,))
+
+
+def __manage_queues(managed_queues: Dict[str, QueueState]) -> NoReturn:
+    for state in managed_queues.values():
+        __manage(state)
+
+
+def synchronized(queue_name: Union[str, None] = None, shared: bool = False) -> Callable:
     """
         Acquire the queue's Lock object before the decorated function calling. The Lock object
         will be released at the
@@ -383,18 +1447,88 @@ def synchronized(queue_name: Union[str, None] = None) -> Callable:
 
         The same Lock object will be shared if several queues have the same assigned datframe.
 
+        Coroutine functions may be decorated: the coroutines first acquire the queue's asyncio
+        Lock object (shared like the Lock objects) then the queue's Lock object without blocking
+        the event loop.
+
+        With the shared mode, several decorated calls hold the queue's Lock object at the same time
+        (their new queue's items are added one call at a time). The managing processes of the
+        managing functions called in the decorated function are run after the call with the
+        exclusive Lock object. The shared mode is only for the functions which don't add or
+        remove rows: functions reading the assigned dataframe, or updating the values of its
+        existing rows with their own lock, and adding queue's items. The functions adding rows
+        (setting with enlargement, append, ...) must use the exclusive mode: pandas doesn't
+        support concurrent changes of the rows of a dataframe.
+
+        The queues of a SharedFrame object use the Lock object of the SharedFrame object, held by
+        one process at a time (the shared mode is exclusive).
+
+        The waiting and holding times of the calls are recorded if the Lock object is profiled
+        (see 'profile_lock'). Otherwise, the calls are not timed.
+
         :param queue_name: Name of the queue for the synchronization
         :type queue_name: Union[str, None]
 
+        :param shared: Shared mode (not available for coroutine functions)
+        :type shared: bool
+
         :return: Decorated function
         :rtype: Callable
     """
 
     def decorator(decorated_function: Callable) -> Callable:
+        get_state = __bind_state(queue_name)
+        # Name of the decorated function in the profiles of the Lock objects
+        holder = '{}.{}'.format(decorated_function.__module__, decorated_function.__qualname__)
+
+        if shared:
+            assert not asyncio.iscoroutinefunction(decorated_function), \
+                "The shared mode is not available for coroutine functions"
+
+            @wraps(decorated_function)
+            def shared_wrapper(*args, **kwargs) -> Any:
+                state = get_state()
+                lock = state.lock
+                if not isinstance(lock, SharedExclusiveLock):
+                    # Lock object of a SharedFrame object : exclusive calls
+                    with lock:
+                        return decorated_function(*args, **kwargs)
+                return __call_shared(lock, decorated_function, args, kwargs, state.name, holder)
+            return shared_wrapper
+
+        if asyncio.iscoroutinefunction(decorated_function):
+            @wraps(decorated_function)
+            async def async_wrapper(*args, **kwargs) -> Any:
+                # noinspection PyProtectedMember
+                instance = QueuesHandler._QueuesHandler__instance
+                profile = getattr(instance.get_assigned_lock(queue_name), 'profile', None)
+                if profile is not None:
+                    start = perf_counter()
+                async with instance.get_assigned_async_lock(queue_name):
+                    lock = instance.get_assigned_lock(queue_name)
+                    await __acquire_lock(lock)
+                    if profile is not None:
+                        acquisition_time = perf_counter()
+                    try:
+                        return await decorated_function(*args, **kwargs)
+                    finally:
+                        if profile is not None:
+                            release_time = perf_counter()
+                        lock.release()
+                        if profile is not None:
+                            # The waiting time includes the waiting for the asyncio Lock object
+                            profile.record(get_state().name, holder, 'exclusive',
+                                           acquisition_time - start,
+                                           release_time - acquisition_time)
+            return async_wrapper
+
         @wraps(decorated_function)
         def wrapper(*args, **kwargs) -> Any:
-            # noinspection PyProtectedMember
-            lock = QueuesHandler._QueuesHandler__instance.get_assigned_lock(queue_name)
+            state = get_state()
+            lock = state.lock
+            profile = getattr(lock, 'profile', None)
+            if profile is not None:
+                return profile.call(lock, state.name, holder, decorated_function, args, kwargs)
             lock.acquire()
             try:
                 return decorated_function(*args, **kwargs)
@@ -405,11 +1539,101 @@ def synchronized(queue_name: Union[str, None] = None) -> Callable:
     return decorator
 
 
-def assign_dataframe(dataframe: Union[DataFrame, None],
+def __create_queue_items(dataframe: DataFrame,
+                         selected_columns: List[Any]) -> List[Tuple[Any, Dict]]:
+    """
+        Create the initial queue's items of an assigned dataframe.
+
+        The selected columns are extracted as whole columns and zipped with the index's labels:
+        queue's items follow the dataframe's row order without creating a Series for each row.
+
+        :param dataframe: Assigned dataframe
+        :type dataframe: DataFrame
+
+        :param selected_columns: Names of the dataframe's columns used for the queue's items
+        :type selected_columns: List[Any]
+
+        :return: Queue's items
+        :rtype: List[Tuple[Any, Dict]]
+    """
+
+    labels = dataframe.index.tolist()
+    if selected_columns:
+        rows_values = zip(*[dataframe[column].tolist() for column in selected_columns])
+    else:
+        rows_values = repeat((), len(labels))
+    return [(label, dict(zip(selected_columns, row_values)))
+            for label, row_values in zip(labels, rows_values)]
+
+
+def __set_queue(real_queue_name: str, items: Dict[QueueHandlerItem, Any],
+                eviction_worker: bool = False, max_overflow: Union[int, None] = None,
+                ttl_sweep_interval: Union[float, None] = None) -> NoReturn:
+    """
+        Replace the state of a queue in the QueuesHandler's instance: the eviction worker of the
+        previous state is stopped, its write-ahead log is closed and the eviction worker of the
+        new state is started.
+
+        :param real_queue_name: Name of the queue
+        :type real_queue_name: str
+
+        :param items: Items of the new state (without eviction worker)
+        :type items: Dict[QueueHandlerItem, Any]
+
+        :param eviction_worker: Start an eviction worker (see 'assign_dataframe')
+        :type eviction_worker: bool
+
+        :param max_overflow: Max overflow of the eviction worker
+        :type max_overflow: Union[int, None]
+
+        :param ttl_sweep_interval: Sweep interval of the eviction worker
+        :type ttl_sweep_interval: Union[float, None]
+    """
+
+    handler = QueuesHandler()
+    previous_worker = handler.pop_eviction_worker(real_queue_name)
+    if previous_worker is not None:
+        previous_worker.stop(timeout=0)
+    previous_wal = handler.pop_wal(real_queue_name)
+    if previous_wal is not None and previous_wal is not items.get(QueueHandlerItem.WAL):
+        previous_wal.close()
+
+    if eviction_worker:
+        # The worker runs the managing process of the new state of the queue
+        items[QueueHandlerItem.EVICTION_WORKER] = EvictionWorker(
+            real_queue_name, lambda: __remove_rows(state), lambda: state.lock, max_overflow,
+            period=ttl_sweep_interval)
+
+    handler[real_queue_name] = items
+    state = handler.get_state(real_queue_name)
+    dataframe = state.dataframe
+    for hook in HOOKS[DATAFRAME_ASSIGNED]:
+        hook(real_queue_name, len(state.queue),
+             len(dataframe) if dataframe is not None else None, state.max_size)
+
+
+def assign_dataframe(dataframe: Union[DataFrame, SharedFrame, FrameBackend, None],
                      max_size: int,
                      selected_columns: Iterable[Any],
                      queue_name: Union[str, None] = None,
-                     queue_behaviour: QueueBehaviour = QueueBehaviour.LAST_ITEM) -> NoReturn:
+                     queue_behaviour: QueueBehaviour = QueueBehaviour.LAST_ITEM,
+                     high_watermark: Union[int, None] = None,
+                     low_watermark: Union[int, None] = None,
+                     managing_period_calls: Union[int, None] = None,
+                     managing_period_ms: Union[float, None] = None,
+                     queue_storage: QueueStorage = QueueStorage.DEQUE,
+                     eviction_worker: bool = False,
+                     max_overflow: Union[int, None] = None,
+                     max_queue_length: Union[int, None] = None,
+                     queue_full_policy: QueueFullPolicy = QueueFullPolicy.RAISE,
+                     queue_full_timeout: Union[float, None] = None,
+                     max_bytes: Union[int, None] = None,
+                     ttl: Union[float, None] = None,
+                     ttl_sweep_interval: Union[float, None] = None,
+                     wal_path: Union[str, None] = None,
+                     wal_sync_ms: float = 10,
+                     wal_sync_bytes: int = 1 << 20,
+                     shards_nb: int = 8) -> NoReturn:
     """
         Assign a dataframe to a QueueHandler's queue and reset the queue.
 
@@ -417,8 +1641,19 @@ def assign_dataframe(dataframe: Union[DataFrame, None],
         columns's names in the
         'selected_columns' parameter.
 
+        A SharedFrame object may be assigned for the processes sharing the dataframe: its queue is
+        stored in the shared memory with the rows (the other processes attach the SharedFrame
+        object, see 'attach_dataframe'). Its queue only supports the LAST_ITEM and ALL_ITEMS
+        behaviours, without eviction worker, queue limit, byte budget and time-to-live.
+
+        A FrameBackend object may be assigned to store the rows without DataFrame object (see
+        FrameBackend): the rows of the high watermark (plus the max overflow with an eviction
+        worker) are reserved and the managing process removes the rows through its interface. A
+        RingFrame object keeps the rows in preallocated slots and frees the slots of the removed
+        rows without reallocation. Its queue doesn't support a byte budget.
+
         :param dataframe: New assigned dataframe
-        :type dataframe: Union[DataFrame, None]
+        :type dataframe: Union[DataFrame, SharedFrame, FrameBackend, None]
 
         :param max_size: Max size of the assigned dataframe for the managing
         :type max_size: int
@@ -432,6 +1667,81 @@ def assign_dataframe(dataframe: Union[DataFrame, None],
 
         :param queue_behaviour: behaviour of the queue during the managing process
         :type queue_behaviour: QueueBehaviour
+
+        :param high_watermark: Dataframe's size above which the managing process removes rows
+        (max size by default)
+        :type high_watermark: Union[int, None]
+
+        :param low_watermark: Dataframe's size reached at the end of the managing process
+        (max size by default)
+        :type low_watermark: Union[int, None]
+
+        :param managing_period_calls: The managing process is only run every N calls of the
+        managing functions (every call by default)
+        :type managing_period_calls: Union[int, None]
+
+        :param managing_period_ms: The managing process is only run every T milliseconds during
+        the calls of the managing functions (every call by default)
+        :type managing_period_ms: Union[float, None]
+
+        :param queue_storage: Storage of the queue's items
+        :type queue_storage: QueueStorage
+
+        :param eviction_worker: Run the managing process in a background thread holding the
+        queue's lock (the functions modifying the dataframe must hold the same lock, see
+        'synchronized')
+        :type eviction_worker: bool
+
+        :param max_overflow: With an eviction worker, number of rows above the high watermark
+        before the managing functions remove the rows themselves (max size by default)
+        :type max_overflow: Union[int, None]
+
+        :param max_queue_length: Max number of items in the queue, greater than the high
+        watermark (unbounded by default). When it is reached, the superseded items are removed
+        from the queue before the queue full policy is applied (see QueueLimit)
+        :type max_queue_length: Union[int, None]
+
+        :param queue_full_policy: Behaviour of the adding functions when the new items don't fit
+        in the bounded queue (a blocked synchronized function releases the queue's lock needed by
+        the managing processes while waiting)
+        :type queue_full_policy: QueueFullPolicy
+
+        :param queue_full_timeout: Maximum waiting time in seconds of the blocked adding functions
+        (no limit by default)
+        :type queue_full_timeout: Union[float, None]
+
+        :param max_bytes: Byte budget of the assigned dataframe (no budget by default). The managing
+        process also removes rows while the estimated memory of the dataframe is greater than the
+        budget. The memory of the rows is estimated when their queue's items are added
+        :type max_bytes: Union[int, None]
+
+        :param ttl: Time-to-live in seconds of the queue's items (no expiry by default). The
+        managing process also removes the rows of the expired items (see 'expire_items')
+        :type ttl: Union[float, None]
+
+        :param ttl_sweep_interval: Period in seconds of the managing process run by the eviction
+        worker without managing function's call (requires an eviction worker)
+        :type ttl_sweep_interval: Union[float, None]
+
+        :param wal_path: Path of the write-ahead log of the queue (no log by default). The items
+        added in the queue, the evictions of the managing process, the compactions and the reads
+        of the rows are logged since the last snapshot (see 'save_queue' and 'replay'). The log is
+        reset by the assignment
+        :type wal_path: Union[str, None]
+
+        :param wal_sync_ms: Max age in milliseconds of the records of the log which are not synced
+        in the file (group commit, 0 : each record is synced). The records are synced by a thread
+        of the log when no later record is written
+        :type wal_sync_ms: float
+
+        :param wal_sync_bytes: Max size in bytes of the records of the log which are not synced in
+        the file (group commit)
+        :type wal_sync_bytes: int
+
+        :param shards_nb: Number of shards of the sharded storage (see QueueStorage.SHARDED). The
+        shared calls add items without waiting for each other when the queue doesn't have a queue
+        limit, a byte budget, a time-to-live, a write-ahead log and 'item_added' hooks
+        :type shards_nb: int
     """
 
     if __debug__ and dataframe is not None:
@@ -440,50 +1750,533 @@ def assign_dataframe(dataframe: Union[DataFrame, None],
             assert selected_column in columns, \
                 "Selected columns {} doesn't exist in the dataframe".format(selected_column)
 
-    def get_values(local_row, local_columns, counter):
-        values = dict()
-        for local_column in local_columns:
-            values[local_column] = local_row[local_column]
-        if local_row.name not in counter:
-            counter[local_row.name] = Counter()
-        counter[local_row.name][frozenset(local_columns)] += 1
-        return values
+    high_watermark = max_size if high_watermark is None else high_watermark
+    low_watermark = max_size if low_watermark is None else low_watermark
+    assert low_watermark <= max_size <= high_watermark, \
+        "The max size {} is not between the low watermark {} and the high watermark {}".format(
+            max_size, low_watermark, high_watermark)
+    eviction_policy = EvictionPolicy(high_watermark, low_watermark,
+                                     period_calls=managing_period_calls,
+                                     period_ms=managing_period_ms)
+    assert max_queue_length is None or max_queue_length > high_watermark, \
+        "The max length of the queue {} is not greater than the high watermark {}".format(
+            max_queue_length, high_watermark)
+    queue_limit = None if max_queue_length is None else QueueLimit(
+        max_queue_length, queue_full_policy, queue_full_timeout)
+    memory_budget = None if max_bytes is None else MemoryBudget(max_bytes)
+    assert ttl_sweep_interval is None or eviction_worker, \
+        "The sweep of the expired items requires an eviction worker"
+    assert queue_behaviour not in ACCESS_QUEUES or \
+        (queue_storage == QueueStorage.DEQUE and ttl is None), \
+        "The behaviour {} only supports the deque storage without time-to-live".format(
+            queue_behaviour)
+    is_backend = isinstance(dataframe, FrameBackend)
+    assert not is_backend or memory_budget is None, \
+        "The queue of a FrameBackend object doesn't support a byte budget"
+    if memory_budget is not None and dataframe is not None:
+        memory_budget.reset(dataframe)
+    is_shared_frame = isinstance(dataframe, SharedFrame)
+    assert not is_shared_frame or \
+        (queue_behaviour in (QueueBehaviour.LAST_ITEM, QueueBehaviour.ALL_ITEMS) and
+         queue_storage == QueueStorage.DEQUE and not eviction_worker and queue_limit is None and
+         memory_budget is None and ttl is None and wal_path is None), \
+        "The queue of a SharedFrame object only supports the LAST_ITEM and ALL_ITEMS behaviours " \
+        "without eviction worker, queue limit, byte budget, time-to-live and write-ahead log"
+    if is_backend:
+        dataframe.reserve(high_watermark + (max_size if max_overflow is None else max_overflow)
+                          if eviction_worker else high_watermark)
 
     handler = QueuesHandler()
     real_queue_name = handler.default_queue_name if queue_name is None else queue_name
+    previous_worker = handler.pop_eviction_worker(real_queue_name)
+    if previous_worker is not None:
+        previous_worker.stop(timeout=0)
+    previous_wal = handler.pop_wal(real_queue_name)
+    if previous_wal is not None:
+        previous_wal.close()
+    if wal_path is None:
+        wal = None
+    else:
+        wal = WriteAheadLog(wal_path, wal_sync_ms, wal_sync_bytes)
+        # The records of the previous queue are obsolete
+        wal.reset()
     # Reset the dedicated queue
-    if dataframe is not None:
-        if not dataframe.empty:
-            reseted_counter = {}
-            reseted_queue = dataframe.apply(lambda row:
-                                            (row.name,
-                                             get_values(row, selected_columns, reseted_counter)),
-                                            axis=1,
-                                            result_type='reduce')
+    selected_columns = list(selected_columns)
+    if is_shared_frame:
+        dataframe.assign(max_size, high_watermark, low_watermark,
+                         queue_behaviour == QueueBehaviour.ALL_ITEMS, selected_columns)
+        reseted_queue = dataframe.queue
+        # The items are counted in the shared memory
+        reseted_counter = dataframe.counter
+    elif dataframe is None or dataframe.empty:
+        reseted_queue = []
+        reseted_counter = InternedCounter()
+    else:
+        # The initial items of a FrameBackend object are created from its materialized rows
+        initial_dataframe = dataframe.to_dataframe() if is_backend else dataframe
+        if queue_storage == QueueStorage.COLUMNAR:
+            reseted_queue = ColumnarQueue.from_dataframe(initial_dataframe, selected_columns)
         else:
-            reseted_counter = {}
-            reseted_queue = []
+            reseted_queue = __create_queue_items(initial_dataframe, selected_columns)
+        reseted_counter = InternedCounter.from_labels(initial_dataframe.index.tolist(),
+                                                      selected_columns)
+    if queue_storage == QueueStorage.COLUMNAR and not isinstance(reseted_queue, ColumnarQueue):
+        reseted_queue = ColumnarQueue(reseted_queue)
+    elif queue_storage == QueueStorage.SHARDED:
+        # The items are counted in the shards
+        reseted_queue = ShardedQueue(reseted_queue, shards_nb)
+        reseted_counter = reseted_queue.counter
+    if ttl is None:
+        expiry = None
     else:
-        reseted_counter = {}
-        reseted_queue = []
+        # The initial items are timestamped at the assignment
+        expiry = QueueExpiry(ttl)
+        expiry.add(len(reseted_queue))
+
+    __set_queue(real_queue_name, {QueueHandlerItem.QUEUE: reseted_queue,
+                                  QueueHandlerItem.COUNTER: reseted_counter,
+                                  QueueHandlerItem.DATAFRAME: dataframe,
+                                  QueueHandlerItem.MAX_SIZE: max_size,
+                                  QueueHandlerItem.BEHAVIOUR: queue_behaviour,
+                                  QueueHandlerItem.EVICTION_POLICY: eviction_policy,
+                                  QueueHandlerItem.QUEUE_LIMIT: queue_limit,
+                                  QueueHandlerItem.MEMORY_BUDGET: memory_budget,
+                                  QueueHandlerItem.EXPIRY: expiry,
+                                  QueueHandlerItem.WAL: wal},
+                eviction_worker, max_size if max_overflow is None else max_overflow,
+                ttl_sweep_interval)
+
+
+def attach_dataframe(frame: SharedFrame, queue_name: Union[str, None] = None,
+                     managing_period_calls: Union[int, None] = None,
+                     managing_period_ms: Union[float, None] = None) -> NoReturn:
+    """
+        Assign a SharedFrame object to a QueueHandler's queue without resetting its shared queue.
 
-    handler[real_queue_name] = {QueueHandlerItem.QUEUE: reseted_queue,
-                                QueueHandlerItem.COUNTER: reseted_counter,
-                                QueueHandlerItem.DATAFRAME: dataframe,
-                                QueueHandlerItem.MAX_SIZE: max_size,
-                                QueueHandlerItem.BEHAVIOUR: queue_behaviour}
-    # noinspection PyProtectedMember
-    QueuesHandler._QueuesHandler__instance.assign_lock(queue_name, dataframe)
-    if __debug__:
-        logging.debug(
-            __create_logging_message("New dataframe assigned to the queue '{}'\n"
-                                     "Size of the queue : {}\n"
-                                     "Size of the assigned dataframe : {}\n"
-                                     "Max size of the assigned dataframe : {}".
-                                     format(real_queue_name,
-                                            len(reseted_queue),
-                                            len(dataframe) if dataframe is not None else None,
-                                            max_size)))
+        The SharedFrame object is assigned in one process (see 'assign_dataframe') then attached in
+        the other processes (it must be passed to the processes when they are created). The max
+        size, the watermarks, the behaviour and the columns of the queue's items are the ones of
+        the assignment.
+
+        :param frame: Assigned SharedFrame object
+        :type frame: SharedFrame
+
+        :param queue_name: Name of the selected queue
+        :type queue_name: Union[str, None]
+
+        :param managing_period_calls: The managing process is only run every N calls of the
+        managing functions in this process (every call by default)
+        :type managing_period_calls: Union[int, None]
+
+        :param managing_period_ms: The managing process is only run every T milliseconds during
+        the calls of the managing functions in this process (every call by default)
+        :type managing_period_ms: Union[float, None]
+    """
+
+    assert isinstance(frame, SharedFrame), "Frame is not a SharedFrame object"
+
+    handler = QueuesHandler()
+    real_queue_name = handler.default_queue_name if queue_name is None else queue_name
+    __set_queue(real_queue_name, {
+        QueueHandlerItem.QUEUE: frame.queue,
+        QueueHandlerItem.COUNTER: frame.counter,
+        QueueHandlerItem.DATAFRAME: frame,
+        QueueHandlerItem.MAX_SIZE: frame.max_size,
+        QueueHandlerItem.BEHAVIOUR: QueueBehaviour.ALL_ITEMS if frame.is_all_items
+        else QueueBehaviour.LAST_ITEM,
+        QueueHandlerItem.EVICTION_POLICY: EvictionPolicy(frame.high_watermark,
+                                                         frame.low_watermark,
+                                                         period_calls=managing_period_calls,
+                                                         period_ms=managing_period_ms)})
+
+
+def save_queue(queue_name: Union[str, None], path: str, save_dataframe: bool = True) -> NoReturn:
+    """
+        Save the state of a queue in a directory : queue's items in their order, counters,
+        behaviour, sizes, parameters of 'assign_dataframe' and the assigned dataframe (optional).
+
+        The queue's items, the counters and the dataframe's columns are saved as numpy arrays in
+        .npy files (see 'load_queue'). The functions modifying the assigned dataframe must not
+        run at the same time (see 'synchronized').
+
+        The new snapshot replaces the previous snapshot of the directory once it is written and
+        synced (see QueueSnapshot): a queue loaded from the previous snapshot may be saved in the
+        same directory. The write-ahead log of the queue is reset after the replacement: it
+        contains the mutations since the last snapshot (see 'replay').
+
+        :param queue_name: Name of the selected queue (None : default queue)
+        :type queue_name: Union[str, None]
+
+        :param path: Directory of the snapshots (created if it doesn't exist)
+        :type path: str
+
+        :param save_dataframe: Save the assigned dataframe (the rows of a FrameBackend object
+        are loaded as a DataFrame object)
+        :type save_dataframe: bool
+    """
+
+    handler = QueuesHandler()
+    state = handler.get_state(queue_name)
+    assert not isinstance(state.dataframe, SharedFrame), \
+        "The queue '{}' of a SharedFrame object can't be saved".format(state.name)
+
+    eviction_policy = state.eviction_policy
+    worker = state.eviction_worker
+    queue_limit = state.queue_limit
+    snapshot = QueueSnapshot()
+    snapshot.metadata.update({
+        'queue_name': state.name,
+        'is_default_queue': state.name == handler.default_queue_name,
+        'behaviour': state.behaviour.name,
+        'queue_storage': QueueStorage.COLUMNAR.name if isinstance(state.queue, ColumnarQueue)
+        else QueueStorage.SHARDED.name if isinstance(state.queue, ShardedQueue)
+        else QueueStorage.DEQUE.name,
+        'shards_nb': state.queue.shards_nb if isinstance(state.queue, ShardedQueue) else None,
+        'max_size': state.max_size,
+        'high_watermark': eviction_policy.high_watermark,
+        'low_watermark': eviction_policy.low_watermark,
+        'managing_period_calls': eviction_policy.period_calls,
+        'managing_period_ms': eviction_policy.period_ms,
+        'eviction_worker': worker is not None,
+        'max_overflow': None if worker is None else worker.max_overflow,
+        'ttl_sweep_interval': None if worker is None else worker.period,
+        'max_queue_length': None if queue_limit is None else queue_limit.max_length,
+        'queue_full_policy': None if queue_limit is None else queue_limit.policy.name,
+        'queue_full_timeout': None if queue_limit is None else queue_limit.timeout,
+        'max_bytes': None if state.memory_budget is None else state.memory_budget.max_bytes})
+    # Items may be added by shared calls at the same time (see 'synchronized')
+    with state.append_lock:
+        snapshot.add_queue(state.queue)
+        if isinstance(state.queue, FrequencyQueue):
+            snapshot.add_frequencies(state.queue)
+        snapshot.add_counter(state.counter)
+        if state.expiry is not None:
+            snapshot.add_expiry(state.expiry)
+        if save_dataframe and state.dataframe is not None:
+            # The rows of a FrameBackend object are saved as a DataFrame object
+            snapshot.add_dataframe(get_backend(state.dataframe).to_dataframe())
+        wal = state.wal
+        if wal is not None:
+            # Records of older generations are included in the snapshot
+            snapshot.metadata['wal_generation'] = wal.generation + 1
+        snapshot.save(path)
+        # The log is only reset when the new snapshot is current
+        if wal is not None:
+            wal.reset()
+
+
+def load_queue(path: str, queue_name: Union[str, None] = None,
+               dataframe: Union[DataFrame, FrameBackend, None] = None,
+               mmap: bool = True) -> Union[DataFrame, FrameBackend]:
+    """
+        Restore a queue saved by 'save_queue' (warm restart) : unlike 'assign_dataframe', the
+        queue's items keep their order and their counters.
+
+        The numeric and boolean arrays are memory-mapped (copy on write) : the queue and the
+        counters are restored without rebuilding the items row by row. The queue's items of the
+        removed rows are ignored by the managing process. The ages of the items with a
+        time-to-live are restored. Only trusted snapshots must be loaded (object arrays and
+        parameters are pickled). The write-ahead log of the queue is closed (see 'replay').
+
+        :param path: Directory of the snapshots (current snapshot loaded)
+        :type path: str
+
+        :param queue_name: Name of the restored queue (name of the saved queue by default)
+        :type queue_name: Union[str, None]
+
+        :param dataframe: Assigned dataframe (saved dataframe by default)
+        :type dataframe: Union[DataFrame, FrameBackend, None]
+
+        :param mmap: Memory-map the arrays of the snapshot
+        :type mmap: bool
+
+        :return: Assigned dataframe
+        :rtype: Union[DataFrame, FrameBackend]
+    """
+
+    return __restore_queue(QueueSnapshot.load(path, mmap), queue_name, dataframe).dataframe
+
+
+def __restore_queue(snapshot: QueueSnapshot, queue_name: Union[str, None],
+                    dataframe: Union[DataFrame, FrameBackend, None]) -> QueueState:
+    """
+        Replace the state of a queue by the state of a snapshot (see 'load_queue').
+
+        :return: Restored state of the queue
+        :rtype: QueueState
+    """
+
+    metadata = snapshot.metadata
+    handler = QueuesHandler()
+    if queue_name is None:
+        queue_name = handler.default_queue_name if metadata['is_default_queue'] \
+            else metadata['queue_name']
+    if dataframe is None and snapshot.has_dataframe():
+        dataframe = snapshot.get_dataframe()
+
+    behaviour = QueueBehaviour[metadata['behaviour']]
+    queue = snapshot.get_queue()
+    if behaviour == QueueBehaviour.LFU:
+        queue = FrequencyQueue.from_frequencies(queue, snapshot.get_frequencies())
+    elif behaviour == QueueBehaviour.LRU:
+        queue = RecencyQueue(queue)
+    elif QueueStorage[metadata['queue_storage']] == QueueStorage.DEQUE:
+        queue = deque(queue)
+    elif QueueStorage[metadata['queue_storage']] == QueueStorage.SHARDED:
+        queue = ShardedQueue(queue, metadata['shards_nb'])
+    queue_limit = None if metadata['max_queue_length'] is None else QueueLimit(
+        metadata['max_queue_length'], QueueFullPolicy[metadata['queue_full_policy']],
+        metadata['queue_full_timeout'])
+    memory_budget = None if metadata['max_bytes'] is None else MemoryBudget(metadata['max_bytes'])
+    assert not isinstance(dataframe, FrameBackend) or memory_budget is None, \
+        "The queue of a FrameBackend object doesn't support a byte budget"
+    if memory_budget is not None and dataframe is not None:
+        memory_budget.reset(dataframe)
+
+    __set_queue(queue_name, {
+        QueueHandlerItem.QUEUE: queue,
+        # The items of a sharded queue are counted in its shards
+        QueueHandlerItem.COUNTER: queue.counter if isinstance(queue, ShardedQueue)
+        else snapshot.get_counter(),
+        QueueHandlerItem.DATAFRAME: dataframe,
+        QueueHandlerItem.MAX_SIZE: metadata['max_size'],
+        QueueHandlerItem.BEHAVIOUR: behaviour,
+        QueueHandlerItem.EVICTION_POLICY: EvictionPolicy(
+            metadata['high_watermark'], metadata['low_watermark'],
+            period_calls=metadata['managing_period_calls'],
+            period_ms=metadata['managing_period_ms']),
+        QueueHandlerItem.QUEUE_LIMIT: queue_limit,
+        QueueHandlerItem.MEMORY_BUDGET: memory_budget,
+        QueueHandlerItem.EXPIRY: snapshot.get_expiry() if snapshot.has_expiry() else None},
+        metadata['eviction_worker'], metadata['max_overflow'], metadata['ttl_sweep_interval'])
+    return handler.get_state(queue_name)
+
+
+def __replay_record(state: QueueState, record_type: WalRecordType, payload: Any,
+                    timestamp: float, removed_labels: Dict[Any, None]) -> NoReturn:
+    """
+        Apply a record of a write-ahead log to the state of a queue.
+
+        :param state: State of the queue
+        :type state: QueueState
+
+        :param record_type: Type of the record
+        :type record_type: WalRecordType
+
+        :param payload: Payload of the record
+        :type payload: Any
+
+        :param timestamp: Monotonic time of the record
+        :type timestamp: float
+
+        :param removed_labels: Labels of the rows removed by the previous records (updated)
+        :type removed_labels: Dict[Any, None]
+    """
+
+    queue = state.queue
+    counter = state.counter
+    if record_type == WalRecordType.APPEND:
+        replaced_items = queue.extend(payload)
+        state.superseded_nb += counter.increment_many(payload)
+        if replaced_items:
+            for item in replaced_items:
+                counter.decrement(item[0], item[1])
+        if state.expiry is not None:
+            state.expiry.add(len(payload), timestamp)
+        for label, _ in payload:
+            removed_labels.pop(label, None)
+    elif record_type == WalRecordType.EVICTION:
+        items_nb = min(payload[0], len(queue))
+        if state.expiry is not None:
+            state.expiry.pop(items_nb)
+        for item in __popleft_items(queue, items_nb):
+            if counter.decrement(item[0], item[1]) > 1:
+                state.superseded_nb -= 1
+        removed_labels.update(dict.fromkeys(payload[1]))
+    elif record_type == WalRecordType.COMPACTION:
+        __compact_queue(state)
+    elif record_type == WalRecordType.TOUCH:
+        for label in payload:
+            queue.touch(label)
+    else:
+        raise ValueError("Record type '{}' not supported".format(record_type))
+
+
+def replay(snapshot_path: str, wal_path: str, queue_name: Union[str, None] = None,
+           dataframe: Union[DataFrame, FrameBackend, None] = None, wal_sync_ms: float = 10,
+           wal_sync_bytes: int = 1 << 20) -> Union[DataFrame, FrameBackend]:
+    """
+        Restore a queue from its last snapshot (see 'load_queue') and the records of its
+        write-ahead log (see 'assign_dataframe'), then keep logging its mutations in the log.
+
+        The records apply the logged appends, evictions, compactions and reads to the queue and
+        its counters. The rows removed by the logged evictions and not added again are removed
+        from the assigned dataframe (the rows added since the snapshot are not logged). The
+        records older than the snapshot are ignored and the log must not be newer than the
+        snapshot.
+
+        :param snapshot_path: Directory of the snapshot
+        :type snapshot_path: str
+
+        :param wal_path: Path of the write-ahead log
+        :type wal_path: str
+
+        :param queue_name: Name of the restored queue (name of the saved queue by default)
+        :type queue_name: Union[str, None]
+
+        :param dataframe: Assigned dataframe (saved dataframe by default)
+        :type dataframe: Union[DataFrame, FrameBackend, None]
+
+        :param wal_sync_ms: Max age in milliseconds of the records of the log which are not synced
+        :type wal_sync_ms: float
+
+        :param wal_sync_bytes: Max size in bytes of the records of the log which are not synced
+        :type wal_sync_bytes: int
+
+        :return: Assigned dataframe
+        :rtype: Union[DataFrame, FrameBackend]
+    """
+
+    snapshot = QueueSnapshot.load(snapshot_path)
+    state = __restore_queue(snapshot, queue_name, dataframe)
+    wal = WriteAheadLog(wal_path, wal_sync_ms, wal_sync_bytes)
+    with state.lock:
+        snapshot_generation = snapshot.metadata.get('wal_generation', 0)
+        if wal.generation > snapshot_generation:
+            wal.close()
+            raise AssertionError("The write-ahead log '{}' is newer than the snapshot '{}'"
+                                 .format(wal_path, snapshot_path))
+        if wal.generation == snapshot_generation:
+            # Wall-clock times of the records -> monotonic times
+            clock_offset = monotonic() - time()
+            removed_labels = dict()
+            for record_type, timestamp, payload in wal.read_records():
+                __replay_record(state, record_type, payload, timestamp + clock_offset,
+                                removed_labels)
+            if removed_labels and state.dataframe is not None:
+                # The removed labels missing in the dataframe are ignored
+                backend = get_backend(state.dataframe)
+                backend.drop_labels(backend.select_labels(list(removed_labels)))
+        else:
+            # The snapshot was saved before the reset of the log
+            while wal.generation < snapshot_generation:
+                wal.reset()
+        if state.memory_budget is not None and state.dataframe is not None:
+            state.memory_budget.reset(state.dataframe)
+        state.wal = wal
+    return state.dataframe
+
+
+def sync_wal(queue_name: Union[str, None] = None) -> NoReturn:
+    """
+        Sync the records of the write-ahead log of a queue which are not synced yet (see
+        'wal_sync_ms' and 'wal_sync_bytes' parameters of 'assign_dataframe').
+
+        :param queue_name: Name of the selected queue
+        :type queue_name: Union[str, None]
+    """
+
+    wal = QueuesHandler().get_state(queue_name).wal
+    assert wal is not None, "The queue '{}' doesn't have a write-ahead log".format(queue_name)
+    wal.sync()
+
+
+def profile_lock(queue_name: Union[str, None] = None, enabled: bool = True) -> NoReturn:
+    """
+        Enable or disable the profiling of the Lock object of a queue (see LockProfile): the
+        acquisitions of the synchronized functions and of the eviction worker are recorded with
+        their waiting and holding times, the queue's name and the function's name.
+
+        The profile is shared by the queues with the same Lock object (see 'lock_profile' property
+        of QueueInfoProvider). A new Lock object (new assigned dataframe) isn't profiled. The Lock
+        objects of SharedFrame objects can't be profiled.
+
+        :param queue_name: Name of the selected queue
+        :type queue_name: Union[str, None]
+
+        :param enabled: Enable (new profile if the Lock object isn't profiled) or disable (the
+        profile is removed) the profiling
+        :type enabled: bool
+    """
+
+    lock = QueuesHandler().get_state(queue_name).lock
+    assert isinstance(lock, SharedExclusiveLock), \
+        "The lock of the queue '{}' can't be profiled".format(queue_name)
+    if not enabled:
+        lock.profile = None
+    elif lock.profile is None:
+        lock.profile = LockProfile()
+
+
+def wait_for_eviction(queue_name: Union[str, None] = None,
+                      timeout: Union[float, None] = None) -> bool:
+    """
+        Wait until the eviction worker of a queue has done the requested managing processes.
+
+        The queue's lock must not be held by the calling thread.
+
+        :param queue_name: Name of the selected queue
+        :type queue_name: Union[str, None]
+
+        :param timeout: Maximum waiting time in seconds (no limit by default)
+        :type timeout: Union[float, None]
+
+        :return: False if the timeout is reached (True without eviction worker)
+        :rtype: bool
+    """
+
+    worker = QueuesHandler().get_state(queue_name).eviction_worker
+    return True if worker is None else worker.wait(timeout)
+
+
+def expire_items(queue_name: Union[str, None] = None) -> int:
+    """
+        Run the managing process of a queue with a time-to-live now : the rows of the expired items
+        are removed (and the excess rows of the dataframe, see 'managing').
+
+        The search of the expired items stops at the first item which hasn't expired. The
+        functions modifying the assigned dataframe must not run at the same time (see
+        'synchronized').
+
+        :param queue_name: Name of the selected queue
+        :type queue_name: Union[str, None]
+
+        :return: Number of expired items removed from the queue
+        :rtype: int
+    """
+
+    state = QueuesHandler().get_state(queue_name)
+    assert isinstance(state.dataframe, (DataFrame, FrameBackend)), \
+        "The dataframe of the queue '{}' is not assigned".format(state.name)
+    assert state.expiry is not None, "The queue '{}' doesn't have a time-to-live".format(
+        state.name)
+    expired_nb = state.expiry.get_expired_nb()
+    if expired_nb > 0:
+        __remove_rows(state)
+    return expired_nb
+
+
+def stop_eviction_worker(queue_name: Union[str, None] = None,
+                         timeout: Union[float, None] = None) -> bool:
+    """
+        Stop the eviction worker of a queue after its current managing process. The managing
+        functions of the queue remove the rows themselves again.
+
+        :param queue_name: Name of the selected queue
+        :type queue_name: Union[str, None]
+
+        :param timeout: Maximum waiting time in seconds for the end of the worker (no limit by
+        default)
+        :type timeout: Union[float, None]
+
+        :return: False if the worker is still running (True without eviction worker)
+        :rtype: bool
+    """
+
+    handler = QueuesHandler()
+    real_queue_name = handler.default_queue_name if queue_name is None else queue_name
+    worker = handler.pop_eviction_worker(real_queue_name)
+    return True if worker is None else worker.stop(timeout)
 
 
 def list_queue_names() -> Tuple[str]:
@@ -633,6 +2426,65 @@ class QueueInfoProvider:
     def max_size(self) -> int:
         return self.__handler[self.__queue_name][QueueHandlerItem.MAX_SIZE]
 
+    @property
+    def high_watermark(self) -> int:
+        return self.__handler[self.__queue_name][QueueHandlerItem.EVICTION_POLICY].high_watermark
+
+    @property
+    def low_watermark(self) -> int:
+        return self.__handler[self.__queue_name][QueueHandlerItem.EVICTION_POLICY].low_watermark
+
+    @property
+    def max_queue_length(self) -> Union[int, None]:
+        queue_limit = self.__handler[self.__queue_name][QueueHandlerItem.QUEUE_LIMIT]
+        return None if queue_limit is None else queue_limit.max_length
+
+    @property
+    def ttl(self) -> Union[float, None]:
+        expiry = self.__handler[self.__queue_name][QueueHandlerItem.EXPIRY]
+        return None if expiry is None else expiry.ttl
+
+    @property
+    def max_bytes(self) -> Union[int, None]:
+        memory_budget = self.__handler[self.__queue_name][QueueHandlerItem.MEMORY_BUDGET]
+        return None if memory_budget is None else memory_budget.max_bytes
+
+    @property
+    def estimated_bytes(self) -> Union[int, None]:
+        """
+            Estimated memory of the assigned dataframe (None without byte budget)
+        """
+
+        memory_budget = self.__handler[self.__queue_name][QueueHandlerItem.MEMORY_BUDGET]
+        return None if memory_budget is None else memory_budget.estimated_bytes
+
+    @property
+    def stats(self) -> QueueStats:
+        """
+            Runtime statistics of the queue since its assignment or the last reset of the
+            statistics (see QueueStats)
+        """
+
+        return self.__handler.get_state(self.__queue_name).get_stats()
+
+    @property
+    def shards_nb(self) -> Union[int, None]:
+        queue = self.__handler[self.__queue_name][QueueHandlerItem.QUEUE]
+        return queue.shards_nb if isinstance(queue, ShardedQueue) else None
+
+    @property
+    def wal_path(self) -> Union[str, None]:
+        wal = self.__handler[self.__queue_name][QueueHandlerItem.WAL]
+        return None if wal is None else wal.path
+
+    @property
+    def lock_profile(self) -> Union[LockProfile, None]:
+        """
+            Profile of the queue's Lock object (None if it isn't profiled, see 'profile_lock')
+        """
+
+        return getattr(self.__handler.get_state(self.__queue_name).lock, 'profile', None)
+
     @property
     def queue(self) -> QueueWrapper:
         return QueueInfoProvider.QueueWrapper(self.__queue_name)
@@ -645,6 +2497,56 @@ class QueueInfoProvider:
         return "{} : {}".format(type(self).__name__, self.__queue_name)
 
 
+def export_stats(queue_names: Union[Iterable[str], None] = None) -> str:
+    """
+        Export the runtime statistics of queues in the Prometheus text format (see QueueStats):
+        counters ('dfqueue_<counter>_total'), latency histograms
+        ('dfqueue_<histogram>_seconds') and sizes of the queues and of the assigned dataframes
+        ('dfqueue_queue_items', 'dfqueue_dataframe_rows' and 'dfqueue_max_size'), with a 'queue'
+        label.
+
+        :param queue_names: Names of the selected queues (all the queues by default)
+        :type queue_names: Union[Iterable[str], None]
+
+        :return: Metrics of the queues
+        :rtype: str
+    """
+
+    handler = QueuesHandler()
+    queue_stats = list()
+    for queue_name in list_queue_names() if queue_names is None else queue_names:
+        state = handler.get_state(queue_name)
+        gauges = {'queue_items': len(state.queue), 'max_size': state.max_size}
+        if state.dataframe is not None:
+            gauges['dataframe_rows'] = len(state.dataframe)
+        queue_stats.append((queue_name, state.get_stats(), gauges))
+    return format_prometheus(queue_stats)
+
+
+def serve_stats(port: int = 0, address: str = '127.0.0.1',
+                queue_names: Union[Iterable[str], None] = None) -> HTTPServer:
+    """
+        Serve the runtime statistics of queues in the Prometheus text format (see 'export_stats')
+        from a background thread, on '/' and '/metrics'.
+
+        :param port: Port of the server (free port by default, see 'server_address' attribute of
+        the server)
+        :type port: int
+
+        :param address: Address of the server (local address by default)
+        :type address: str
+
+        :param queue_names: Names of the selected queues (all the queues by default)
+        :type queue_names: Union[Iterable[str], None]
+
+        :return: Running server (stopped by its 'shutdown' method)
+        :rtype: HTTPServer
+    """
+
+    queue_names = None if queue_names is None else list(queue_names)
+    return start_stats_server(lambda: export_stats(queue_names), port, address)
+
+
 def get_info_provider(queue_name: Union[str, None] = None) -> QueueInfoProvider:
     """
         Generate an information provider to a specific queue.
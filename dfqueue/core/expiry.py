@@ -0,0 +1,125 @@
+# coding: utf8
+
+from collections import deque
+from itertools import chain, compress, repeat
+from time import monotonic
+from typing import Iterable, List, NoReturn, Tuple, Union
+
+
+__all__ = ['QueueExpiry']
+
+
+class QueueExpiry:
+    """
+        Time-to-live of the queue's items.
+
+        The monotonic timestamps of the items are stored beside the queue in insertion order,
+        run-length encoded ([timestamp, items number] for each addition of items), so they are
+        popped with the items. The expired items are the first items of the queue: their search
+        stops at the first item which hasn't expired.
+    """
+
+    __slots__ = ('__ttl', '__runs', '__items_nb')
+
+    def __init__(self, ttl: float):
+        assert isinstance(ttl, (int, float)) and ttl > 0, "The time-to-live is not positive"
+
+        self.__ttl = ttl
+        # [timestamp, items number] of each addition of items
+        self.__runs = deque()
+        self.__items_nb = 0
+
+    @property
+    def ttl(self) -> float:
+        return self.__ttl
+
+    def __len__(self) -> int:
+        return self.__items_nb
+
+    def add(self, items_nb: int, timestamp: Union[float, None] = None) -> NoReturn:
+        """
+            Timestamp new items added at the end of the queue.
+
+            :param items_nb: Number of new items
+            :type items_nb: int
+
+            :param timestamp: Monotonic timestamp of the items (current time by default)
+            :type timestamp: Union[float, None]
+        """
+
+        if items_nb <= 0:
+            return
+        timestamp = monotonic() if timestamp is None else timestamp
+        runs = self.__runs
+        if runs and runs[-1][0] == timestamp:
+            runs[-1][1] += items_nb
+        else:
+            runs.append([timestamp, items_nb])
+        self.__items_nb += items_nb
+
+    def pop(self, items_nb: int) -> NoReturn:
+        """
+            Remove the timestamps of the first items of the queue.
+
+            :param items_nb: Number of removed items
+            :type items_nb: int
+        """
+
+        runs = self.__runs
+        self.__items_nb -= items_nb
+        while items_nb > 0 and runs:
+            run = runs[0]
+            if run[1] > items_nb:
+                run[1] -= items_nb
+                return
+            items_nb -= run[1]
+            runs.popleft()
+
+    def get_expired_nb(self, now: Union[float, None] = None) -> int:
+        """
+            :param now: Monotonic current time (current time by default)
+            :type now: Union[float, None]
+
+            :return: Number of expired items at the beginning of the queue
+            :rtype: int
+        """
+
+        runs = self.__runs
+        if not runs:
+            return 0
+        deadline = (monotonic() if now is None else now) - self.__ttl
+        if runs[0][0] > deadline:
+            return 0
+        expired_nb = 0
+        for timestamp, items_nb in runs:
+            if timestamp > deadline:
+                break
+            expired_nb += items_nb
+        return expired_nb
+
+    def get_runs(self) -> List[Tuple[float, int]]:
+        """
+            :return: Monotonic timestamp and number of items of each addition of items, in the
+            queue's order
+            :rtype: List[Tuple[float, int]]
+        """
+
+        return [(timestamp, items_nb) for timestamp, items_nb in self.__runs]
+
+    def filter(self, selectors: Iterable[bool]) -> NoReturn:
+        """
+            Keep the timestamps of the selected items (one selector for each item of the queue).
+
+            :param selectors: True for each kept item
+            :type selectors: Iterable[bool]
+        """
+
+        timestamps = chain.from_iterable(repeat(timestamp, items_nb)
+                                         for timestamp, items_nb in self.__runs)
+        self.__runs = deque()
+        self.__items_nb = 0
+        for timestamp in compress(timestamps, selectors):
+            self.add(1, timestamp)
+
+    def __repr__(self) -> str:
+        return "<{} ttl={} items={}>".format(type(self).__name__, self.__ttl, self.__items_nb)
@@ -0,0 +1,166 @@
+# coding: utf8
+
+import logging
+from enum import Enum
+from typing import Any, Callable, Dict, List, NoReturn, Tuple, Union
+
+
+__all__ = ['QueueEvent', 'register_hook', 'unregister_hook', 'register_logging_hooks',
+           'unregister_logging_hooks']
+
+
+class QueueEvent(Enum):
+    """
+        Events of the queues and signatures of their hooks.
+
+        ITEM_ADDED : an item is added in a queue
+        hook(queue_name, item, queue_size, dataframe_size, max_size)
+
+        BATCH_EVICTED : a batch of items is removed from a queue during the managing process
+        hook(queue_name, queue_items, removed_labels, queue_size, dataframe_size, max_size)
+
+        ITEM_IGNORED : an item removed from a queue during the managing process doesn't remove its
+        row (the item is superseded by a later item or its values are stale)
+        hook(queue_name, item)
+
+        DATAFRAME_ASSIGNED : a dataframe is assigned to a queue
+        hook(queue_name, queue_size, dataframe_size, max_size)
+    """
+
+    ITEM_ADDED = 0
+    BATCH_EVICTED = 1
+    ITEM_IGNORED = 2
+    DATAFRAME_ASSIGNED = 3
+
+
+# Registered hooks of each event (index : event's value).
+# Tuples are replaced (never modified) so they may be read without lock.
+HOOKS = [tuple() for _ in QueueEvent]
+
+ITEM_ADDED = QueueEvent.ITEM_ADDED.value
+BATCH_EVICTED = QueueEvent.BATCH_EVICTED.value
+ITEM_IGNORED = QueueEvent.ITEM_IGNORED.value
+DATAFRAME_ASSIGNED = QueueEvent.DATAFRAME_ASSIGNED.value
+
+
+def register_hook(event: QueueEvent, hook: Callable[..., Any]) -> NoReturn:
+    """
+        Register a hook called when an event occurs in any queue.
+
+        Nothing is computed for an event without hook.
+
+        :param event: Selected event
+        :type event: QueueEvent
+
+        :param hook: Called function (see QueueEvent for its signature)
+        :type hook: Callable[..., Any]
+    """
+
+    assert isinstance(event, QueueEvent), "Event is not a QueueEvent object"
+    assert callable(hook), "Hook is not callable"
+    HOOKS[event.value] = HOOKS[event.value] + (hook,)
+
+
+def unregister_hook(event: QueueEvent, hook: Callable[..., Any]) -> NoReturn:
+    """
+        Unregister a hook of an event.
+
+        :param event: Selected event
+        :type event: QueueEvent
+
+        :param hook: Registered function
+        :type hook: Callable[..., Any]
+    """
+
+    assert isinstance(event, QueueEvent), "Event is not a QueueEvent object"
+    hooks = list(HOOKS[event.value])
+    assert hook in hooks, "The hook {} is not registered for {}".format(hook, event)
+    hooks.remove(hook)
+    HOOKS[event.value] = tuple(hooks)
+
+
+def _create_logging_message(message: str) -> str:
+    """
+        Generate a logging message with a predefined format.
+
+        :param message: raw logging message
+        :type message: str
+
+        :return: formatted message
+        :rtype: str
+    """
+
+    line_decorator = '| '
+    lines = message.split('\n')
+    edge_length = max([len(line) for line in lines]) + len(line_decorator)
+    edge = ''.join(['-' for _ in range(edge_length)])
+    decorated_message = '\n' + edge + '\n'
+
+    for line in lines:
+        decorated_line = line_decorator + line
+        decorated_message += \
+            decorated_line + ''.join([' ' for _ in range(edge_length - len(decorated_line))]) + '\n'
+    decorated_message += edge
+    return decorated_message
+
+
+def log_item_added(queue_name: str, item: Tuple[Any, Dict], queue_size: int,
+                   dataframe_size: int, max_size: int) -> NoReturn:
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug(
+            _create_logging_message("New item added in the queue '{}' : {}\n"
+                                    "Size of the queue : {}\n"
+                                    "Size of the assigned dataframe : {}\n"
+                                    "Max size of the assigned dataframe : {}".
+                                    format(queue_name, item, queue_size, dataframe_size,
+                                           max_size)))
+
+
+def log_batch_evicted(queue_name: str, queue_items: Dict[Any, Dict], removed_labels: List[Any],
+                      queue_size: int, dataframe_size: int, max_size: int) -> NoReturn:
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug(
+            _create_logging_message("Item removed from the queue '{}' : {}\n"
+                                    "Size of the queue : {}\n"
+                                    "Size of the assigned dataframe : {}\n"
+                                    "Max size of the assigned dataframe : {}".
+                                    format(queue_name,
+                                           "\n".join([str((label, values)) for label, values
+                                                      in queue_items.items()]),
+                                           queue_size, dataframe_size, max_size)))
+
+
+def log_dataframe_assigned(queue_name: str, queue_size: int, dataframe_size: Union[int, None],
+                           max_size: int) -> NoReturn:
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug(
+            _create_logging_message("New dataframe assigned to the queue '{}'\n"
+                                    "Size of the queue : {}\n"
+                                    "Size of the assigned dataframe : {}\n"
+                                    "Max size of the assigned dataframe : {}".
+                                    format(queue_name, queue_size, dataframe_size, max_size)))
+
+
+LOGGING_HOOKS = {QueueEvent.ITEM_ADDED: log_item_added,
+                 QueueEvent.BATCH_EVICTED: log_batch_evicted,
+                 QueueEvent.DATAFRAME_ASSIGNED: log_dataframe_assigned}
+
+
+def register_logging_hooks() -> NoReturn:
+    """
+        Log the queues's events at DEBUG level (logging output of the first versions).
+    """
+
+    for event, hook in LOGGING_HOOKS.items():
+        if hook not in HOOKS[event.value]:
+            register_hook(event, hook)
+
+
+def unregister_logging_hooks() -> NoReturn:
+    """
+        Stop the logging of the queues's events.
+    """
+
+    for event, hook in LOGGING_HOOKS.items():
+        if hook in HOOKS[event.value]:
+            unregister_hook(event, hook)
@@ -0,0 +1,279 @@
+# coding: utf8
+
+from threading import Condition, Lock, get_ident
+from time import monotonic, perf_counter
+from typing import Any, Callable, Dict, List, NoReturn, Tuple
+
+
+__all__ = ['SharedExclusiveLock', 'LockProfile', 'LockHolderStats']
+
+
+class LockHolderStats:
+    """
+        Acquisitions of a lock by the same queue, holder (decorated function or eviction worker)
+        and side ('exclusive' or 'shared') with their waiting and holding times in seconds.
+    """
+
+    __slots__ = ('queue_name', 'holder', 'mode', 'acquisitions', 'wait_time', 'hold_time',
+                 'max_wait_time', 'max_hold_time')
+
+    def __init__(self, queue_name: str, holder: str, mode: str):
+        self.queue_name = queue_name
+        self.holder = holder
+        self.mode = mode
+        self.acquisitions = 0
+        self.wait_time = 0.0
+        self.hold_time = 0.0
+        self.max_wait_time = 0.0
+        self.max_hold_time = 0.0
+
+    def copy(self) -> 'LockHolderStats':
+        holder_stats = LockHolderStats(self.queue_name, self.holder, self.mode)
+        for name in self.__slots__[3:]:
+            setattr(holder_stats, name, getattr(self, name))
+        return holder_stats
+
+    def __repr__(self) -> str:
+        return "{}(queue_name={!r}, holder={!r}, mode={!r}, acquisitions={}, wait_time={:.6f}, " \
+               "hold_time={:.6f})".format(type(self).__name__, self.queue_name, self.holder,
+                                          self.mode, self.acquisitions, self.wait_time,
+                                          self.hold_time)
+
+
+class LockProfile:
+    """
+        Waiting and holding times of the acquisitions of a lock for each queue, holder and side of
+        the lock (see LockHolderStats).
+    """
+
+    __slots__ = ('__lock', '__holders')
+
+    def __init__(self):
+        self.__lock = Lock()
+        # (queue's name, holder, mode) -> LockHolderStats
+        self.__holders = dict()
+
+    def record(self, queue_name: str, holder: str, mode: str, wait_time: float,
+               hold_time: float) -> NoReturn:
+        """
+            Record an acquisition of the lock.
+
+            :param queue_name: Name of the queue
+            :type queue_name: str
+
+            :param holder: Name of the holder (decorated function or eviction worker)
+            :type holder: str
+
+            :param mode: Side of the lock ('exclusive' or 'shared')
+            :type mode: str
+
+            :param wait_time: Waiting time in seconds before the acquisition
+            :type wait_time: float
+
+            :param hold_time: Holding time in seconds
+            :type hold_time: float
+        """
+
+        key = (queue_name, holder, mode)
+        with self.__lock:
+            holder_stats = self.__holders.get(key)
+            if holder_stats is None:
+                holder_stats = self.__holders[key] = LockHolderStats(*key)
+            holder_stats.acquisitions += 1
+            holder_stats.wait_time += wait_time
+            holder_stats.hold_time += hold_time
+            if wait_time > holder_stats.max_wait_time:
+                holder_stats.max_wait_time = wait_time
+            if hold_time > holder_stats.max_hold_time:
+                holder_stats.max_hold_time = hold_time
+
+    def call(self, lock: Any, queue_name: str, holder: str, function: Callable, args: Tuple = (),
+             kwargs: Dict = None) -> Any:
+        """
+            Call a function holding a lock (exclusive side) and record the acquisition.
+
+            :param lock: Profiled lock
+            :type lock: Any
+
+            :return: Result of the call
+            :rtype: Any
+        """
+
+        start = perf_counter()
+        lock.acquire()
+        acquisition_time = perf_counter()
+        try:
+            return function(*args, **(kwargs or {}))
+        finally:
+            release_time = perf_counter()
+            lock.release()
+            self.record(queue_name, holder, 'exclusive', acquisition_time - start,
+                        release_time - acquisition_time)
+
+    def get_holders(self) -> List[LockHolderStats]:
+        """
+            :return: Statistics of each queue, holder and side (copies), by decreasing holding time
+            :rtype: List[LockHolderStats]
+        """
+
+        with self.__lock:
+            holders = [holder_stats.copy() for holder_stats in self.__holders.values()]
+        return sorted(holders, key=lambda holder_stats: holder_stats.hold_time, reverse=True)
+
+    @property
+    def acquisitions(self) -> int:
+        return sum(holder_stats.acquisitions for holder_stats in self.get_holders())
+
+    @property
+    def wait_time(self) -> float:
+        return sum(holder_stats.wait_time for holder_stats in self.get_holders())
+
+    @property
+    def hold_time(self) -> float:
+        return sum(holder_stats.hold_time for holder_stats in self.get_holders())
+
+    def reset(self) -> NoReturn:
+        with self.__lock:
+            self.__holders = dict()
+
+    def __repr__(self) -> str:
+        return "<{} acquisitions={} wait_time={:.6f} hold_time={:.6f}>".format(
+            type(self).__name__, self.acquisitions, self.wait_time, self.hold_time)
+
+
+class SharedExclusiveLock:
+    """
+        Lock of an assigned dataframe with a shared side and an exclusive side.
+
+        The exclusive side has the interface of a Lock object (acquire, release, locked, context
+        manager). The shared side may be held by several threads at the same time but never with
+        the exclusive side. Waiting exclusive acquisitions have priority over new shared
+        acquisitions so the managing process is not starved.
+
+        The exclusive side is a Lock object, also held by the shared acquisitions while they
+        count themselves : without shared calls, an exclusive acquisition is an acquisition of the
+        Lock object. An exclusive acquisition holds the Lock object while waiting for the release
+        of the shared side, so the new shared acquisitions wait for it.
+
+        The lock is not reentrant and may be released by another thread.
+
+        The acquisitions of the synchronized functions and of the eviction workers are recorded in
+        the 'profile' attribute when it is a LockProfile object (None by default).
+    """
+
+    __slots__ = ('__exclusive_lock', '__condition', '__shared_nb', '__owner', 'profile')
+
+    def __init__(self):
+        self.__exclusive_lock = Lock()
+        # Notified when the last shared acquisition is released
+        self.__condition = Condition(Lock())
+        self.__shared_nb = 0
+        # Identifier of the thread holding the exclusive side (None if it isn't held)
+        self.__owner = None
+        self.profile = None
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        """
+            Acquire the exclusive side.
+
+            :param blocking: Wait for the lock (see Lock.acquire)
+            :type blocking: bool
+
+            :param timeout: Maximum waiting time in seconds (-1 : no limit)
+            :type timeout: float
+
+            :return: True if the lock is acquired
+            :rtype: bool
+        """
+
+        deadline = monotonic() + timeout if blocking and timeout >= 0 else None
+        if not self.__exclusive_lock.acquire(blocking, timeout):
+            return False
+        # The shared acquisitions hold the Lock object to increase the number of shared calls
+        if self.__shared_nb == 0:
+            self.__owner = get_ident()
+            return True
+        with self.__condition:
+            if not blocking:
+                is_acquired = self.__shared_nb == 0
+            else:
+                is_acquired = self.__condition.wait_for(
+                    lambda: self.__shared_nb == 0,
+                    None if deadline is None else max(deadline - monotonic(), 0))
+        if is_acquired:
+            self.__owner = get_ident()
+        else:
+            self.__exclusive_lock.release()
+        return is_acquired
+
+    def release(self) -> NoReturn:
+        """
+            Release the exclusive side.
+        """
+
+        self.__owner = None
+        self.__exclusive_lock.release()
+
+    def acquire_shared(self, blocking: bool = True, timeout: float = -1) -> bool:
+        """
+            Acquire the shared side.
+
+            :param blocking: Wait for the lock (see Lock.acquire)
+            :type blocking: bool
+
+            :param timeout: Maximum waiting time in seconds (-1 : no limit)
+            :type timeout: float
+
+            :return: True if the lock is acquired
+            :rtype: bool
+        """
+
+        if not self.__exclusive_lock.acquire(blocking, timeout):
+            return False
+        with self.__condition:
+            self.__shared_nb += 1
+        self.__exclusive_lock.release()
+        return True
+
+    def release_shared(self) -> NoReturn:
+        """
+            Release the shared side.
+        """
+
+        with self.__condition:
+            if self.__shared_nb == 0:
+                raise RuntimeError("release unlocked lock")
+            self.__shared_nb -= 1
+            if self.__shared_nb == 0:
+                self.__condition.notify_all()
+
+    def locked(self) -> bool:
+        """
+            :return: True if the exclusive side or the shared side is held
+            :rtype: bool
+        """
+
+        return self.__exclusive_lock.locked() or self.__shared_nb > 0
+
+    def is_owned(self) -> bool:
+        """
+            :return: True if the exclusive side is held by the current thread
+            :rtype: bool
+        """
+
+        return self.__owner == get_ident()
+
+    @property
+    def shared_nb(self) -> int:
+        return self.__shared_nb
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, *args) -> NoReturn:
+        self.release()
+
+    def __repr__(self) -> str:
+        return "<{} exclusive={} shared={}>".format(
+            type(self).__name__, self.__exclusive_lock.locked() and self.__shared_nb == 0,
+            self.__shared_nb)
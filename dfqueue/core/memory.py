@@ -0,0 +1,172 @@
+# coding: utf8
+
+from sys import getsizeof
+from typing import Any, Iterable, NoReturn, Tuple
+from pandas import DataFrame
+
+
+__all__ = ['MemoryBudget']
+
+
+# Size of a reference in the arrays of the object columns
+POINTER_BYTES = 8
+
+
+def _get_dtypes(dataframe: DataFrame) -> Tuple:
+    """
+        :return: Dtypes of the columns (read from the cached columns, faster than
+        DataFrame.dtypes)
+        :rtype: Tuple
+    """
+
+    columns = dataframe.columns
+    if not columns.is_unique:
+        return tuple(dataframe.dtypes)
+    return tuple(dataframe[column].dtype for column in columns)
+
+
+class MemoryBudget:
+    """
+        Byte budget of an assigned dataframe and estimate of the dataframe's memory.
+
+        The memory of a row is estimated when its queue's item is added: the fixed size of the
+        index's label and of the non-object values plus the size of the object values (as
+        DataFrame.memory_usage(deep=True), without the hash table of the index). The dataframe's
+        estimate is the sum of the row's estimates: it is updated when rows are added or removed
+        by the queue, without scanning the dataframe. The values of the object columns and of
+        the extension columns with object values (strings, categories, ...) have a variable size.
+
+        All the rows are estimated again when the columns or their dtypes change (e.g. a numeric
+        column converted to objects by a new value).
+    """
+
+    __slots__ = ('__max_bytes', '__row_bytes', '__estimated_bytes', '__columns', '__dtypes',
+                 '__fixed_bytes', '__object_columns', '__is_object_index')
+
+    def __init__(self, max_bytes: int):
+        assert isinstance(max_bytes, int) and max_bytes > 0, \
+            "The byte budget is not a positive integer"
+
+        self.__max_bytes = max_bytes
+        # Row's label -> estimated bytes
+        self.__row_bytes = dict()
+        self.__estimated_bytes = 0
+        # Layout of the dataframe (updated when its columns or their dtypes change)
+        self.__columns = None
+        self.__dtypes = None
+        self.__fixed_bytes = 0
+        self.__object_columns = list()
+        self.__is_object_index = False
+
+    @property
+    def max_bytes(self) -> int:
+        return self.__max_bytes
+
+    @property
+    def estimated_bytes(self) -> int:
+        return self.__estimated_bytes
+
+    def is_exceeded(self) -> bool:
+        return self.__estimated_bytes > self.__max_bytes
+
+    def get_excess_rows_nb(self) -> int:
+        """
+            :return: Number of average rows above the byte budget
+            :rtype: int
+        """
+
+        excess_bytes = self.__estimated_bytes - self.__max_bytes
+        if excess_bytes <= 0 or not self.__row_bytes:
+            return 0
+        average_row_bytes = self.__estimated_bytes / len(self.__row_bytes)
+        return max(1, -int(-excess_bytes // average_row_bytes))
+
+    def __update_layout(self, dataframe: DataFrame) -> bool:
+        """
+            :return: True if the layout of the dataframe has changed
+            :rtype: bool
+        """
+
+        columns = dataframe.columns
+        dtypes = _get_dtypes(dataframe)
+        if columns is self.__columns and dtypes == self.__dtypes:
+            return False
+        self.__is_object_index = dataframe.index.dtype == object
+        self.__fixed_bytes = POINTER_BYTES if self.__is_object_index else \
+            dataframe.index.dtype.itemsize
+        self.__object_columns = list()
+        for column, dtype in zip(columns, dtypes):
+            # Object values of the object and extension columns (strings, categories, ...)
+            if getattr(dtype, 'kind', 'O') == 'O':
+                self.__object_columns.append(column)
+                self.__fixed_bytes += POINTER_BYTES
+            else:
+                self.__fixed_bytes += getattr(dtype, 'itemsize', POINTER_BYTES)
+        self.__columns = columns
+        self.__dtypes = dtypes
+        return True
+
+    def reset(self, dataframe: DataFrame) -> NoReturn:
+        """
+            Estimate the memory of all the rows of a dataframe.
+
+            :param dataframe: Assigned dataframe
+            :type dataframe: DataFrame
+        """
+
+        self.__update_layout(dataframe)
+        labels = dataframe.index.tolist()
+        if self.__is_object_index:
+            rows_bytes = [self.__fixed_bytes + getsizeof(label) for label in labels]
+        else:
+            rows_bytes = [self.__fixed_bytes] * len(labels)
+        for column in self.__object_columns:
+            for index, value in enumerate(dataframe[column].tolist()):
+                rows_bytes[index] += getsizeof(value)
+        self.__row_bytes = dict(zip(labels, rows_bytes))
+        self.__estimated_bytes = sum(self.__row_bytes.values())
+
+    def update_rows(self, dataframe: DataFrame, labels: Iterable[Any]) -> NoReturn:
+        """
+            Estimate the memory of new or modified rows (rows missing in the dataframe are
+            ignored). All the rows are estimated again if the layout of the dataframe has changed.
+
+            :param dataframe: Assigned dataframe
+            :type dataframe: DataFrame
+
+            :param labels: Labels of the rows
+            :type labels: Iterable[Any]
+        """
+
+        if self.__update_layout(dataframe):
+            self.reset(dataframe)
+            return
+        at = dataframe.at
+        row_bytes = self.__row_bytes
+        for label in labels:
+            try:
+                new_bytes = self.__fixed_bytes
+                if self.__is_object_index:
+                    new_bytes += getsizeof(label)
+                for column in self.__object_columns:
+                    new_bytes += getsizeof(at[label, column])
+            except KeyError:
+                continue
+            self.__estimated_bytes += new_bytes - row_bytes.get(label, 0)
+            row_bytes[label] = new_bytes
+
+    def remove_rows(self, labels: Iterable[Any]) -> NoReturn:
+        """
+            Remove the estimate of removed rows.
+
+            :param labels: Labels of the removed rows
+            :type labels: Iterable[Any]
+        """
+
+        row_bytes = self.__row_bytes
+        for label in labels:
+            self.__estimated_bytes -= row_bytes.pop(label, 0)
+
+    def __repr__(self) -> str:
+        return "<{} {}/{} bytes>".format(type(self).__name__, self.__estimated_bytes,
+                                         self.__max_bytes)
@@ -0,0 +1,311 @@
+# coding: utf8
+
+from typing import Any, Dict, Iterable, List, NoReturn, Sequence, Union
+# noinspection PyPackageRequirements
+import numpy
+from pandas import DataFrame, Index, Series
+from .backends import FrameBackend
+from .storage import _is_accepted
+
+
+__all__ = ['RingFrame']
+
+
+def _get_missing_value(dtype: numpy.dtype) -> Any:
+    """
+        :return: Value of the empty slots of a column (NaN, NaT, None, 0 or False)
+        :rtype: Any
+    """
+
+    if dtype.kind in 'fc':
+        return numpy.nan
+    if dtype.kind in 'mM':
+        return numpy.datetime64('NaT') if dtype.kind == 'M' else numpy.timedelta64('NaT')
+    if dtype.kind in 'iu':
+        return 0
+    if dtype.kind == 'b':
+        return False
+    return None
+
+
+def _is_storable(dtype: numpy.dtype, value: Any) -> bool:
+    """
+        Check if a value can be stored in a column of a ring frame without changing its dtype.
+
+        :param dtype: Dtype of the column
+        :type dtype: numpy.dtype
+
+        :param value: Value to store
+        :type value: Any
+
+        :return: True if the value can be stored as is
+        :rtype: bool
+    """
+
+    kind = dtype.kind
+    if kind in 'fc':
+        # No loss of precision in the width of the column
+        if isinstance(value, numpy.number):
+            return numpy.can_cast(value.dtype, dtype)
+        if isinstance(value, complex):
+            return kind == 'c' and dtype.itemsize >= 16
+        return isinstance(value, (int, float)) and dtype.itemsize >= (16 if kind == 'c' else 8)
+    if kind in 'mM':
+        try:
+            numpy.array([value], dtype='datetime64[ns]' if kind == 'M' else 'timedelta64[ns]')
+        except (TypeError, ValueError):
+            return False
+        return True
+    return _is_accepted(dtype, value)
+
+
+class RingFrame(FrameBackend):
+    """
+        Dataframe store with preallocated slots for the queues whose dataframe has a fixed max
+        size.
+
+        The rows are stored in the slots of one numpy array for each column. A dictionary maps the
+        labels to the slots and a stack keeps the free slots: a new row takes a free slot and a
+        removed row gives its slot back, without reallocation of the columns (the managing process
+        removes k rows in O(k)). The columns are reallocated when a value doesn't fit the dtype of
+        its column (object column) or when all the slots are used (the capacity is doubled).
+
+        The functions adding rows write them with 'set_row' or 'set_value' and the rows are read
+        with 'get_row' and 'get_value'. 'to_dataframe' materializes the rows as a DataFrame
+        object. The positions of the rows (see FrameBackend) are their slots.
+    """
+
+    def __init__(self, columns: Sequence[Any], capacity: int,
+                 dtypes: Union[Dict[Any, Any], None] = None):
+        """
+            :param columns: Names of the columns
+            :type columns: Sequence[Any]
+
+            :param capacity: Number of preallocated slots
+            :type capacity: int
+
+            :param dtypes: Dtype of each column (float64 by default)
+            :type dtypes: Union[Dict[Any, Any], None]
+        """
+
+        columns = columns if isinstance(columns, Index) else Index(list(columns),
+                                                                   tupleize_cols=False)
+        dtypes = dict() if dtypes is None else dtypes
+        assert len(columns) > 0 and columns.is_unique, "The columns are empty or not unique"
+        assert isinstance(capacity, int) and capacity > 0, "Capacity is not a positive integer"
+        assert all(column in columns for column in dtypes), "Dtypes of unknown columns"
+
+        self.__columns = columns
+        self.__column_positions = {column: position for position, column in enumerate(columns)}
+        self.__arrays = list()
+        for column in columns:
+            dtype = numpy.dtype(dtypes.get(column, numpy.float64))
+            self.__arrays.append(numpy.full(capacity, _get_missing_value(dtype), dtype=dtype))
+        # Label of each used slot
+        self.__slot_labels = numpy.full(capacity, None, dtype=object)
+        self.__is_used = numpy.zeros(capacity, dtype=bool)
+        self.__slots = dict()
+        # The first slots are used first
+        self.__free_slots = list(range(capacity - 1, -1, -1))
+
+    @staticmethod
+    def from_dataframe(dataframe: DataFrame, capacity: Union[int, None] = None) -> 'RingFrame':
+        """
+            Copy the rows of a dataframe in a new ring frame with the same columns and dtypes
+            (the columns without numpy dtype are stored as objects).
+
+            :param dataframe: Copied dataframe (unique labels)
+            :type dataframe: DataFrame
+
+            :param capacity: Number of preallocated slots (number of rows by default)
+            :type capacity: Union[int, None]
+
+            :return: New ring frame
+            :rtype: RingFrame
+        """
+
+        assert dataframe.index.is_unique, "The labels of the dataframe are not unique"
+        capacity = max(len(dataframe), 1) if capacity is None else capacity
+        assert capacity >= len(dataframe), \
+            "The capacity {} is lower than the number of rows {}".format(capacity, len(dataframe))
+        dtypes = {column: dtype if isinstance(dtype, numpy.dtype) else numpy.dtype(object)
+                  for column, dtype in dataframe.dtypes.items()}
+        frame = RingFrame(dataframe.columns, capacity, dtypes)
+        rows_nb = len(dataframe)
+        for position, array in enumerate(frame.__arrays):
+            column = dataframe.iloc[:, position]
+            array[:rows_nb] = column.values if array.dtype.kind != 'O' else \
+                column.astype(object).values
+        labels = dataframe.index.tolist()
+        slot_labels = frame.__slot_labels
+        for slot, label in enumerate(labels):
+            # Tuples are not unpacked
+            slot_labels[slot] = label
+        frame.__is_used[:rows_nb] = True
+        frame.__slots = dict(zip(labels, range(rows_nb)))
+        del frame.__free_slots[len(frame.__free_slots) - rows_nb:]
+        return frame
+
+    @property
+    def columns(self) -> Index:
+        return self.__columns
+
+    @property
+    def dtypes(self) -> Series:
+        return Series([array.dtype for array in self.__arrays], index=self.__columns)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.__is_used)
+
+    @property
+    def empty(self) -> bool:
+        return not self.__slots
+
+    def reserve(self, capacity: int) -> NoReturn:
+        """
+            Preallocate slots (no effect if the capacity is already greater).
+
+            :param capacity: Min number of slots
+            :type capacity: int
+        """
+
+        previous_capacity = len(self.__is_used)
+        if capacity <= previous_capacity:
+            return
+        for position, array in enumerate(self.__arrays):
+            new_array = numpy.full(capacity, _get_missing_value(array.dtype), dtype=array.dtype)
+            new_array[:previous_capacity] = array
+            self.__arrays[position] = new_array
+        slot_labels = numpy.full(capacity, None, dtype=object)
+        slot_labels[:previous_capacity] = self.__slot_labels
+        self.__slot_labels = slot_labels
+        is_used = numpy.zeros(capacity, dtype=bool)
+        is_used[:previous_capacity] = self.__is_used
+        self.__is_used = is_used
+        self.__free_slots[:0] = range(capacity - 1, previous_capacity - 1, -1)
+
+    # Rows
+
+    def __get_slot(self, label: Any) -> int:
+        slot = self.__slots.get(label)
+        if slot is None:
+            if not self.__free_slots:
+                self.reserve(2 * len(self.__is_used))
+            slot = self.__free_slots.pop()
+            self.__slots[label] = slot
+            self.__slot_labels[slot] = label
+            self.__is_used[slot] = True
+            for array in self.__arrays:
+                array[slot] = _get_missing_value(array.dtype)
+        return slot
+
+    def __set(self, slot: int, position: int, value: Any) -> NoReturn:
+        array = self.__arrays[position]
+        if array.dtype.kind != 'O' and not _is_storable(array.dtype, value):
+            array = self.__arrays[position] = array.astype(object)
+        array[slot] = value
+
+    def set_row(self, label: Any, values: Dict[Any, Any]) -> NoReturn:
+        """
+            Add or modify a row (the missing values of a new row are NaN, NaT, None, 0 or False
+            according to the dtypes of the columns).
+
+            :param label: Row's label
+            :type label: Any
+
+            :param values: Column -> value
+            :type values: Dict[Any, Any]
+        """
+
+        positions = [(self.__column_positions[column], value) for column, value in values.items()]
+        slot = self.__get_slot(label)
+        for position, value in positions:
+            self.__set(slot, position, value)
+
+    def set_value(self, label: Any, column: Any, value: Any) -> NoReturn:
+        """
+            Modify a value (see DataFrame.at), the row is added if it doesn't exist.
+
+            :param label: Row's label
+            :type label: Any
+
+            :param column: Column of the value
+            :type column: Any
+
+            :param value: New value
+            :type value: Any
+        """
+
+        position = self.__column_positions[column]
+        self.__set(self.__get_slot(label), position, value)
+
+    def get_row(self, label: Any) -> Dict[Any, Any]:
+        slot = self.__slots[label]
+        return {column: array[slot] for column, array in zip(self.__columns, self.__arrays)}
+
+    def get_value(self, label: Any, column: Any) -> Any:
+        return self.__arrays[self.__column_positions[column]][self.__slots[label]]
+
+    def remove_row(self, label: Any) -> NoReturn:
+        slot = self.__slots.pop(label)
+        self.__slot_labels[slot] = None
+        self.__is_used[slot] = False
+        self.__free_slots.append(slot)
+
+    def drop_labels(self, labels: Iterable[Any]) -> NoReturn:
+        """
+            Remove rows (their slots are free for the next rows).
+
+            :param labels: Labels of the removed rows
+            :type labels: Iterable[Any]
+        """
+
+        for label in labels:
+            self.remove_row(label)
+
+    def get_positions(self, labels: List[Any]) -> numpy.ndarray:
+        slots = self.__slots
+        return numpy.fromiter((slots.get(label, -1) for label in labels), dtype=numpy.int64,
+                              count=len(labels))
+
+    def select_labels(self, labels: List[Any]) -> List[Any]:
+        # The dictionary of the slots is enough (no order of the removed rows)
+        slots = self.__slots
+        return [label for label in labels if label in slots]
+
+    def get_values(self, column: Any, positions: numpy.ndarray) -> numpy.ndarray:
+        values = self.__arrays[self.__column_positions[column]][positions]
+        # Timestamps and timedeltas are compared with the values of the items
+        return Series(values).astype(object).values if values.dtype.kind in 'mM' else values
+
+    def __contains__(self, label: Any) -> bool:
+        return label in self.__slots
+
+    def __len__(self) -> int:
+        return len(self.__slots)
+
+    @property
+    def labels(self) -> List[Any]:
+        """
+            Labels of the rows (in the order of their additions)
+        """
+        return list(self.__slots)
+
+    def to_dataframe(self) -> DataFrame:
+        """
+            :return: Copy of the rows (in the order of their slots)
+            :rtype: DataFrame
+        """
+
+        slots = numpy.flatnonzero(self.__is_used)
+        dataframe = DataFrame({position: array[slots]
+                               for position, array in enumerate(self.__arrays)},
+                              index=Index(self.__slot_labels[slots].tolist()),
+                              columns=range(len(self.__arrays)))
+        dataframe.columns = self.__columns
+        return dataframe
+
+    def __repr__(self) -> str:
+        return "<{} rows={}/{} columns={}>".format(type(self).__name__, len(self),
+                                                   self.capacity, list(self.__columns))
@@ -0,0 +1,335 @@
+# coding: utf8
+
+import heapq
+from collections import deque, Counter
+from itertools import count, islice
+from threading import Lock
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+from .counters import InternedCounter
+
+
+__all__ = ['ShardedQueue', 'ShardedCounter']
+
+
+class _Shard:
+    """
+        Items of a sharded queue with the same label's hash, their sequence numbers and their
+        counts.
+    """
+
+    __slots__ = ('lock', 'items', 'sequences', 'counter', 'added_nb')
+
+    def __init__(self):
+        self.lock = Lock()
+        self.items = deque()
+        # Sequence number of each item (increasing)
+        self.sequences = deque()
+        self.counter = InternedCounter()
+        # Counted items added since the last call of 'pop_added_nb'
+        self.added_nb = 0
+
+
+class ShardedQueue:
+    """
+        Queue of (label, dictionary of checking values) items partitioned in shards by the hash
+        of their labels.
+
+        Each shard has its own lock, deque and counters (see 'counter' property): items of
+        different shards may be added by several threads at the same time. Each item gets a
+        sequence number when it is added (with the lock of its shard held) and the first items
+        are removed in the order of their sequence numbers (the heads of the shards are
+        compared), so the order of the queue is the global order of the appends (concurrent
+        appends in different shards are ordered either way).
+
+        It may be manipulated as the deque of the items (in the order of the sequence numbers):
+        - append and extend methods
+        - popleft and popleft_many methods
+        - brackets with int type
+        - len function
+        - iteration
+        - containing
+        - equality
+    """
+
+    __slots__ = ('__shards', '__sequence', '__counter')
+
+    def __init__(self, items: Iterable[Tuple[Any, Dict]] = (), shards_nb: int = 8):
+        """
+            :param items: Initial items in the queue's order (counted)
+            :type items: Iterable[Tuple[Any, Dict]]
+
+            :param shards_nb: Number of shards
+            :type shards_nb: int
+        """
+
+        assert isinstance(shards_nb, int) and shards_nb > 0, \
+            "The number of shards is not a positive integer"
+        self.__shards = tuple(_Shard() for _ in range(shards_nb))
+        # Thread-safe generator of the sequence numbers (see 'next' function)
+        self.__sequence = count()
+        self.__counter = ShardedCounter(self.__shards)
+        self.extend(items, counted=True)
+        self.pop_added_nb()
+
+    @property
+    def shards_nb(self) -> int:
+        return len(self.__shards)
+
+    @property
+    def counter(self) -> 'ShardedCounter':
+        """
+            Counters of the queue's items (one for each shard)
+        """
+        return self.__counter
+
+    def get_shard_lengths(self) -> List[int]:
+        return [len(shard.items) for shard in self.__shards]
+
+    def append(self, item: Tuple[Any, Dict]) -> None:
+        shard = self.__shards[hash(item[0]) % len(self.__shards)]
+        with shard.lock:
+            shard.sequences.append(next(self.__sequence))
+            shard.items.append(item)
+
+    def extend(self, items: Iterable[Tuple[Any, Dict]], counted: bool = False) -> None:
+        """
+            Add items at the end of the queue.
+
+            :param items: New items
+            :type items: Iterable[Tuple[Any, Dict]]
+
+            :param counted: Count the items in the counters of the shards in the same pass (and
+            in the number of added items, see 'pop_added_nb')
+            :type counted: bool
+        """
+
+        shards = self.__shards
+        shards_nb = len(shards)
+        sequence = self.__sequence
+        items = list(items)
+        shard_indexes = [hash(item[0]) % shards_nb for item in items]
+        # Shard index -> (sequence numbers, items)
+        shard_items = {shard_index: (list(), list()) for shard_index in sorted(set(shard_indexes))}
+        # The sequence numbers are drawn with the locks of the shards held (acquired in the order
+        # of the shards) : the sequence numbers of each shard stay increasing with concurrent
+        # appends and the items of the call keep their order
+        locks = [shards[shard_index].lock for shard_index in shard_items]
+        for lock in locks:
+            lock.acquire()
+        try:
+            for shard_index, item in zip(shard_indexes, items):
+                sequences, items_of_shard = shard_items[shard_index]
+                sequences.append(next(sequence))
+                items_of_shard.append(item)
+            for shard_index, (sequences, items_of_shard) in shard_items.items():
+                shard = shards[shard_index]
+                shard.sequences.extend(sequences)
+                shard.items.extend(items_of_shard)
+                if counted:
+                    shard.counter.increment_many(items_of_shard)
+                    shard.added_nb += len(items_of_shard)
+        finally:
+            for lock in locks:
+                lock.release()
+
+    def pop_added_nb(self) -> int:
+        """
+            Collect the number of items added by the counted extensions (see 'extend'). Each shard
+            counts its items with its lock held, so the concurrent extensions don't lose any item.
+
+            :return: Number of counted items added since the last call
+            :rtype: int
+        """
+
+        added_nb = 0
+        for shard in self.__shards:
+            with shard.lock:
+                added_nb += shard.added_nb
+                shard.added_nb = 0
+        return added_nb
+
+    def popleft(self) -> Tuple[Any, Dict]:
+        items = self.popleft_many(1)
+        if not items:
+            raise IndexError("pop from an empty queue")
+        return items[0]
+
+    def popleft_many(self, items_nb: int) -> List[Tuple[Any, Dict]]:
+        """
+            Remove and return the first items of the queue (lowest sequence numbers).
+
+            :param items_nb: Number of removed items
+            :type items_nb: int
+
+            :return: Removed items
+            :rtype: List[Tuple[Any, Dict]]
+        """
+
+        shards = self.__shards
+        # Heads of the shards : (sequence number, shard index)
+        heads = [(shard.sequences[0], index) for index, shard in enumerate(shards)
+                 if shard.sequences]
+        heapq.heapify(heads)
+        items = list()
+        while len(items) < items_nb and heads:
+            _, index = heads[0]
+            shard = shards[index]
+            with shard.lock:
+                shard.sequences.popleft()
+                items.append(shard.items.popleft())
+                if shard.sequences:
+                    heapq.heapreplace(heads, (shard.sequences[0], index))
+                else:
+                    heapq.heappop(heads)
+        return items
+
+    def clear(self) -> None:
+        for shard in self.__shards:
+            with shard.lock:
+                shard.items.clear()
+                shard.sequences.clear()
+
+    def __len__(self) -> int:
+        return sum(len(shard.items) for shard in self.__shards)
+
+    def __iter__(self) -> Iterator[Tuple[Any, Dict]]:
+        snapshots = list()
+        for shard in self.__shards:
+            with shard.lock:
+                snapshots.append(list(zip(shard.sequences, shard.items)))
+        return (item for _, item in heapq.merge(*snapshots, key=lambda entry: entry[0]))
+
+    def __getitem__(self, index: int) -> Tuple[Any, Dict]:
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("queue index out of range")
+        return next(islice(self, index, None))
+
+    def __contains__(self, item: Any) -> bool:
+        if not isinstance(item, (tuple, list)) or len(item) != 2:
+            return False
+        shard = self.__shards[hash(item[0]) % len(self.__shards)]
+        with shard.lock:
+            return item in shard.items
+
+    def __eq__(self, other: Any) -> bool:
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __ne__(self, other: Any) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __repr__(self) -> str:
+        return "{}({}, shards_nb={})".format(type(self).__name__, list(self), len(self.__shards))
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+
+class ShardedCounter:
+    """
+        Counters of the items of a sharded queue: one InternedCounter object for each shard, held
+        by the lock of the shard.
+
+        The labels of the shards are disjoint: the counter may be read as one InternedCounter
+        object (see InternedCounter).
+    """
+
+    __slots__ = ('__shards',)
+
+    def __init__(self, shards: Tuple[_Shard, ...]):
+        self.__shards = shards
+
+    def __get_shard(self, label: Any) -> _Shard:
+        return self.__shards[hash(label) % len(self.__shards)]
+
+    def increment(self, label: Any, checking_values: Dict) -> int:
+        shard = self.__get_shard(label)
+        with shard.lock:
+            return shard.counter.increment(label, checking_values)
+
+    def increment_many(self, items: Iterable[Tuple[Any, Dict]]) -> int:
+        shards = self.__shards
+        shards_nb = len(shards)
+        shard_items = dict()
+        for item in items:
+            shard_items.setdefault(hash(item[0]) % shards_nb, list()).append(item)
+        superseded_nb = 0
+        for shard_index, items_of_shard in shard_items.items():
+            shard = shards[shard_index]
+            with shard.lock:
+                superseded_nb += shard.counter.increment_many(items_of_shard)
+        return superseded_nb
+
+    def decrement(self, label: Any, checking_values: Dict) -> int:
+        shard = self.__get_shard(label)
+        with shard.lock:
+            return shard.counter.decrement(label, checking_values)
+
+    def count(self, label: Any, checking_values: Dict) -> int:
+        return self.__get_shard(label).counter.count(label, checking_values)
+
+    @property
+    def schemas_nb(self) -> int:
+        return len(set(schema for schema, _ in self.to_schema_counts()))
+
+    def to_schema_counts(self) -> List[Tuple[Any, Dict[Any, int]]]:
+        """
+            :return: Checking columns and counts (label -> count) of each schema with items
+            (merged copies of the dictionaries of the shards)
+            :rtype: List[Tuple[Any, Dict[Any, int]]]
+        """
+
+        schema_counts = dict()
+        for shard in self.__shards:
+            with shard.lock:
+                for schema, counts in shard.counter.to_schema_counts():
+                    schema_counts.setdefault(schema, dict()).update(counts)
+        return list(schema_counts.items())
+
+    def __getitem__(self, label: Any) -> Counter:
+        return self.__get_shard(label).counter[label]
+
+    def __len__(self) -> int:
+        return sum(len(shard.counter) for shard in self.__shards)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.keys())
+
+    def __contains__(self, label: Any) -> bool:
+        return label in self.__get_shard(label).counter
+
+    def keys(self) -> List[Any]:
+        return [label for shard in self.__shards for label in shard.counter.keys()]
+
+    def values(self) -> List[Counter]:
+        return [label_counter for shard in self.__shards for label_counter
+                in shard.counter.values()]
+
+    def items(self) -> List[Tuple[Any, Counter]]:
+        return [item for shard in self.__shards for item in shard.counter.items()]
+
+    def to_dict(self) -> Dict[Any, Counter]:
+        return dict(self.items())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (ShardedCounter, InternedCounter)):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return InternedCounter.from_schema_counts(self.to_schema_counts()) == other
+        return NotImplemented
+
+    def __ne__(self, other: Any) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __repr__(self) -> str:
+        return "{}({})".format(type(self).__name__, self.to_dict())
+
+    def __str__(self) -> str:
+        return self.__repr__()
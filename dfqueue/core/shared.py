@@ -0,0 +1,656 @@
+# coding: utf8
+
+import ctypes
+import math
+import multiprocessing
+from collections import Counter
+from multiprocessing.context import BaseContext
+from typing import Any, Dict, Iterable, Iterator, List, NoReturn, Sequence, Tuple, Union
+# noinspection PyPackageRequirements
+import numpy
+from pandas import DataFrame
+from .counters import InternedCounter
+
+
+__all__ = ['SharedFrame', 'SharedQueueView', 'SharedCounterView']
+
+
+# Fields of the header
+ROWS_NB = 0
+FREE_NB = 1
+QUEUE_HEAD = 2
+QUEUE_LENGTH = 3
+TABLE_FILLED_NB = 4
+MAX_SIZE = 5
+HIGH_WATERMARK = 6
+LOW_WATERMARK = 7
+ALL_ITEMS = 8
+CHECKING_NB = 9
+HEADER_SIZE = 16
+
+# States of the hash table's entries
+EMPTY = 0
+USED = 1
+DELETED = 2
+
+# Load factor (used and deleted entries) of the hash table before its rebuilding
+MAX_LOAD_FACTOR = 0.75
+
+
+def _check_label(label: Any) -> NoReturn:
+    assert isinstance(label, (int, numpy.integer)), \
+        "The label {!r} of the shared frame is not an integer".format(label)
+
+
+class SharedFrame:
+    """
+        Dataframe store and queue in shared memory for the queues shared by several processes.
+
+        Rows have integer labels and float values in fixed columns. The rows, the queue's items
+        (label and checking values) and the counters are stored in one shared memory segment
+        with a fixed capacity:
+        - an open addressing hash table : label -> (row's slot, number of queue's items)
+        - the rows's slots (labels and values) and a stack of free slots
+        - a ring buffer of queue's items
+
+        With the LAST_ITEM behaviour, the superseded items (followed by an item of the same label)
+        are removed from the ring buffer when it is full, so the rows may be updated without limit
+        while the labels of the queue's items fit in the ring buffer.
+
+        Each operation holds a cross-process Lock object. The 'lock' attribute is another
+        cross-process Lock object used to synchronize the decorated functions (see
+        'synchronized').
+
+        A SharedFrame object must be passed to the worker processes when they are created
+        (Process's arguments or Pool's initializer) and attached to the queue in each process
+        (see 'attach_dataframe').
+    """
+
+    def __init__(self, columns: Sequence[Any], capacity: int,
+                 queue_capacity: Union[int, None] = None,
+                 context: Union[BaseContext, None] = None):
+        """
+            :param columns: Names of the columns
+            :type columns: Sequence[Any]
+
+            :param capacity: Max number of rows
+            :type capacity: int
+
+            :param queue_capacity: Max number of queue's items (4 times the capacity by default)
+            :type queue_capacity: Union[int, None]
+
+            :param context: Multiprocessing context of the processes sharing the frame (default
+            context by default)
+            :type context: Union[BaseContext, None]
+        """
+
+        columns = tuple(columns)
+        queue_capacity = 4 * capacity if queue_capacity is None else queue_capacity
+        assert columns and len(set(columns)) == len(columns), \
+            "The columns are empty or not unique"
+        assert isinstance(capacity, int) and capacity > 0, "Capacity is not a positive integer"
+        assert isinstance(queue_capacity, int) and queue_capacity > 0, \
+            "Queue capacity is not a positive integer"
+
+        self.__columns = columns
+        self.__capacity = capacity
+        self.__queue_capacity = queue_capacity
+        # Power of two with at least two entries for each row and each queue's item
+        self.__table_size = 1 << int(math.ceil(math.log2(2 * (capacity + queue_capacity))))
+        integers_nb, floats_nb = self.__get_sizes()
+        # The Lock objects of a context can't be used by the processes of another context
+        context = multiprocessing.get_context() if context is None else context
+        self.__buffer = context.RawArray(ctypes.c_char, 8 * (integers_nb + floats_nb))
+        self.__operation_lock = context.Lock()
+        self.lock = context.Lock()
+        self.__create_views()
+
+        table_states = self.__table_states
+        for index in range(self.__table_size):
+            table_states[index] = EMPTY
+        for slot in range(capacity):
+            # The last slots are used first
+            self.__free_slots[slot] = slot
+        self.__header[FREE_NB] = capacity
+        self.__header[HIGH_WATERMARK] = capacity
+        self.__header[LOW_WATERMARK] = capacity
+        self.__header[MAX_SIZE] = capacity
+
+    def __get_sizes(self) -> Tuple[int, int]:
+        columns_nb = len(self.__columns)
+        integers_nb = HEADER_SIZE + columns_nb + 4 * self.__table_size + 2 * self.__capacity + \
+            self.__queue_capacity
+        floats_nb = columns_nb * (self.__capacity + self.__queue_capacity)
+        return integers_nb, floats_nb
+
+    def __create_views(self) -> NoReturn:
+        columns_nb = len(self.__columns)
+        integers_nb, _ = self.__get_sizes()
+        buffer = memoryview(self.__buffer).cast('B')
+        integers = buffer[:8 * integers_nb].cast('q')
+        floats = buffer[8 * integers_nb:].cast('d')
+
+        def take(view: memoryview, start: int, size: int) -> Tuple[memoryview, int]:
+            return view[start:start + size], start + size
+
+        self.__header, offset = take(integers, 0, HEADER_SIZE)
+        self.__checking_positions, offset = take(integers, offset, columns_nb)
+        self.__table_keys, offset = take(integers, offset, self.__table_size)
+        self.__table_slots, offset = take(integers, offset, self.__table_size)
+        self.__table_counts, offset = take(integers, offset, self.__table_size)
+        self.__table_states, offset = take(integers, offset, self.__table_size)
+        self.__row_labels, offset = take(integers, offset, self.__capacity)
+        self.__free_slots, offset = take(integers, offset, self.__capacity)
+        self.__queue_labels, offset = take(integers, offset, self.__queue_capacity)
+        self.__row_values, offset = take(floats, 0, columns_nb * self.__capacity)
+        self.__queue_values, offset = take(floats, offset, columns_nb * self.__queue_capacity)
+        self.__column_positions = {column: position
+                                   for position, column in enumerate(self.__columns)}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The memoryviews are created again in each process
+        return {'columns': self.__columns, 'capacity': self.__capacity,
+                'queue_capacity': self.__queue_capacity, 'table_size': self.__table_size,
+                'buffer': self.__buffer, 'operation_lock': self.__operation_lock,
+                'lock': self.lock}
+
+    def __setstate__(self, state: Dict[str, Any]) -> NoReturn:
+        self.__columns = state['columns']
+        self.__capacity = state['capacity']
+        self.__queue_capacity = state['queue_capacity']
+        self.__table_size = state['table_size']
+        self.__buffer = state['buffer']
+        self.__operation_lock = state['operation_lock']
+        self.lock = state['lock']
+        self.__create_views()
+
+    @property
+    def columns(self) -> Tuple:
+        return self.__columns
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    @property
+    def queue_capacity(self) -> int:
+        return self.__queue_capacity
+
+    @property
+    def max_size(self) -> int:
+        return self.__header[MAX_SIZE]
+
+    @property
+    def high_watermark(self) -> int:
+        return self.__header[HIGH_WATERMARK]
+
+    @property
+    def low_watermark(self) -> int:
+        return self.__header[LOW_WATERMARK]
+
+    @property
+    def is_all_items(self) -> bool:
+        return self.__header[ALL_ITEMS] == 1
+
+    @property
+    def checking_columns(self) -> Tuple:
+        return tuple(self.__columns[self.__checking_positions[index]]
+                     for index in range(self.__header[CHECKING_NB]))
+
+    @property
+    def queue(self) -> 'SharedQueueView':
+        return SharedQueueView(self)
+
+    @property
+    def counter(self) -> 'SharedCounterView':
+        return SharedCounterView(self)
+
+    # Hash table (the operation lock must be held)
+
+    def __find(self, label: int) -> int:
+        table_keys = self.__table_keys
+        table_states = self.__table_states
+        mask = self.__table_size - 1
+        index = hash(label) & mask
+        while True:
+            entry_state = table_states[index]
+            if entry_state == EMPTY:
+                return -1
+            if entry_state == USED and table_keys[index] == label:
+                return index
+            index = (index + 1) & mask
+
+    def __insert(self, label: int) -> int:
+        index = self.__find(label)
+        if index >= 0:
+            return index
+        if self.__header[TABLE_FILLED_NB] + 1 > MAX_LOAD_FACTOR * self.__table_size:
+            self.__rebuild_table()
+        table_states = self.__table_states
+        mask = self.__table_size - 1
+        index = hash(label) & mask
+        while table_states[index] == USED:
+            index = (index + 1) & mask
+        if table_states[index] == EMPTY:
+            self.__header[TABLE_FILLED_NB] += 1
+        table_states[index] = USED
+        self.__table_keys[index] = label
+        self.__table_slots[index] = -1
+        self.__table_counts[index] = 0
+        return index
+
+    def __release(self, index: int) -> NoReturn:
+        # Entries without row and without queue's item are deleted
+        if self.__table_slots[index] < 0 and self.__table_counts[index] == 0:
+            self.__table_states[index] = DELETED
+
+    def __rebuild_table(self) -> NoReturn:
+        entries = [(self.__table_keys[index], self.__table_slots[index],
+                    self.__table_counts[index]) for index in range(self.__table_size)
+                   if self.__table_states[index] == USED]
+        for index in range(self.__table_size):
+            self.__table_states[index] = EMPTY
+        self.__header[TABLE_FILLED_NB] = 0
+        for label, slot, count in entries:
+            index = self.__insert(label)
+            self.__table_slots[index] = slot
+            self.__table_counts[index] = count
+
+    # Rows
+
+    def set_row(self, label: int, values: Dict[Any, float]) -> NoReturn:
+        """
+            Add or modify a row (the missing values of a new row are NaN).
+
+            :param label: Row's label
+            :type label: int
+
+            :param values: Column -> value
+            :type values: Dict[Any, float]
+        """
+
+        _check_label(label)
+        positions = [(self.__column_positions[column], float(value))
+                     for column, value in values.items()]
+        with self.__operation_lock:
+            index = self.__insert(label)
+            slot = self.__table_slots[index]
+            row_values = self.__row_values
+            columns_nb = len(self.__columns)
+            if slot < 0:
+                free_nb = self.__header[FREE_NB]
+                if free_nb == 0:
+                    self.__release(index)
+                    raise IndexError("The shared frame is full ({} rows)".format(
+                        self.__capacity))
+                slot = self.__free_slots[free_nb - 1]
+                self.__header[FREE_NB] = free_nb - 1
+                self.__header[ROWS_NB] += 1
+                self.__table_slots[index] = slot
+                self.__row_labels[slot] = label
+                for position in range(columns_nb):
+                    row_values[slot * columns_nb + position] = math.nan
+            for position, value in positions:
+                row_values[slot * columns_nb + position] = value
+
+    def __remove_slot(self, index: int) -> NoReturn:
+        slot = self.__table_slots[index]
+        free_nb = self.__header[FREE_NB]
+        self.__free_slots[free_nb] = slot
+        self.__header[FREE_NB] = free_nb + 1
+        self.__header[ROWS_NB] -= 1
+        self.__table_slots[index] = -1
+
+    def remove_row(self, label: int) -> NoReturn:
+        with self.__operation_lock:
+            index = self.__find(label)
+            if index < 0 or self.__table_slots[index] < 0:
+                raise KeyError(label)
+            self.__remove_slot(index)
+            self.__release(index)
+
+    def get_row(self, label: int) -> Dict[Any, float]:
+        with self.__operation_lock:
+            index = self.__find(label)
+            slot = -1 if index < 0 else self.__table_slots[index]
+            if slot < 0:
+                raise KeyError(label)
+            columns_nb = len(self.__columns)
+            return {column: self.__row_values[slot * columns_nb + position]
+                    for position, column in enumerate(self.__columns)}
+
+    def __contains__(self, label: Any) -> bool:
+        with self.__operation_lock:
+            index = self.__find(label)
+            return index >= 0 and self.__table_slots[index] >= 0
+
+    def __len__(self) -> int:
+        return self.__header[ROWS_NB]
+
+    def to_dataframe(self) -> DataFrame:
+        """
+            :return: Copy of the rows (in the order of their slots)
+            :rtype: DataFrame
+        """
+
+        with self.__operation_lock:
+            table_states = numpy.frombuffer(self.__table_states, dtype=numpy.int64)
+            table_slots = numpy.frombuffer(self.__table_slots, dtype=numpy.int64)
+            slots = numpy.sort(table_slots[(table_states == USED) & (table_slots >= 0)])
+            labels = numpy.frombuffer(self.__row_labels, dtype=numpy.int64)[slots]
+            values = numpy.frombuffer(self.__row_values, dtype=numpy.float64).reshape(
+                (self.__capacity, len(self.__columns)))[slots]
+        return DataFrame(values, index=labels, columns=list(self.__columns))
+
+    # Queue
+
+    def assign(self, max_size: int, high_watermark: int, low_watermark: int, all_items: bool,
+               checking_columns: Iterable[Any]) -> NoReturn:
+        """
+            Reset the queue : one item for each row with the checking values of the row.
+
+            :param max_size: Max size of the rows for the managing
+            :type max_size: int
+
+            :param high_watermark: Number of rows above which the managing process removes rows
+            :type high_watermark: int
+
+            :param low_watermark: Number of rows at the end of the managing process
+            :type low_watermark: int
+
+            :param all_items: ALL_ITEMS behaviour (LAST_ITEM behaviour otherwise)
+            :type all_items: bool
+
+            :param checking_columns: Columns of the queue's items
+            :type checking_columns: Iterable[Any]
+        """
+
+        checking_positions = [self.__column_positions[column] for column in checking_columns]
+        header = self.__header
+        with self.__operation_lock:
+            header[MAX_SIZE] = max_size
+            header[HIGH_WATERMARK] = high_watermark
+            header[LOW_WATERMARK] = low_watermark
+            header[ALL_ITEMS] = int(all_items)
+            header[CHECKING_NB] = len(checking_positions)
+            for index, position in enumerate(checking_positions):
+                self.__checking_positions[index] = position
+            header[QUEUE_HEAD] = 0
+            header[QUEUE_LENGTH] = 0
+            assert header[ROWS_NB] <= self.__queue_capacity, "The shared queue is full"
+
+            columns_nb = len(self.__columns)
+            for index in range(self.__table_size):
+                if self.__table_states[index] != USED:
+                    continue
+                slot = self.__table_slots[index]
+                self.__table_counts[index] = 0
+                if slot < 0:
+                    self.__release(index)
+                    continue
+                self.__push(self.__table_keys[index],
+                            [self.__row_values[slot * columns_nb + position]
+                             for position in checking_positions])
+                self.__table_counts[index] = 1
+
+    def __compact_queue(self) -> int:
+        """
+            Remove the superseded items of the queue with the LAST_ITEM behaviour (the managing
+            process ignores them) and uncount them (the operation lock must be held).
+
+            :return: Number of removed items
+            :rtype: int
+        """
+
+        header = self.__header
+        if header[ALL_ITEMS] == 1:
+            return 0
+        queue_capacity = self.__queue_capacity
+        queue_labels = self.__queue_labels
+        head = header[QUEUE_HEAD]
+        length = header[QUEUE_LENGTH]
+        # Positions of the last item of each label
+        last_positions = dict()
+        for offset in range(length):
+            position = (head + offset) % queue_capacity
+            last_positions[queue_labels[position]] = position
+        if len(last_positions) == length:
+            return 0
+
+        columns_nb = len(self.__columns)
+        checking_nb = header[CHECKING_NB]
+        queue_values = self.__queue_values
+        kept_items = list()
+        for offset in range(length):
+            position = (head + offset) % queue_capacity
+            label = queue_labels[position]
+            if last_positions[label] == position:
+                kept_items.append((label, [queue_values[position * columns_nb + index]
+                                           for index in range(checking_nb)]))
+            else:
+                self.__table_counts[self.__find(label)] -= 1
+        header[QUEUE_HEAD] = 0
+        header[QUEUE_LENGTH] = 0
+        for label, checking_values in kept_items:
+            self.__push(label, checking_values)
+        return length - len(kept_items)
+
+    def __push(self, label: int, checking_values: List[float]) -> NoReturn:
+        header = self.__header
+        length = header[QUEUE_LENGTH]
+        if length == self.__queue_capacity:
+            if self.__compact_queue() == 0:
+                raise IndexError("The shared queue is full ({} items)".format(length))
+            length = header[QUEUE_LENGTH]
+        position = (header[QUEUE_HEAD] + length) % self.__queue_capacity
+        self.__queue_labels[position] = label
+        columns_nb = len(self.__columns)
+        queue_values = self.__queue_values
+        for index, value in enumerate(checking_values):
+            queue_values[position * columns_nb + index] = value
+        header[QUEUE_LENGTH] = length + 1
+
+    def append_items(self, items: Iterable[Tuple[int, Dict[Any, float]]]) -> NoReturn:
+        """
+            Add new items at the end of the queue and count them.
+
+            :param items: New queue's items (label, checking values)
+            :type items: Iterable[Tuple[int, Dict[Any, float]]]
+        """
+
+        checking_columns = self.checking_columns
+        items = [(label, [float(values[column]) for column in checking_columns])
+                 for label, values in items]
+        for label, _ in items:
+            _check_label(label)
+        with self.__operation_lock:
+            for label, checking_values in items:
+                index = self.__insert(label)
+                try:
+                    self.__push(label, checking_values)
+                except IndexError:
+                    self.__release(index)
+                    raise
+                self.__table_counts[index] += 1
+
+    def get_count(self, label: int) -> int:
+        """
+            :return: Number of queue's items of a label
+            :rtype: int
+        """
+
+        with self.__operation_lock:
+            index = self.__find(label)
+            return 0 if index < 0 else self.__table_counts[index]
+
+    def get_counter(self) -> InternedCounter:
+        """
+            :return: Copy of the number of queue's items of each label
+            :rtype: InternedCounter
+        """
+
+        with self.__operation_lock:
+            counts = {self.__table_keys[index]: self.__table_counts[index]
+                      for index in range(self.__table_size)
+                      if self.__table_states[index] == USED and self.__table_counts[index] > 0}
+            checking_columns = self.checking_columns
+        return InternedCounter.from_schema_counts([(checking_columns, counts)])
+
+    def is_eviction_needed(self) -> bool:
+        return self.__header[ROWS_NB] > self.__header[HIGH_WATERMARK]
+
+    def manage(self) -> int:
+        """
+            Run the managing process of the queue: remove the rows of the first queue's items when
+            the number of rows is greater than the high watermark, until the low watermark is
+            reached (see 'QueueBehaviour' for the ignored items).
+
+            :return: Number of removed rows
+            :rtype: int
+        """
+
+        header = self.__header
+        if header[ROWS_NB] <= header[HIGH_WATERMARK]:
+            return 0
+        with self.__operation_lock:
+            columns_nb = len(self.__columns)
+            checking_positions = [self.__checking_positions[index]
+                                  for index in range(header[CHECKING_NB])]
+            is_all_items = self.is_all_items
+            row_values = self.__row_values
+            queue_values = self.__queue_values
+            removed_nb = 0
+            while header[ROWS_NB] > header[LOW_WATERMARK] and header[QUEUE_LENGTH] > 0:
+                position = header[QUEUE_HEAD]
+                header[QUEUE_HEAD] = (position + 1) % self.__queue_capacity
+                header[QUEUE_LENGTH] -= 1
+                index = self.__find(self.__queue_labels[position])
+                count = self.__table_counts[index]
+                self.__table_counts[index] = count - 1
+                slot = self.__table_slots[index]
+                if (is_all_items or count == 1) and slot >= 0:
+                    # Missing values are equal to each other
+                    is_matching = True
+                    for item_position, row_position in enumerate(checking_positions):
+                        row_value = row_values[slot * columns_nb + row_position]
+                        item_value = queue_values[position * columns_nb + item_position]
+                        if row_value != item_value and \
+                                not (math.isnan(row_value) and math.isnan(item_value)):
+                            is_matching = False
+                            break
+                    if is_matching:
+                        self.__remove_slot(index)
+                        removed_nb += 1
+                self.__release(index)
+            return removed_nb
+
+    def get_queue_items(self) -> List[Tuple[int, Dict[Any, float]]]:
+        """
+            :return: Copy of the queue's items
+            :rtype: List[Tuple[int, Dict[Any, float]]]
+        """
+
+        with self.__operation_lock:
+            header = self.__header
+            checking_columns = self.checking_columns
+            columns_nb = len(self.__columns)
+            items = list()
+            for offset in range(header[QUEUE_LENGTH]):
+                position = (header[QUEUE_HEAD] + offset) % self.__queue_capacity
+                items.append((self.__queue_labels[position],
+                              {column: self.__queue_values[position * columns_nb + index]
+                               for index, column in enumerate(checking_columns)}))
+            return items
+
+    def __repr__(self) -> str:
+        return "<{} rows={}/{} items={}/{}>".format(type(self).__name__, len(self),
+                                                    self.__capacity,
+                                                    self.__header[QUEUE_LENGTH],
+                                                    self.__queue_capacity)
+
+
+class SharedQueueView:
+    """
+        Read only view of the queue of a SharedFrame object.
+
+        It may be manipulated as a list:
+        - brackets with int type
+        - len function
+        - iteration
+        - containing
+        - equality
+    """
+
+    def __init__(self, frame: SharedFrame):
+        self.__frame = frame
+
+    def __len__(self) -> int:
+        return len(self.__frame.get_queue_items())
+
+    def __iter__(self) -> Iterator[Tuple[int, Dict[Any, float]]]:
+        return iter(self.__frame.get_queue_items())
+
+    def __getitem__(self, index: int) -> Tuple[int, Dict[Any, float]]:
+        return self.__frame.get_queue_items()[index]
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self.__frame.get_queue_items()
+
+    def __eq__(self, other: Any) -> bool:
+        return self.__frame.get_queue_items() == list(other)
+
+    def __repr__(self) -> str:
+        return "{}({})".format(type(self).__name__, self.__frame.get_queue_items())
+
+
+class SharedCounterView:
+    """
+        Read only view of the counters of the queue's items of a SharedFrame object (see
+        InternedCounter).
+
+        It may be manipulated as a dict:
+        - brackets with label
+        - len function
+        - iteration
+        - containing
+        - equality
+        - keys method
+        - values method
+        - items method
+    """
+
+    def __init__(self, frame: SharedFrame):
+        self.__frame = frame
+
+    def count(self, label: Any, checking_values: Dict) -> int:
+        return self.__frame.get_counter().count(label, checking_values)
+
+    def __getitem__(self, label: Any) -> Counter:
+        return self.__frame.get_counter()[label]
+
+    def __len__(self) -> int:
+        return len(self.__frame.get_counter())
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(list(self.__frame.get_counter()))
+
+    def __contains__(self, label: Any) -> bool:
+        return self.__frame.get_count(label) > 0
+
+    def keys(self) -> List[Any]:
+        return list(self.__frame.get_counter().keys())
+
+    def values(self) -> List[Counter]:
+        return self.__frame.get_counter().values()
+
+    def items(self) -> List[Tuple[Any, Counter]]:
+        return self.__frame.get_counter().items()
+
+    def to_dict(self) -> Dict[Any, Counter]:
+        return self.__frame.get_counter().to_dict()
+
+    def __eq__(self, other: Any) -> bool:
+        return self.__frame.get_counter() == other
+
+    def __repr__(self) -> str:
+        return "{}({})".format(type(self).__name__, self.__frame.get_counter().to_dict())
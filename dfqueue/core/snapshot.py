@@ -0,0 +1,326 @@
+# coding: utf8
+
+import os
+import pickle
+import shutil
+import tempfile
+from time import monotonic
+from typing import Any, Dict, Iterable, List, NoReturn, Tuple, Union
+# noinspection PyPackageRequirements
+import numpy
+from pandas import DataFrame, Index, MultiIndex
+from .storage import ColumnarQueue
+from .counters import InternedCounter
+from .access import FrequencyQueue
+from .expiry import QueueExpiry
+
+
+__all__ = ['QueueSnapshot']
+
+
+# Version of the snapshot's format
+SNAPSHOT_VERSION = 1
+# File of the snapshot's parameters (written after the arrays)
+METADATA_FILE_NAME = 'metadata.pickle'
+# File of the name of the current snapshot's directory in the directory of the snapshots
+CURRENT_FILE_NAME = 'CURRENT'
+# Prefix of the directories of the snapshots
+SNAPSHOT_DIRECTORY_PREFIX = 'snapshot-'
+
+
+class QueueSnapshot:
+    """
+        Binary columnar snapshot of a queue: parameters and arrays saved in a directory.
+
+        Each array is saved in a .npy file and the parameters in a pickle file. The queue's items
+        are saved as the arrays of a ColumnarQueue object (labels and checking values grouped by
+        checking columns), the counters as arrays of labels and counts and the dataframe as one
+        array for each column. Numeric and boolean arrays are memory-mapped (copy on write) when
+        they are loaded: the queue and the counters are restored without a row-wise rebuild.
+
+        Each snapshot is written in a new directory, synced, then designated by the CURRENT file
+        (replaced atomically) : the files of the previous snapshot, which may be memory-mapped by
+        a loaded queue, are never overwritten and a failed save keeps the previous snapshot.
+
+        Object arrays are pickled: only trusted snapshots must be loaded.
+    """
+
+    __slots__ = ('metadata', 'arrays')
+
+    def __init__(self, metadata: Union[Dict[str, Any], None] = None,
+                 arrays: Union[Dict[str, numpy.ndarray], None] = None):
+        self.metadata = dict() if metadata is None else metadata
+        self.arrays = dict() if arrays is None else arrays
+
+    def save(self, path: str) -> NoReturn:
+        """
+            :param path: Directory of the snapshots (created if it doesn't exist)
+            :type path: str
+        """
+
+        os.makedirs(path, exist_ok=True)
+        snapshot_path = tempfile.mkdtemp(prefix=SNAPSHOT_DIRECTORY_PREFIX, dir=path)
+        try:
+            for name, array in self.arrays.items():
+                with open(os.path.join(snapshot_path, name + '.npy'), 'wb') as array_file:
+                    numpy.save(array_file, array, allow_pickle=True)
+                    _sync_file(array_file)
+            metadata = dict(self.metadata, version=SNAPSHOT_VERSION, arrays=list(self.arrays))
+            with open(os.path.join(snapshot_path, METADATA_FILE_NAME), 'wb') as metadata_file:
+                pickle.dump(metadata, metadata_file, protocol=pickle.HIGHEST_PROTOCOL)
+                _sync_file(metadata_file)
+            _sync_directory(snapshot_path)
+
+            current_path = os.path.join(path, CURRENT_FILE_NAME)
+            with open(current_path + '.tmp', 'w') as current_file:
+                current_file.write(os.path.basename(snapshot_path))
+                _sync_file(current_file)
+            os.replace(current_path + '.tmp', current_path)
+            _sync_directory(path)
+        except BaseException:
+            shutil.rmtree(snapshot_path, ignore_errors=True)
+            raise
+        _remove_previous_snapshots(path, os.path.basename(snapshot_path))
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'QueueSnapshot':
+        """
+            :param path: Directory of the snapshots
+            :type path: str
+
+            :param mmap: Memory-map the numeric and boolean arrays
+            :type mmap: bool
+
+            :return: Current snapshot
+            :rtype: QueueSnapshot
+        """
+
+        current_path = os.path.join(path, CURRENT_FILE_NAME)
+        if os.path.exists(current_path):
+            with open(current_path, 'r') as current_file:
+                path = os.path.join(path, current_file.read().strip())
+        # Otherwise, snapshot saved directly in the directory (previous layout)
+        with open(os.path.join(path, METADATA_FILE_NAME), 'rb') as metadata_file:
+            metadata = pickle.load(metadata_file)
+        assert metadata.get('version') == SNAPSHOT_VERSION, \
+            "Snapshot version {} not supported".format(metadata.get('version'))
+
+        arrays = dict()
+        for name in metadata['arrays']:
+            array_path = os.path.join(path, name + '.npy')
+            if mmap:
+                try:
+                    arrays[name] = numpy.load(array_path, mmap_mode='c')
+                    continue
+                except ValueError:
+                    # Object arrays can't be memory-mapped
+                    pass
+            arrays[name] = numpy.load(array_path, allow_pickle=True)
+        return cls(metadata, arrays)
+
+    # Queue
+
+    def add_queue(self, queue: Any) -> NoReturn:
+        """
+            :param queue: Queue's items in the queue's order
+            :type queue: Any
+        """
+
+        if isinstance(queue, ColumnarQueue):
+            schema_ids, segments = queue.to_arrays()
+        else:
+            schema_ids, segments = self.__to_queue_arrays(queue)
+        self.arrays['queue_schema_ids'] = schema_ids
+        self.metadata['queue_schemas'] = [columns for columns, _, _ in segments]
+        for schema_id, (_, labels, values) in enumerate(segments):
+            self.arrays['queue_labels_{}'.format(schema_id)] = labels
+            for column_index, array in enumerate(values):
+                self.arrays['queue_values_{}_{}'.format(schema_id, column_index)] = array
+
+    def add_frequencies(self, queue: FrequencyQueue) -> NoReturn:
+        self.arrays['queue_frequencies'] = numpy.array(
+            [queue.get_frequency(item[0]) for item in queue], dtype=numpy.int64)
+
+    def get_queue(self) -> ColumnarQueue:
+        arrays = self.arrays
+        return ColumnarQueue.from_arrays(
+            arrays['queue_schema_ids'],
+            [(columns, arrays['queue_labels_{}'.format(schema_id)],
+              [arrays['queue_values_{}_{}'.format(schema_id, column_index)]
+               for column_index in range(len(columns))])
+             for schema_id, columns in enumerate(self.metadata['queue_schemas'])])
+
+    def get_frequencies(self) -> Union[List[int], None]:
+        frequencies = self.arrays.get('queue_frequencies')
+        return None if frequencies is None else frequencies.tolist()
+
+    # Counter
+
+    def add_counter(self, counter: InternedCounter) -> NoReturn:
+        schema_counts = counter.to_schema_counts()
+        self.metadata['counter_schemas'] = [list(columns) for columns, _ in schema_counts]
+        for schema_id, (_, counts) in enumerate(schema_counts):
+            self.arrays['counter_labels_{}'.format(schema_id)] = \
+                self.__to_array(list(counts.keys()))
+            self.arrays['counter_counts_{}'.format(schema_id)] = \
+                numpy.fromiter(counts.values(), dtype=numpy.int64, count=len(counts))
+
+    def get_counter(self) -> InternedCounter:
+        arrays = self.arrays
+        return InternedCounter.from_schema_counts(
+            (columns, zip(arrays['counter_labels_{}'.format(schema_id)].tolist(),
+                          arrays['counter_counts_{}'.format(schema_id)].tolist()))
+            for schema_id, columns in enumerate(self.metadata['counter_schemas']))
+
+    # Expiry
+
+    def add_expiry(self, expiry: QueueExpiry) -> NoReturn:
+        # Monotonic timestamps are saved as ages : they are specific to the process
+        now = monotonic()
+        runs = expiry.get_runs()
+        self.metadata['ttl'] = expiry.ttl
+        self.arrays['expiry_ages'] = numpy.array([now - timestamp for timestamp, _ in runs],
+                                                 dtype=numpy.float64)
+        self.arrays['expiry_counts'] = numpy.array([items_nb for _, items_nb in runs],
+                                                   dtype=numpy.int64)
+
+    def has_expiry(self) -> bool:
+        return 'ttl' in self.metadata
+
+    def get_expiry(self) -> QueueExpiry:
+        now = monotonic()
+        expiry = QueueExpiry(self.metadata['ttl'])
+        for age, items_nb in zip(self.arrays['expiry_ages'].tolist(),
+                                 self.arrays['expiry_counts'].tolist()):
+            expiry.add(items_nb, now - age)
+        return expiry
+
+    # Dataframe
+
+    def add_dataframe(self, dataframe: DataFrame) -> NoReturn:
+        self.metadata['dataframe'] = {'columns': list(dataframe.columns),
+                                      'columns_name': dataframe.columns.name,
+                                      'dtypes': list(dataframe.dtypes),
+                                      'index_names': list(dataframe.index.names)}
+        self.arrays['dataframe_index'] = dataframe.index.to_numpy()
+        for position in range(len(dataframe.columns)):
+            self.arrays['dataframe_column_{}'.format(position)] = \
+                dataframe.iloc[:, position].to_numpy()
+
+    def has_dataframe(self) -> bool:
+        return 'dataframe' in self.metadata
+
+    def get_dataframe(self) -> DataFrame:
+        dataframe_metadata = self.metadata['dataframe']
+        index_names = dataframe_metadata['index_names']
+        if len(index_names) > 1:
+            # Labels of a MultiIndex saved as tuples
+            index = MultiIndex.from_tuples(self.arrays['dataframe_index'].tolist(),
+                                           names=index_names)
+        else:
+            index = Index(self.arrays['dataframe_index'])
+            index.names = index_names
+        dataframe = DataFrame({position: self.arrays['dataframe_column_{}'.format(position)]
+                               for position in range(len(dataframe_metadata['columns']))},
+                              index=index, columns=range(len(dataframe_metadata['columns'])))
+        for position, dtype in enumerate(dataframe_metadata['dtypes']):
+            if dtype != dataframe.dtypes[position]:
+                dataframe[position] = dataframe[position].astype(dtype)
+        dataframe.columns = Index(dataframe_metadata['columns'],
+                                  name=dataframe_metadata['columns_name'])
+        return dataframe
+
+    @classmethod
+    def __to_queue_arrays(cls, queue: Iterable[Tuple[Any, Dict]]) -> \
+            Tuple[numpy.ndarray, List[Tuple[Tuple, numpy.ndarray, List[numpy.ndarray]]]]:
+        # Same layout as the arrays of a ColumnarQueue object, built from lists
+        schema_cache = dict()
+        segments = list()
+        schema_ids = list()
+        for label, checking_values in queue:
+            columns = tuple(checking_values)
+            schema_id = schema_cache.get(columns)
+            if schema_id is None:
+                key = frozenset(columns)
+                schema_id = schema_cache.get(key)
+                if schema_id is None:
+                    schema_id = len(segments)
+                    segments.append((columns, list(), [list() for _ in columns]))
+                    schema_cache[key] = schema_id
+                schema_cache[columns] = schema_id
+            segment_columns, labels, values = segments[schema_id]
+            labels.append(label)
+            for column, column_values in zip(segment_columns, values):
+                column_values.append(checking_values[column])
+            schema_ids.append(schema_id)
+        return numpy.array(schema_ids, dtype=numpy.int32), \
+            [(columns, cls.__to_array(labels), [cls.__to_array(column_values)
+                                                for column_values in values])
+             for columns, labels, values in segments]
+
+    @staticmethod
+    def __to_array(values: List[Any]) -> numpy.ndarray:
+        if values and len(set(map(type, values))) == 1:
+            array = numpy.array(values)
+            # Tuples (labels of a MultiIndex) are converted to 2D arrays
+            if array.ndim == 1 and array.dtype.kind in 'biuf':
+                return array
+        # Values of several types or of other types are saved as objects
+        array = numpy.empty(len(values), dtype=object)
+        for index, value in enumerate(values):
+            # Tuples are not unpacked
+            array[index] = value
+        return array
+
+
+def _sync_file(file: Any) -> NoReturn:
+    file.flush()
+    os.fsync(file.fileno())
+
+
+def _sync_directory(path: str) -> NoReturn:
+    # The entries of a directory are synced through a file descriptor of the directory (POSIX)
+    try:
+        descriptor = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+
+def _remove_previous_snapshots(path: str, current_name: str) -> NoReturn:
+    """
+        Remove the files of the previous snapshots. The mappings of their files stay valid on POSIX
+        systems; the files which can't be removed (mapped files on Windows) are removed by a next
+        save.
+
+        :param path: Directory of the snapshots
+        :type path: str
+
+        :param current_name: Name of the directory of the current snapshot
+        :type current_name: str
+    """
+
+    for name in os.listdir(path):
+        entry_path = os.path.join(path, name)
+        if name.startswith(SNAPSHOT_DIRECTORY_PREFIX) and name != current_name and \
+                os.path.isdir(entry_path):
+            shutil.rmtree(entry_path, ignore_errors=True)
+
+    # Snapshot saved directly in the directory (previous layout)
+    metadata_path = os.path.join(path, METADATA_FILE_NAME)
+    if os.path.exists(metadata_path):
+        try:
+            with open(metadata_path, 'rb') as metadata_file:
+                file_names = [name + '.npy' for name in pickle.load(metadata_file)['arrays']]
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError):
+            file_names = list()
+        for file_name in file_names + [METADATA_FILE_NAME]:
+            try:
+                os.remove(os.path.join(path, file_name))
+            except OSError:
+                pass
@@ -0,0 +1,250 @@
+# coding: utf8
+
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from threading import Thread
+from typing import Callable, Dict, Iterable, List, NoReturn, Tuple, Union
+
+
+__all__ = ['QueueStats', 'LatencyHistogram', 'format_prometheus', 'start_stats_server']
+
+
+class LatencyHistogram:
+    """
+        Histogram of durations in seconds with fixed bucket bounds (Prometheus histogram).
+
+        Each duration is counted in the first bucket whose bound is greater than or equal to the
+        duration (the last bucket has no bound).
+    """
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    # 1 µs to 1 s
+    DEFAULT_BOUNDS = (0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001,
+                      0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                      1.0)
+
+    def __init__(self, bounds: Iterable[float] = DEFAULT_BOUNDS):
+        self.bounds = tuple(bounds)
+        assert list(self.bounds) == sorted(set(self.bounds)), \
+            "The bounds of the buckets are not increasing"
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, duration: float) -> NoReturn:
+        self.counts[bisect_left(self.bounds, duration)] += 1
+        self.sum += duration
+        self.count += 1
+
+    def get_cumulative_counts(self) -> List[Tuple[float, int]]:
+        """
+            :return: Bound (infinity for the last bucket) and number of durations lower than or
+            equal to the bound of each bucket
+            :rtype: List[Tuple[float, int]]
+        """
+
+        cumulative_counts = list()
+        total = 0
+        for bound, bucket_count in zip(self.bounds + (float('inf'),), self.counts):
+            total += bucket_count
+            cumulative_counts.append((bound, total))
+        return cumulative_counts
+
+    def get_quantile(self, quantile: float) -> Union[float, None]:
+        """
+            :return: Bound of the bucket of the quantile (None without duration, the greatest
+            bound for the last bucket)
+            :rtype: Union[float, None]
+        """
+
+        assert 0 <= quantile <= 1, "The quantile is not between 0 and 1"
+        if self.count == 0:
+            return None
+        rank = quantile * self.count
+        for bound, cumulative_count in self.get_cumulative_counts():
+            if cumulative_count >= rank and cumulative_count > 0:
+                return min(bound, self.bounds[-1])
+        return self.bounds[-1]
+
+    def reset(self) -> NoReturn:
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def __repr__(self) -> str:
+        return "{}(count={}, sum={})".format(type(self).__name__, self.count, self.sum)
+
+
+class QueueStats:
+    """
+        Runtime statistics of a queue: monotonic counters and latency histograms.
+
+        Counters:
+        - adding_calls : calls of the adding functions
+        - items_added : items added in the queue
+        - managing_calls : calls of the managing functions (the calls of the same shared call are
+        counted once, see 'synchronized')
+        - managing_runs : managing processes run because the dataframe or the items exceeded
+        their limits (max size, byte budget or time-to-live)
+        - items_evicted : items removed from the queue by the managing processes
+        - rows_evicted : rows removed from the dataframe by the managing processes
+        - items_superseded : removed items ignored because a later item has the same label and
+        checking columns (LAST_ITEM behaviour)
+        - items_stale : removed items ignored because their rows are missing or their checking
+        values don't match the rows
+
+        Histograms:
+        - adding_latency : duration of the queue's part of the adding functions (creation and
+        adding of the items)
+        - managing_latency : duration of the queue's part of the managing functions (check of the
+        eviction policy and managing process)
+
+        The items added are counted with the lock of the queue's appends held (the shards of a
+        sharded queue count their items, added to 'items_added' when the statistics are read).
+        The other statistics are updated without lock: the concurrent shared calls of the same
+        queue may lose a few updates (see 'synchronized').
+    """
+
+    __slots__ = ('adding_calls', 'items_added', 'managing_calls', 'managing_runs',
+                 'items_evicted', 'rows_evicted', 'items_superseded', 'items_stale',
+                 'adding_latency', 'managing_latency')
+
+    COUNTER_NAMES = ('adding_calls', 'items_added', 'managing_calls', 'managing_runs',
+                     'items_evicted', 'rows_evicted', 'items_superseded', 'items_stale')
+    HISTOGRAM_NAMES = ('adding_latency', 'managing_latency')
+
+    def __init__(self):
+        self.adding_latency = LatencyHistogram()
+        self.managing_latency = LatencyHistogram()
+        self.reset()
+
+    def reset(self) -> NoReturn:
+        """
+            Set the counters to 0 and empty the histograms.
+        """
+
+        self.adding_calls = 0
+        self.items_added = 0
+        self.managing_calls = 0
+        self.managing_runs = 0
+        self.items_evicted = 0
+        self.rows_evicted = 0
+        self.items_superseded = 0
+        self.items_stale = 0
+        self.adding_latency.reset()
+        self.managing_latency.reset()
+
+    def to_dict(self) -> Dict[str, Union[int, Dict]]:
+        """
+            :return: Counters and histograms (count, sum and counts of the buckets)
+            :rtype: Dict[str, Union[int, Dict]]
+        """
+
+        stats = {name: getattr(self, name) for name in self.COUNTER_NAMES}
+        for name in self.HISTOGRAM_NAMES:
+            histogram = getattr(self, name)
+            stats[name] = {'count': histogram.count, 'sum': histogram.sum,
+                           'buckets': histogram.get_cumulative_counts()}
+        return stats
+
+    def __repr__(self) -> str:
+        return "{}({})".format(type(self).__name__, ", ".join(
+            "{}={}".format(name, getattr(self, name)) for name in self.COUNTER_NAMES))
+
+
+def __escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def __format_float(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+def format_prometheus(queue_stats: Iterable[Tuple[str, QueueStats, Dict[str, float]]]) -> str:
+    """
+        Format the statistics of queues in the Prometheus text format (version 0.0.4).
+
+        :param queue_stats: Name, statistics and gauges (name -> value) of each queue
+        :type queue_stats: Iterable[Tuple[str, QueueStats, Dict[str, float]]]
+
+        :return: Metrics of the queues ('dfqueue_' prefix, 'queue' label)
+        :rtype: str
+    """
+
+    queue_stats = [(__escape_label_value(str(queue_name)), stats, gauges)
+                   for queue_name, stats, gauges in queue_stats]
+    lines = list()
+    for name in QueueStats.COUNTER_NAMES:
+        metric_name = 'dfqueue_{}_total'.format(name)
+        lines.append('# TYPE {} counter'.format(metric_name))
+        for queue_name, stats, _ in queue_stats:
+            lines.append('{}{{queue="{}"}} {}'.format(metric_name, queue_name,
+                                                       getattr(stats, name)))
+    for name in QueueStats.HISTOGRAM_NAMES:
+        metric_name = 'dfqueue_{}_seconds'.format(name)
+        lines.append('# TYPE {} histogram'.format(metric_name))
+        for queue_name, stats, _ in queue_stats:
+            histogram = getattr(stats, name)
+            for bound, cumulative_count in histogram.get_cumulative_counts():
+                lines.append('{}_bucket{{queue="{}",le="{}"}} {}'.format(
+                    metric_name, queue_name, __format_float(bound), cumulative_count))
+            lines.append('{}_sum{{queue="{}"}} {}'.format(metric_name, queue_name,
+                                                          __format_float(histogram.sum)))
+            lines.append('{}_count{{queue="{}"}} {}'.format(metric_name, queue_name,
+                                                            histogram.count))
+    gauge_names = sorted(set(name for _, _, gauges in queue_stats for name in gauges))
+    for name in gauge_names:
+        metric_name = 'dfqueue_{}'.format(name)
+        lines.append('# TYPE {} gauge'.format(metric_name))
+        for queue_name, _, gauges in queue_stats:
+            if name in gauges:
+                lines.append('{}{{queue="{}"}} {}'.format(metric_name, queue_name,
+                                                           __format_float(gauges[name])))
+    return '\n'.join(lines) + '\n'
+
+
+class __StatsServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def start_stats_server(get_metrics: Callable[[], str], port: int, address: str) -> HTTPServer:
+    """
+        Serve metrics in the Prometheus text format from a background thread (GET requests on
+        '/' and '/metrics').
+
+        :param get_metrics: Function returning the metrics
+        :type get_metrics: Callable[[], str]
+
+        :param port: Port of the server (free port if 0)
+        :type port: int
+
+        :param address: Address of the server
+        :type address: str
+
+        :return: Running server (stopped by its 'shutdown' method)
+        :rtype: HTTPServer
+    """
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> NoReturn:
+            if self.path.split('?')[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = get_metrics().encode('utf8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> NoReturn:
+            # Scrapes are not logged
+            pass
+
+    server = __StatsServer((address, port), MetricsHandler)
+    Thread(target=server.serve_forever, name='dfqueue-stats-server', daemon=True).start()
+    return server
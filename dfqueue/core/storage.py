@@ -0,0 +1,444 @@
+# coding: utf8
+
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+# noinspection PyPackageRequirements
+import numpy
+from pandas import DataFrame
+
+
+__all__ = ['QueueStorage', 'ColumnarQueue']
+
+
+class QueueStorage(Enum):
+    """
+        Storage of the queue's items.
+
+        DEQUE : deque of (label, dictionary of checking values) tuples
+        COLUMNAR : growable typed arrays of labels and checking values grouped by checking columns
+        (see ColumnarQueue)
+        SHARDED : deques partitioned by the hash of the labels, each with its own lock and
+        counters (see ShardedQueue)
+    """
+
+    DEQUE = 0
+    COLUMNAR = 1
+    SHARDED = 2
+
+
+_INT64_BOUNDS = (-2 ** 63, 2 ** 63)
+# Integer dtype -> (min value, max value)
+_INTEGER_BOUNDS = dict()
+
+
+def _get_integer_bounds(dtype: numpy.dtype) -> Tuple[int, int]:
+    bounds = _INTEGER_BOUNDS.get(dtype)
+    if bounds is None:
+        info = numpy.iinfo(dtype)
+        bounds = _INTEGER_BOUNDS[dtype] = (int(info.min), int(info.max))
+    return bounds
+
+
+def _infer_dtype(value: Any) -> numpy.dtype:
+    """
+        Infer the dtype of a growable array from its first value.
+
+        :param value: First value of the array
+        :type value: Any
+
+        :return: Numeric or boolean dtype if the value is a numeric or boolean scalar, object
+        dtype otherwise
+        :rtype: numpy.dtype
+    """
+
+    value_type = type(value)
+    if value_type is bool:
+        return numpy.dtype(bool)
+    if value_type is int:
+        return numpy.dtype(numpy.int64) if _INT64_BOUNDS[0] <= value < _INT64_BOUNDS[1] else \
+            numpy.dtype(object)
+    if value_type is float:
+        return numpy.dtype(numpy.float64)
+    if isinstance(value, numpy.generic) and value.dtype.kind in 'biuf':
+        return value.dtype
+    return numpy.dtype(object)
+
+
+def _is_accepted(dtype: numpy.dtype, value: Any) -> bool:
+    """
+        Check if a value can be stored in a typed array without conversion: same kind as the
+        array's dtype and no overflow or loss of precision in its width.
+
+        :param dtype: Dtype of the array
+        :type dtype: numpy.dtype
+
+        :param value: Value to store
+        :type value: Any
+
+        :return: True if the value can be stored as is
+        :rtype: bool
+    """
+
+    kind = dtype.kind
+    value_type = type(value)
+    if kind == 'f':
+        if value_type is float:
+            return dtype.itemsize >= 8
+        return isinstance(value, numpy.floating) and numpy.can_cast(value.dtype, dtype)
+    if kind in 'iu':
+        if value_type is not int and not isinstance(
+                value, numpy.signedinteger if kind == 'i' else numpy.unsignedinteger):
+            return False
+        min_value, max_value = _get_integer_bounds(dtype)
+        return min_value <= value <= max_value
+    if kind == 'b':
+        return value_type is bool or isinstance(value, numpy.bool_)
+    return True
+
+
+class _GrowableArray:
+    """
+        Numpy array with amortized O(1) appends at the end and removals at the beginning.
+
+        Numeric and boolean values are stored in a typed array. The array is converted to an
+        object array if a value doesn't fit its dtype.
+    """
+
+    __slots__ = ('__data', '__start', '__stop', '__kind')
+
+    def __init__(self, values: Union[numpy.ndarray, None] = None,
+                 dtype: Union[numpy.dtype, None] = None):
+        if values is not None:
+            self.__data = values
+        else:
+            self.__data = numpy.empty(0, dtype=object if dtype is None else dtype)
+        self.__start = 0
+        self.__stop = len(self.__data)
+        # None until the first value if the dtype is not fixed
+        self.__kind = None if values is None and dtype is None else self.__data.dtype.kind
+
+    def __len__(self) -> int:
+        return self.__stop - self.__start
+
+    @property
+    def nbytes(self) -> int:
+        return self.__data.nbytes
+
+    @property
+    def dtype(self) -> numpy.dtype:
+        return self.__data.dtype
+
+    def __reserve(self) -> None:
+        if self.__stop < len(self.__data):
+            return
+        size = self.__stop - self.__start
+        if self.__start > 0 and size <= len(self.__data) // 2:
+            self.__data[:size] = self.__data[self.__start:self.__stop]
+        else:
+            data = numpy.empty(max(2 * size, 8), dtype=self.__data.dtype)
+            data[:size] = self.__data[self.__start:self.__stop]
+            self.__data = data
+        self.__start = 0
+        self.__stop = size
+
+    def append(self, value: Any) -> None:
+        if self.__kind is None:
+            self.__data = self.__data.astype(_infer_dtype(value))
+            self.__kind = self.__data.dtype.kind
+        elif self.__kind != 'O' and not _is_accepted(self.__data.dtype, value):
+            self.__data = self.__data.astype(object)
+            self.__kind = 'O'
+        self.__reserve()
+        self.__data[self.__stop] = value
+        self.__stop += 1
+
+    def popleft(self) -> Any:
+        if self.__start == self.__stop:
+            raise IndexError("pop from an empty array")
+        value = self.__data[self.__start]
+        if self.__kind == 'O':
+            # Release the reference of the popped object
+            self.__data[self.__start] = None
+        self.__start += 1
+        if self.__start == self.__stop:
+            self.__start = self.__stop = 0
+        return value.item() if self.__kind != 'O' else value
+
+    def popleft_many(self, values_nb: int) -> List[Any]:
+        stop = min(self.__start + values_nb, self.__stop)
+        values = self.__data[self.__start:stop].tolist()
+        if self.__kind == 'O':
+            self.__data[self.__start:stop] = None
+        self.__start = stop
+        if self.__start == self.__stop:
+            self.__start = self.__stop = 0
+        return values
+
+    def __getitem__(self, index: int) -> Any:
+        value = self.__data[self.__start + index]
+        return value.item() if self.__kind != 'O' else value
+
+    def view(self) -> numpy.ndarray:
+        return self.__data[self.__start:self.__stop]
+
+    def tolist(self) -> List[Any]:
+        return self.view().tolist()
+
+
+class _SchemaSegment:
+    """
+        Labels and checking values of the queue's items with the same checking columns.
+    """
+
+    __slots__ = ('columns', 'labels', 'values')
+
+    def __init__(self, columns: Tuple, labels: Union[_GrowableArray, None] = None,
+                 values: Union[List[_GrowableArray], None] = None):
+        self.columns = columns
+        self.labels = _GrowableArray() if labels is None else labels
+        self.values = [_GrowableArray() for _ in columns] if values is None else values
+
+    def append(self, label: Any, values: Iterable[Any]) -> None:
+        self.labels.append(label)
+        for array, value in zip(self.values, values):
+            array.append(value)
+
+    def popleft(self) -> Tuple[Any, Dict]:
+        return self.labels.popleft(), dict(zip(self.columns,
+                                               [array.popleft() for array in self.values]))
+
+    def popleft_many(self, items_nb: int) -> Iterator[Tuple[Any, Dict]]:
+        columns = self.columns
+        labels = self.labels.popleft_many(items_nb)
+        rows_values = zip(*[array.popleft_many(items_nb) for array in self.values]) if columns \
+            else iter(tuple, None)
+        return ((label, dict(zip(columns, values))) for label, values in zip(labels, rows_values))
+
+    def __getitem__(self, index: int) -> Tuple[Any, Dict]:
+        return self.labels[index], dict(zip(self.columns,
+                                            [array[index] for array in self.values]))
+
+    def __iter__(self) -> Iterator[Tuple[Any, Dict]]:
+        columns = self.columns
+        for label, values in zip(self.labels.tolist(),
+                                 zip(*[array.tolist() for array in self.values]) if columns
+                                 else iter(tuple, None)):
+            yield label, dict(zip(columns, values))
+
+    @property
+    def nbytes(self) -> int:
+        return self.labels.nbytes + sum(array.nbytes for array in self.values)
+
+
+class ColumnarQueue:
+    """
+        Queue storing labels and checking values in growable typed arrays.
+
+        Queue's items with the same checking columns (i.e the same schema) share the same arrays:
+        one array for the labels and one array for each checking column. The order of the items
+        is kept in an array of schema identifiers. Numeric and boolean values keep their dtype.
+
+        Removing the first item is a cursor advance in the arrays. Items are materialized as
+        (label, dictionary of checking values) tuples when they are read, so the queue may be
+        manipulated as a deque:
+        - append, extend and popleft methods
+        - brackets with int type
+        - len function
+        - iteration
+        - containing
+        - equality
+    """
+
+    def __init__(self, items: Iterable[Tuple[Any, Dict]] = ()):
+        self.__schema_ids = _GrowableArray(dtype=numpy.int32)
+        self.__segments = list()
+        # Checking columns (in any order) -> schema identifier
+        self.__schema_cache = dict()
+        self.extend(items)
+
+    @classmethod
+    def from_dataframe(cls, dataframe: DataFrame, selected_columns: Sequence[Any]) -> \
+            'ColumnarQueue':
+        """
+            Create a queue with one item for each row of a dataframe, in the dataframe's order.
+
+            The selected columns are copied without a conversion in Python objects, except the
+            columns which are not numeric or boolean.
+
+            :param dataframe: Selected dataframe
+            :type dataframe: DataFrame
+
+            :param selected_columns: Names of the dataframe's columns used for the items
+            :type selected_columns: Sequence[Any]
+
+            :return: Queue
+            :rtype: ColumnarQueue
+        """
+
+        def to_array(values: Any) -> numpy.ndarray:
+            array = numpy.asarray(values)
+            if array.dtype.kind in 'biuf':
+                return array.copy()
+            return numpy.asarray(values.astype(object) if hasattr(values, 'astype') else
+                                 array, dtype=object).copy()
+
+        queue = cls()
+        if dataframe.empty:
+            return queue
+
+        columns = tuple(selected_columns)
+        segment = _SchemaSegment(columns,
+                                 _GrowableArray(to_array(dataframe.index)),
+                                 [_GrowableArray(to_array(dataframe[column]))
+                                  for column in columns])
+        queue.__segments.append(segment)
+        queue.__schema_cache[columns] = 0
+        queue.__schema_cache[frozenset(columns)] = 0
+        queue.__schema_ids = _GrowableArray(numpy.zeros(len(dataframe), dtype=numpy.int32))
+        return queue
+
+    @classmethod
+    def from_arrays(cls, schema_ids: numpy.ndarray,
+                    segments: Iterable[Tuple[Tuple, numpy.ndarray, List[numpy.ndarray]]]) -> \
+            'ColumnarQueue':
+        """
+            Create a queue from the arrays of another queue (see 'to_arrays') without copying
+            them. The arrays are copied when they grow.
+
+            :param schema_ids: Schema identifier of each item (int32 array)
+            :type schema_ids: numpy.ndarray
+
+            :param segments: Checking columns, labels and checking values of each schema
+            :type segments: Iterable[Tuple[Tuple, numpy.ndarray, List[numpy.ndarray]]]
+
+            :return: Queue
+            :rtype: ColumnarQueue
+        """
+
+        def to_growable_array(values: numpy.ndarray) -> _GrowableArray:
+            # The dtype of an empty array is inferred from its first value
+            return _GrowableArray(values) if len(values) else _GrowableArray()
+
+        queue = cls()
+        for columns, labels, values in segments:
+            columns = tuple(columns)
+            queue.__schema_cache[columns] = len(queue.__segments)
+            queue.__schema_cache[frozenset(columns)] = len(queue.__segments)
+            queue.__segments.append(_SchemaSegment(columns, to_growable_array(labels),
+                                                   [to_growable_array(array)
+                                                    for array in values]))
+        queue.__schema_ids = _GrowableArray(numpy.asarray(schema_ids, dtype=numpy.int32))
+        return queue
+
+    def to_arrays(self) -> Tuple[numpy.ndarray, List[Tuple[Tuple, numpy.ndarray,
+                                                           List[numpy.ndarray]]]]:
+        """
+            :return: Schema identifier of each item and checking columns, labels and checking
+            values of each schema (views of the queue's arrays)
+            :rtype: Tuple[numpy.ndarray, List[Tuple[Tuple, numpy.ndarray, List[numpy.ndarray]]]]
+        """
+
+        return self.__schema_ids.view(), [(segment.columns, segment.labels.view(),
+                                           [array.view() for array in segment.values])
+                                          for segment in self.__segments]
+
+    def __get_schema_id(self, columns: Tuple) -> int:
+        schema_id = self.__schema_cache.get(columns)
+        if schema_id is None:
+            key = frozenset(columns)
+            schema_id = self.__schema_cache.get(key)
+            if schema_id is None:
+                schema_id = len(self.__segments)
+                self.__segments.append(_SchemaSegment(columns))
+                self.__schema_cache[key] = schema_id
+            self.__schema_cache[columns] = schema_id
+        return schema_id
+
+    def append(self, item: Tuple[Any, Dict]) -> None:
+        label, checking_values = item
+        schema_id = self.__get_schema_id(tuple(checking_values))
+        segment = self.__segments[schema_id]
+        segment.append(label, [checking_values[column] for column in segment.columns])
+        self.__schema_ids.append(schema_id)
+
+    def extend(self, items: Iterable[Tuple[Any, Dict]]) -> None:
+        for item in items:
+            self.append(item)
+
+    def popleft(self) -> Tuple[Any, Dict]:
+        if not len(self.__schema_ids):
+            raise IndexError("pop from an empty queue")
+        return self.__segments[self.__schema_ids.popleft()].popleft()
+
+    def popleft_many(self, items_nb: int) -> List[Tuple[Any, Dict]]:
+        """
+            Remove and return the first items of the queue.
+
+            :param items_nb: Number of removed items (all the items if it is greater than the
+            queue's length)
+            :type items_nb: int
+
+            :return: Removed items
+            :rtype: List[Tuple[Any, Dict]]
+        """
+
+        schema_ids = self.__schema_ids.popleft_many(items_nb)
+        if len(self.__segments) == 1:
+            return list(self.__segments[0].popleft_many(len(schema_ids)))
+        schema_ids_array = numpy.asarray(schema_ids, dtype=numpy.int32)
+        segment_items = [segment.popleft_many(int(numpy.count_nonzero(schema_ids_array ==
+                                                                        schema_id)))
+                         for schema_id, segment in enumerate(self.__segments)]
+        return [next(segment_items[schema_id]) for schema_id in schema_ids]
+
+    def clear(self) -> None:
+        self.__init__()
+
+    @property
+    def nbytes(self) -> int:
+        """
+            Size in bytes of the arrays (the objects referenced in object arrays are not counted).
+        """
+        return self.__schema_ids.nbytes + sum(segment.nbytes for segment in self.__segments)
+
+    def __len__(self) -> int:
+        return len(self.__schema_ids)
+
+    def __iter__(self) -> Iterator[Tuple[Any, Dict]]:
+        segment_iterators = [iter(segment) for segment in self.__segments]
+        for schema_id in self.__schema_ids.tolist():
+            yield next(segment_iterators[schema_id])
+
+    def __getitem__(self, index: int) -> Tuple[Any, Dict]:
+        if not isinstance(index, int):
+            raise TypeError("Queue indices must be integers")
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("Queue index out of range")
+        schema_id = self.__schema_ids[index]
+        if len(self.__segments) == 1:
+            return self.__segments[0][index]
+        previous_ids = self.__schema_ids.view()[:index]
+        return self.__segments[schema_id][int(numpy.count_nonzero(previous_ids == schema_id))]
+
+    def __contains__(self, item: Any) -> bool:
+        return any(queue_item == item for queue_item in self)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, (ColumnarQueue, Sequence)):
+            return NotImplemented
+        if len(self) != len(other):
+            return False
+        return all(item == other_item for item, other_item in zip(self, other))
+
+    def __ne__(self, other: Any) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __repr__(self) -> str:
+        return "{}({})".format(type(self).__name__, list(self))
+
+    def __str__(self) -> str:
+        return self.__repr__()
@@ -0,0 +1,306 @@
+# coding: utf8
+
+import os
+import mmap
+import pickle
+import struct
+import zlib
+from enum import Enum
+from threading import Condition, Lock, Thread, current_thread
+from time import monotonic, time
+from typing import Any, Dict, Iterable, Iterator, List, NoReturn, Tuple
+
+
+__all__ = ['WriteAheadLog', 'WalRecordType']
+
+
+class WalRecordType(Enum):
+    """
+        Mutations of a queue in the write-ahead log.
+
+        APPEND : items added at the end of the queue (list of items)
+        EVICTION : items removed at the beginning of the queue by the managing process (number of
+        items, labels of the removed rows)
+        COMPACTION : superseded items removed from a full queue (no payload)
+        TOUCH : reads of rows in a queue with the LRU or LFU behaviour (list of labels)
+    """
+
+    APPEND = 1
+    EVICTION = 2
+    COMPACTION = 3
+    TOUCH = 4
+
+
+# Beginning of the file : magic number and generation
+FILE_HEADER = struct.Struct('<8sI')
+MAGIC_NUMBER = b'DFQWAL01'
+# Beginning of each record : type, generation, payload's length, payload's CRC-32, time
+RECORD_HEADER = struct.Struct('<BIIId')
+# The mapped file grows by this size at least
+GROWTH_BYTES = 1 << 20
+
+
+class WriteAheadLog:
+    """
+        Append-only log of the mutations of a queue in a memory-mapped file.
+
+        Each record is a binary header (type, generation, length, CRC-32 and wall-clock time)
+        followed by a pickled payload. A zero byte follows the last record. The file is synced
+        (group commit) when the records written since the last sync exceed 'sync_bytes' bytes or
+        when the last sync is older than 'sync_ms' milliseconds: the records of the calls between
+        two syncs are lost by a crash. The write of a record checks both limits; a daemon thread
+        of the log (started by the first record which is not synced) syncs the records at the end
+        of the period when no later write syncs them.
+
+        The generation of the file is incremented when the log is reset (see 'save_queue'): the
+        records of the previous generations are ignored. The reading stops at the first
+        incomplete or corrupted record.
+    """
+
+    def __init__(self, path: str, sync_ms: float = 10, sync_bytes: int = 1 << 20):
+        """
+            :param path: Path of the log's file (created if it doesn't exist)
+            :type path: str
+
+            :param sync_ms: Max age in milliseconds of the records which are not synced (0 : every
+            record is synced)
+            :type sync_ms: float
+
+            :param sync_bytes: Max size of the records which are not synced
+            :type sync_bytes: int
+        """
+
+        assert sync_ms >= 0, "The sync period is negative"
+        assert isinstance(sync_bytes, int) and sync_bytes >= 0, \
+            "The sync size is not a positive integer"
+
+        self.__path = path
+        self.__sync_s = sync_ms / 1000
+        self.__sync_bytes = sync_bytes
+        self.__lock = Lock()
+        # Notified when records are not synced or when the log is closed (see '__run_sync')
+        self.__unsynced = Condition(self.__lock)
+        self.__sync_thread = None
+        self.__file = open(path, 'a+b')
+        self.__file.seek(0, os.SEEK_END)
+        if self.__file.tell() < FILE_HEADER.size:
+            self.__file.truncate(0)
+            self.__file.write(FILE_HEADER.pack(MAGIC_NUMBER, 0))
+            self.__file.flush()
+            os.fsync(self.__file.fileno())
+        self.__map = self.__create_map(max(os.path.getsize(path), GROWTH_BYTES))
+        magic_number, self.__generation = FILE_HEADER.unpack_from(self.__map, 0)
+        assert magic_number == MAGIC_NUMBER, "'{}' is not a write-ahead log".format(path)
+
+        # End of the valid records : the remaining bytes (incomplete or previous records) are
+        # cleared
+        self.__offset = FILE_HEADER.size
+        for _ in self.__read_records():
+            pass
+        self.__map[self.__offset:] = bytes(len(self.__map) - self.__offset)
+        self.__map.flush()
+        self.__synced_offset = self.__offset
+        self.__sync_time = monotonic()
+        # Statistics
+        self.__written_bytes = 0
+        self.__synced_bytes = 0
+        self.__syncs_nb = 0
+
+    def __create_map(self, size: int) -> mmap.mmap:
+        if os.path.getsize(self.__path) < size:
+            self.__file.truncate(size)
+        return mmap.mmap(self.__file.fileno(), size)
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    @property
+    def generation(self) -> int:
+        return self.__generation
+
+    @property
+    def size(self) -> int:
+        """
+            Size in bytes of the valid records
+        """
+        return self.__offset - FILE_HEADER.size
+
+    @property
+    def written_bytes(self) -> int:
+        """
+            Bytes of the records written since the opening of the log
+        """
+        return self.__written_bytes
+
+    @property
+    def synced_bytes(self) -> int:
+        """
+            Bytes of the pages written in the file by the syncs since the opening of the log
+        """
+        return self.__synced_bytes
+
+    @property
+    def syncs_nb(self) -> int:
+        return self.__syncs_nb
+
+    def __read_records(self) -> Iterator[Tuple[WalRecordType, float, bytes]]:
+        file_map = self.__map
+        while self.__offset + RECORD_HEADER.size <= len(file_map):
+            record_type, generation, length, checksum, timestamp = \
+                RECORD_HEADER.unpack_from(file_map, self.__offset)
+            start = self.__offset + RECORD_HEADER.size
+            if record_type == 0 or generation != self.__generation or \
+                    start + length > len(file_map):
+                return
+            payload = file_map[start:start + length]
+            if zlib.crc32(payload) != checksum:
+                return
+            self.__offset = start + length
+            yield WalRecordType(record_type), timestamp, payload
+
+    def read_records(self) -> List[Tuple[WalRecordType, float, Any]]:
+        """
+            :return: Type, wall-clock time and payload of the valid records
+            :rtype: List[Tuple[WalRecordType, float, Any]]
+        """
+
+        with self.__lock:
+            end = self.__offset
+            self.__offset = FILE_HEADER.size
+            try:
+                return [(record_type, timestamp, pickle.loads(payload) if payload else None)
+                        for record_type, timestamp, payload in self.__read_records()]
+            finally:
+                self.__offset = end
+
+    def write(self, record_type: WalRecordType, payload: Any = None) -> NoReturn:
+        """
+            Append a record at the end of the log (synced according to the group commit).
+
+            :param record_type: Type of the record
+            :type record_type: WalRecordType
+
+            :param payload: Payload of the record (pickled)
+            :type payload: Any
+        """
+
+        data = b'' if payload is None else pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        header = RECORD_HEADER.pack(record_type.value, self.__generation, len(data),
+                                    zlib.crc32(data), time())
+        record_size = len(header) + len(data)
+        with self.__lock:
+            offset = self.__offset
+            # The zero byte after the record is in the map
+            if offset + record_size >= len(self.__map):
+                self.__grow(record_size)
+            file_map = self.__map
+            file_map[offset:offset + len(header)] = header
+            file_map[offset + len(header):offset + record_size] = data
+            file_map[offset + record_size] = 0
+            self.__offset = offset + record_size
+            self.__written_bytes += record_size
+            if self.__offset - self.__synced_offset >= self.__sync_bytes or \
+                    monotonic() - self.__sync_time >= self.__sync_s:
+                self.__sync()
+            elif self.__sync_thread is None:
+                self.__sync_thread = Thread(target=self.__run_sync,
+                                            name='dfqueue-wal-{}'.format(self.__path),
+                                            daemon=True)
+                self.__sync_thread.start()
+            elif offset == self.__synced_offset:
+                # First record since the last sync
+                self.__unsynced.notify()
+
+    def log_append(self, items: List[Tuple[Any, Dict]]) -> NoReturn:
+        self.write(WalRecordType.APPEND, items)
+
+    def log_eviction(self, items_nb: int, removed_labels: Iterable[Any]) -> NoReturn:
+        self.write(WalRecordType.EVICTION, (items_nb, list(removed_labels)))
+
+    def log_compaction(self) -> NoReturn:
+        self.write(WalRecordType.COMPACTION)
+
+    def log_touch(self, labels: List[Any]) -> NoReturn:
+        self.write(WalRecordType.TOUCH, labels)
+
+    def __grow(self, record_size: int) -> NoReturn:
+        self.__sync()
+        size = len(self.__map)
+        self.__map.close()
+        self.__map = self.__create_map(size + max(size, record_size + 1, GROWTH_BYTES))
+        # The new size of the file is synced with its metadata
+        os.fsync(self.__file.fileno())
+
+    def __sync(self) -> NoReturn:
+        # Pages with the records written since the last sync (zero byte included)
+        start = self.__synced_offset - self.__synced_offset % mmap.PAGESIZE
+        stop = min(self.__offset + 1, len(self.__map))
+        self.__map.flush(start, stop - start)
+        self.__synced_bytes += -(-(stop - start) // mmap.PAGESIZE) * mmap.PAGESIZE
+        self.__syncs_nb += 1
+        self.__synced_offset = self.__offset
+        self.__sync_time = monotonic()
+
+    def __run_sync(self) -> NoReturn:
+        """
+            Sync the records which are not synced at the end of the sync period (until the log is
+            closed).
+        """
+
+        with self.__lock:
+            while not self.__map.closed:
+                if self.__synced_offset == self.__offset:
+                    self.__unsynced.wait()
+                    continue
+                remaining_s = self.__sync_time + self.__sync_s - monotonic()
+                if remaining_s > 0:
+                    self.__unsynced.wait(remaining_s)
+                else:
+                    self.__sync()
+
+    def sync(self) -> NoReturn:
+        """
+            Sync the records which are not synced yet.
+        """
+
+        with self.__lock:
+            if self.__synced_offset != self.__offset:
+                self.__sync()
+
+    def reset(self) -> NoReturn:
+        """
+            Remove all the records (new generation of the log).
+        """
+
+        with self.__lock:
+            self.__generation += 1
+            FILE_HEADER.pack_into(self.__map, 0, MAGIC_NUMBER, self.__generation)
+            self.__map[FILE_HEADER.size] = 0
+            self.__offset = FILE_HEADER.size
+            self.__synced_offset = 0
+            self.__sync()
+
+    def close(self) -> NoReturn:
+        """
+            Sync the records and close the file (truncated after the last record).
+        """
+
+        with self.__lock:
+            if self.__map.closed:
+                return
+            self.__sync()
+            self.__map.close()
+            self.__file.truncate(self.__offset + 1)
+            self.__file.close()
+            self.__unsynced.notify_all()
+        if self.__sync_thread is not None and self.__sync_thread is not current_thread():
+            self.__sync_thread.join()
+
+    @property
+    def closed(self) -> bool:
+        return self.__map.closed
+
+    def __repr__(self) -> str:
+        return "<{} {} generation={} size={}>".format(type(self).__name__, self.__path,
+                                                      self.__generation, self.size)
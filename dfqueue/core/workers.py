@@ -0,0 +1,144 @@
+# coding: utf8
+
+import logging
+from threading import Condition, Thread, current_thread
+from typing import Callable, NoReturn, Union
+
+
+__all__ = ['EvictionWorker']
+
+
+class EvictionWorker:
+    """
+        Daemon thread running the managing process of a queue in the background.
+
+        The managing functions only notify the worker (non-blocking) and the worker removes the
+        rows while holding the queue's lock. The dataframe's size may exceed the high watermark by
+        'max_overflow' rows before a managing function removes the rows itself.
+
+        With a period, the worker also runs the managing process periodically (e.g. for the expiry
+        of the queue's items).
+    """
+
+    def __init__(self, queue_name: str, remove_rows: Callable[[], NoReturn],
+                 get_lock: Callable[[], Union[object, None]], max_overflow: int,
+                 period: Union[float, None] = None):
+        """
+            :param queue_name: Name of the queue (used for the thread's name and the lock's profile)
+            :type queue_name: str
+
+            :param remove_rows: Managing process of the queue
+            :type remove_rows: Callable[[], NoReturn]
+
+            :param get_lock: Function returning the current lock of the queue
+            :type get_lock: Callable[[], Lock]
+
+            :param max_overflow: Number of rows above the high watermark before a managing
+            function removes the rows itself
+            :type max_overflow: int
+
+            :param period: Period in seconds of the managing process without request (no
+            periodic managing process by default)
+            :type period: Union[float, None]
+        """
+
+        assert isinstance(max_overflow, int) and max_overflow >= 0, \
+            "Max overflow is not a positive integer"
+        assert period is None or period > 0, "The period is not positive"
+        self.__queue_name = queue_name
+        self.__remove_rows = remove_rows
+        self.__get_lock = get_lock
+        self.__max_overflow = max_overflow
+        self.__period = period
+        self.__condition = Condition()
+        self.__is_requested = False
+        self.__is_evicting = False
+        self.__is_stopped = False
+        self.__thread = Thread(target=self.__run, name='dfqueue-eviction-{}'.format(queue_name),
+                               daemon=True)
+        self.__thread.start()
+
+    @property
+    def max_overflow(self) -> int:
+        return self.__max_overflow
+
+    @property
+    def period(self) -> Union[float, None]:
+        return self.__period
+
+    @property
+    def is_alive(self) -> bool:
+        return self.__thread.is_alive()
+
+    def notify(self) -> NoReturn:
+        """
+            Request a managing process (non-blocking).
+        """
+
+        if self.__is_requested:
+            return
+        with self.__condition:
+            self.__is_requested = True
+            self.__condition.notify_all()
+
+    def wait(self, timeout: Union[float, None] = None) -> bool:
+        """
+            Wait until the requested managing processes are done.
+
+            The queue's lock must not be held by the calling thread.
+
+            :param timeout: Maximum waiting time in seconds (no limit by default)
+            :type timeout: Union[float, None]
+
+            :return: False if the timeout is reached
+            :rtype: bool
+        """
+
+        with self.__condition:
+            return self.__condition.wait_for(
+                lambda: self.__is_stopped or not (self.__is_requested or self.__is_evicting),
+                timeout)
+
+    def stop(self, timeout: Union[float, None] = None) -> bool:
+        """
+            Stop the worker after its current managing process. Pending requests are discarded.
+
+            :param timeout: Maximum waiting time in seconds for the end of the thread (no limit by
+            default, 0 to return immediately)
+            :type timeout: Union[float, None]
+
+            :return: False if the thread is still running
+            :rtype: bool
+        """
+
+        with self.__condition:
+            self.__is_stopped = True
+            self.__condition.notify_all()
+        if self.__thread is not current_thread():
+            self.__thread.join(timeout)
+        return not self.__thread.is_alive()
+
+    def __run(self) -> NoReturn:
+        while True:
+            with self.__condition:
+                self.__condition.wait_for(lambda: self.__is_requested or self.__is_stopped,
+                                          self.__period)
+                if self.__is_stopped:
+                    break
+                self.__is_requested = False
+                self.__is_evicting = True
+            try:
+                lock = self.__get_lock()
+                profile = getattr(lock, 'profile', None)
+                if profile is None:
+                    with lock:
+                        self.__remove_rows()
+                else:
+                    profile.call(lock, self.__queue_name, 'EvictionWorker', self.__remove_rows)
+            except Exception:
+                logging.exception("Managing process of the thread '{}' failed".format(
+                    self.__thread.name))
+            finally:
+                with self.__condition:
+                    self.__is_evicting = False
+                    self.__condition.notify_all()
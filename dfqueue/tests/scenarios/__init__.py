@@ -1,7 +1,8 @@
 # coding: utf8
 
-from typing import Tuple, Dict, NoReturn, List, Any
+from typing import Tuple, Dict, NoReturn, List, Any, Callable
 from pandas import DataFrame, Series
+from dfqueue import adding, managing
 
 
 def create_queue_item(result: tuple, selected_columns: List[Any]) -> Tuple[str, Dict]:
@@ -25,3 +26,25 @@ def change_row_value(dataframe: DataFrame, index: str, new_columns_dict: dict) -
 
 def remove_row(dataframe: DataFrame, index: str) -> NoReturn:
     dataframe.drop([index], inplace=True)
+
+
+def create_functions(queue_name: str, managed_changes: bool = False) -> Tuple[Callable, Callable]:
+    # Adding functions with the 'A' column as checking column (the changes of values trigger the
+    # managing process with managed_changes)
+    @managing(queue_name=queue_name)
+    @adding(queue_items_creation_function=create_queue_item,
+            other_args={"selected_columns": ['A']},
+            queue_name=queue_name)
+    def adding_add_row(dataframe: DataFrame, index: str, columns_dict: dict) -> Tuple[str, Dict]:
+        return add_row(dataframe, index, columns_dict)
+
+    @adding(queue_items_creation_function=create_queue_item,
+            other_args={"selected_columns": ['A']},
+            queue_name=queue_name)
+    def adding_change_row_value(dataframe: DataFrame, index: str,
+                                new_columns_dict: dict) -> Tuple[str, Dict]:
+        return change_row_value(dataframe, index, new_columns_dict)
+
+    if managed_changes:
+        adding_change_row_value = managing(queue_name=queue_name)(adding_change_row_value)
+    return adding_add_row, adding_change_row_value
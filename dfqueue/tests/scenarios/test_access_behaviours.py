@@ -0,0 +1,93 @@
+# coding: utf8
+
+from typing import Tuple, Dict, List
+# noinspection PyPackageRequirements
+import pytest
+from pandas import DataFrame
+from dfqueue import adding, managing, touching, touch, assign_dataframe, get_info_provider, \
+    QueueBehaviour, QueueStorage
+from . import add_row, create_queue_item
+
+
+def create_functions(queue_name: str):
+    @managing(queue_name=queue_name)
+    @adding(queue_items_creation_function=create_queue_item,
+            other_args={"selected_columns": ['A']},
+            queue_name=queue_name)
+    def access_add_row(dataframe: DataFrame, index: str, columns_dict: dict) -> Tuple[str, Dict]:
+        return add_row(dataframe, index, columns_dict)
+
+    @touching(queue_name=queue_name)
+    def read_rows(dataframe: DataFrame, indexes: List[str]) -> List[str]:
+        dataframe.loc[indexes]
+        return indexes
+
+    return access_add_row, read_rows
+
+
+def test_lru_behaviour():
+    queue_name = 'TEST_LRU_BEHAVIOUR'
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 3, ['A'], queue_name, queue_behaviour=QueueBehaviour.LRU)
+    add_row_function, read_rows_function = create_functions(queue_name)
+
+    for index in range(3):
+        add_row_function(dataframe, str(index), {'A': index, 'B': index})
+    read_rows_function(dataframe, ['0'])
+
+    # The least recently used row is removed
+    add_row_function(dataframe, '3', {'A': 3, 'B': 3})
+    assert list(dataframe.index) == ['0', '2', '3']
+
+    touch(['2'], queue_name)
+    add_row_function(dataframe, '4', {'A': 4, 'B': 4})
+    assert list(dataframe.index) == ['2', '3', '4']
+    provider = get_info_provider(queue_name)
+    assert list(provider.queue) == [('3', {'A': 3}), ('2', {'A': 2}), ('4', {'A': 4})]
+    assert len(provider.counter) == 3
+
+
+def test_lfu_behaviour():
+    queue_name = 'TEST_LFU_BEHAVIOUR'
+    dataframe = DataFrame({'A': [0, 1, 2], 'B': [0, 1, 2]}, index=['0', '1', '2'])
+    assign_dataframe(dataframe, 3, ['A'], queue_name, queue_behaviour=QueueBehaviour.LFU)
+    add_row_function, read_rows_function = create_functions(queue_name)
+
+    read_rows_function(dataframe, ['0', '0', '1'])
+
+    # The least frequently used rows are removed
+    add_row_function(dataframe, '3', {'A': 3, 'B': 3})
+    assert list(dataframe.index) == ['0', '1', '3']
+    add_row_function(dataframe, '4', {'A': 4, 'B': 4})
+    assert list(dataframe.index) == ['0', '1', '4']
+    read_rows_function(dataframe, ['4', '4', '4'])
+    # The new row is the least frequently used row
+    add_row_function(dataframe, '5', {'A': 5, 'B': 5})
+    assert list(dataframe.index) == ['0', '1', '4']
+    assert get_info_provider(queue_name).queue[0] == ('1', {'A': 1})
+
+
+def test_touching_other_behaviours():
+    queue_name = 'TEST_TOUCHING_OTHER_BEHAVIOURS'
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 2, ['A'], queue_name)
+    add_row_function, read_rows_function = create_functions(queue_name)
+
+    add_row_function(dataframe, '0', {'A': 0, 'B': 0})
+    add_row_function(dataframe, '1', {'A': 1, 'B': 1})
+    # Reads are ignored by the LAST_ITEM behaviour
+    read_rows_function(dataframe, ['0'])
+    add_row_function(dataframe, '2', {'A': 2, 'B': 2})
+    assert list(dataframe.index) == ['1', '2']
+
+
+def test_invalid_access_behaviours():
+    dataframe = DataFrame(columns=['A', 'B'])
+
+    with pytest.raises(AssertionError):
+        assign_dataframe(dataframe, 2, ['A'], 'TEST_INVALID_ACCESS_BEHAVIOURS',
+                         queue_behaviour=QueueBehaviour.LRU, queue_storage=QueueStorage.COLUMNAR)
+
+    with pytest.raises(AssertionError):
+        assign_dataframe(dataframe, 2, ['A'], 'TEST_INVALID_ACCESS_BEHAVIOURS',
+                         queue_behaviour=QueueBehaviour.LFU, ttl=10)
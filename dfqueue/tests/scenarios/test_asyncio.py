@@ -0,0 +1,99 @@
+# coding: utf8
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, Dict
+from pandas import DataFrame
+# noinspection PyProtectedMember
+from dfqueue.core.dfqueue import QueuesHandler
+from dfqueue import adding, managing, synchronized, assign_dataframe
+from . import add_row, create_queue_item
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.submitted_nb = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted_nb += 1
+        return super().submit(*args, **kwargs)
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_asyncio():
+    queue_name = 'TEST_ASYNCIO'
+    executor = CountingExecutor()
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 5, ['A'], queue_name, low_watermark=2)
+    # noinspection PyProtectedMember
+    lock = QueuesHandler._QueuesHandler__instance.get_assigned_lock(queue_name)
+
+    @synchronized(queue_name=queue_name)
+    @managing(queue_name=queue_name, offload_eviction=True, executor=executor)
+    @adding(queue_items_creation_function=create_queue_item,
+            other_args={"selected_columns": ['A']},
+            queue_name=queue_name)
+    async def async_add_row(index: str, columns_dict: dict) -> Tuple[str, Dict]:
+        assert lock.locked()
+        await asyncio.sleep(0)
+        return add_row(dataframe, index, columns_dict)
+
+    async def add_rows():
+        await asyncio.gather(*[async_add_row(str(index), {'A': index, 'B': index})
+                               for index in range(6)])
+        assert len(dataframe) == 2
+        assert executor.submitted_nb == 1
+        await asyncio.gather(*[async_add_row(str(index), {'A': index, 'B': index})
+                               for index in range(6, 10)])
+
+    run(add_rows())
+    executor.shutdown()
+    assert not lock.locked()
+    assert list(dataframe.index) == ['8', '9']
+    assert executor.submitted_nb == 2
+
+
+def test_asyncio_lock():
+    queue_name_1 = 'TEST_ASYNCIO_LOCK_1'
+    queue_name_2 = 'TEST_ASYNCIO_LOCK_2'
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 5, ['A'], queue_name_1)
+    assign_dataframe(dataframe, 5, ['A'], queue_name_2)
+    # noinspection PyProtectedMember
+    instance = QueuesHandler._QueuesHandler__instance
+    lock = instance.get_assigned_lock(queue_name_1)
+    ticks = list()
+
+    @synchronized(queue_name=queue_name_2)
+    async def synchronized_function() -> int:
+        return len(ticks)
+
+    async def tick():
+        for _ in range(5):
+            ticks.append(None)
+            await asyncio.sleep(0.02)
+
+    async def wait_for_lock():
+        # The same asyncio Lock object is shared by the queues of a dataframe
+        assert instance.get_assigned_async_lock(queue_name_1) is \
+            instance.get_assigned_async_lock(queue_name_2)
+        results = await asyncio.gather(synchronized_function(), tick())
+        return results[0]
+
+    # The Lock object is held by another thread : the event loop is not blocked
+    lock.acquire()
+    thread = threading.Thread(target=lambda: (time.sleep(0.5), lock.release()))
+    thread.start()
+    assert run(wait_for_lock()) == 5
+    thread.join()
+    assert not lock.locked()
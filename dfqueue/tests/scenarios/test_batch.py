@@ -0,0 +1,87 @@
+# coding: utf8
+
+# noinspection PyPackageRequirements
+import pytest
+from pandas import DataFrame
+# noinspection PyProtectedMember
+from dfqueue.core.dfqueue import QueuesHandler
+from dfqueue import assign_dataframe, batch, get_info_provider, QueueStorage
+from . import remove_row, create_functions
+
+
+def run_operations(dataframe: DataFrame, queue_name: str) -> None:
+    add_row_function, change_row_value_function = create_functions(queue_name)
+    for index in range(20):
+        add_row_function(dataframe, str(index), {'A': index, 'B': -index})
+        if index % 3 == 0:
+            change_row_value_function(dataframe, str(index // 2), {'A': index * 10, 'B': 0})
+        if index % 7 == 0:
+            remove_row(dataframe, str(index))
+
+
+@pytest.mark.parametrize("queue_storage", [QueueStorage.DEQUE, QueueStorage.COLUMNAR])
+def test_batch(queue_storage):
+    reference_dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(reference_dataframe, 5, ['A'], 'TEST_BATCH_REFERENCE',
+                     queue_storage=queue_storage)
+    for index in range(4):
+        run_operations(reference_dataframe, 'TEST_BATCH_REFERENCE')
+
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 5, ['A'], 'TEST_BATCH', queue_storage=queue_storage)
+    provider = get_info_provider('TEST_BATCH')
+    for index in range(4):
+        with batch('TEST_BATCH'):
+            run_operations(dataframe, 'TEST_BATCH')
+            # Items are buffered and rows are not removed
+            assert len(provider.queue) == 5 * (index > 0)
+            assert len(dataframe) > 5
+        assert len(dataframe) == 5
+
+    # Rows removed and added again during the per-call managing are at the end of the reference
+    assert dataframe.sort_index().equals(reference_dataframe.sort_index())
+    assert QueuesHandler()._QueuesHandler__counters['TEST_BATCH'] == \
+        QueuesHandler()._QueuesHandler__counters['TEST_BATCH_REFERENCE']
+    assert list(provider.queue) == list(get_info_provider('TEST_BATCH_REFERENCE').queue)
+
+
+def test_nested_batch():
+    queue_name = 'TEST_NESTED_BATCH'
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 2, ['A'], queue_name)
+    add_row_function, change_row_value_function = create_functions(queue_name)
+
+    with batch(queue_name):
+        with batch(queue_name):
+            for index in range(4):
+                add_row_function(dataframe, str(index), {'A': index, 'B': index})
+        assert len(dataframe) == 4
+        assert len(QueuesHandler()._QueuesHandler__queues[queue_name]) == 0
+    assert list(dataframe.index) == ['2', '3']
+
+    # Without managing function, no rows are removed at the end of the batch
+    with batch(queue_name):
+        change_row_value_function(dataframe, '4', {'A': 4, 'B': 4})
+    assert list(dataframe.index) == ['2', '3', '4']
+    assert len(QueuesHandler()._QueuesHandler__queues[queue_name]) == 3
+
+
+def test_batch_exception():
+    queue_name = 'TEST_BATCH_EXCEPTION'
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 2, ['A'], queue_name)
+    add_row_function, _ = create_functions(queue_name)
+
+    with pytest.raises(ValueError):
+        with batch(queue_name):
+            for index in range(3):
+                add_row_function(dataframe, str(index), {'A': index, 'B': index})
+            raise ValueError()
+
+    # Buffered items are added even if the batch is interrupted
+    assert list(dataframe.index) == ['1', '2']
+    assert len(QueuesHandler()._QueuesHandler__queues[queue_name]) == 2
+
+    with pytest.raises(AssertionError):
+        with batch('UNKNOWN_QUEUE'):
+            pass
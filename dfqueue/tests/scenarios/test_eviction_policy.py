@@ -0,0 +1,78 @@
+# coding: utf8
+
+import time
+from typing import Tuple, Dict
+from uuid import uuid4
+# noinspection PyPackageRequirements
+import pytest
+from pandas import DataFrame
+from dfqueue import adding, managing, assign_dataframe, get_info_provider
+from . import add_row, create_queue_item
+
+
+def create_add_row_function(queue_name: str):
+    @managing(queue_name=queue_name)
+    @adding(queue_items_creation_function=create_queue_item,
+            other_args={"selected_columns": ['A']},
+            queue_name=queue_name)
+    def watermark_add_row(dataframe: DataFrame, index: str, columns_dict: dict) -> Tuple[str, Dict]:
+        return add_row(dataframe, index, columns_dict)
+    return watermark_add_row
+
+
+def test_watermarks():
+    queue_name = 'TEST_WATERMARKS'
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 8, ['A'], queue_name, high_watermark=10, low_watermark=5)
+    add_row_function = create_add_row_function(queue_name)
+
+    provider = get_info_provider(queue_name)
+    assert provider.high_watermark == 10
+    assert provider.low_watermark == 5
+
+    for index in range(10):
+        add_row_function(dataframe, str(index), {'A': str(uuid4()), 'B': str(uuid4())})
+        assert len(dataframe) == index + 1
+
+    # The high watermark is crossed : rows are removed until the low watermark
+    add_row_function(dataframe, '10', {'A': str(uuid4()), 'B': str(uuid4())})
+    assert list(dataframe.index) == ['6', '7', '8', '9', '10']
+    assert len(provider.queue) == 5
+
+
+def test_period_calls():
+    queue_name = 'TEST_PERIOD_CALLS'
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 2, ['A'], queue_name, managing_period_calls=3)
+    add_row_function = create_add_row_function(queue_name)
+
+    expected_sizes = [1, 2, 2, 3, 4, 2, 3, 4, 2]
+    for index, expected_size in enumerate(expected_sizes):
+        add_row_function(dataframe, str(index), {'A': str(uuid4()), 'B': str(uuid4())})
+        assert len(dataframe) == expected_size
+
+
+def test_period_ms():
+    queue_name = 'TEST_PERIOD_MS'
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 2, ['A'], queue_name, managing_period_ms=200)
+    add_row_function = create_add_row_function(queue_name)
+
+    for index in range(5):
+        add_row_function(dataframe, str(index), {'A': str(uuid4()), 'B': str(uuid4())})
+    assert len(dataframe) == 5
+
+    time.sleep(0.2)
+    add_row_function(dataframe, '5', {'A': str(uuid4()), 'B': str(uuid4())})
+    assert list(dataframe.index) == ['4', '5']
+
+
+@pytest.mark.parametrize("max_size,high_watermark,low_watermark", [
+    (5, 4, None),
+    (5, None, 6),
+    (5, 10, 6)
+])
+def test_invalid_watermarks(max_size, high_watermark, low_watermark):
+    with pytest.raises(AssertionError):
+        assign_dataframe(DataFrame(columns=['A', 'B']), max_size, ['A'], 'TEST_WATERMARKS',
+                         high_watermark=high_watermark, low_watermark=low_watermark)
@@ -0,0 +1,80 @@
+# coding: utf8
+
+from typing import Tuple, Dict
+from pandas import DataFrame
+# noinspection PyProtectedMember
+from dfqueue.core.dfqueue import QueuesHandler, QueueHandlerItem
+from dfqueue import adding, managing, synchronized, assign_dataframe, wait_for_eviction, \
+    stop_eviction_worker
+from . import add_row, create_queue_item
+
+
+def create_add_row_function(queue_name: str):
+    @managing(queue_name=queue_name)
+    @adding(queue_items_creation_function=create_queue_item,
+            other_args={"selected_columns": ['A']},
+            queue_name=queue_name)
+    def worker_add_row(dataframe: DataFrame, index: str, columns_dict: dict) -> Tuple[str, Dict]:
+        return add_row(dataframe, index, columns_dict)
+    return worker_add_row
+
+
+def get_worker(queue_name: str):
+    return QueuesHandler()[queue_name][QueueHandlerItem.EVICTION_WORKER]
+
+
+def test_eviction_worker():
+    queue_name = 'TEST_EVICTION_WORKER'
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 5, ['A'], queue_name, eviction_worker=True)
+    add_row_function = synchronized(queue_name=queue_name)(create_add_row_function(queue_name))
+    worker = get_worker(queue_name)
+    assert worker.is_alive
+    assert worker.max_overflow == 5
+
+    for index in range(20):
+        add_row_function(dataframe, str(index), {'A': index, 'B': index})
+        # The dataframe's size is bounded by the max size and the max overflow
+        assert len(dataframe) <= 10
+
+    assert wait_for_eviction(queue_name, timeout=10)
+    assert list(dataframe.index) == ['15', '16', '17', '18', '19']
+
+    assert stop_eviction_worker(queue_name, timeout=10)
+    assert not worker.is_alive
+    assert get_worker(queue_name) is None
+    assert stop_eviction_worker(queue_name)
+    assert wait_for_eviction(queue_name)
+
+    # Without eviction worker, the managing functions remove the rows themselves
+    add_row_function(dataframe, '20', {'A': 20, 'B': 20})
+    assert list(dataframe.index) == ['16', '17', '18', '19', '20']
+
+
+def test_eviction_worker_max_overflow():
+    queue_name = 'TEST_EVICTION_WORKER_MAX_OVERFLOW'
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 4, ['A'], queue_name, low_watermark=2, eviction_worker=True,
+                     max_overflow=2)
+    add_row_function = create_add_row_function(queue_name)
+    worker = get_worker(queue_name)
+
+    # The worker can't remove rows while the queue's lock is held
+    # noinspection PyProtectedMember
+    with QueuesHandler._QueuesHandler__instance.get_assigned_lock(queue_name):
+        for index in range(6):
+            add_row_function(dataframe, str(index), {'A': index, 'B': index})
+        assert len(dataframe) == 6
+        assert not worker.wait(timeout=0.1)
+
+        # The max overflow is exceeded : the managing function removes the rows itself
+        add_row_function(dataframe, '6', {'A': 6, 'B': 6})
+        assert list(dataframe.index) == ['5', '6']
+
+    assert wait_for_eviction(queue_name, timeout=10)
+    assert list(dataframe.index) == ['5', '6']
+
+    # A new assignment stops the previous worker
+    assign_dataframe(dataframe, 4, ['A'], queue_name)
+    assert worker.stop(timeout=10)
+    assert get_worker(queue_name) is None
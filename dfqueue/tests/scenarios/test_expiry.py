@@ -0,0 +1,83 @@
+# coding: utf8
+
+import time
+# noinspection PyPackageRequirements
+import pytest
+from pandas import DataFrame
+from dfqueue import synchronized, assign_dataframe, get_info_provider, \
+    expire_items, wait_for_eviction, stop_eviction_worker
+from . import create_functions
+
+
+def test_expiry():
+    queue_name = 'TEST_EXPIRY'
+    dataframe = DataFrame({'A': [0], 'B': [0]}, index=['0'])
+    assign_dataframe(dataframe, 100, ['A'], queue_name, ttl=0.2)
+    add_row_function, change_row_value_function = create_functions(queue_name)
+    provider = get_info_provider(queue_name)
+    assert provider.ttl == 0.2
+
+    add_row_function(dataframe, '1', {'A': 1, 'B': 1})
+    add_row_function(dataframe, '2', {'A': 2, 'B': 2})
+    time.sleep(0.3)
+
+    # The updated row's age starts at its last item
+    change_row_value_function(dataframe, '1', {'A': 10, 'B': 10})
+    add_row_function(dataframe, '3', {'A': 3, 'B': 3})
+    assert list(dataframe.index) == ['1', '3']
+    assert list(provider.queue) == [('1', {'A': 10}), ('3', {'A': 3})]
+
+    time.sleep(0.3)
+    assert expire_items(queue_name) == 2
+    assert dataframe.empty
+    assert len(provider.queue) == 0
+    assert expire_items(queue_name) == 0
+
+
+def test_expiry_compaction():
+    queue_name = 'TEST_EXPIRY_COMPACTION'
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 2, ['A'], queue_name, ttl=0.2, max_queue_length=3)
+    add_row_function, change_row_value_function = create_functions(queue_name)
+
+    add_row_function(dataframe, '0', {'A': 0, 'B': 0})
+    add_row_function(dataframe, '1', {'A': 1, 'B': 1})
+    time.sleep(0.3)
+    change_row_value_function(dataframe, '0', {'A': 10, 'B': 10})
+    # The queue is full : the superseded item of the row '0' is removed with its timestamp
+    change_row_value_function(dataframe, '0', {'A': 20, 'B': 20})
+
+    # Only the item of the row '1' has expired
+    assert expire_items(queue_name) == 1
+    assert list(dataframe.index) == ['0']
+    assert list(get_info_provider(queue_name).queue) == [('0', {'A': 10}), ('0', {'A': 20})]
+
+
+def test_expiry_sweeper():
+    queue_name = 'TEST_EXPIRY_SWEEPER'
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 100, ['A'], queue_name, ttl=0.1, eviction_worker=True,
+                     ttl_sweep_interval=0.05)
+    add_row_function = synchronized(queue_name=queue_name)(create_functions(queue_name)[0])
+
+    add_row_function(dataframe, '0', {'A': 0, 'B': 0})
+    # The rows are removed without managing function's call
+    deadline = time.monotonic() + 10
+    while not dataframe.empty and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert dataframe.empty
+
+    assert stop_eviction_worker(queue_name, timeout=10)
+    assert wait_for_eviction(queue_name)
+
+
+def test_invalid_expiry():
+    queue_name = 'TEST_INVALID_EXPIRY'
+    dataframe = DataFrame(columns=['A', 'B'])
+
+    with pytest.raises(AssertionError):
+        assign_dataframe(dataframe, 100, ['A'], queue_name, ttl=1, ttl_sweep_interval=1)
+
+    assign_dataframe(dataframe, 100, ['A'], queue_name)
+    with pytest.raises(AssertionError):
+        expire_items(queue_name)
@@ -0,0 +1,55 @@
+# coding: utf8
+
+from sys import getsizeof
+from pandas import DataFrame
+from dfqueue import assign_dataframe, get_info_provider
+from . import create_functions
+
+
+def get_rows_memory(dataframe: DataFrame) -> int:
+    # Memory of the rows without the hash table of the index (built by the label lookups)
+    return int(dataframe.memory_usage(deep=True, index=False).sum()) + \
+        sum(8 + getsizeof(label) for label in dataframe.index)
+
+
+def test_memory_budget():
+    queue_name = 'TEST_MEMORY_BUDGET'
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 1000, ['A'], queue_name, max_bytes=5000)
+    add_row_function, change_row_value_function = create_functions(queue_name,
+                                                                   managed_changes=True)
+    provider = get_info_provider(queue_name)
+    assert provider.max_bytes == 5000
+    assert provider.estimated_bytes == 0
+
+    # Small rows : the row count and the budget are not reached
+    for index in range(10):
+        add_row_function(dataframe, str(index), {'A': index, 'B': 'b'})
+    assert len(dataframe) == 10
+    assert provider.estimated_bytes == get_rows_memory(dataframe)
+
+    # Large rows : the first rows are removed until the estimate is under the budget
+    for index in range(10, 13):
+        add_row_function(dataframe, str(index), {'A': index, 'B': 'b' * 1500})
+        assert provider.estimated_bytes <= 5000
+        assert provider.estimated_bytes == get_rows_memory(dataframe)
+    assert list(dataframe.index)[-3:] == ['10', '11', '12']
+    assert len(dataframe) < 13
+
+    # Updated rows are estimated again
+    change_row_value_function(dataframe, '10', {'A': 100, 'B': 'b'})
+    assert provider.estimated_bytes == get_rows_memory(dataframe)
+
+
+def test_memory_budget_initial_rows():
+    queue_name = 'TEST_MEMORY_BUDGET_INITIAL_ROWS'
+    dataframe = DataFrame({'A': range(5), 'B': ['b' * 1000] * 5},
+                          index=[str(index) for index in range(5)])
+    assign_dataframe(dataframe, 1000, ['A'], queue_name, max_bytes=3000)
+    add_row_function, _ = create_functions(queue_name)
+    provider = get_info_provider(queue_name)
+    assert provider.estimated_bytes == get_rows_memory(dataframe)
+
+    add_row_function(dataframe, '5', {'A': 5, 'B': 'b'})
+    assert provider.estimated_bytes <= 3000
+    assert list(dataframe.index) == ['3', '4', '5']
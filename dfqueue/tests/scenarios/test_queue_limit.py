@@ -0,0 +1,164 @@
+# coding: utf8
+
+import time
+from collections import Counter
+from threading import Thread
+# noinspection PyPackageRequirements
+import pytest
+from pandas import DataFrame
+from dfqueue import managing, synchronized, assign_dataframe, get_info_provider, QueueBehaviour, \
+    QueueFullPolicy, QueueFullError
+from . import create_functions
+
+
+def test_queue_compaction():
+    queue_name = 'TEST_QUEUE_COMPACTION'
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 3, ['A'], queue_name, max_queue_length=5)
+    add_row_function, change_row_value_function = create_functions(queue_name)
+    provider = get_info_provider(queue_name)
+    assert provider.max_queue_length == 5
+
+    for index in range(3):
+        add_row_function(dataframe, str(index), {'A': index, 'B': index})
+
+    # The superseded items are removed when the max length is reached
+    for value in range(100):
+        change_row_value_function(dataframe, '1', {'A': value, 'B': value})
+        assert len(provider.queue) <= 5
+    # The queue is only compacted when it is full
+    assert list(provider.queue) == [('0', {'A': 0}), ('2', {'A': 2}), ('1', {'A': 97}),
+                                    ('1', {'A': 98}), ('1', {'A': 99})]
+    assert provider.counter == {'0': Counter({frozenset(['A']): 1}),
+                                '1': Counter({frozenset(['A']): 3}),
+                                '2': Counter({frozenset(['A']): 1})}
+
+    # The managing process is unchanged (the row '1' is the most recently updated row)
+    add_row_function(dataframe, '3', {'A': 3, 'B': 3})
+    add_row_function(dataframe, '4', {'A': 4, 'B': 4})
+    assert list(dataframe.index) == ['1', '3', '4']
+
+
+@pytest.mark.parametrize("rows_nb, compacted", [(15, False), (14, True)])
+def test_queue_compaction_threshold(rows_nb: int, compacted: bool):
+    queue_name = 'TEST_QUEUE_COMPACTION_THRESHOLD_{}'.format(rows_nb)
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 15, ['A'], queue_name, max_queue_length=16,
+                     queue_full_policy=QueueFullPolicy.RAISE)
+    add_row_function, change_row_value_function = create_functions(queue_name)
+    provider = get_info_provider(queue_name)
+
+    for index in range(rows_nb):
+        add_row_function(dataframe, str(index), {'A': index, 'B': index})
+    for index in range(16 - rows_nb):
+        change_row_value_function(dataframe, str(index), {'A': 20, 'B': 20})
+    assert len(provider.queue) == 16
+
+    # The full queue is only compacted with at least 1/8 of its max length superseded
+    if compacted:
+        change_row_value_function(dataframe, '5', {'A': 21, 'B': 21})
+        assert len(provider.queue) == 15
+        assert list(provider.queue)[-1] == ('5', {'A': 21})
+    else:
+        with pytest.raises(QueueFullError):
+            change_row_value_function(dataframe, '5', {'A': 21, 'B': 21})
+        assert len(provider.queue) == 16
+
+
+def test_queue_limit_high_watermark():
+    # The rows of the dataframe have their items in the queue until the managing process
+    with pytest.raises(AssertionError):
+        assign_dataframe(DataFrame(columns=['A', 'B']), 3, ['A'], 'TEST_QUEUE_LIMIT_WATERMARK',
+                         max_queue_length=3)
+    with pytest.raises(AssertionError):
+        assign_dataframe(DataFrame(columns=['A', 'B']), 3, ['A'], 'TEST_QUEUE_LIMIT_WATERMARK',
+                         high_watermark=5, max_queue_length=4)
+
+
+def test_queue_full_raise():
+    queue_name = 'TEST_QUEUE_FULL_RAISE'
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 2, ['A'], queue_name, queue_behaviour=QueueBehaviour.ALL_ITEMS,
+                     max_queue_length=3)
+    add_row_function, change_row_value_function = create_functions(queue_name)
+
+    for index in range(2):
+        add_row_function(dataframe, str(index), {'A': index, 'B': index})
+    change_row_value_function(dataframe, '1', {'A': 10, 'B': 10})
+
+    # All the items are used by the managing process : nothing is compacted and the rows are
+    # not written
+    with pytest.raises(QueueFullError):
+        change_row_value_function(dataframe, '1', {'A': 20, 'B': 20})
+    with pytest.raises(QueueFullError):
+        add_row_function(dataframe, '2', {'A': 2, 'B': 2})
+    assert list(dataframe.index) == ['0', '1']
+    assert dataframe.at['1', 'A'] == 10
+    assert len(get_info_provider(queue_name).queue) == 3
+
+
+def test_queue_full_eviction():
+    queue_name = 'TEST_QUEUE_FULL_EVICTION'
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 2, ['A'], queue_name, queue_behaviour=QueueBehaviour.ALL_ITEMS,
+                     max_queue_length=3)
+    add_row_function, change_row_value_function = create_functions(queue_name)
+    add_row_function = synchronized(queue_name=queue_name)(add_row_function)
+
+    add_row_function(dataframe, '0', {'A': 0, 'B': 0})
+    add_row_function(dataframe, '1', {'A': 1, 'B': 1})
+    change_row_value_function(dataframe, '1', {'A': 10, 'B': 10})
+    dataframe.at['X'] = [None, None]
+
+    # The queue is full : the synchronized adding function runs the due managing process first
+    add_row_function(dataframe, '2', {'A': 2, 'B': 2})
+    assert list(dataframe.index) == ['X', '2']
+    assert list(get_info_provider(queue_name).queue) == [('2', {'A': 2})]
+
+
+def test_queue_full_block():
+    queue_name = 'TEST_QUEUE_FULL_BLOCK'
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 2, ['A'], queue_name, queue_behaviour=QueueBehaviour.ALL_ITEMS,
+                     max_queue_length=3, queue_full_policy=QueueFullPolicy.BLOCK,
+                     queue_full_timeout=10)
+    add_row_function, change_row_value_function = create_functions(queue_name)
+    add_row_function = synchronized(queue_name=queue_name)(add_row_function)
+
+    @synchronized(queue_name=queue_name)
+    @managing(queue_name=queue_name)
+    def add_unqueued_row():
+        dataframe.at['X'] = [None, None]
+
+    add_row_function(dataframe, '0', {'A': 0, 'B': 0})
+    add_row_function(dataframe, '1', {'A': 1, 'B': 1})
+    change_row_value_function(dataframe, '1', {'A': 10, 'B': 10})
+
+    # The new row waits for the managing process of another thread without holding the lock
+    thread = Thread(target=add_row_function, args=(dataframe, '2', {'A': 2, 'B': 2}))
+    thread.start()
+    time.sleep(0.2)
+    assert thread.is_alive()
+    assert '2' not in dataframe.index
+    add_unqueued_row()
+    thread.join(10)
+    assert not thread.is_alive()
+    assert list(dataframe.index) == ['X', '2']
+    assert list(get_info_provider(queue_name).queue) == [('2', {'A': 2})]
+
+
+def test_queue_full_block_timeout():
+    queue_name = 'TEST_QUEUE_FULL_BLOCK_TIMEOUT'
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 1, ['A'], queue_name, queue_behaviour=QueueBehaviour.ALL_ITEMS,
+                     max_queue_length=2, queue_full_policy=QueueFullPolicy.BLOCK,
+                     queue_full_timeout=0.1)
+    add_row_function, change_row_value_function = create_functions(queue_name)
+
+    add_row_function(dataframe, '0', {'A': 0, 'B': 0})
+    change_row_value_function(dataframe, '0', {'A': 10, 'B': 10})
+    start = time.monotonic()
+    with pytest.raises(QueueFullError):
+        add_row_function(dataframe, '1', {'A': 1, 'B': 1})
+    assert time.monotonic() - start >= 0.1
+    assert list(dataframe.index) == ['0']
@@ -0,0 +1,83 @@
+# coding: utf8
+
+# noinspection PyPackageRequirements
+import pytest
+from pandas import DataFrame
+from dfqueue import adding, managing, assign_dataframe, get_info_provider, save_queue, \
+    load_queue, register_hook, unregister_hook, QueueBehaviour, QueueEvent, RingFrame
+
+
+def run_operations(queue_name: str, frame, queue_behaviour: QueueBehaviour) -> list:
+    assign_dataframe(frame, 3, ['A'], queue_name, queue_behaviour=queue_behaviour)
+
+    @managing(queue_name=queue_name)
+    @adding(queue_name=queue_name)
+    def add_row(label: str, value: int) -> list:
+        if isinstance(frame, RingFrame):
+            frame.set_row(label, {'A': value, 'B': value * 10})
+        else:
+            frame.loc[label] = [value, value * 10]
+        return [(label, {'A': value})]
+
+    # The checking value of the item doesn't match the row
+    @adding(queue_name=queue_name)
+    def add_stale_item(label: str) -> list:
+        return [(label, {'A': -1})]
+
+    evicted_batches = list()
+
+    def on_batch_evicted(name, queue_items, removed_labels, *_):
+        if name == queue_name:
+            evicted_batches.append((dict(queue_items), sorted(removed_labels)))
+
+    register_hook(QueueEvent.BATCH_EVICTED, on_batch_evicted)
+    try:
+        add_row('a', 3)
+        add_stale_item('c')
+        for value, label in enumerate('defghij'):
+            add_row(label, value + 4)
+        add_row('h', 20)
+        add_row('k', 21)
+    finally:
+        unregister_hook(QueueEvent.BATCH_EVICTED, on_batch_evicted)
+    return evicted_batches
+
+
+@pytest.mark.parametrize('queue_behaviour', [QueueBehaviour.LAST_ITEM, QueueBehaviour.ALL_ITEMS])
+def test_ring_frame_managing(queue_behaviour):
+    dataframe = DataFrame({'A': [0, 1, 2], 'B': [0, 10, 20]}, index=['a', 'b', 'c'])
+    frame = RingFrame.from_dataframe(dataframe)
+    # Same evictions as a DataFrame object
+    expected_batches = run_operations('TEST_RING_FRAME_EXPECTED', dataframe, queue_behaviour)
+    assert run_operations('TEST_RING_FRAME', frame, queue_behaviour) == expected_batches
+    assert get_info_provider('TEST_RING_FRAME').assigned_dataframe is frame
+    assert len(frame) == 3
+    assert frame.to_dataframe().sort_index().equals(dataframe.sort_index())
+    # The rows are added before the managing process : the capacity is doubled once, then the
+    # slots of the removed rows are reused
+    assert frame.capacity == 6
+
+
+def test_ring_frame_assignment():
+    queue_name = 'TEST_RING_FRAME_ASSIGNMENT'
+    frame = RingFrame(['A', 'B'], 2)
+    assign_dataframe(frame, 10, ['A'], queue_name, high_watermark=15)
+    assert frame.capacity == 15
+    assert len(get_info_provider(queue_name).queue) == 0
+
+    with pytest.raises(AssertionError):
+        assign_dataframe(frame, 10, ['A'], queue_name, max_bytes=1000)
+
+
+def test_ring_frame_snapshot(tmp_path):
+    queue_name = 'TEST_RING_FRAME_SNAPSHOT'
+    frame = RingFrame.from_dataframe(DataFrame({'A': [0.0, 1.0]}, index=[1, 2]), capacity=4)
+    assign_dataframe(frame, 4, ['A'], queue_name)
+    frame.set_row(3, {'A': 2.0})
+    frame.remove_row(1)
+
+    save_queue(queue_name, str(tmp_path))
+    dataframe = load_queue(str(tmp_path))
+    assert isinstance(dataframe, DataFrame)
+    assert dataframe.index.tolist() == [2, 3]
+    assert get_info_provider(queue_name).assigned_dataframe is dataframe
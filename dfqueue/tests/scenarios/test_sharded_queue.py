@@ -0,0 +1,84 @@
+# coding: utf8
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from threading import Lock
+from pandas import DataFrame
+from dfqueue import adding, managing, synchronized, assign_dataframe, get_info_provider, \
+    QueueStorage, QueueBehaviour
+
+
+def test_sharded_queue_threads():
+    queue_name = 'TEST_SHARDED_QUEUE_THREADS'
+    dataframe = DataFrame({'A': range(100)})
+    assign_dataframe(dataframe, 100, ['A'], queue_name, queue_storage=QueueStorage.SHARDED,
+                     queue_behaviour=QueueBehaviour.ALL_ITEMS, shards_nb=4)
+    dataframe_lock = Lock()
+
+    # The rows are updated with the dataframe's lock : the items are added in parallel
+    @synchronized(queue_name=queue_name, shared=True)
+    @adding(queue_name=queue_name)
+    def update_row(label: int, value: int) -> list:
+        with dataframe_lock:
+            dataframe.at[label, 'A'] = value
+        return [(label, {'A': value})]
+
+    @synchronized(queue_name=queue_name)
+    @managing(queue_name=queue_name)
+    def manage() -> None:
+        pass
+
+    def thread_updating(start_value: int):
+        for value in range(start_value, start_value + 1000):
+            update_row(value % 100, value)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for future in [executor.submit(thread_updating, start_value * 1000)
+                       for start_value in range(4)]:
+            future.result()
+
+    provider = get_info_provider(queue_name)
+    assert len(provider.queue) == 4100
+    assert sum(sum(label_counter.values()) for label_counter in provider.counter.values()) == \
+        4100
+    assert provider.counter[0] == Counter({frozenset(['A']): 41})
+
+    # The rows are not removed (dataframe's size under the max size)
+    manage()
+    assert len(provider.queue) == 4100
+    assert len(dataframe) == 100
+
+
+def test_sharded_queue_stats():
+    queue_name = 'TEST_SHARDED_QUEUE_STATS'
+    dataframe = DataFrame({'A': range(100)})
+    assign_dataframe(dataframe, 100, ['A'], queue_name, queue_storage=QueueStorage.SHARDED,
+                     queue_behaviour=QueueBehaviour.ALL_ITEMS, shards_nb=8)
+
+    @synchronized(queue_name=queue_name, shared=True)
+    @adding(queue_name=queue_name)
+    def add_item(label: int) -> list:
+        return [(label, {'A': label})]
+
+    def thread_adding(thread_index: int):
+        for call_index in range(5000):
+            add_item((thread_index * 7 + call_index) % 100)
+
+    # Frequent thread switches between the appends of the shards
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for future in [executor.submit(thread_adding, thread_index)
+                           for thread_index in range(8)]:
+                future.result()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    # The shards count their items : no added item is lost by the statistics
+    provider = get_info_provider(queue_name)
+    assert len(provider.queue) == 40100
+    assert provider.stats.items_added == 40000
+    # The items counted by the shards are only collected once
+    assert provider.stats.items_added == 40000
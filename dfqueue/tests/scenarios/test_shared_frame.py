@@ -0,0 +1,109 @@
+# coding: utf8
+
+import multiprocessing
+from collections import Counter
+from typing import Tuple, Dict
+from pandas import DataFrame
+from dfqueue import adding, managing, synchronized, assign_dataframe, attach_dataframe, \
+    get_info_provider, batch, QueueBehaviour, SharedFrame
+from . import create_queue_item
+
+QUEUE_NAME = 'TEST_SHARED_FRAME'
+
+
+def shared_add_row(frame: SharedFrame, index: int, columns_dict: dict) -> Tuple[int, Dict]:
+    frame.set_row(index, columns_dict)
+    return index, columns_dict
+
+
+@synchronized(queue_name=QUEUE_NAME)
+@managing(queue_name=QUEUE_NAME)
+@adding(queue_items_creation_function=create_queue_item,
+        other_args={"selected_columns": ['A']},
+        queue_name=QUEUE_NAME)
+def process_add_row(frame: SharedFrame, index: int, columns_dict: dict) -> Tuple[int, Dict]:
+    return shared_add_row(frame, index, columns_dict)
+
+
+@synchronized(queue_name=QUEUE_NAME, shared=True)
+@adding(queue_items_creation_function=create_queue_item,
+        other_args={"selected_columns": ['A']},
+        queue_name=QUEUE_NAME)
+def process_change_row_value(frame: SharedFrame, index: int,
+                             new_columns_dict: dict) -> Tuple[int, Dict]:
+    return shared_add_row(frame, index, new_columns_dict)
+
+
+def run_process(frame: SharedFrame, first_label: int, operation_number: int):
+    attach_dataframe(frame, QUEUE_NAME)
+    for label in range(first_label, first_label + operation_number):
+        process_add_row(frame, label, {'A': label, 'B': 0})
+        process_change_row_value(frame, label, {'A': -label})
+
+
+def test_shared_frame():
+    frame = SharedFrame(['A', 'B'], 200)
+    frame.set_row(0, {'A': 0, 'B': 0})
+    assign_dataframe(frame, 100, ['A'], QUEUE_NAME)
+    provider = get_info_provider(QUEUE_NAME)
+    assert provider.assigned_dataframe is frame
+    assert list(provider.queue) == [(0, {'A': 0.0})]
+
+    processes = [multiprocessing.Process(target=run_process, args=(frame, 1000 * index, 300))
+                 for index in range(1, 4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+
+    # Each process evicts the rows of the other processes
+    assert len(frame) == 100
+    dataframe = frame.to_dataframe()
+    assert isinstance(dataframe, DataFrame)
+    assert (dataframe['A'] == -dataframe.index).all()
+    # The items of the removed rows are removed from the shared queue
+    assert sorted(set(label for label, _ in provider.queue)) == sorted(dataframe.index.tolist())
+
+    with batch(QUEUE_NAME):
+        process_add_row(frame, 1, {'A': 1, 'B': 1})
+        assert len(frame) == 101
+    assert len(frame) == 100
+    assert 1 in frame
+
+
+def test_attach_dataframe():
+    frame = SharedFrame(['A'], 10)
+    assign_dataframe(frame, 5, ['A'], 'TEST_SHARED_FRAME_ASSIGNED',
+                     queue_behaviour=QueueBehaviour.ALL_ITEMS, high_watermark=6, low_watermark=4)
+    frame.append_items([(0, {'A': 0})])
+
+    attach_dataframe(frame, 'TEST_SHARED_FRAME_ATTACHED')
+    provider = get_info_provider('TEST_SHARED_FRAME_ATTACHED')
+    assert provider.max_size == 5
+    assert provider.high_watermark == 6
+    assert provider.low_watermark == 4
+    # The shared queue isn't reset
+    assert list(provider.queue) == [(0, {'A': 0.0})]
+    # The items are counted in the shared memory
+    assert provider.counter == {0: Counter({frozenset(['A']): 1})}
+    assert get_info_provider('TEST_SHARED_FRAME_ASSIGNED').counter[0][frozenset(['A'])] == 1
+
+
+def test_updated_rows():
+    queue_name = 'TEST_SHARED_FRAME_UPDATED'
+    frame = SharedFrame(['A'], 100)
+    assign_dataframe(frame, 100, ['A'], queue_name)
+
+    @managing(queue_name=queue_name)
+    @adding(queue_items_creation_function=create_queue_item,
+            other_args={"selected_columns": ['A']},
+            queue_name=queue_name)
+    def update_row(index: int, value: int) -> Tuple[int, Dict]:
+        return shared_add_row(frame, index, {'A': value})
+
+    # The queue's items of the same rows don't fill the ring buffer
+    for value in range(2000):
+        update_row(value % 10, value)
+    assert len(frame) == 10
+    assert get_info_provider(queue_name).queue[-1] == (9, {'A': 1999.0})
@@ -0,0 +1,66 @@
+# coding: utf8
+
+from concurrent.futures import ThreadPoolExecutor
+from random import randint
+from typing import Tuple, Dict
+from pandas import DataFrame
+# noinspection PyPackageRequirements
+import pytest
+# noinspection PyProtectedMember
+from dfqueue.core.dfqueue import QueuesHandler
+from dfqueue import adding, managing, synchronized, assign_dataframe, get_info_provider
+from . import add_row, create_queue_item
+
+
+def test_shared_synchronized():
+    queue_name = 'TEST_SHARED_SYNCHRONIZED'
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 50, ['A'], queue_name)
+    # noinspection PyProtectedMember
+    lock = QueuesHandler._QueuesHandler__instance.get_assigned_lock(queue_name)
+
+    @synchronized(queue_name=queue_name)
+    @managing(queue_name=queue_name)
+    @adding(queue_items_creation_function=create_queue_item,
+            other_args={"selected_columns": ['A']},
+            queue_name=queue_name)
+    def exclusive_add_row(index: str, columns_dict: dict) -> Tuple[str, Dict]:
+        return add_row(dataframe, index, columns_dict)
+
+    # Rows are read but the structure of the dataframe is not modified
+    @synchronized(queue_name=queue_name, shared=True)
+    @managing(queue_name=queue_name)
+    @adding(queue_name=queue_name)
+    def shared_touch_row() -> list:
+        assert lock.shared_nb > 0
+        label = dataframe.index[randint(0, len(dataframe) - 1)]
+        return [(label, {'A': dataframe.at[label, 'A']})]
+
+    def thread_adding(start_index: int):
+        for index in range(start_index, start_index + 500):
+            exclusive_add_row(str(index), {'A': index, 'B': index})
+
+    def thread_touching():
+        for _ in range(2000):
+            shared_touch_row()
+
+    exclusive_add_row('-1', {'A': -1, 'B': -1})
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(thread_adding, 0), executor.submit(thread_adding, 500),
+                   executor.submit(thread_touching), executor.submit(thread_touching)]
+        for future in futures:
+            future.result()
+
+    assert not lock.locked()
+    assert len(dataframe) == 50
+    provider = get_info_provider(queue_name)
+    counter = QueuesHandler()._QueuesHandler__counters[queue_name]
+    assert sum(sum(label_counter.values()) for label_counter in counter.values()) == \
+        len(provider.queue)
+
+
+def test_shared_synchronized_coroutine():
+    with pytest.raises(AssertionError):
+        @synchronized(shared=True)
+        async def coroutine_function():
+            pass
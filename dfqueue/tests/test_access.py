@@ -0,0 +1,53 @@
+# coding: utf8
+
+# noinspection PyPackageRequirements
+import pytest
+from dfqueue.core.access import RecencyQueue, FrequencyQueue
+
+
+def test_recency_queue():
+    queue = RecencyQueue([('a', {'A': 1}), ('b', {'A': 2}), ('c', {'A': 3})])
+    assert len(queue) == 3
+
+    assert queue.append(('a', {'A': 10})) == ('a', {'A': 1})
+    assert queue.append(('d', {'A': 4})) is None
+    assert queue.touch('b')
+    assert not queue.touch('UNKNOWN')
+    assert list(queue) == [('c', {'A': 3}), ('a', {'A': 10}), ('d', {'A': 4}), ('b', {'A': 2})]
+    assert queue[1] == ('a', {'A': 10})
+    assert queue[-1] == ('b', {'A': 2})
+    assert ('d', {'A': 4}) in queue
+
+    assert queue.popleft() == ('c', {'A': 3})
+    assert queue == [('a', {'A': 10}), ('d', {'A': 4}), ('b', {'A': 2})]
+    queue.clear()
+    with pytest.raises(IndexError):
+        queue.popleft()
+
+
+def test_frequency_queue():
+    queue = FrequencyQueue([('a', {'A': 1}), ('b', {'A': 2}), ('c', {'A': 3})])
+
+    assert queue.touch('a')
+    assert queue.touch('a')
+    assert queue.touch('c')
+    assert queue.extend([('b', {'A': 20}), ('d', {'A': 4})]) == [('b', {'A': 2})]
+    assert not queue.touch('UNKNOWN')
+    assert queue.get_frequency('a') == 3
+    assert queue.get_frequency('b') == 2
+    assert queue.get_frequency('UNKNOWN') == 0
+    # Least frequently used first, then least recently used
+    assert list(queue) == [('d', {'A': 4}), ('c', {'A': 3}), ('b', {'A': 20}), ('a', {'A': 1})]
+
+    assert queue.popleft() == ('d', {'A': 4})
+    assert queue.popleft() == ('c', {'A': 3})
+    assert queue.append(('e', {'A': 5})) is None
+    assert list(queue) == [('e', {'A': 5}), ('b', {'A': 20}), ('a', {'A': 1})]
+    assert len(queue) == 3
+
+    for _ in range(3):
+        queue.popleft()
+    assert len(queue) == 0
+    assert list(queue) == []
+    with pytest.raises(IndexError):
+        queue.popleft()
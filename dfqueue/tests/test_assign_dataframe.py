@@ -1,12 +1,12 @@
 # coding: utf8
 
-from collections import deque
+from collections import deque, Counter
 from datetime import datetime
 # noinspection PyPackageRequirements
 import pytest
 # noinspection PyPackageRequirements
 from numpy import array
-from pandas import DataFrame
+from pandas import DataFrame, MultiIndex
 from dfqueue import assign_dataframe
 # noinspection PyProtectedMember
 from dfqueue.core.dfqueue import QueuesHandler, QueueHandlerItem
@@ -72,3 +72,28 @@ def test_assign_none(queue_name):
     assert queue_data[QueueHandlerItem.MAX_SIZE] == 1
     assert queue_data[QueueHandlerItem.DATAFRAME] is None
     assert queue_data[QueueHandlerItem.QUEUE] == deque()
+
+
+@pytest.mark.parametrize("dataframe,selected_columns", [
+    (DataFrame(array([[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12]]), index=['a1', 'a2', 'a1'],
+               columns=['A', 'B', 'C', 'D']), ["D", "B"]),
+    (DataFrame(array([[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12]]), index=['a1', 'a2', 'a3'],
+               columns=MultiIndex.from_tuples([('A', '1'), ('A', '2'), ('B', '1'), ('B', '2')])),
+     [('A', '2'), ('B', '1')]),
+    (DataFrame(array([[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12]]), index=['a1', 'a2', 'a3'],
+               columns=['A', 'B', 'C', 'D']), [])
+])
+def test_assign_dataframe_order_and_counter(dataframe, selected_columns):
+    assign_dataframe(dataframe, 10, selected_columns, queue_name="TEST_3")
+    queue_data = QueuesHandler()["TEST_3"]
+
+    expected_queue = deque()
+    expected_counter = dict()
+    for index, label in enumerate(dataframe.index):
+        expected_queue.append((label, {column: dataframe.iloc[index][column]
+                                       for column in selected_columns}))
+        expected_counter.setdefault(label, Counter())[frozenset(selected_columns)] += 1
+
+    assert queue_data[QueueHandlerItem.QUEUE] == expected_queue
+    assert queue_data[QueueHandlerItem.COUNTER] == expected_counter
+    assert list(queue_data[QueueHandlerItem.COUNTER]) == list(expected_counter)
@@ -0,0 +1,97 @@
+# coding: utf8
+
+from datetime import datetime
+# noinspection PyPackageRequirements
+import numpy
+# noinspection PyPackageRequirements
+import pytest
+from pandas import DataFrame, Timestamp
+from dfqueue import adding, managing, assign_dataframe, get_info_provider, FrameBackend, \
+    DataFrameBackend
+from dfqueue.core.backends import get_backend
+
+
+class DictBackend(FrameBackend):
+    """
+        Rows stored in a dictionary (label -> values of the columns).
+    """
+
+    def __init__(self, columns: list):
+        self.rows = dict()
+        self.__columns = columns
+
+    @property
+    def columns(self) -> list:
+        return self.__columns
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def get_positions(self, labels: list) -> numpy.ndarray:
+        positions = {label: position for position, label in enumerate(self.rows)}
+        return numpy.array([positions.get(label, -1) for label in labels], dtype=numpy.int64)
+
+    def get_values(self, column, positions: numpy.ndarray) -> numpy.ndarray:
+        values = numpy.array([row[column] for row in self.rows.values()], dtype=object)
+        return values[positions]
+
+    def drop_labels(self, labels: list):
+        for label in labels:
+            del self.rows[label]
+
+    def to_dataframe(self) -> DataFrame:
+        return DataFrame.from_dict(self.rows, orient='index', columns=self.__columns)
+
+
+def test_dataframe_backend():
+    dataframe = DataFrame({'A': [1, 2, 3],
+                           'B': [Timestamp(datetime(2020, 1, day)) for day in range(1, 4)]},
+                          index=['a', 'b', 'c'])
+    backend = get_backend(dataframe)
+    assert isinstance(backend, DataFrameBackend)
+    assert get_backend(backend) is backend
+    assert len(backend) == 3
+    assert backend.get_positions(['c', 'd', 'a']).tolist() == [2, -1, 0]
+    assert backend.get_values('B', numpy.array([1])).tolist() == [datetime(2020, 1, 2)]
+    assert backend.select_labels(['c', 'd', 'a']) == ['a', 'c']
+    assert backend.select_matching_labels({'a': {'A': 1}, 'c': {'A': 0}}) == ['a']
+
+    backend.drop_labels(['a'])
+    assert dataframe.index.tolist() == ['b', 'c']
+    assert backend.to_dataframe() is dataframe
+
+
+def test_incomplete_backend():
+    class ColumnsBackend(FrameBackend):
+        @property
+        def columns(self) -> list:
+            return ['A']
+
+    # The abstract methods are checked at the creation of the backend
+    with pytest.raises(TypeError):
+        FrameBackend()
+    with pytest.raises(TypeError):
+        ColumnsBackend()
+    assert DictBackend(['A']).empty
+
+
+def test_custom_backend_managing():
+    queue_name = 'TEST_CUSTOM_BACKEND'
+    backend = DictBackend(['A', 'B'])
+    backend.rows = {'a': {'A': 0, 'B': 'x'}, 'b': {'A': 1, 'B': 'y'}}
+    assign_dataframe(backend, 3, ['A'], queue_name)
+    assert len(get_info_provider(queue_name).queue) == 2
+
+    @managing(queue_name=queue_name)
+    @adding(queue_name=queue_name)
+    def add_row(label: str, value: int) -> list:
+        backend.rows[label] = {'A': value, 'B': str(value)}
+        return [(label, {'A': value})]
+
+    add_row('c', 2)
+    add_row('a', 3)
+    assert sorted(backend.rows) == ['a', 'b', 'c']
+    add_row('d', 4)
+    # The first item of 'a' is superseded by its last item : the row of 'b' is removed
+    assert sorted(backend.rows) == ['a', 'c', 'd']
+    assert get_info_provider(queue_name).assigned_dataframe is backend
@@ -0,0 +1,171 @@
+# coding: utf8
+
+from datetime import datetime
+# noinspection PyPackageRequirements
+import numpy
+# noinspection PyPackageRequirements
+import pytest
+from pandas import DataFrame, Index, MultiIndex, RangeIndex, Timestamp
+from dfqueue import assign_dataframe, managing, adding
+from dfqueue.core.comparison import select_matching_labels, get_label_positions, LabelPositions
+
+
+def test_select_matching_labels():
+    dataframe = DataFrame({'A': [1.0, numpy.nan, 3.0], 'B': ['a', None, 'c'],
+                           'C': [Timestamp(datetime(2020, 1, 1)), None,
+                                 Timestamp(datetime(2020, 1, 3))]},
+                          index=['a1', 'a2', 'a3'])
+
+    assert sorted(select_matching_labels(dataframe, {'a1': {'A': 1.0, 'B': 'a'},
+                                                     'a2': {'A': numpy.nan, 'B': None},
+                                                     'a3': {'A': 3.0, 'B': 'x'}})) == ['a1', 'a2']
+    assert sorted(select_matching_labels(dataframe, {'a1': {'C': datetime(2020, 1, 1)},
+                                                     'a2': {'C': None},
+                                                     'a3': {'C': datetime(2020, 1, 1)}})) == \
+        ['a1', 'a2']
+    # Items with different checking columns in the same batch
+    assert sorted(select_matching_labels(dataframe, {'a1': {'A': 1},
+                                                     'a2': {'B': None},
+                                                     'a3': {'A': 3.0, 'B': 'c'}})) == \
+        ['a1', 'a2', 'a3']
+    assert select_matching_labels(dataframe, {'a1': {}}) == ['a1']
+    assert select_matching_labels(dataframe, {}) == []
+
+
+def test_select_matching_labels_multiindex():
+    columns = MultiIndex.from_tuples([('A', '1'), ('A', '2'), ('B', '1')])
+    dataframe = DataFrame([[1, 'x', 2.5], [2, 'y', 3.5]], index=[0, 1], columns=columns)
+
+    assert select_matching_labels(dataframe, {0: {('A', '1'): 1, ('B', '1'): 2.5},
+                                              1: {('A', '1'): 2, ('B', '1'): 0.0}}) == [0]
+    assert select_matching_labels(dataframe, {0: {('A', '2'): 'y'},
+                                              1: {('A', '2'): 'y'}}) == [1]
+
+
+def test_get_label_positions():
+    # Binary searches
+    assert get_label_positions(Index([2, 5, 7, 10]), [10, 3, 2, 11, 7]).tolist() == \
+        [3, -1, 0, -1, 2]
+    assert get_label_positions(Index([2, 5, 7]), numpy.array([5], dtype=numpy.uint8)).tolist() == \
+        [1]
+    # Hash table of the index
+    assert get_label_positions(Index([2, 5, 7]), ['a', 5]).tolist() == [-1, 1]
+    assert get_label_positions(Index([7, 2, 5]), [5, 7]).tolist() == [2, 0]
+    assert get_label_positions(Index(['a', 'b', 'c']), ['c', 'd', 'a']).tolist() == [2, -1, 0]
+    # Arithmetic
+    assert get_label_positions(RangeIndex(10, 20, 2), [12, 13, 18, 20]).tolist() == [1, -1, 4, -1]
+    assert get_label_positions(Index([1, 2]), []).tolist() == []
+    with pytest.raises(ValueError):
+        get_label_positions(Index(['a', 'b', 'a']), ['b'])
+
+
+def test_label_positions():
+    label_positions = LabelPositions()
+    index = Index(['a', 'b', 'c', 'd', 'e'])
+    assert label_positions.get_positions(index, ['c', 'x', 'a']).tolist() == [2, -1, 0]
+
+    # Removed rows : the other labels keep their slots
+    new_index = index.delete([0, 2])
+    label_positions.remove(index, ['a', 'c'], new_index)
+    assert label_positions.get_positions(new_index, ['d', 'a', 'b', 'e']).tolist() == \
+        [1, -1, 0, 2]
+    # Rows added at the end of the index (removed label added again)
+    index = new_index.append(Index(['a', 'f']))
+    assert label_positions.get_positions(index, ['f', 'a', 'd']).tolist() == [4, 3, 1]
+
+    # Index changed by other operations : the map is rebuilt
+    index = index.delete([1])
+    assert label_positions.get_positions(index, ['f', 'd']).tolist() == [3, -1]
+    index = index.insert(0, 'g')
+    assert label_positions.get_positions(index, ['g', 'f']).tolist() == [0, 4]
+    index = Index(['e', 'f', 'g'])
+    assert label_positions.get_positions(index, ['g', 'a']).tolist() == [2, -1]
+
+    # Index searched by arithmetic until its first removal
+    label_positions = LabelPositions()
+    index = RangeIndex(0, 10)
+    assert label_positions.get_positions(index, [9, 10]).tolist() == [9, -1]
+    new_index = index.delete([9])
+    label_positions.remove(index, [9], new_index)
+    assert label_positions.get_positions(new_index, [9, 8]).tolist() == [-1, 8]
+
+
+def test_label_positions_non_unique():
+    with pytest.raises(ValueError):
+        LabelPositions().get_positions(Index(['a', 'b', 'a']), ['b'])
+
+    # Duplicated label added at the end of the index
+    label_positions = LabelPositions()
+    index = Index(['a', 'b'])
+    assert label_positions.get_positions(index, ['b']).tolist() == [1]
+    with pytest.raises(ValueError):
+        label_positions.get_positions(index.append(Index(['a'])), ['b'])
+
+
+def test_managing_with_integer_index():
+    queue_name = 'TEST_COMPARISON'
+    dataframe = DataFrame({'A': numpy.arange(10.0)}, index=numpy.arange(0, 20, 2))
+    dataframe.drop([4], inplace=True)
+    assign_dataframe(dataframe, 6, ['A'], queue_name=queue_name)
+
+    @managing(queue_name=queue_name)
+    def manage():
+        pass
+
+    manage()
+    assert list(dataframe.index) == [8, 10, 12, 14, 16, 18]
+
+
+def test_managing_with_missing_values():
+    queue_name = 'TEST_COMPARISON'
+    dataframe = DataFrame({'A': [numpy.nan, 2.0, 3.0], 'B': [None, 'b', 'c']},
+                          index=['a1', 'a2', 'a3'])
+    assign_dataframe(dataframe, 2, ['A', 'B'], queue_name=queue_name)
+
+    @managing(queue_name=queue_name)
+    def manage():
+        pass
+
+    manage()
+    assert list(dataframe.index) == ['a2', 'a3']
+
+
+@pytest.mark.parametrize("index_type", ['string', 'integer'])
+def test_managing_with_added_rows(index_type: str):
+    queue_name = 'TEST_COMPARISON'
+    labels = ['row_{}'.format(label) if index_type == 'string' else 2 * label
+              for label in range(200)]
+    dataframe = DataFrame({'A': numpy.arange(20.0)}, index=labels[:20])
+    assign_dataframe(dataframe, 20, ['A'], queue_name=queue_name)
+
+    @managing(queue_name=queue_name)
+    @adding(queue_name=queue_name)
+    def add_row(label, value: float) -> list:
+        dataframe.at[label, 'A'] = value
+        return [(label, {'A': value})]
+
+    # The positions of the labels follow the added and removed rows (some rows updated)
+    updated_labels = list(labels[:20])
+    for label_index in range(20, 200):
+        add_row(labels[label_index], float(label_index))
+        updated_labels.append(labels[label_index])
+        if label_index % 7 == 0:
+            add_row(labels[label_index - 10], -1.0)
+            updated_labels.remove(labels[label_index - 10])
+            updated_labels.append(labels[label_index - 10])
+        assert len(dataframe) == 20
+    assert set(dataframe.index) == set(updated_labels[-20:])
+
+
+def test_managing_with_non_unique_index():
+    queue_name = 'TEST_COMPARISON'
+    dataframe = DataFrame({'A': numpy.arange(3.0)}, index=['a1', 'a2', 'a1'])
+    assign_dataframe(dataframe, 2, ['A'], queue_name=queue_name)
+
+    @managing(queue_name=queue_name)
+    def manage():
+        pass
+
+    with pytest.raises(ValueError):
+        manage()
+    assert len(dataframe) == 3
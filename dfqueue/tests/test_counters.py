@@ -0,0 +1,58 @@
+# coding: utf8
+
+from collections import Counter
+# noinspection PyPackageRequirements
+import pytest
+from dfqueue.core.counters import InternedCounter
+
+
+def test_interned_counter():
+    counter = InternedCounter()
+
+    assert counter.increment('a1', {'A': 1, 'B': 2}) == 1
+    assert counter.increment('a1', {'B': 3, 'A': 4}) == 2
+    assert counter.increment('a1', {'A': 5}) == 1
+    assert counter.increment('a2', {'A': 6}) == 1
+    assert counter.schemas_nb == 2
+
+    assert counter['a1'] == Counter({frozenset(['A', 'B']): 2, frozenset(['A']): 1})
+    assert counter == {'a1': Counter({frozenset(['A', 'B']): 2, frozenset(['A']): 1}),
+                       'a2': Counter({frozenset(['A']): 1})}
+    assert counter.count('a1', {'B': None, 'A': None}) == 2
+    assert set(counter.keys()) == {'a1', 'a2'}
+    assert len(counter) == 2
+    assert 'a2' in counter
+
+    assert counter.decrement('a2', {'A': 6}) == 1
+    assert 'a2' not in counter
+    assert counter.decrement('a2', {'A': 6}) == 0
+    assert counter == {'a1': Counter({frozenset(['A', 'B']): 2, frozenset(['A']): 1}),
+                       'a2': Counter({frozenset(['A']): 0})}
+    with pytest.raises(KeyError):
+        counter['a2']
+
+    assert counter.decrement('a1', {'A': 1, 'B': 2}) == 2
+    assert counter.decrement('a1', {'A': 5}) == 1
+    assert counter == {'a1': Counter({frozenset(['A', 'B']): 1})}
+
+
+def test_interned_counter_conversion():
+    legacy_counter = {'a1': Counter({frozenset(['A']): 2}),
+                      'a2': Counter({frozenset(['A']): 1, frozenset(['B']): 3})}
+    counter = InternedCounter(legacy_counter)
+
+    assert counter == legacy_counter
+    assert counter.to_dict() == legacy_counter
+    assert counter.schemas_nb == 2
+    assert InternedCounter.from_labels(['a1', 'a2', 'a1'], ['A']) == \
+        {'a1': Counter({frozenset(['A']): 2}), 'a2': Counter({frozenset(['A']): 1})}
+
+
+def test_interned_counter_increment_many():
+    counter = InternedCounter()
+    counter.increment('a1', {'A': 1})
+    counter.increment_many([('a1', {'A': 2}), ('a2', {'B': 3, 'A': 4}), ('a2', {'A': 5, 'B': 6})])
+
+    assert counter == {'a1': Counter({frozenset(['A']): 2}),
+                       'a2': Counter({frozenset(['A', 'B']): 2})}
+    assert counter.schemas_nb == 2
@@ -0,0 +1,52 @@
+# coding: utf8
+
+# noinspection PyPackageRequirements
+import pytest
+from dfqueue.core.expiry import QueueExpiry
+
+
+def test_add_and_pop():
+    expiry = QueueExpiry(10)
+    expiry.add(3, timestamp=1)
+    expiry.add(2, timestamp=1)
+    expiry.add(4, timestamp=5)
+    expiry.add(0, timestamp=6)
+    assert len(expiry) == 9
+
+    expiry.pop(4)
+    assert len(expiry) == 5
+    assert expiry.get_expired_nb(now=11) == 1
+    expiry.pop(1)
+    assert expiry.get_expired_nb(now=11) == 0
+    assert expiry.get_expired_nb(now=15) == 4
+
+
+def test_expired_nb():
+    expiry = QueueExpiry(10)
+    assert expiry.get_expired_nb(now=100) == 0
+
+    for timestamp in range(5):
+        expiry.add(2, timestamp=timestamp)
+    assert expiry.get_expired_nb(now=9.5) == 0
+    assert expiry.get_expired_nb(now=10) == 2
+    assert expiry.get_expired_nb(now=12) == 6
+    assert expiry.get_expired_nb(now=100) == 10
+
+
+def test_filter():
+    expiry = QueueExpiry(10)
+    expiry.add(2, timestamp=0)
+    expiry.add(2, timestamp=5)
+    expiry.filter([True, False, False, True])
+
+    assert len(expiry) == 2
+    assert expiry.get_expired_nb(now=10) == 1
+    assert expiry.get_expired_nb(now=15) == 2
+
+
+def test_invalid_ttl():
+    with pytest.raises(AssertionError):
+        QueueExpiry(0)
+
+    with pytest.raises(AssertionError):
+        QueueExpiry("UNKNOWN")
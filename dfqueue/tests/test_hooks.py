@@ -0,0 +1,96 @@
+# coding: utf8
+
+import logging
+from typing import Tuple, Dict
+# noinspection PyPackageRequirements
+import pytest
+from pandas import DataFrame
+from dfqueue import adding, managing, assign_dataframe, QueueEvent, register_hook, \
+    unregister_hook, register_logging_hooks, unregister_logging_hooks
+from dfqueue.core.hooks import HOOKS
+from .scenarios import add_row, change_row_value, create_queue_item
+
+
+QUEUE_NAME = 'TEST_HOOKS'
+
+
+@managing(queue_name=QUEUE_NAME)
+@adding(queue_items_creation_function=create_queue_item,
+        other_args={"selected_columns": ['A']},
+        queue_name=QUEUE_NAME)
+def hook_add_row(dataframe: DataFrame, index: str, columns_dict: dict) -> Tuple[str, Dict]:
+    return add_row(dataframe, index, columns_dict)
+
+
+@managing(queue_name=QUEUE_NAME)
+@adding(queue_items_creation_function=create_queue_item,
+        other_args={"selected_columns": ['A']},
+        queue_name=QUEUE_NAME)
+def hook_change_row_value(dataframe: DataFrame, index: str,
+                          new_columns_dict: dict) -> Tuple[str, Dict]:
+    return change_row_value(dataframe, index, new_columns_dict)
+
+
+def test_hooks():
+    events = list()
+    hooks = {event: (lambda *args, event=event: events.append((event, args)))
+             for event in QueueEvent}
+    for event, hook in hooks.items():
+        register_hook(event, hook)
+
+    try:
+        dataframe = DataFrame(columns=['A', 'B'])
+        assign_dataframe(dataframe, 2, ['A'], QUEUE_NAME)
+        assert events == [(QueueEvent.DATAFRAME_ASSIGNED, (QUEUE_NAME, 0, 0, 2))]
+
+        events.clear()
+        hook_add_row(dataframe, 'a1', {'A': 1, 'B': 1})
+        hook_add_row(dataframe, 'a2', {'A': 2, 'B': 2})
+        hook_change_row_value(dataframe, 'a1', {'A': 3, 'B': 3})
+        assert events == [(QueueEvent.ITEM_ADDED, (QUEUE_NAME, ('a1', {'A': 1}), 1, 1, 2)),
+                          (QueueEvent.ITEM_ADDED, (QUEUE_NAME, ('a2', {'A': 2}), 2, 2, 2)),
+                          (QueueEvent.ITEM_ADDED, (QUEUE_NAME, ('a1', {'A': 3}), 3, 2, 2))]
+
+        # The first item of 'a1' is stale
+        events.clear()
+        hook_add_row(dataframe, 'a3', {'A': 4, 'B': 4})
+        assert events == [(QueueEvent.ITEM_ADDED, (QUEUE_NAME, ('a3', {'A': 4}), 4, 3, 2)),
+                          (QueueEvent.ITEM_IGNORED, (QUEUE_NAME, ('a1', {'A': 1}))),
+                          (QueueEvent.BATCH_EVICTED,
+                           (QUEUE_NAME, {}, [], 3, 3, 2)),
+                          (QueueEvent.BATCH_EVICTED,
+                           (QUEUE_NAME, {'a2': {'A': 2}}, ['a2'], 2, 2, 2))]
+        assert list(dataframe.index) == ['a1', 'a3']
+    finally:
+        for event, hook in hooks.items():
+            unregister_hook(event, hook)
+
+    assert all(len(hooks) == 0 for hooks in HOOKS)
+    with pytest.raises(AssertionError):
+        unregister_hook(QueueEvent.ITEM_ADDED, print)
+    with pytest.raises(AssertionError):
+        register_hook(QueueEvent.ITEM_ADDED, None)
+
+
+def test_logging_hooks(caplog):
+    dataframe = DataFrame(columns=['A', 'B'])
+    assign_dataframe(dataframe, 1, ['A'], QUEUE_NAME)
+
+    with caplog.at_level(logging.DEBUG):
+        hook_add_row(dataframe, 'a1', {'A': 1, 'B': 1})
+        assert len(caplog.records) == 0
+
+        register_logging_hooks()
+        register_logging_hooks()
+        try:
+            hook_add_row(dataframe, 'a2', {'A': 2, 'B': 2})
+        finally:
+            unregister_logging_hooks()
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert len(messages) == 2
+    assert "New item added in the queue '{}' : ('a2', {{'A': 2}})".format(QUEUE_NAME) \
+        in messages[0]
+    assert "Item removed from the queue '{}' : ('a1', {{'A': 1}})".format(QUEUE_NAME) \
+        in messages[1]
+    assert all(len(hooks) == 0 for hooks in HOOKS)
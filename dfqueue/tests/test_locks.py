@@ -0,0 +1,141 @@
+# coding: utf8
+
+import threading
+import time
+# noinspection PyPackageRequirements
+import pytest
+from pandas import DataFrame
+from dfqueue import assign_dataframe, get_info_provider, adding, managing, synchronized, \
+    profile_lock
+from dfqueue.core.locks import SharedExclusiveLock, LockProfile
+
+
+def test_shared_exclusive_lock():
+    lock = SharedExclusiveLock()
+    assert not lock.locked()
+
+    assert lock.acquire_shared()
+    assert lock.acquire_shared(blocking=False)
+    assert lock.shared_nb == 2
+    assert lock.locked()
+    assert not lock.acquire(blocking=False)
+    assert not lock.acquire(timeout=0.01)
+    lock.release_shared()
+    lock.release_shared()
+
+    with lock:
+        assert lock.locked()
+        assert not lock.acquire_shared(blocking=False)
+        assert not lock.acquire_shared(timeout=0.01)
+        assert not lock.acquire(blocking=False)
+    assert not lock.locked()
+
+    with pytest.raises(RuntimeError):
+        lock.release()
+    with pytest.raises(RuntimeError):
+        lock.release_shared()
+
+
+def test_shared_exclusive_lock_priority():
+    lock = SharedExclusiveLock()
+    events = list()
+    lock.acquire_shared()
+
+    def exclusive_acquisition():
+        with lock:
+            events.append('exclusive')
+
+    thread = threading.Thread(target=exclusive_acquisition)
+    thread.start()
+    time.sleep(0.05)
+    # A waiting exclusive acquisition blocks the new shared acquisitions
+    assert not lock.acquire_shared(blocking=False)
+    assert events == []
+
+    lock.release_shared()
+    thread.join(timeout=10)
+    assert events == ['exclusive']
+    assert lock.acquire_shared(blocking=False)
+    lock.release_shared()
+    assert not lock.locked()
+
+
+def test_lock_profile():
+    profile = LockProfile()
+    profile.record('QUEUE', 'function', 'exclusive', 0.5, 1.0)
+    profile.record('QUEUE', 'function', 'exclusive', 0.1, 3.0)
+    profile.record('QUEUE', 'function', 'shared', 0.0, 2.0)
+    holders = profile.get_holders()
+    assert [(holder_stats.holder, holder_stats.mode) for holder_stats in holders] == \
+        [('function', 'exclusive'), ('function', 'shared')]
+    assert holders[0].acquisitions == 2
+    assert holders[0].wait_time == pytest.approx(0.6)
+    assert holders[0].hold_time == pytest.approx(4.0)
+    assert holders[0].max_wait_time == 0.5
+    assert holders[0].max_hold_time == 3.0
+    assert profile.acquisitions == 3
+    assert profile.hold_time == pytest.approx(6.0)
+
+    lock = SharedExclusiveLock()
+    assert profile.call(lock, 'QUEUE', 'call', lambda value: lock.locked() and value, (1,)) == 1
+    assert not lock.locked()
+    with pytest.raises(ValueError):
+        profile.call(lock, 'QUEUE', 'call', int, ('a',))
+    assert not lock.locked()
+    assert [holder_stats.acquisitions for holder_stats in profile.get_holders()
+            if holder_stats.holder == 'call'] == [2]
+
+    profile.reset()
+    assert profile.get_holders() == []
+
+
+def test_profile_lock():
+    queue_name = 'TEST_PROFILE_LOCK'
+    other_queue_name = 'TEST_PROFILE_LOCK_OTHER'
+    dataframe = DataFrame({'A': [0, 1, 2]}, index=['a', 'b', 'c'])
+    assign_dataframe(dataframe, 3, ['A'], queue_name)
+    assign_dataframe(dataframe, 3, ['A'], other_queue_name)
+
+    @synchronized(queue_name=queue_name)
+    @managing(queue_name=queue_name)
+    @adding(queue_name=queue_name)
+    def add_row(label: str, value: int) -> list:
+        dataframe.at[label, 'A'] = value
+        return [(label, {'A': value})]
+
+    @synchronized(queue_name=other_queue_name, shared=True)
+    @managing(queue_name=other_queue_name)
+    @adding(queue_name=other_queue_name)
+    def read_row(label: str) -> list:
+        return [(label, {'A': dataframe.at[label, 'A']})]
+
+    # Not profiled by default
+    assert get_info_provider(queue_name).lock_profile is None
+    add_row('a', 10)
+
+    profile_lock(queue_name)
+    profile = get_info_provider(queue_name).lock_profile
+    assert isinstance(profile, LockProfile)
+    # Same Lock object for the queues of the same dataframe
+    assert get_info_provider(other_queue_name).lock_profile is profile
+    add_row('b', 11)
+    add_row('d', 12)
+    read_row('a')
+
+    holders = {(holder_stats.queue_name, holder_stats.holder.split('.')[-1], holder_stats.mode):
+               holder_stats for holder_stats in profile.get_holders()}
+    assert set(holders) == {(queue_name, 'add_row', 'exclusive'),
+                            (other_queue_name, 'read_row', 'shared'),
+                            (other_queue_name, 'read_row (managing)', 'exclusive')}
+    assert holders[(queue_name, 'add_row', 'exclusive')].acquisitions == 2
+    assert holders[(queue_name, 'add_row', 'exclusive')].hold_time > 0
+    assert holders[(other_queue_name, 'read_row', 'shared')].acquisitions == 1
+
+    # Enabling again keeps the profile
+    profile_lock(other_queue_name)
+    assert get_info_provider(queue_name).lock_profile is profile
+
+    profile_lock(queue_name, enabled=False)
+    assert get_info_provider(queue_name).lock_profile is None
+    add_row('a', 13)
+    assert profile.acquisitions == 4
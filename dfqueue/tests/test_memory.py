@@ -0,0 +1,90 @@
+# coding: utf8
+
+from sys import getsizeof
+# noinspection PyPackageRequirements
+import pytest
+from pandas import DataFrame
+from dfqueue.core.memory import MemoryBudget
+
+
+def get_rows_memory(dataframe: DataFrame) -> int:
+    # Memory of the rows without the hash table of the index (built by the label lookups)
+    return int(dataframe.memory_usage(deep=True, index=False).sum()) + \
+        sum(8 + getsizeof(label) for label in dataframe.index)
+
+
+def create_dataframe() -> DataFrame:
+    return DataFrame({'A': [1, 2, 3], 'B': ['a', 'b' * 100, 'c' * 1000], 'C': [0.1, 0.2, 0.3]},
+                     index=['r1', 'r2', 'r3'])
+
+
+def test_reset():
+    dataframe = create_dataframe()
+    memory_budget = MemoryBudget(1000)
+    memory_budget.reset(dataframe)
+
+    assert memory_budget.max_bytes == 1000
+    assert memory_budget.estimated_bytes == get_rows_memory(dataframe)
+    assert memory_budget.is_exceeded()
+
+
+def test_update_rows():
+    dataframe = create_dataframe()
+    memory_budget = MemoryBudget(100000)
+    memory_budget.reset(dataframe.iloc[:1])
+
+    memory_budget.update_rows(dataframe, ['r2', 'r3', 'UNKNOWN'])
+    assert memory_budget.estimated_bytes == get_rows_memory(dataframe)
+
+    dataframe.at['r3', 'B'] = 'c'
+    memory_budget.update_rows(dataframe, ['r3'])
+    assert memory_budget.estimated_bytes == get_rows_memory(dataframe)
+    assert not memory_budget.is_exceeded()
+
+
+def test_changed_dtypes():
+    dataframe = DataFrame({'A': [1, 2], 'B': [3, 4]}, index=['r1', 'r2'])
+    memory_budget = MemoryBudget(10 ** 6)
+    memory_budget.reset(dataframe)
+
+    # The integer column is converted to objects in place
+    dataframe.loc['r2', 'B'] = 'x' * 20000
+    memory_budget.update_rows(dataframe, ['r2'])
+    assert memory_budget.estimated_bytes == get_rows_memory(dataframe)
+    dataframe.loc['r3'] = [5, 'y' * 20000]
+    memory_budget.update_rows(dataframe, ['r3'])
+    assert memory_budget.estimated_bytes == get_rows_memory(dataframe)
+
+    # The values of the extension columns with object values have a variable size
+    dataframe = DataFrame({'A': ['a', 'b' * 1000]}, index=[1, 2], dtype='category')
+    memory_budget.reset(dataframe)
+    assert memory_budget.estimated_bytes == 2 * (8 + 8) + getsizeof('a') + getsizeof('b' * 1000)
+
+
+def test_remove_rows():
+    dataframe = create_dataframe()
+    memory_budget = MemoryBudget(100000)
+    memory_budget.reset(dataframe)
+
+    memory_budget.remove_rows(['r3', 'UNKNOWN'])
+    dataframe.drop(['r3'], inplace=True)
+    assert memory_budget.estimated_bytes == get_rows_memory(dataframe)
+
+
+def test_excess_rows_nb():
+    dataframe = DataFrame({'A': range(10)}, index=range(10, 20))
+    memory_budget = MemoryBudget(16 * 5)
+    memory_budget.reset(dataframe)
+
+    assert memory_budget.estimated_bytes == 16 * 10
+    assert memory_budget.get_excess_rows_nb() == 5
+    memory_budget.remove_rows(range(10, 15))
+    assert memory_budget.get_excess_rows_nb() == 0
+
+
+def test_invalid_budget():
+    with pytest.raises(AssertionError):
+        MemoryBudget(0)
+
+    with pytest.raises(AssertionError):
+        MemoryBudget(1.5)
@@ -120,3 +120,29 @@ def test_invalid_set_item():
                                        QueueHandlerItem.DATAFRAME: DataFrame(),
                                        QueueHandlerItem.MAX_SIZE: 1,
                                        QueueHandlerItem.BEHAVIOUR: "UNKNOWN"}
+
+
+def test_get_state():
+    handler = QueuesHandler()
+    default_queue_name = handler.default_queue_name
+    generation = handler.generation
+    state = handler.get_state(None)
+
+    assert state is handler.get_state(default_queue_name)
+    assert state.name == default_queue_name
+    assert state.lock is handler.get_assigned_lock(default_queue_name)
+
+    dataframe = DataFrame()
+    handler[default_queue_name] = {QueueHandlerItem.QUEUE: deque(),
+                                   QueueHandlerItem.COUNTER: dict(),
+                                   QueueHandlerItem.DATAFRAME: dataframe,
+                                   QueueHandlerItem.MAX_SIZE: 1,
+                                   QueueHandlerItem.BEHAVIOUR: QueueBehaviour.LAST_ITEM}
+    new_state = handler.get_state(default_queue_name)
+
+    assert handler.generation == generation + 1
+    assert new_state is not state
+    assert new_state.dataframe is dataframe
+
+    with pytest.raises(AssertionError):
+        handler.get_state("UNKNOWN")
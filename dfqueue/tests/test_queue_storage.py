@@ -0,0 +1,110 @@
+# coding: utf8
+
+from collections import deque
+from random import Random
+from uuid import uuid4
+# noinspection PyPackageRequirements
+import numpy
+# noinspection PyPackageRequirements
+import pytest
+from pandas import DataFrame
+from dfqueue import assign_dataframe, get_info_provider, managing, QueueStorage
+# noinspection PyProtectedMember
+from dfqueue.core.dfqueue import QueuesHandler
+from dfqueue.core.storage import ColumnarQueue
+
+
+def test_columnar_queue_as_deque():
+    random = Random(0)
+    columnar_queue = ColumnarQueue()
+    reference_queue = deque()
+    schemas = [('A',), ('A', 'B'), ()]
+    values = [lambda: random.randint(0, 10), lambda: random.random(), lambda: str(uuid4()),
+              lambda: random.random() > 0.5, lambda: None, lambda: 2 ** 70]
+
+    for _ in range(2000):
+        if reference_queue and random.random() < 0.4:
+            assert columnar_queue.popleft() == reference_queue.popleft()
+        else:
+            columns = random.choice(schemas)
+            item = (random.choice([random.randint(0, 50), str(random.randint(0, 50))]),
+                    {column: random.choice(values)() for column in columns})
+            columnar_queue.append(item)
+            reference_queue.append(item)
+        assert len(columnar_queue) == len(reference_queue)
+
+    assert columnar_queue == reference_queue
+    assert list(columnar_queue) == list(reference_queue)
+    for index in [0, 1, len(reference_queue) // 2, -1, -2]:
+        assert columnar_queue[index] == reference_queue[index]
+    assert reference_queue[3] in columnar_queue
+    assert ('UNKNOWN', {}) not in columnar_queue
+
+    while reference_queue:
+        assert columnar_queue.popleft() == reference_queue.popleft()
+    assert not columnar_queue
+    with pytest.raises(IndexError):
+        columnar_queue.popleft()
+
+
+def test_columnar_queue_dtypes():
+    dataframe = DataFrame({'A': numpy.arange(5, dtype=numpy.int32),
+                           'B': numpy.linspace(0, 1, 5),
+                           'C': [str(index) for index in range(5)]})
+    queue = ColumnarQueue.from_dataframe(dataframe, ['A', 'B', 'C'])
+    # noinspection PyProtectedMember
+    segment = queue._ColumnarQueue__segments[0]
+
+    assert [array.dtype for array in segment.values] == [numpy.int32, numpy.float64, object]
+    assert list(queue) == [(index, {'A': index, 'B': index / 4, 'C': str(index)})
+                           for index in range(5)]
+
+    queue.append((5, {'B': 1.25, 'A': 5, 'C': '5'}))
+    queue.append((6, {'A': 'six', 'B': 1.5, 'C': '6'}))
+    assert [array.dtype for array in segment.values] == [object, numpy.float64, object]
+    assert queue[-1] == (6, {'A': 'six', 'B': 1.5, 'C': '6'})
+
+
+def test_columnar_queue_overflow():
+    dataframe = DataFrame({'A': numpy.arange(3, dtype=numpy.int32),
+                           'B': numpy.arange(3, dtype=numpy.uint8),
+                           'C': numpy.zeros(3, dtype=numpy.float32)})
+    queue = ColumnarQueue.from_dataframe(dataframe, ['A', 'B', 'C'])
+    # noinspection PyProtectedMember
+    segment = queue._ColumnarQueue__segments[0]
+
+    # Values fitting the widths of the arrays
+    queue.append((3, {'A': numpy.int64(-2 ** 31), 'B': 255, 'C': numpy.float32(0.5)}))
+    assert [array.dtype for array in segment.values] == [numpy.int32, numpy.uint8,
+                                                         numpy.float32]
+
+    # Values overflowing the widths or losing precision : the arrays are converted to objects
+    queue.append((4, {'A': numpy.int64(2 ** 40), 'B': numpy.uint64(300), 'C': 0.1}))
+    queue.append((5, {'A': 2 ** 31, 'B': 256, 'C': numpy.float64(0.2)}))
+    assert [array.dtype for array in segment.values] == [object, object, object]
+    assert queue[-2] == (4, {'A': 2 ** 40, 'B': 300, 'C': 0.1})
+    assert queue[-1] == (5, {'A': 2 ** 31, 'B': 256, 'C': 0.2})
+    assert queue[3] == (3, {'A': -2 ** 31, 'B': 255, 'C': 0.5})
+
+
+@pytest.mark.parametrize("queue_storage", [QueueStorage.DEQUE, QueueStorage.COLUMNAR])
+def test_assign_dataframe_queue_storage(queue_storage):
+    queue_name = 'TEST_QUEUE_STORAGE'
+    dataframe = DataFrame({'A': [1, 2, 3, 4], 'B': [0.5, 1.5, 2.5, 3.5]},
+                          index=['a1', 'a2', 'a3', 'a4'])
+    assign_dataframe(dataframe, 2, ['A', 'B'], queue_name, queue_storage=queue_storage)
+    queue = QueuesHandler()._QueuesHandler__queues[queue_name]
+    assert isinstance(queue, ColumnarQueue if queue_storage == QueueStorage.COLUMNAR else deque)
+
+    provider = get_info_provider(queue_name)
+    assert provider.queue == deque([('a1', {'A': 1, 'B': 0.5}), ('a2', {'A': 2, 'B': 1.5}),
+                                    ('a3', {'A': 3, 'B': 2.5}), ('a4', {'A': 4, 'B': 3.5})])
+    assert provider.queue[1:3] == (('a2', {'A': 2, 'B': 1.5}), ('a3', {'A': 3, 'B': 2.5}))
+
+    @managing(queue_name=queue_name)
+    def manage():
+        pass
+
+    manage()
+    assert list(dataframe.index) == ['a3', 'a4']
+    assert provider.queue == deque([('a3', {'A': 3, 'B': 2.5}), ('a4', {'A': 4, 'B': 3.5})])
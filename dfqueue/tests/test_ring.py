@@ -0,0 +1,96 @@
+# coding: utf8
+
+from datetime import datetime
+# noinspection PyPackageRequirements
+import numpy
+# noinspection PyPackageRequirements
+import pytest
+from pandas import DataFrame, Timestamp
+from pandas.testing import assert_frame_equal
+from dfqueue import RingFrame
+
+
+def test_ring_frame_rows():
+    frame = RingFrame(['A', 'B'], 2, dtypes={'B': object})
+    assert frame.empty
+    assert frame.capacity == 2
+    assert list(frame.dtypes) == [numpy.dtype(numpy.float64), numpy.dtype(object)]
+
+    frame.set_row('a', {'A': 1.0, 'B': 'x'})
+    frame.set_value('b', 'A', 2)
+    assert len(frame) == 2
+    assert 'a' in frame and 'c' not in frame
+    assert frame.get_row('a') == {'A': 1.0, 'B': 'x'}
+    assert frame.get_value('b', 'A') == 2.0
+    # Missing values of a new row
+    assert frame.get_value('b', 'B') is None
+
+    # The slot of the removed row is reused
+    frame.remove_row('a')
+    frame.set_row('c', {'A': 3.0})
+    assert frame.capacity == 2
+    assert frame.labels == ['b', 'c']
+    assert frame.get_value('c', 'A') == 3.0
+    assert frame.get_value('c', 'B') is None
+    with pytest.raises(KeyError):
+        frame.get_row('a')
+    with pytest.raises(KeyError):
+        frame.remove_row('a')
+
+    # All the slots are used : the capacity is doubled
+    frame.set_row('d', {'A': 4.0, 'B': 'z'})
+    assert frame.capacity == 4
+    assert_frame_equal(frame.to_dataframe(),
+                       DataFrame({'A': [3.0, 2.0, 4.0], 'B': [None, None, 'z']},
+                                 index=['c', 'b', 'd']))
+
+    # The column is converted to objects for a value which doesn't fit its dtype
+    frame.set_value('b', 'A', 'text')
+    assert frame.dtypes['A'] == numpy.dtype(object)
+    assert frame.get_value('b', 'A') == 'text'
+
+    frame.drop_labels(['b', 'c', 'd'])
+    assert frame.empty
+    assert frame.to_dataframe().empty
+
+
+def test_ring_frame_overflow():
+    frame = RingFrame(['A', 'B', 'C', 'D'], 2,
+                      dtypes={'A': numpy.int32, 'B': numpy.uint8, 'C': numpy.float32,
+                              'D': numpy.uint8})
+    frame.set_row('a', {'A': numpy.int64(2 ** 31 - 1), 'B': 255, 'C': numpy.float16(0.5),
+                        'D': numpy.uint64(7)})
+    assert list(frame.dtypes) == [numpy.int32, numpy.uint8, numpy.float32, numpy.uint8]
+
+    # The values overflowing or losing precision are stored in object columns
+    frame.set_value('b', 'A', numpy.int64(2 ** 40))
+    frame.set_value('b', 'B', 300)
+    frame.set_value('b', 'C', 0.1)
+    frame.set_value('b', 'D', numpy.uint64(300))
+    assert list(frame.dtypes) == [numpy.dtype(object)] * 4
+    assert frame.get_row('b') == {'A': 2 ** 40, 'B': 300, 'C': 0.1, 'D': 300}
+    assert frame.get_row('a') == {'A': 2 ** 31 - 1, 'B': 255, 'C': 0.5, 'D': 7}
+
+
+def test_ring_frame_from_dataframe():
+    dataframe = DataFrame({'A': [1, 2, 3], 'B': [0.5, numpy.nan, 1.5],
+                           'C': [Timestamp(datetime(2020, 1, day)) for day in range(1, 4)]},
+                          index=[10, 20, 30])
+    frame = RingFrame.from_dataframe(dataframe, capacity=5)
+    assert frame.capacity == 5
+    assert list(frame.dtypes) == list(dataframe.dtypes)
+    assert_frame_equal(frame.to_dataframe(), dataframe)
+
+    frame.set_row(40, {'A': 4})
+    assert frame.get_row(40)['A'] == 4
+    assert numpy.isnat(frame.get_value(40, 'C'))
+    assert frame.get_positions([30, 50, 10]).tolist() == [2, -1, 0]
+
+    assert sorted(frame.select_matching_labels({10: {'A': 1, 'C': datetime(2020, 1, 1)},
+                                                20: {'B': numpy.nan},
+                                                30: {'A': 0}})) == [10, 20]
+
+    with pytest.raises(AssertionError):
+        RingFrame.from_dataframe(dataframe, capacity=2)
+    with pytest.raises(AssertionError):
+        RingFrame(['A', 'A'], 2)
@@ -0,0 +1,148 @@
+# coding: utf8
+
+import sys
+from collections import Counter
+from threading import Thread
+# noinspection PyPackageRequirements
+import pytest
+from pandas import DataFrame
+from dfqueue import assign_dataframe, get_info_provider, managing, adding, save_queue, \
+    load_queue, QueueStorage, QueueBehaviour
+from dfqueue.core.dfqueue import QueuesHandler, QueueHandlerItem
+from dfqueue.core.counters import InternedCounter
+from dfqueue.core.sharding import ShardedQueue, ShardedCounter
+
+
+def test_sharded_queue():
+    items = [(label, {'A': index}) for index, label in enumerate('abcdefgh')]
+    queue = ShardedQueue(items[:4], shards_nb=3)
+    queue.extend(items[4:6])
+    for item in items[6:]:
+        queue.append(item)
+
+    assert queue.shards_nb == 3
+    assert sum(queue.get_shard_lengths()) == len(queue) == 8
+    # Global order of the appends
+    assert list(queue) == items
+    assert queue == items
+    assert queue[0] == items[0]
+    assert queue[-1] == items[-1]
+    assert items[2] in queue
+    assert ('a', {'A': 10}) not in queue
+    with pytest.raises(IndexError):
+        _ = queue[8]
+
+    assert queue.popleft() == items[0]
+    assert queue.popleft_many(3) == items[1:4]
+    queue.append(items[0])
+    assert queue.popleft_many(10) == items[4:] + [items[0]]
+    with pytest.raises(IndexError):
+        queue.popleft()
+    with pytest.raises(AssertionError):
+        ShardedQueue(shards_nb=0)
+
+
+def test_concurrent_extend():
+    queue = ShardedQueue(shards_nb=4)
+
+    def extend_queue(thread_index: int):
+        for call_index in range(200):
+            queue.extend([(label, {'A': (thread_index, call_index)}) for label in range(8)])
+
+    # Frequent thread switches between the sequence numbers and the shard locks
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [Thread(target=extend_queue, args=(thread_index,))
+                   for thread_index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    # The calls adding items in the same shards are ordered : the items of each call are
+    # removed together in the order of the call
+    items = queue.popleft_many(len(queue))
+    assert [item[0] for item in items] == list(range(8)) * 4 * 200
+    for thread_index in range(4):
+        calls = [item[1]['A'][1] for item in items if item[1]['A'][0] == thread_index]
+        assert calls == sorted(calls)
+
+
+def test_sharded_counter():
+    items = [('a', {'A': 0}), ('b', {'A': 1}), ('a', {'A': 2}), ('c', {'B': 3})]
+    queue = ShardedQueue(items, shards_nb=4)
+    counter = queue.counter
+    assert isinstance(counter, ShardedCounter)
+    expected_counter = InternedCounter()
+    expected_counter.increment_many(items)
+
+    assert counter == expected_counter
+    assert expected_counter == counter
+    assert counter == {'a': Counter({frozenset(['A']): 2}), 'b': Counter({frozenset(['A']): 1}),
+                       'c': Counter({frozenset(['B']): 1})}
+    assert len(counter) == 3
+    assert set(counter) == {'a', 'b', 'c'}
+    assert 'a' in counter
+    assert counter['a'] == Counter({frozenset(['A']): 2})
+    assert counter.count('a', {'A': 5}) == 2
+    assert counter.schemas_nb == 2
+    assert sorted(counter.to_schema_counts(), key=lambda entry: len(entry[1])) == \
+        [(frozenset(['B']), {'c': 1}), (frozenset(['A']), {'a': 2, 'b': 1})]
+
+    assert counter.decrement('a', {'A': 0}) == 2
+    assert counter.decrement('b', {'A': 1}) == 1
+    assert 'b' not in counter
+    assert counter.increment('d', {'A': 4}) == 1
+    assert set(counter.keys()) == {'a', 'c', 'd'}
+
+
+def test_assign_sharded_queue(tmp_path):
+    queue_name = 'TEST_SHARDED_QUEUE'
+    dataframe = DataFrame({'A': range(6)}, index=list('abcdef'))
+    assign_dataframe(dataframe, 4, ['A'], queue_name, queue_storage=QueueStorage.SHARDED,
+                     shards_nb=3)
+    provider = get_info_provider(queue_name)
+    assert provider.shards_nb == 3
+    state = QueuesHandler().get_state(queue_name)
+    assert isinstance(state.queue, ShardedQueue)
+    assert state.counter is state.queue.counter
+    assert list(provider.queue) == [(label, {'A': index}) for index, label
+                                    in enumerate('abcdef')]
+    assert len(provider.counter) == 6
+
+    @managing(queue_name=queue_name)
+    @adding(queue_name=queue_name)
+    def add_row(label: str, value: int) -> list:
+        dataframe.at[label, 'A'] = value
+        return [(label, {'A': value})]
+
+    # The first rows are removed in the global order of the queue
+    add_row('g', 6)
+    assert list(dataframe.index) == ['d', 'e', 'f', 'g']
+    add_row('d', 7)
+    add_row('h', 8)
+    # The first item of row 'd' is superseded : row 'e' is removed
+    assert list(dataframe.index) == ['d', 'f', 'g', 'h']
+    assert provider.counter == {label: Counter({frozenset(['A']): 1}) for label in 'fgdh'}
+
+    # The shards are restored by a snapshot
+    saved_queue = list(provider.queue)
+    save_queue(queue_name, str(tmp_path))
+    assign_dataframe(None, 1, [], queue_name)
+    assert provider.shards_nb is None
+    load_queue(str(tmp_path))
+    assert provider.shards_nb == 3
+    assert list(provider.queue) == saved_queue
+    assert provider.counter == {label: Counter({frozenset(['A']): 1}) for label in 'fgdh'}
+
+    # The counter of a sharded queue is its ShardedCounter object
+    items = QueuesHandler()[queue_name]
+    items[QueueHandlerItem.COUNTER] = InternedCounter()
+    with pytest.raises(AssertionError):
+        QueuesHandler()[queue_name] = items
+    with pytest.raises(AssertionError):
+        assign_dataframe(dataframe, 4, ['A'], queue_name, queue_storage=QueueStorage.SHARDED,
+                         queue_behaviour=QueueBehaviour.LRU)
@@ -0,0 +1,162 @@
+# coding: utf8
+
+import math
+from collections import Counter
+# noinspection PyPackageRequirements
+import pytest
+# noinspection PyPackageRequirements
+import numpy
+from dfqueue.core.shared import SharedFrame
+
+
+def test_rows():
+    frame = SharedFrame(['A', 'B'], 3)
+    assert frame.columns == ('A', 'B')
+    assert len(frame) == 0
+
+    frame.set_row(10, {'A': 1, 'B': 2})
+    frame.set_row(20, {'A': 3})
+    assert len(frame) == 2
+    assert 10 in frame and 20 in frame and 30 not in frame
+    assert frame.get_row(10) == {'A': 1.0, 'B': 2.0}
+    assert math.isnan(frame.get_row(20)['B'])
+
+    frame.set_row(10, {'B': 5})
+    assert frame.get_row(10) == {'A': 1.0, 'B': 5.0}
+
+    frame.set_row(30, {'A': 0, 'B': 0})
+    with pytest.raises(IndexError):
+        frame.set_row(40, {'A': 0})
+
+    frame.remove_row(20)
+    assert 20 not in frame
+    with pytest.raises(KeyError):
+        frame.remove_row(20)
+    with pytest.raises(KeyError):
+        frame.get_row(20)
+    frame.set_row(40, {'A': 4, 'B': 4})
+
+    dataframe = frame.to_dataframe()
+    assert sorted(dataframe.index.tolist()) == [10, 30, 40]
+    assert list(dataframe.columns) == ['A', 'B']
+    assert dataframe.loc[40, 'A'] == 4.0
+
+
+def test_table_rebuilding():
+    frame = SharedFrame(['A'], 4, queue_capacity=4)
+    # Deleted entries are reused or removed by the rebuilding of the table
+    for label in range(1000):
+        frame.set_row(label, {'A': label})
+        frame.remove_row(label)
+    frame.set_row(7, {'A': 7})
+    assert len(frame) == 1
+    assert frame.get_row(7) == {'A': 7.0}
+
+
+def test_last_item_behaviour():
+    frame = SharedFrame(['A', 'B'], 10)
+    for label in range(3):
+        frame.set_row(label, {'A': label, 'B': 0})
+    frame.assign(3, 3, 2, False, ['A'])
+    assert frame.checking_columns == ('A',)
+    assert not frame.is_all_items
+    assert list(frame.queue) == [(0, {'A': 0.0}), (1, {'A': 1.0}), (2, {'A': 2.0})]
+
+    # Row 0 is updated : its first item is ignored
+    frame.set_row(0, {'A': 10})
+    frame.append_items([(0, {'A': 10})])
+    assert frame.get_count(0) == 2
+    frame.set_row(3, {'A': 3})
+    frame.append_items([(3, {'A': 3})])
+    assert frame.is_eviction_needed()
+
+    assert frame.manage() == 2
+    assert sorted(frame.to_dataframe().index.tolist()) == [0, 3]
+    assert frame.queue == [(0, {'A': 10.0}), (3, {'A': 3.0})]
+    assert frame.get_count(0) == 1
+    assert frame.get_count(1) == 0
+    assert frame.manage() == 0
+
+
+def test_all_items_behaviour():
+    frame = SharedFrame(['A'], 10)
+    frame.assign(2, 2, 2, True, ['A'])
+    assert frame.is_all_items
+    for label, value in [(0, 0), (1, 1), (0, 2), (2, 2)]:
+        frame.set_row(label, {'A': value})
+        frame.append_items([(label, {'A': value})])
+
+    # The first item of row 0 doesn't match the row
+    assert frame.manage() == 1
+    assert sorted(frame.to_dataframe().index.tolist()) == [0, 2]
+    assert len(frame.queue) == 2
+
+
+def test_missing_values():
+    frame = SharedFrame(['A', 'B'], 10)
+    frame.assign(1, 1, 1, False, ['B'])
+    frame.set_row(0, {'A': 0})
+    frame.append_items([(0, {'B': math.nan})])
+    frame.set_row(1, {'A': 1, 'B': 1})
+    frame.append_items([(1, {'B': 1})])
+    assert frame.manage() == 1
+    assert 0 not in frame
+
+
+def test_full_queue():
+    frame = SharedFrame(['A'], 10, queue_capacity=2)
+    frame.assign(10, 10, 10, False, ['A'])
+    frame.append_items([(0, {'A': 0}), (1, {'A': 1})])
+    with pytest.raises(IndexError):
+        frame.append_items([(2, {'A': 2})])
+
+
+def test_queue_compaction():
+    frame = SharedFrame(['A'], 100)
+    frame.assign(100, 100, 100, False, ['A'])
+    # The superseded items are removed when the ring buffer is full
+    for value in range(1000):
+        frame.set_row(value % 10, {'A': value})
+        frame.append_items([(value % 10, {'A': value})])
+    queue_items = frame.get_queue_items()
+    assert len(queue_items) <= frame.queue_capacity
+    assert queue_items[-10:] == [(label, {'A': float(990 + label)}) for label in range(10)]
+    labels = [label for label, _ in queue_items]
+    assert all(frame.get_count(label) == labels.count(label) for label in range(10))
+
+    # The items of the ALL_ITEMS behaviour are never removed
+    frame = SharedFrame(['A'], 10, queue_capacity=2)
+    frame.assign(10, 10, 10, True, ['A'])
+    frame.append_items([(0, {'A': 0}), (0, {'A': 1})])
+    with pytest.raises(IndexError):
+        frame.append_items([(0, {'A': 2})])
+
+
+def test_labels():
+    frame = SharedFrame(['A'], 10)
+    frame.assign(10, 10, 10, False, ['A'])
+    # The labels are checked before the modification of the table
+    with pytest.raises(AssertionError):
+        frame.set_row('x', {'A': 0})
+    with pytest.raises(AssertionError):
+        frame.append_items([(1, {'A': 1}), ('x', {'A': 0})])
+    assert frame.to_dataframe().empty
+    assert len(frame.queue) == 0
+
+    frame.set_row(numpy.int64(2), {'A': 2})
+    frame.append_items([(numpy.int64(2), {'A': 2}), (2, {'A': 3})])
+    assert frame.get_count(2) == 2
+    assert frame.counter == {2: Counter({frozenset(['A']): 2})}
+    assert 2 in frame.counter and 1 not in frame.counter
+    assert list(frame.counter) == [2]
+
+
+def test_pickling():
+    frame = SharedFrame(['A'], 10)
+    frame.set_row(1, {'A': 1})
+    state = frame.__getstate__()
+    copied_frame = SharedFrame.__new__(SharedFrame)
+    copied_frame.__setstate__(state)
+    copied_frame.set_row(2, {'A': 2})
+    assert len(frame) == 2
+    assert frame.get_row(2) == {'A': 2.0}
@@ -0,0 +1,219 @@
+# coding: utf8
+
+import time
+from collections import Counter
+# noinspection PyPackageRequirements
+import numpy
+# noinspection PyPackageRequirements
+import pytest
+from pandas import DataFrame, Categorical, MultiIndex
+from dfqueue import assign_dataframe, get_info_provider, managing, adding, save_queue, \
+    load_queue, touch, QueueBehaviour, QueueStorage
+from dfqueue.core.dfqueue import QueuesHandler, QueueHandlerItem
+from dfqueue.core.snapshot import QueueSnapshot
+from dfqueue.core.storage import ColumnarQueue
+from dfqueue.core.access import FrequencyQueue
+
+
+def create_functions(queue_name: str):
+    @managing(queue_name=queue_name)
+    @adding(queue_name=queue_name)
+    def add_row(dataframe: DataFrame, label: str, value: int) -> list:
+        dataframe.at[label, 'A'] = value
+        dataframe.at[label, 'B'] = str(value)
+        return [(label, {'A': value})]
+
+    return add_row
+
+
+@pytest.mark.parametrize("queue_storage", [QueueStorage.DEQUE, QueueStorage.COLUMNAR])
+def test_save_load_queue(tmp_path, queue_storage):
+    queue_name = 'TEST_SNAPSHOT_{}'.format(queue_storage.name)
+    dataframe = DataFrame({'A': [0, 1], 'B': ['0', '1']}, index=['a', 'b'])
+    assign_dataframe(dataframe, 3, ['A'], queue_name, queue_storage=queue_storage,
+                     high_watermark=4, managing_period_calls=2)
+    add_row = create_functions(queue_name)
+    # Row 'a' is updated : its first item is superseded
+    add_row(dataframe, 'a', 10)
+    add_row(dataframe, 'c', 2)
+    provider = get_info_provider(queue_name)
+    saved_queue = list(provider.queue)
+    saved_counter = provider.counter.items()
+
+    save_queue(queue_name, str(tmp_path))
+    assign_dataframe(DataFrame(columns=['A', 'B']), 100, ['A'], queue_name)
+    restored_dataframe = load_queue(str(tmp_path))
+
+    assert restored_dataframe.equals(dataframe)
+    assert list(restored_dataframe.dtypes) == list(dataframe.dtypes)
+    state = QueuesHandler().get_state(queue_name)
+    assert state.dataframe is restored_dataframe
+    assert isinstance(state.queue, ColumnarQueue) == (queue_storage == QueueStorage.COLUMNAR)
+    assert list(provider.queue) == saved_queue
+    assert provider.counter.items() == saved_counter
+    assert provider.counter['a'] == Counter({frozenset(['A']): 2})
+    assert provider.max_size == 3
+    assert provider.high_watermark == 4
+    assert state.eviction_policy.period_calls == 2
+
+    # The superseded item of row 'a' is ignored : rows 'b' then 'a' are removed
+    add_row = create_functions(queue_name)
+    add_row(restored_dataframe, 'd', 3)
+    add_row(restored_dataframe, 'e', 4)
+    assert sorted(restored_dataframe.index) == ['c', 'd', 'e']
+
+
+@pytest.mark.parametrize("queue_storage", [QueueStorage.DEQUE, QueueStorage.COLUMNAR])
+def test_save_load_same_path(tmp_path, queue_storage):
+    queue_name = 'TEST_SNAPSHOT_SAME_PATH_{}'.format(queue_storage.name)
+    rows_nb = 100000
+    dataframe = DataFrame({'A': numpy.arange(rows_nb)})
+    assign_dataframe(dataframe, rows_nb, ['A'], queue_name, queue_storage=queue_storage)
+    provider = get_info_provider(queue_name)
+    saved_queue = list(provider.queue)
+
+    # The arrays of the loaded queue are memory-mapped : the second save doesn't overwrite them
+    save_queue(queue_name, str(tmp_path))
+    load_queue(str(tmp_path))
+    save_queue(queue_name, str(tmp_path))
+    assert list(provider.queue) == saved_queue
+    restored_dataframe = load_queue(str(tmp_path))
+    assert restored_dataframe.equals(dataframe)
+    assert list(provider.queue) == saved_queue
+    assert len([path for path in tmp_path.iterdir() if path.is_dir()]) == 1
+
+
+def test_failed_save(tmp_path):
+    QueueSnapshot({'value': 1}, {'array': numpy.arange(3)}).save(str(tmp_path))
+
+    # The lambda function can't be pickled : the previous snapshot is kept
+    with pytest.raises(Exception):
+        QueueSnapshot({'value': 2}, {'array': numpy.array([lambda: 0, 1], dtype=object)}).save(
+            str(tmp_path))
+    snapshot = QueueSnapshot.load(str(tmp_path))
+    assert snapshot.metadata['value'] == 1
+    assert snapshot.arrays['array'].tolist() == [0, 1, 2]
+    assert len([path for path in tmp_path.iterdir() if path.is_dir()]) == 1
+
+
+def test_load_previous_layout(tmp_path):
+    # Snapshot saved directly in the directory
+    QueueSnapshot({'value': 1}, {'array': numpy.arange(3)}).save(str(tmp_path / 'snapshots'))
+    snapshot_path, = [path for path in (tmp_path / 'snapshots').iterdir() if path.is_dir()]
+    snapshot_path.rename(tmp_path / 'previous')
+    assert QueueSnapshot.load(str(tmp_path / 'previous')).metadata['value'] == 1
+
+    QueueSnapshot({'value': 2}, {'array': numpy.arange(2)}).save(str(tmp_path / 'previous'))
+    assert QueueSnapshot.load(str(tmp_path / 'previous')).metadata['value'] == 2
+    assert not (tmp_path / 'previous' / 'array.npy').exists()
+
+
+def test_load_queue_without_dataframe(tmp_path):
+    queue_name = 'TEST_SNAPSHOT_WITHOUT_DATAFRAME'
+    dataframe = DataFrame({'A': [0, 1]}, index=[10, 20])
+    assign_dataframe(dataframe, 4, ['A'], queue_name, max_bytes=1000, max_queue_length=5)
+    save_queue(queue_name, str(tmp_path), save_dataframe=False)
+
+    with pytest.raises(AssertionError):
+        get_info_provider('TEST_SNAPSHOT_RESTORED')
+    other_dataframe = DataFrame({'A': [0, 1]}, index=[10, 20])
+    assert load_queue(str(tmp_path), 'TEST_SNAPSHOT_RESTORED', other_dataframe) is \
+        other_dataframe
+    provider = get_info_provider('TEST_SNAPSHOT_RESTORED')
+    assert list(provider.queue) == [(10, {'A': 0}), (20, {'A': 1})]
+    assert provider.max_bytes == 1000
+    assert provider.estimated_bytes == 2 * 16
+    assert provider.max_queue_length == 5
+
+
+@pytest.mark.parametrize("queue_storage", [QueueStorage.DEQUE, QueueStorage.COLUMNAR])
+def test_save_load_multiindex(tmp_path, queue_storage):
+    queue_name = 'TEST_SNAPSHOT_MULTIINDEX_{}'.format(queue_storage.name)
+    dataframe = DataFrame({'A': [0, 1, 2]},
+                          index=MultiIndex.from_tuples([(1, 10), (1, 20), (2, 10)],
+                                                       names=['first', 'second']))
+    assign_dataframe(dataframe, 10, ['A'], queue_name, queue_storage=queue_storage)
+    provider = get_info_provider(queue_name)
+    saved_queue = list(provider.queue)
+    saved_counter = provider.counter.items()
+
+    save_queue(queue_name, str(tmp_path))
+    restored_dataframe = load_queue(str(tmp_path))
+    assert restored_dataframe.equals(dataframe)
+    assert isinstance(restored_dataframe.index, MultiIndex)
+    assert restored_dataframe.index.names == ['first', 'second']
+    assert list(provider.queue) == saved_queue
+    assert provider.counter.items() == saved_counter
+    assert provider.counter[(1, 20)] == Counter({frozenset(['A']): 1})
+
+
+@pytest.mark.parametrize("queue_behaviour", [QueueBehaviour.LRU, QueueBehaviour.LFU])
+def test_save_load_access_queue(tmp_path, queue_behaviour):
+    queue_name = 'TEST_SNAPSHOT_{}'.format(queue_behaviour.name)
+    dataframe = DataFrame({'A': [0, 1, 2]}, index=['a', 'b', 'c'])
+    assign_dataframe(dataframe, 10, ['A'], queue_name, queue_behaviour=queue_behaviour)
+    touch(['a', 'a', 'b'], queue_name)
+    saved_queue = list(get_info_provider(queue_name).queue)
+    save_queue(queue_name, str(tmp_path))
+    load_queue(str(tmp_path))
+
+    queue = QueuesHandler()[queue_name][QueueHandlerItem.QUEUE]
+    assert list(queue) == saved_queue
+    if queue_behaviour == QueueBehaviour.LFU:
+        assert [queue.get_frequency(label) for label in 'abc'] == [3, 2, 1]
+
+
+def test_save_load_expiry(tmp_path):
+    queue_name = 'TEST_SNAPSHOT_EXPIRY'
+    dataframe = DataFrame({'A': [0]}, index=['a'])
+    assign_dataframe(dataframe, 10, ['A'], queue_name, ttl=10)
+    time.sleep(0.05)
+    save_queue(queue_name, str(tmp_path))
+    load_queue(str(tmp_path))
+
+    expiry = QueuesHandler()[queue_name][QueueHandlerItem.EXPIRY]
+    assert len(expiry) == 1
+    # The age of the items is kept
+    assert expiry.get_expired_nb(time.monotonic() + 9.96) == 1
+    assert expiry.get_expired_nb(time.monotonic() + 9.9) == 0
+
+
+def test_snapshot_arrays(tmp_path):
+    dataframe = DataFrame({'A': [1.5, 2.5], 'B': Categorical(['x', 'y']), 'C': [True, False]},
+                          index=[3, 4])
+    dataframe.index.name = 'I'
+    queue = ColumnarQueue([(3, {'A': 1.5}), ('x', {'B': 'x'}), (4, {'A': 2.5})])
+    snapshot = QueueSnapshot()
+    snapshot.add_queue(queue)
+    snapshot.add_dataframe(dataframe)
+    snapshot.save(str(tmp_path))
+
+    loaded_snapshot = QueueSnapshot.load(str(tmp_path))
+    # Numeric arrays are memory-mapped
+    assert isinstance(loaded_snapshot.arrays['queue_schema_ids'], numpy.memmap)
+    assert isinstance(loaded_snapshot.arrays['dataframe_column_0'], numpy.memmap)
+    assert list(loaded_snapshot.get_queue()) == list(queue)
+    loaded_dataframe = loaded_snapshot.get_dataframe()
+    assert loaded_dataframe.equals(dataframe)
+    assert loaded_dataframe.index.name == 'I'
+    assert loaded_dataframe['B'].dtype == dataframe['B'].dtype
+
+    restored_queue = loaded_snapshot.get_queue()
+    restored_queue.append((5, {'A': 3.5}))
+    restored_queue.popleft()
+    assert list(restored_queue) == [('x', {'B': 'x'}), (4, {'A': 2.5}), (5, {'A': 3.5})]
+
+
+def test_frequency_queue_from_frequencies():
+    queue = FrequencyQueue([('a', {}), ('b', {}), ('c', {})])
+    queue.touch('a')
+    queue.touch('a')
+    queue.touch('c')
+    restored_queue = FrequencyQueue.from_frequencies(
+        list(queue), [queue.get_frequency(item[0]) for item in queue])
+    assert list(restored_queue) == list(queue)
+    restored_queue.touch('b')
+    assert list(restored_queue) == [('c', {}), ('b', {}), ('a', {})]
+    assert restored_queue.get_frequency('b') == 2
+    with pytest.raises(AssertionError):
+        FrequencyQueue.from_frequencies([('a', {}), ('b', {})], [2, 1])
@@ -0,0 +1,139 @@
+# coding: utf8
+
+from urllib.request import urlopen
+from urllib.error import HTTPError
+# noinspection PyPackageRequirements
+import pytest
+from pandas import DataFrame
+from dfqueue import assign_dataframe, get_info_provider, managing, adding, batch, \
+    export_stats, serve_stats
+from dfqueue.core.stats import LatencyHistogram, QueueStats
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram([0.001, 0.01, 0.1])
+    assert histogram.get_quantile(0.5) is None
+    for duration in [0.0005, 0.001, 0.005, 0.05, 5]:
+        histogram.observe(duration)
+    assert histogram.counts == [2, 1, 1, 1]
+    assert histogram.count == 5
+    assert histogram.sum == pytest.approx(5.0565)
+    assert histogram.get_cumulative_counts() == [(0.001, 2), (0.01, 3), (0.1, 4),
+                                                 (float('inf'), 5)]
+    assert histogram.get_quantile(0.4) == 0.001
+    assert histogram.get_quantile(0.5) == 0.01
+    assert histogram.get_quantile(1) == 0.1
+    histogram.reset()
+    assert histogram.counts == [0, 0, 0, 0]
+    assert histogram.count == 0
+
+    with pytest.raises(AssertionError):
+        LatencyHistogram([0.1, 0.01])
+
+
+def create_functions(queue_name: str, dataframe: DataFrame):
+    @managing(queue_name=queue_name)
+    @adding(queue_name=queue_name)
+    def add_row(label: str, value: int) -> list:
+        dataframe.at[label, 'A'] = value
+        return [(label, {'A': value})]
+
+    # The checking value of the item doesn't match the row
+    @adding(queue_name=queue_name)
+    def add_stale_item(label: str) -> list:
+        return [(label, {'A': -1})]
+
+    return add_row, add_stale_item
+
+
+def test_queue_stats():
+    queue_name = 'TEST_STATS'
+    dataframe = DataFrame({'A': [0, 1, 2]}, index=['a', 'b', 'c'])
+    assign_dataframe(dataframe, 3, ['A'], queue_name)
+    add_row, add_stale_item = create_functions(queue_name, dataframe)
+    stats = get_info_provider(queue_name).stats
+    assert isinstance(stats, QueueStats)
+    assert stats.adding_calls == stats.items_added == stats.managing_calls == 0
+
+    # Row 'a' is updated : its first item is superseded
+    add_row('a', 10)
+    add_stale_item('b')
+    assert stats.adding_calls == 2
+    assert stats.items_added == 2
+    assert stats.managing_calls == 1
+    assert stats.managing_runs == 0
+
+    # The first items of rows 'a' and 'b' are superseded : rows 'c' then 'a' are removed
+    add_row('d', 3)
+    add_row('e', 4)
+    assert list(dataframe.index) == ['b', 'd', 'e']
+    assert stats.managing_runs == 2
+    assert stats.items_evicted == 4
+    assert stats.rows_evicted == 2
+    assert stats.items_superseded == 2
+    assert stats.items_stale == 0
+
+    # The last item of row 'b' is stale : row 'd' is removed
+    add_row('f', 5)
+    assert list(dataframe.index) == ['b', 'e', 'f']
+    assert stats.adding_calls == 5
+    assert stats.items_added == 5
+    assert stats.managing_calls == 4
+    assert stats.managing_runs == 3
+    assert stats.items_evicted == 6
+    assert stats.rows_evicted == 3
+    assert stats.items_superseded == 2
+    assert stats.items_stale == 1
+    assert stats.adding_latency.count == 5
+    assert stats.managing_latency.count == 4
+    assert stats.managing_latency.sum > 0
+
+    # Items of a batch are counted at the end of the batch
+    with batch(queue_name):
+        add_row('a', 11)
+        assert stats.items_added == 5
+    assert stats.items_added == 6
+    assert stats.adding_calls == 6
+
+    stats.reset()
+    assert stats.to_dict()['items_added'] == 0
+    assert stats.to_dict()['adding_latency']['count'] == 0
+    # The statistics of a new assignment are new
+    assign_dataframe(dataframe, 3, ['A'], queue_name)
+    assert get_info_provider(queue_name).stats is not stats
+
+
+def test_export_stats():
+    queue_name = 'TEST_EXPORT_STATS'
+    dataframe = DataFrame({'A': [0, 1]}, index=['a', 'b'])
+    assign_dataframe(dataframe, 2, ['A'], queue_name)
+    add_row, _ = create_functions(queue_name, dataframe)
+    add_row('c', 2)
+
+    metrics = export_stats([queue_name])
+    lines = metrics.splitlines()
+    assert '# TYPE dfqueue_items_added_total counter' in lines
+    assert 'dfqueue_items_added_total{queue="TEST_EXPORT_STATS"} 1' in lines
+    assert 'dfqueue_rows_evicted_total{queue="TEST_EXPORT_STATS"} 1' in lines
+    assert '# TYPE dfqueue_adding_latency_seconds histogram' in lines
+    assert 'dfqueue_adding_latency_seconds_bucket{queue="TEST_EXPORT_STATS",le="+Inf"} 1' \
+        in lines
+    assert 'dfqueue_managing_latency_seconds_count{queue="TEST_EXPORT_STATS"} 1' in lines
+    assert 'dfqueue_queue_items{queue="TEST_EXPORT_STATS"} 2.0' in lines
+    assert 'dfqueue_dataframe_rows{queue="TEST_EXPORT_STATS"} 2.0' in lines
+    assert 'dfqueue_max_size{queue="TEST_EXPORT_STATS"} 2.0' in lines
+    assert metrics.endswith('\n')
+    # All the queues by default
+    assert 'queue="TEST_EXPORT_STATS"' in export_stats()
+
+    server = serve_stats(queue_names=[queue_name])
+    try:
+        url = 'http://{}:{}'.format(*server.server_address)
+        with urlopen(url + '/metrics') as response:
+            assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+            assert response.read().decode('utf8') == export_stats([queue_name])
+        with pytest.raises(HTTPError):
+            urlopen(url + '/unknown')
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,233 @@
+# coding: utf8
+
+import os
+import time
+# noinspection PyPackageRequirements
+import pytest
+from pandas import DataFrame
+from dfqueue import assign_dataframe, get_info_provider, managing, adding, save_queue, replay, \
+    sync_wal, touch, QueueBehaviour, RingFrame
+from dfqueue.core.dfqueue import QueuesHandler
+from dfqueue.core.wal import WriteAheadLog, WalRecordType, FILE_HEADER, RECORD_HEADER
+
+
+def test_records(tmp_path):
+    path = str(tmp_path / 'queue.wal')
+    wal = WriteAheadLog(path)
+    assert wal.generation == 0
+    assert wal.size == 0
+    wal.log_append([('a', {'A': 1}), ('b', {'A': 2})])
+    wal.log_eviction(1, ['a'])
+    wal.log_compaction()
+    wal.log_touch(['b'])
+    records = wal.read_records()
+    assert [record[0] for record in records] == [WalRecordType.APPEND, WalRecordType.EVICTION,
+                                                 WalRecordType.COMPACTION, WalRecordType.TOUCH]
+    assert [record[2] for record in records] == [[('a', {'A': 1}), ('b', {'A': 2})],
+                                                 (1, ['a']), None, ['b']]
+    assert wal.size == wal.written_bytes
+    wal.close()
+    assert wal.closed
+    assert os.path.getsize(path) == FILE_HEADER.size + wal.size + 1
+
+    # The records are read again when the log is reopened
+    wal = WriteAheadLog(path)
+    assert [record[2] for record in wal.read_records()][-1] == ['b']
+    wal.log_touch(['a'])
+    assert len(wal.read_records()) == 5
+    wal.close()
+
+
+def test_reset(tmp_path):
+    path = str(tmp_path / 'queue.wal')
+    wal = WriteAheadLog(path)
+    wal.log_touch(['a'])
+    wal.reset()
+    assert wal.generation == 1
+    assert wal.size == 0
+    assert wal.read_records() == list()
+    wal.log_touch(['b'])
+    wal.close()
+
+    wal = WriteAheadLog(path)
+    assert wal.generation == 1
+    assert wal.read_records()[0][2] == ['b']
+    wal.close()
+
+
+def test_corrupted_tail(tmp_path):
+    path = str(tmp_path / 'queue.wal')
+    wal = WriteAheadLog(path)
+    wal.log_touch(['a'])
+    first_size = wal.size
+    wal.log_touch(['b'])
+    wal.close()
+
+    # Last byte of the second record's payload
+    with open(path, 'r+b') as wal_file:
+        wal_file.seek(FILE_HEADER.size + wal.size - 1)
+        wal_file.write(b'\xff')
+
+    wal = WriteAheadLog(path)
+    assert [record[2] for record in wal.read_records()] == [['a']]
+    assert wal.size == first_size
+    # The corrupted record is overwritten
+    wal.log_touch(['c'])
+    assert [record[2] for record in wal.read_records()] == [['a'], ['c']]
+    wal.close()
+
+    with pytest.raises(AssertionError):
+        with open(path, 'r+b') as wal_file:
+            wal_file.write(b'NOTAWAL!')
+        WriteAheadLog(path)
+
+
+def test_group_commit(tmp_path):
+    wal = WriteAheadLog(str(tmp_path / 'queue.wal'), sync_ms=0)
+    for index in range(10):
+        wal.log_touch([index])
+    assert wal.syncs_nb == 10
+
+    wal = WriteAheadLog(str(tmp_path / 'grouped.wal'), sync_ms=60000, sync_bytes=1 << 20)
+    for index in range(10):
+        wal.log_touch([index])
+    assert wal.syncs_nb == 0
+    wal.sync()
+    assert wal.syncs_nb == 1
+    assert wal.synced_bytes >= wal.written_bytes
+
+    # The records are synced at the end of the period without a later write
+    wal = WriteAheadLog(str(tmp_path / 'timed.wal'), sync_ms=50, sync_bytes=1 << 20)
+    wal.log_touch(['a'])
+    wal.log_touch(['b'])
+    assert wal.syncs_nb == 0
+    time.sleep(0.5)
+    assert wal.syncs_nb == 1
+    assert wal.synced_bytes >= wal.written_bytes
+    # Synced by the write (last sync older than the period), then by the thread
+    wal.log_touch(['c'])
+    assert wal.syncs_nb == 2
+    wal.log_touch(['d'])
+    time.sleep(0.5)
+    assert wal.syncs_nb == 3
+    wal.close()
+
+    # The size threshold syncs the records
+    wal = WriteAheadLog(str(tmp_path / 'sized.wal'), sync_ms=60000, sync_bytes=1)
+    wal.log_touch(['a'])
+    assert wal.syncs_nb == 1
+
+    # The file grows with the records
+    payload = [str(index) * 1000 for index in range(1000, 3000)]
+    wal.log_touch(payload)
+    assert wal.read_records()[-1][2] == payload
+    assert wal.size > RECORD_HEADER.size + 2000 * 4000
+    wal.close()
+
+
+def create_functions(queue_name: str):
+    @managing(queue_name=queue_name)
+    @adding(queue_name=queue_name)
+    def add_row(dataframe: DataFrame, label: str, value: int) -> list:
+        dataframe.at[label, 'A'] = value
+        return [(label, {'A': value})]
+
+    return add_row
+
+
+@pytest.mark.parametrize("behaviour", [QueueBehaviour.LAST_ITEM, QueueBehaviour.LRU])
+def test_replay(tmp_path, behaviour):
+    queue_name = 'TEST_WAL_{}'.format(behaviour.name)
+    snapshot_path = str(tmp_path / 'snapshot')
+    wal_path = str(tmp_path / 'queue.wal')
+    dataframe = DataFrame({'A': [0, 1]}, index=['a', 'b'])
+    assign_dataframe(dataframe, 3, ['A'], queue_name, queue_behaviour=behaviour,
+                     wal_path=wal_path, wal_sync_ms=60000)
+    provider = get_info_provider(queue_name)
+    assert provider.wal_path == wal_path
+    add_row = create_functions(queue_name)
+    add_row(dataframe, 'c', 2)
+    save_queue(queue_name, snapshot_path, save_dataframe=False)
+    assert QueuesHandler().get_state(queue_name).wal.size == 0
+
+    # Mutations after the snapshot : appends, reads and evictions
+    add_row(dataframe, 'd', 3)
+    touch(['b'], queue_name)
+    add_row(dataframe, 'a', 10)
+    add_row(dataframe, 'e', 4)
+    sync_wal(queue_name)
+    expected_queue = list(provider.queue)
+    expected_counter = provider.counter.items()
+    expected_dataframe = dataframe.copy()
+
+    # Rows of the snapshot's dataframe and rows added after the snapshot
+    restored_dataframe = replay(snapshot_path, wal_path, dataframe=DataFrame(
+        {'A': [10, 1, 2, 3, 4]}, index=['a', 'b', 'c', 'd', 'e']))
+    assert list(provider.queue) == expected_queue
+    assert provider.counter.items() == expected_counter
+    assert restored_dataframe.sort_index().equals(
+        expected_dataframe.sort_index().astype(restored_dataframe.dtypes))
+    assert provider.wal_path == wal_path
+
+    # The mutations are logged after the replay
+    add_row = create_functions(queue_name)
+    add_row(restored_dataframe, 'f', 5)
+    assert len(restored_dataframe) == 3
+    assert QueuesHandler().get_state(queue_name).wal.read_records()[-1][0] == \
+        WalRecordType.EVICTION
+    assign_dataframe(None, 1, [], queue_name)
+
+
+def test_replay_ring_frame(tmp_path):
+    queue_name = 'TEST_WAL_RING_FRAME'
+    snapshot_path = str(tmp_path / 'snapshot')
+    wal_path = str(tmp_path / 'queue.wal')
+    frame = RingFrame.from_dataframe(DataFrame({'A': [0.0, 1.0]}, index=['a', 'b']))
+    assign_dataframe(frame, 2, ['A'], queue_name, wal_path=wal_path)
+
+    @managing(queue_name=queue_name)
+    @adding(queue_name=queue_name)
+    def add_row(ring_frame: RingFrame, label: str, value: float) -> list:
+        ring_frame.set_row(label, {'A': value})
+        return [(label, {'A': value})]
+
+    save_queue(queue_name, snapshot_path, save_dataframe=False)
+    add_row(frame, 'c', 2.0)
+    add_row(frame, 'd', 3.0)
+    sync_wal(queue_name)
+    assert sorted(frame.labels) == ['c', 'd']
+
+    # 'a' is missing in the restored frame
+    restored_frame = RingFrame.from_dataframe(
+        DataFrame({'A': [1.0, 2.0, 3.0]}, index=['b', 'c', 'd']))
+    assert replay(snapshot_path, wal_path, dataframe=restored_frame) is restored_frame
+    assert sorted(restored_frame.labels) == ['c', 'd']
+    assert list(get_info_provider(queue_name).queue) == [('c', {'A': 2.0}), ('d', {'A': 3.0})]
+    assign_dataframe(None, 1, [], queue_name)
+
+
+def test_replay_generations(tmp_path):
+    queue_name = 'TEST_WAL_GENERATIONS'
+    snapshot_path = str(tmp_path / 'snapshot')
+    wal_path = str(tmp_path / 'queue.wal')
+    dataframe = DataFrame({'A': [0, 1]}, index=['a', 'b'])
+    assign_dataframe(dataframe, 3, ['A'], queue_name, wal_path=wal_path)
+    save_queue(queue_name, snapshot_path)
+    add_row = create_functions(queue_name)
+    add_row(dataframe, 'c', 2)
+    saved_queue = list(get_info_provider(queue_name).queue)
+    save_queue(queue_name, str(tmp_path / 'newer_snapshot'))
+
+    # The log contains the mutations since the newer snapshot
+    with pytest.raises(AssertionError):
+        replay(snapshot_path, wal_path, queue_name)
+
+    # The records older than the snapshot are ignored
+    replay(str(tmp_path / 'newer_snapshot'), wal_path, queue_name)
+    assert list(get_info_provider(queue_name).queue) == saved_queue
+
+    with pytest.raises(AssertionError):
+        sync_wal('TEST_WAL_UNKNOWN_QUEUE')
+    assign_dataframe(None, 1, [], queue_name)
+    with pytest.raises(AssertionError):
+        sync_wal(queue_name)